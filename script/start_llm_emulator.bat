@@ -0,0 +1,3 @@
+cd ..\src\Backend\llm_emulator\
+CALL conda.bat activate easy-notebook
+python main.py
\ No newline at end of file
@@ -0,0 +1,4 @@
+#!/bin/bash
+cd ../src/Backend/llm_emulator
+conda activate easy-notebook
+uvicorn main:app --host 0.0.0.0 --port 38600
\ No newline at end of file
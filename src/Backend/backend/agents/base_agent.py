@@ -6,6 +6,7 @@ from abc import ABC, abstractmethod
 from dotenv import load_dotenv
 from utils.oracle import Oracle
 from utils.parser import StreamingTemplateParser
+from utils.prompt_layout import PromptLayout, STATIC, SESSION, TURN, get_prompt_cache_stats, prefix_hash
 
 load_dotenv()
 
@@ -115,89 +116,105 @@ class BaseAgentTemplate(ABC,Oracle,StreamingTemplateParser):
             
         return self.agent_memory.get("user_intent_observations", {})
         
-    def _build_memory_aware_prompt(self) -> str:
-        """构建包含记忆信息的提示词"""
-        base_prompt = self.role
-        
+    def _memory_context(self) -> Dict[str, List[str]]:
+        """
+        记忆上下文, 按变化频率分为会话级(偏好、已验证和已失败的方法)和轮次级(目标、阻塞、焦点、警告)
+        """
+        session, turn = [], []
         if not self.agent_memory:
-            return base_prompt
-            
-        # 添加记忆上下文
-        memory_context = []
+            return {SESSION: session, TURN: turn}
         
         # 1. 用户意图理解
         intent_obs = self._get_user_intent()
         stated_goals = intent_obs.get("stated_goals", [])
         if stated_goals:
-            memory_context.append(f"用户明确目标: {', '.join(stated_goals)}")
+            turn.append(f"用户明确目标: {', '.join(stated_goals)}")
             
         progress_markers = intent_obs.get("progress_markers", {})
         blocked_on = progress_markers.get("blocked_on", [])
         if blocked_on:
-            memory_context.append(f"当前阻塞: {', '.join(blocked_on)}")
+            turn.append(f"当前阻塞: {', '.join(blocked_on)}")
             
         current_focus = progress_markers.get("current_focus", "")
         if current_focus:
-            memory_context.append(f"当前焦点: {current_focus}")
+            turn.append(f"当前焦点: {current_focus}")
             
         # 2. 避免重复失败的方法
         failed_approaches = self._get_avoided_approaches()
         if failed_approaches:
-            memory_context.append(f"避免以下已尝试失败的方法: {', '.join(failed_approaches)}")
+            session.append(f"避免以下已尝试失败的方法: {', '.join(failed_approaches)}")
             
         # 3. 参考之前成功的解决方案
         working_solutions = self._get_working_solutions()
         if working_solutions:
             solutions_text = ", ".join([f"{k}: {v}" for k, v in list(working_solutions.items())[:3]])  # 只显示前3个
-            memory_context.append(f"可参考的成功方案: {solutions_text}")
+            session.append(f"可参考的成功方案: {solutions_text}")
             
         # 4. 用户偏好
         user_prefs = self._get_user_preferences()
         preferred_libs = user_prefs.get("preferred_libraries", [])
         if preferred_libs:
-            memory_context.append(f"用户偏好的库: {', '.join(preferred_libs[:5])}")  # 只显示前5个
+            session.append(f"用户偏好的库: {', '.join(preferred_libs[:5])}")  # 只显示前5个
             
         explanation_detail = user_prefs.get("explanation_detail", "")
         if explanation_detail:
-            memory_context.append(f"用户偏好的解释详细度: {explanation_detail}")
+            session.append(f"用户偏好的解释详细度: {explanation_detail}")
             
         # 5. 版本信息
-        if self.agent_memory:
-            situation = self.agent_memory.get("situation_tracking", {})
-            code_evolution = situation.get("code_evolution", {})
-            working_versions = code_evolution.get("working_versions", [])
-            if working_versions:
-                memory_context.append("存在历史工作版本，必要时可建议回滚到稳定版本")
+        situation = self.agent_memory.get("situation_tracking", {})
+        code_evolution = situation.get("code_evolution", {})
+        working_versions = code_evolution.get("working_versions", [])
+        if working_versions:
+            session.append("存在历史工作版本，必要时可建议回滚到稳定版本")
                 
         # 6. 终止条件提醒
         should_terminate, terminate_reason = self._should_terminate()
         if should_terminate:
-            memory_context.append(f"重要警告: {terminate_reason}")
-            
-        if memory_context:
-            enhanced_prompt = f"""{base_prompt}
-
-基于历史记忆和当前情况:
-{chr(10).join(['- ' + ctx for ctx in memory_context])}
-
-请基于以上信息，避免重复失败的尝试，优先使用已证明有效的方法。如果遇到警告提示，请按照警告指示行动。"""
-            return enhanced_prompt
+            turn.append(f"重要警告: {terminate_reason}")
             
-        return base_prompt
+        return {SESSION: session, TURN: turn}
+        
+    def _build_prompt_layout(self) -> PromptLayout:
+        """
+        构建分层提示词: 角色(静态)在最前面并保持字节不变, 记忆按会话级、轮次级依次放在后面,
+        这样记忆变化时角色部分仍能命中服务端提示词缓存
+        """
+        layout = PromptLayout()
+        layout.add(STATIC, "role", self.role)
+        
+        memory_context = self._memory_context()
+        if memory_context[SESSION]:
+            layout.add(SESSION, "memory", "基于历史记忆:\n" + "\n".join("- " + ctx for ctx in memory_context[SESSION]))
+        if memory_context[TURN]:
+            layout.add(TURN, "situation", "当前情况:\n" + "\n".join("- " + ctx for ctx in memory_context[TURN]))
+        if memory_context[SESSION] or memory_context[TURN]:
+            layout.add(TURN, "guidance", "请基于以上信息，避免重复失败的尝试，优先使用已证明有效的方法。如果遇到警告提示，请按照警告指示行动。")
+        return layout
+        
+    def _build_memory_aware_prompt(self) -> str:
+        """构建包含记忆信息的提示词"""
+        return self._build_prompt_layout().render()
         
     def _build_system_messages(self) -> List[Dict[str, str]]:
-        """构建系统消息（使用记忆感知的提示词）"""
+        """构建系统消息（静态角色在前，记忆在后）"""
         # 检查是否需要终止
         should_terminate, terminate_reason = self._should_terminate()
         if should_terminate:
-            return [{
-                "role": "system", 
-                "content": f"任务已达到限制: {terminate_reason}。请总结当前问题并建议下一步行动，而不是继续当前操作。"
-            }]
+            return PromptLayout().add(STATIC, "role", self.role).add(
+                TURN, "terminate",
+                f"任务已达到限制: {terminate_reason}。请总结当前问题并建议下一步行动，而不是继续当前操作。"
+            ).messages()
             
         # 使用记忆感知的提示词
-        memory_aware_prompt = self._build_memory_aware_prompt()
-        return [{"role": "system", "content": memory_aware_prompt}]
+        return self._build_prompt_layout().messages()
+        
+    def _create_chat_stream(self, messages: List[Dict[str, Any]], **params):
+        """
+        创建流式请求并统计服务端提示词缓存命中(以第一条系统消息作为稳定前缀)
+        """
+        stream = self.create_stream(self.engine, messages, **params)
+        prefix = messages[0]["content"] if messages and isinstance(messages[0].get("content"), str) else ""
+        return get_prompt_cache_stats().track(stream, type(self).__name__, prefix_hash(prefix))
         
     def _add_user_message(self, content: str):
         """添加用户消息"""
@@ -228,7 +245,8 @@ class BaseAgentTemplate(ABC,Oracle,StreamingTemplateParser):
             chunk_count = 0
             async for chunk in self.query_stream_async(
                 prompt_sys=messages[0]["content"], 
-                prompt_user=query
+                prompt_user=query,
+                prompt_context="\n\n".join(m["content"] for m in messages[1:])
             ):
                 chunk_count += 1
                 print(f"[DEBUG] Received chunk {chunk_count}: '{chunk[:30]}...'")
@@ -250,6 +268,7 @@ class BaseAgentTemplate(ABC,Oracle,StreamingTemplateParser):
                     yield json.dumps(action) + "\n"
             
             print(f"[DEBUG] Stream completed, processed {chunk_count} chunks")
+            get_prompt_cache_stats().record(type(self).__name__, self.last_usage, prefix_hash(messages[0]["content"]))
             
             # 处理剩余的缓存内容
             final_actions = self.finalize()
@@ -127,12 +127,7 @@ class CommandAgent(BaseAgentTemplate):
         """处理OpenAI API流式响应"""
         try:
             # 创建流（OpenAI Python SDK 返回同步 Stream 对象，不需要 await）
-            stream = self.client.chat.completions.create(
-                model=self.engine,
-                messages=messages,
-                stream=True,
-                timeout=30.0
-            )
+            stream = self._create_chat_stream(messages, timeout=30.0)
 
             index = 0
             generated_code = ""
@@ -1,87 +1,22 @@
 import asyncio
-import re
 from collections import deque
 from typing import AsyncGenerator, Dict, Any, List
 
 from .base_agent import BaseAgentTemplate
+from utils.context_builder import ContextBuilder
+from utils.fix_cache import get_fix_cache, payload_error_text
 
 
 class DebugConverter:
     """调试转换器，处理执行结果和代码"""
     
-    def __init__(self):
+    def __init__(self, budgets: Dict[str, int] = None):
         self.messages = []
-        
-    def _extract_image_metadata(self, image_data: str) -> Dict[str, str]:
-        """Extract metadata from base64 image string."""
-        pattern = r'data:image/(\w+);base64,'
-        match = re.match(pattern, image_data)
-        if not match:
-            return {"format": "unknown"}
-        return {"format": match.group(1)}
+        self.builder = ContextBuilder(budgets)
 
-    def _process_execute_result(self, results: List[Dict]) -> List[Dict]:
-        """Process execution results into chat messages."""
-        messages = []
-        
-        for result in results:
-            if result["type"] == "text":
-                messages.append({
-                    "role": "assistant",
-                    "content": result["content"]
-                })
-            elif result["type"] == "image":
-                messages.append({
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": result["content"]
-                            }
-                        },
-                        {
-                            "type": "text",
-                            "text": f"Image generated at {result['timestamp']}"
-                        }
-                    ]
-                })
-        
-        return messages
-
-    def _process_code(self, code: str) -> Dict:
-        """Process executed code into a message."""
-        return {
-            "role": "user",
-            "content": f"Executed Python Code:[需要debug的代码片段]\n```python\n{code}\n```"
-        }
-
-    def process_operation(self, operation: dict) -> List[Dict]:
-        """Process operation into chat messages."""
-        self.messages = []
-        
-        if "executeResult" in operation:
-            self.messages.extend(
-                self._process_execute_result(operation["executeResult"])
-            )
-        
-        if "executeCode" in operation:
-            self.messages.append(
-                self._process_code(operation["executeCode"])
-            )
-        
-        if "description" in operation:
-            self.messages.append({
-                "role": "user",
-                "content": "代码原本的目标是响应:["+operation["description"]+"]"
-            })
-        
-        if "historyCode" in operation:
-            self.messages.append({
-                "role": "user",
-                "content": "历史代码:["+operation["historyCode"]+"]"
-            })
-            
+    def process_operation(self, operation: dict, memory: str = "") -> List[Dict]:
+        """Process operation into chat messages, keeping each section within its token budget."""
+        self.messages = self.builder.build(operation, code_header="Executed Python Code:[需要debug的代码片段]", memory=memory)
         return self.messages
 
 
@@ -141,6 +76,8 @@ print("hello")  # FIXED: Added parentheses for Python 3 syntax
         
         super().__init__(operation, api_key, base_url, engine, role)
         self.converter = DebugConverter()
+        self.fix_cache = get_fix_cache()
+        self._fix_key = None
         
     def validate_operation(self) -> bool:
         """验证操作参数"""
@@ -182,23 +119,34 @@ print("hello")  # FIXED: Added parentheses for Python 3 syntax
             working_solutions = self._get_working_solutions()
             current_error = self.current_context.get("error_message", "")
             
-            initial_content = "Agent is thinking and tend to debug...\n\n"
+            # 本地修复库: 同一错误指纹和代码上下文有已验证的修复时直接使用, 不请求LLM
+            self._fix_key = self.fix_cache.key(payload_error_text(self.payload), self.payload.get("executeCode", ""))
+            cached_fix = self.fix_cache.lookup(self._fix_key)
+            if cached_fix:
+                async for response in self._serve_cached_fix(cached_fix):
+                    yield response
+                return
+            
+            # 记忆提示同时展示给用户并作为memory部分发给模型
+            memory_hints = ""
             
             # 检查历史解决方案
             found_solution = False
             for error_pattern, solution in working_solutions.items():
                 if error_pattern.lower() in current_error.lower():
-                    initial_content += f"💡 发现类似问题的历史解决方案:\n**错误模式**: {error_pattern}\n**解决方案**: {solution}\n\n"
+                    memory_hints += f"💡 发现类似问题的历史解决方案:\n**错误模式**: {error_pattern}\n**解决方案**: {solution}\n\n"
                     found_solution = True
                     break
                     
             # 检查应避免的方法
             failed_approaches = self._get_avoided_approaches()
             if failed_approaches:
-                initial_content += f"⚠️ 避免以下已证明无效的方法:\n"
+                memory_hints += f"⚠️ 避免以下已证明无效的方法:\n"
                 for approach in failed_approaches[:3]:  # 只显示前3个
-                    initial_content += f"- {approach}\n"
-                initial_content += "\n"
+                    memory_hints += f"- {approach}\n"
+                memory_hints += "\n"
+            
+            initial_content = "Agent is thinking and tend to debug...\n\n" + memory_hints
                 
             # 检查代码版本信息
             if self.agent_memory:
@@ -208,8 +156,16 @@ print("hello")  # FIXED: Added parentheses for Python 3 syntax
                 if working_versions:
                     initial_content += f"📋 检测到{len(working_versions)}个历史工作版本，如需要可建议回滚\n\n"
             
-            # 使用DebugConverter处理操作
-            chat_messages = self.converter.process_operation(self.payload)
+            # 同类错误在其他代码中的已验证修复, 只作为参考交给LLM(不放进单元格, 以免被当作代码运行)
+            similar_fixes = self.fix_cache.similar(self._fix_key)
+            if similar_fixes:
+                memory_hints += f"同类错误({self._fix_key['exception']})在其他代码中的已验证修复, 仅供参考:\n"
+                for fix in similar_fixes:
+                    memory_hints += f"```python\n{fix['fixed_code']}\n```\n"
+            
+            # 使用DebugConverter处理操作(各部分按token预算裁剪, 前端的error / HistoryCode字段由ContextBuilder读取)
+            chat_messages = self.converter.process_operation(self.payload, memory=memory_hints)
+            print("Context tokens", self.converter.builder.report)
             
             # 构建记忆感知的消息
             messages = self._build_system_messages()
@@ -242,6 +198,28 @@ print("hello")  # FIXED: Added parentheses for Python 3 syntax
                 "error": str(e)
             })
 
+    async def _serve_cached_fix(self, cached_fix: Dict[str, Any]) -> AsyncGenerator[str, None]:
+        """直接使用本地修复库中已验证的修复, 并再次登记待验证"""
+        yield self._create_response_json("convertCurrentCodeCellToHybridCell", {})
+        yield self._create_response_json("updateCurrentCellWithContent", {
+            "payload": {
+                "content": f"⚡ 命中本地已验证修复 (置信度 {cached_fix['confidence']:.2f}, "
+                           f"已成功 {cached_fix['successes']} 次)\n\n"
+            }
+        })
+        yield self._create_response_json("addNewContent2CurrentCell", {
+            "payload": {
+                "content": cached_fix["response"],
+            },
+            "status": "processing",
+            "index": len(cached_fix["response"])
+        })
+        self.fix_cache.propose(self.payload.get("notebook_id"), self._fix_key, cached_fix["response"])
+        yield self._create_response_json("runCurrentCodeCell", {
+            "payload": {},
+            "status": "processing"
+        })
+
     async def _handle_openai_stream(
         self, 
         messages: List[Dict[str, str]], 
@@ -250,12 +228,7 @@ print("hello")  # FIXED: Added parentheses for Python 3 syntax
         """处理OpenAI API流式响应"""
         try:
             # Note: OpenAI SDK create() is synchronous, returns a Stream object
-            stream = self.client.chat.completions.create(
-                model=self.engine,
-                messages=messages,
-                stream=True,
-                timeout=30.0
-            )
+            stream = self._create_chat_stream(messages, timeout=30.0)
 
             index = 0
             generated_analysis = ""
@@ -305,6 +278,10 @@ print("hello")  # FIXED: Added parentheses for Python 3 syntax
                     "index": index
                 })
             
+            # 登记修复, 由下一次执行结果验证后写入本地修复库
+            if self._fix_key:
+                self.fix_cache.propose(self.payload.get("notebook_id"), self._fix_key, generated_analysis)
+            
             # 运行代码单元格
             yield self._create_response_json("runCurrentCodeCell", {
                 "payload": {},
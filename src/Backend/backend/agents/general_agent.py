@@ -290,12 +290,7 @@ class GeneralAgent(BaseAgentTemplate):
         try:
             # 调用 OpenAI 的 chat.completions 流式输出
             # Note: OpenAI SDK create() is synchronous, returns a Stream object
-            stream = self.client.chat.completions.create(
-                model=self.engine,   # 这里可替换为你实际使用的模型名称
-                messages=messages,
-                stream=True,
-                timeout=30.0
-            )
+            stream = self._create_chat_stream(messages, timeout=30.0)
 
             index = 0
             full_response = ""
@@ -1,81 +1,21 @@
 import asyncio
-import re
 from collections import deque
 from typing import AsyncGenerator, Dict, Any, List
 
 from .base_agent import BaseAgentTemplate
+from utils.context_builder import ContextBuilder
 
 
 class OutputConverter:
     """输出转换器，处理执行结果和代码分析"""
     
-    def __init__(self):
+    def __init__(self, budgets: Dict[str, int] = None):
         self.messages = []
-        
-    def _extract_image_metadata(self, image_data: str) -> Dict[str, str]:
-        """Extract metadata from base64 image string."""
-        pattern = r'data:image/(\w+);base64,'
-        match = re.match(pattern, image_data)
-        if not match:
-            return {"format": "unknown"}
-        return {"format": match.group(1)}
-
-    def _process_execute_result(self, results: List[Dict]) -> List[Dict]:
-        """Process execution results into chat messages."""
-        messages = []
-        
-        for result in results:
-            if result["type"] == "text":
-                messages.append({
-                    "role": "assistant",
-                    "content": result["content"]
-                })
-            elif result["type"] == "image":
-                messages.append({
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": result["content"]
-                            }
-                        },
-                        {
-                            "type": "text",
-                            "text": f"Image generated at {result['timestamp']}"
-                        }
-                    ]
-                })
-        
-        return messages
-
-    def _process_code(self, code: str) -> Dict:
-        """Process executed code into a message."""
-        return {
-            "role": "user",
-            "content": f"Executed Python Code:\n```python\n{code}\n```"
-        }
+        self.builder = ContextBuilder(budgets)
 
-    def process_operation(self, operation: dict) -> List[Dict]:
-        """Process operation into chat messages."""
-        self.messages = []
-        
-        if "executeResult" in operation:
-            self.messages.extend(
-                self._process_execute_result(operation["executeResult"])
-            )
-        
-        if "executeCode" in operation:
-            self.messages.append(
-                self._process_code(operation["executeCode"])
-            )
-        
-        if "description" in operation:
-            self.messages.append({
-                "role": "user",
-                "content": "代码原本的目标是响应:["+operation["description"]+"]"
-            })
-            
+    def process_operation(self, operation: dict, memory: str = "") -> List[Dict]:
+        """Process operation into chat messages, keeping each section within its token budget."""
+        self.messages = self.builder.build(operation, code_header="Executed Python Code:", memory=memory)
         return self.messages
 
 
@@ -141,19 +81,15 @@ class OutputAgent(BaseAgentTemplate):
                     initial_content += f"- {pattern}\n"
                 initial_content += "\n"
             
-            # 使用OutputConverter处理操作
-            chat_messages = self.converter.process_operation(self.payload)
+            # 历史分析模式指导作为memory部分
+            memory = f"请参考以下成功的分析模式: {', '.join(successful_patterns[:3])}" if successful_patterns else ""
+            
+            # 使用OutputConverter处理操作(各部分按token预算裁剪)
+            chat_messages = self.converter.process_operation(self.payload, memory=memory)
+            print("Context tokens", self.converter.builder.report)
             
             # 构建记忆感知的消息
             messages = self._build_system_messages()
-            
-            # 添加历史分析模式指导
-            if successful_patterns:
-                messages.append({
-                    "role": "user",
-                    "content": f"请参考以下成功的分析模式: {', '.join(successful_patterns[:3])}"
-                })
-            
             messages.extend(chat_messages)
             
             # 如果有初始内容，先发送
@@ -200,12 +136,7 @@ class OutputAgent(BaseAgentTemplate):
         """处理OpenAI API流式响应"""
         try:
             # Note: OpenAI SDK create() is synchronous, returns a Stream object
-            stream = self.client.chat.completions.create(
-                model=self.engine,
-                messages=messages,
-                stream=True,
-                timeout=30.0
-            )
+            stream = self._create_chat_stream(messages, timeout=30.0)
 
             index = 0
             generated_analysis = ""
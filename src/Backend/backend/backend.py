@@ -23,6 +23,8 @@ from screenplay import generate_response
 from kernel_manager import KernelExecutionManager
 from api.sandbox_endpoints import router as sandbox_router
 from utils.logger import ModernLogger
+from utils.fix_cache import get_fix_cache
+from utils.prompt_layout import get_prompt_cache_stats
 
 # ========================
 # 配置日志
@@ -367,6 +369,15 @@ async def execute_code_endpoint(execute_request: ExecuteRequest, db: Session = D
             kernel_managers[execute_request.notebook_id] = KernelExecutionManager(work_dir=work_dir)
         kem = kernel_managers[execute_request.notebook_id]
         result = await kem.execute_code_with_progress(execute_request.code)
+        # 验证DebugAgent登记的修复: 修复后的代码执行成功才写入本地修复库; 修复库出错不影响代码执行
+        try:
+            get_fix_cache().verify(
+                execute_request.notebook_id,
+                execute_request.code,
+                result.get("status") == "ok" and not any(o.get("type") == "error" for o in result.get("outputs", [])),
+            )
+        except Exception as e:
+            logger.warning(f"Request {request_id}: Fix cache verification skipped: {e}")
 
         # 过滤结果中的敏感信息
         sanitized_result = sanitize_response_content(result, execute_request.notebook_id)
@@ -393,6 +404,11 @@ async def get_execution_status(notebook_id: str, db: Session = Depends(get_db)):
     kem = kernel_managers[notebook_id]
     return await kem.get_execution_status()
 
+@app.get("/prompt_cache_stats")
+async def get_prompt_cache_stats_endpoint():
+    """各Agent请求的服务端提示词缓存命中率(cached_tokens / prompt_tokens)"""
+    return get_prompt_cache_stats().stats()
+
 @app.post("/shutdown")
 async def shutdown_endpoint(shutdown_request: ShutdownRequest, db: Session = Depends(get_db)):
     request_id = str(uuid.uuid4())
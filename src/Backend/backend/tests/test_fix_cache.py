@@ -0,0 +1,67 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fix_cache import FixCache, payload_error_text  # noqa: E402
+
+TRACEBACK = """---------------------------------------------------------------------------
+KeyError                                  Traceback (most recent call last)
+Cell In[3], line 2
+      1 import pandas as pd
+----> 2 df['price'].mean()
+File ~/venv/lib/python3.11/site-packages/pandas/core/frame.py:3761, in DataFrame.__getitem__(self, key)
+KeyError: 'price'"""
+
+CODE = "import pandas as pd\ndf['price'].mean()"
+FIXED = "import pandas as pd\ndf['Price'].mean()  # FIXED: column name is capitalised"
+RESPONSE = f"The column is called Price.\n\n```python\n{FIXED}\n```"
+
+
+def frontend_payload(**overrides):
+    """code_error_should_debug payload as sent by autoActions.ts (cell outputs in payload.error)"""
+    payload = {
+        "error": [{"type": "error", "content": TRACEBACK, "timestamp": "2025-01-01T00:00:00Z"}],
+        "executeCode": CODE,
+        "HistoryCode": "",
+        "cellId": "cell-1",
+        "description": "",
+        "current_context": {"error_context": [{"type": "error", "content": TRACEBACK}]},
+        "notebook_id": "nb-1",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_payload_error_text_reads_frontend_outputs():
+    assert "KeyError: 'price'" in payload_error_text(frontend_payload())
+    # error_context is used when payload.error is absent
+    assert "KeyError: 'price'" in payload_error_text(frontend_payload(error=None))
+    assert payload_error_text({"current_context": {"error_message": "boom"}}) == "boom"
+
+
+def test_frontend_payload_propose_verify_lookup(tmp_path):
+    cache = FixCache(str(tmp_path / "fixes.db"))
+    payload = frontend_payload()
+    key = cache.key(payload_error_text(payload), payload["executeCode"])
+    assert key["exception"] == "KeyError"
+    assert cache.lookup(key) is None
+
+    cache.propose(payload["notebook_id"], key, RESPONSE)
+    assert cache.verify(payload["notebook_id"], FIXED, succeeded=True) is True
+
+    # the same error in the same code is now served from the cache
+    again = frontend_payload(error=[{"type": "error", "content": TRACEBACK.replace("Cell In[3]", "Cell In[7]")}])
+    hit = cache.lookup(cache.key(payload_error_text(again), again["executeCode"]))
+    assert hit is not None
+    assert hit["fixed_code"] == FIXED
+    assert cache.stats()["verified"] == 1
+
+
+def test_failed_fix_is_not_stored(tmp_path):
+    cache = FixCache(str(tmp_path / "fixes.db"))
+    payload = frontend_payload()
+    key = cache.key(payload_error_text(payload), payload["executeCode"])
+    cache.propose(payload["notebook_id"], key, RESPONSE)
+    assert cache.verify(payload["notebook_id"], FIXED, succeeded=False) is False
+    assert cache.lookup(key) is None
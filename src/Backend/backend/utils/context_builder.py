@@ -0,0 +1,275 @@
+import base64
+import hashlib
+import html
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+# 各部分的默认token预算
+DEFAULT_BUDGETS = {
+    "task": 500,
+    "code": 3000,
+    "error": 1500,
+    "outputs": 2500,
+    "images": 2000,
+    "history": 2000,
+    "memory": 800,
+}
+
+# 图片token估算 (OpenAI视觉模型: 低清晰度固定85, 高清晰度按512像素分块计)
+LOW_DETAIL_TOKENS = 85
+TILE_TOKENS = 170
+UNKNOWN_IMAGE_TOKENS = 765
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+_TRACEBACK_NOISE = re.compile(r"0x[0-9a-fA-F]+|Cell In\[\d+\]|line \d+|File \"[^\"]*\"")
+_TAGS = re.compile(r"<[^>]+>")
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算token数: ASCII约4字符一个token, 其余字符(中文等)约一个字符一个token"""
+    if not text:
+        return 0
+    non_ascii = len(text) - len(text.encode("ascii", "ignore"))
+    return math.ceil((len(text) - non_ascii) / 4) + non_ascii
+
+
+def head_tail(text: str, budget: int, head_share: float = 0.4) -> str:
+    """超出预算时保留开头和结尾(按行切分), 中间替换为省略标记"""
+    tokens = estimate_tokens(text)
+    if tokens <= budget:
+        return text
+    chars_per_token = len(text) / tokens
+    head_chars = int(budget * head_share * chars_per_token)
+    tail_chars = int(budget * (1 - head_share) * chars_per_token)
+    head = text[:head_chars]
+    tail = text[len(text) - tail_chars:] if tail_chars else ""
+    if "\n" in head:
+        head = head.rsplit("\n", 1)[0]
+    if "\n" in tail:
+        tail = tail.split("\n", 1)[1]
+    omitted = text.count("\n") - head.count("\n") - tail.count("\n")
+    marker = f"... [{omitted} lines omitted] ..." if omitted > 1 else f"... [{len(text) - len(head) - len(tail)} chars omitted] ..."
+    return f"{head}\n{marker}\n{tail}"
+
+
+def share_budget(texts: List[str], budget: int, head_share: float = 0.4, floor: int = 100) -> List[str]:
+    """多段文本分享一个预算: 短的先取所需, 剩余预算由更长的平分(每段至少floor)"""
+    kept: List[str] = list(texts)
+    remaining = budget
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    for position, index in enumerate(order):
+        kept[index] = head_tail(texts[index], max(floor, remaining // (len(texts) - position)), head_share)
+        remaining -= estimate_tokens(kept[index])
+    return kept
+
+
+def keep_tail(text: str, budget: int) -> str:
+    """超出预算时只保留结尾(最近的内容)"""
+    tokens = estimate_tokens(text)
+    if tokens <= budget:
+        return text
+    tail = text[len(text) - int(budget * len(text) / tokens):]
+    if "\n" in tail:
+        tail = tail.split("\n", 1)[1]
+    return f"... [{text.count(chr(10)) - tail.count(chr(10))} earlier lines omitted] ...\n{tail}"
+
+
+def traceback_fingerprint(text: str) -> str:
+    """错误信息指纹: 去掉ANSI颜色、内存地址、行号和文件路径后哈希, 同一错误重复出现时指纹相同"""
+    normalized = _TRACEBACK_NOISE.sub("", _ANSI.sub("", text))
+    return hashlib.md5(" ".join(normalized.split()).encode("utf-8")).hexdigest()
+
+
+def image_info(data_url: str) -> Dict[str, Any]:
+    """从base64图片中读取格式和(PNG的)尺寸, 用于估算token"""
+    match = re.match(r"data:image/(\w+);base64,", data_url or "")
+    info: Dict[str, Any] = {"format": match.group(1) if match else "unknown", "width": None, "height": None}
+    if match and info["format"] == "png":
+        try:
+            header = base64.b64decode(data_url[match.end():match.end() + 44])
+            if header[:8] == b"\x89PNG\r\n\x1a\n":
+                info["width"] = int.from_bytes(header[16:20], "big")
+                info["height"] = int.from_bytes(header[20:24], "big")
+        except (ValueError, IndexError):
+            pass
+    return info
+
+
+def image_tokens(info: Dict[str, Any]) -> int:
+    """高清晰度下图片的token数: 先缩放到2048以内、短边768, 再按512像素分块"""
+    width, height = info.get("width"), info.get("height")
+    if not width or not height:
+        return UNKNOWN_IMAGE_TOKENS
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return LOW_DETAIL_TOKENS + TILE_TOKENS * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def html_to_text(content: str) -> str:
+    """把HTML输出(如DataFrame表格)转成紧凑文本"""
+    content = re.sub(r"</t[dh]>", " | ", content, flags=re.IGNORECASE)
+    content = re.sub(r"</tr>|<br\s*/?>|</p>|</div>", "\n", content, flags=re.IGNORECASE)
+    content = html.unescape(_TAGS.sub("", content))
+    return "\n".join(line.strip() for line in content.splitlines() if line.strip())
+
+
+class ContextBuilder:
+    """
+    按token预算组装代码执行上下文
+
+    把操作中的代码、错误、输出、图片、历史代码和记忆分别放进各自的预算:
+    重复的错误堆栈只保留一次, 过长的输出保留头尾, 图片超出预算时改用低清晰度或省略,
+    历史代码只保留最近的部分。report记录每部分原始和实际使用的token数。
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None):
+        self.budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+        self.report: Dict[str, Dict[str, Any]] = {}
+
+    def _record(self, section: str, original: int, used: int, **extra: Any) -> None:
+        self.report[section] = dict({"budget": self.budgets[section], "original": original, "tokens": used}, **extra)
+
+    def _split_results(self, results: List[Dict]) -> Dict[str, List]:
+        """按类型拆分执行结果: 错误堆栈、文本输出、图片"""
+        parts: Dict[str, List] = {"errors": [], "outputs": [], "images": []}
+        for result in results or []:
+            kind = result.get("type")
+            content = result.get("content")
+            if kind == "image":
+                parts["images"].append(result)
+                continue
+            if not isinstance(content, str):
+                content = "" if content is None else str(content)
+            if kind == "html":
+                content = html_to_text(content)
+            content = _ANSI.sub("", content)
+            if not content.strip():
+                continue
+            if kind == "error" or "Traceback (most recent call last)" in content:
+                parts["errors"].append(content)
+            elif kind in ("text", "stream", "html"):
+                parts["outputs"].append(content)
+        return parts
+
+    def _errors(self, errors: List[str]) -> Optional[str]:
+        """去重后的错误信息, 不同错误共享预算, 保留堆栈头部和(更重要的)结尾"""
+        if not errors:
+            return None
+        counts: Dict[str, int] = {}
+        unique: List[str] = []
+        for error in errors:
+            key = traceback_fingerprint(error)
+            if key not in counts:
+                unique.append(error)
+                counts[key] = 0
+            counts[key] += 1
+        blocks = []
+        for error, block in zip(unique, share_budget(unique, self.budgets["error"], head_share=0.25)):
+            repeats = counts[traceback_fingerprint(error)]
+            if repeats > 1:
+                block += f"\n(the same error occurred {repeats} times)"
+            blocks.append(block)
+        text = "[error-message-for-debug]\n" + "\n\n".join(blocks)
+        self._record("error", sum(estimate_tokens(e) for e in errors), estimate_tokens(text),
+                     items=len(errors), unique=len(unique))
+        return text
+
+    def _outputs(self, outputs: List[str]) -> List[str]:
+        """文本输出, 共享预算, 过长的保留头尾"""
+        if not outputs:
+            return []
+        kept = share_budget(outputs, self.budgets["outputs"])
+        self._record("outputs", sum(estimate_tokens(o) for o in outputs), sum(estimate_tokens(k) for k in kept),
+                     items=len(outputs))
+        return kept
+
+    def _images(self, images: List[Dict]) -> List[Dict]:
+        """图片消息: 预算内用高清晰度, 不够时降为低清晰度, 再不够则用文字占位"""
+        if not images:
+            return []
+        remaining = self.budgets["images"]
+        messages, original, downscaled, dropped = [], 0, 0, 0
+        for image in images:
+            url = image.get("content") or ""
+            info = image_info(url)
+            cost = image_tokens(info)
+            original += cost
+            size = f" {info['width']}x{info['height']}" if info["width"] else ""
+            if cost <= remaining:
+                detail = "high"
+            elif LOW_DETAIL_TOKENS <= remaining:
+                detail, cost = "low", LOW_DETAIL_TOKENS
+                downscaled += 1
+            else:
+                dropped += 1
+                messages.append({"role": "user", "content": f"[image omitted: {info['format']}{size}, over the image budget]"})
+                continue
+            remaining -= cost
+            messages.append({
+                "role": "user",
+                "content": [
+                    {"type": "image_url", "image_url": {"url": url, "detail": detail}},
+                    {"type": "text", "text": f"Image generated at {image.get('timestamp', '')}"},
+                ],
+            })
+        self._record("images", original, self.budgets["images"] - remaining,
+                     items=len(images), downscaled=downscaled, dropped=dropped)
+        return messages
+
+    def _section(self, section: str, text: str, tail_only: bool = False) -> str:
+        kept = keep_tail(text, self.budgets[section]) if tail_only else head_tail(text, self.budgets[section])
+        self._record(section, estimate_tokens(text), estimate_tokens(kept))
+        return kept
+
+    def build(self, operation: Dict[str, Any], code_header: str = "Executed Python Code:",
+              memory: str = "") -> List[Dict[str, Any]]:
+        """
+        把操作(executeResult / executeCode / description / HistoryCode)和记忆组装成聊天消息
+
+        前端code_error_should_debug发送的单元格输出在error(或current_context.error_context)中,
+        历史代码在HistoryCode中; 没有executeResult / historyCode时分别取这些字段
+
+        Args:
+            operation: 前端发来的payload
+            code_header: 代码前的说明文字
+            memory: 记忆中的提示(历史解决方案、应避免的方法等)
+        Returns:
+            聊天消息列表, 各部分的token使用见self.report
+        """
+        self.report = {}
+        messages: List[Dict[str, Any]] = []
+
+        results = operation.get("executeResult")
+        if results is None:
+            results = operation.get("error") or (operation.get("current_context") or {}).get("error_context")
+        parts = self._split_results(results if isinstance(results, list) else [])
+        for output in self._outputs(parts["outputs"]):
+            messages.append({"role": "assistant", "content": output})
+        messages.extend(self._images(parts["images"]))
+        error = self._errors(parts["errors"])
+        if error:
+            messages.append({"role": "user", "content": error})
+
+        if "executeCode" in operation:
+            code = self._section("code", operation["executeCode"] or "")
+            messages.append({"role": "user", "content": f"{code_header}\n```python\n{code}\n```"})
+
+        if "description" in operation:
+            description = self._section("task", operation["description"] or "")
+            messages.append({"role": "user", "content": "代码原本的目标是响应:[" + description + "]"})
+
+        history_code = operation.get("historyCode") or operation.get("HistoryCode")
+        if history_code:
+            # 历史代码越靠后越相关, 超出预算时只保留最近的部分
+            history = self._section("history", history_code, tail_only=True)
+            messages.append({"role": "user", "content": "历史代码:[" + history + "]"})
+
+        if memory:
+            messages.append({"role": "user", "content": self._section("memory", memory)})
+
+        self.report["total"] = {"tokens": sum(s["tokens"] for s in self.report.values()),
+                                "original": sum(s["original"] for s in self.report.values())}
+        return messages
@@ -0,0 +1,236 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_FIX_CACHE_PATH = "./debug_fixes.db"
+# 低于该置信度的修复不直接使用, 交给LLM
+MIN_CONFIDENCE = 0.6
+# 修复生成后, 等待下一次执行验证的最长时间(秒)
+PENDING_TTL = 600
+# 帧签名保留的最后几帧
+SIGNATURE_FRAMES = 5
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+_EXCEPTION_LINE = re.compile(r"^([A-Za-z_][\w.]*(?:Error|Exception|Warning|Exit|Interrupt))\b:?\s*(.*)$")
+# IPython: "File ~/x/frame.py:3761, in DataFrame.__getitem__(self, key)"; 标准: "File "x.py", line 3, in f"
+_FRAME = re.compile(r"File (?:\"([^\"]+)\"|(\S+?)(?::\d+)?),(?: line \d+,)? in ([\w.<>]+)")
+_CELL_FRAME = re.compile(r"Cell In\[\d+\]")
+_PYTHON_BLOCK = re.compile(r"```python\n(.*?)```", re.DOTALL)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fixes (
+    fingerprint TEXT NOT NULL,
+    context_hash TEXT NOT NULL,
+    exception TEXT NOT NULL,
+    template TEXT NOT NULL,
+    fixed_code TEXT NOT NULL,
+    response TEXT NOT NULL,
+    successes INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (fingerprint, context_hash)
+);
+"""
+
+
+def payload_error_text(payload: Dict[str, Any]) -> str:
+    """
+    调试操作中的错误输出文本
+
+    执行结果依次取 executeResult、error(前端code_error_should_debug发送的单元格输出)、
+    current_context.error_context, 只保留错误输出(类型为error或包含堆栈); 都没有时退回current_context.error_message
+    """
+    context = payload.get("current_context") or {}
+    for results in (payload.get("executeResult"), payload.get("error"), context.get("error_context")):
+        if not isinstance(results, list):
+            continue
+        errors = []
+        for result in results:
+            content = result.get("content") if isinstance(result, dict) else result
+            content = content if isinstance(content, str) else ("" if content is None else str(content))
+            if (isinstance(result, dict) and result.get("type") == "error") or "Traceback (most recent call last)" in content:
+                errors.append(content)
+        if errors:
+            return "\n".join(errors)
+    return context.get("error_message") or ""
+
+
+def error_signature(traceback_text: str) -> Dict[str, Any]:
+    """
+    把错误堆栈规范化为签名: 异常类型、消息模板(引号内容和数字替换为占位符)和帧签名(文件名+函数名, 不含行号)
+    """
+    text = _ANSI.sub("", traceback_text or "")
+    exception, message = "", ""
+    for line in reversed(text.strip().splitlines()):
+        match = _EXCEPTION_LINE.match(line.strip())
+        if match:
+            exception, message = match.group(1), match.group(2)
+            break
+    template = re.sub(r"'[^']*'|\"[^\"]*\"", "<s>", message)
+    template = re.sub(r"0x[0-9a-fA-F]+", "<addr>", template)
+    template = re.sub(r"\b\d+(?:\.\d+)?\b", "<n>", template)
+    frames = []
+    for line in text.splitlines():
+        if _CELL_FRAME.search(line):
+            frames.append("<cell>")
+            continue
+        match = _FRAME.search(line)
+        if match:
+            path = match.group(1) or match.group(2)
+            frames.append(f"{os.path.basename(path)}:{match.group(3)}")
+    return {"exception": exception, "template": template.strip(), "frames": frames[-SIGNATURE_FRAMES:]}
+
+
+def error_fingerprint(signature: Dict[str, Any]) -> str:
+    payload = "|".join([signature["exception"], signature["template"], ">".join(signature["frames"])])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_code(code: str) -> str:
+    """去掉整行注释、空行和行尾空白, 用于比较代码和计算上下文哈希"""
+    lines = (line.rstrip() for line in (code or "").splitlines())
+    return "\n".join(line for line in lines if line.strip() and not line.lstrip().startswith("#"))
+
+
+def code_context_hash(code: str) -> str:
+    return hashlib.sha1(normalize_code(code).encode("utf-8")).hexdigest()
+
+
+def extract_fixed_code(response: str) -> Optional[str]:
+    """LLM回复中最后一个python代码块(调试提示要求以完整修复代码结尾)"""
+    blocks = _PYTHON_BLOCK.findall(response or "")
+    return blocks[-1].strip() if blocks else None
+
+
+class FixCache:
+    """
+    本地调试修复知识库
+
+    以错误指纹(异常类型+消息模板+帧签名)和出错代码的上下文哈希为键, 只保存经过验证的修复:
+    DebugAgent生成修复后登记为待验证, 下一次执行同一notebook中的修复代码成功才写入,
+    失败则降低已有修复的置信度。命中且置信度足够时直接返回修复, 否则交给LLM。
+    """
+
+    def __init__(self, path: Optional[str] = None, min_confidence: float = MIN_CONFIDENCE):
+        self.path = path or os.environ.get("DEBUG_FIX_CACHE_PATH") or DEFAULT_FIX_CACHE_PATH
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._metrics = {"hits": 0, "misses": 0, "verified": 0, "rejected": 0}
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def confidence(successes: int, failures: int) -> float:
+        """修复成功率的拉普拉斯平滑估计: 验证成功一次为0.67, 之后每次失败都会拉低"""
+        return round((successes + 1) / (successes + failures + 2), 3)
+
+    def key(self, error_text: str, code: str) -> Dict[str, Any]:
+        signature = error_signature(error_text)
+        return dict(signature, fingerprint=error_fingerprint(signature), context_hash=code_context_hash(code))
+
+    def lookup(self, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """同一错误、同一代码上下文的已验证修复(置信度不足时返回None)"""
+        if not key["exception"]:
+            return None
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT fixed_code, response, successes, failures FROM fixes WHERE fingerprint = ? AND context_hash = ?",
+                    (key["fingerprint"], key["context_hash"]),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logging.warning(f"Fix cache read failed: {e}")
+                row = None
+            confidence = self.confidence(row[2], row[3]) if row else 0.0
+            if row is None or confidence < self.min_confidence:
+                self._metrics["misses"] += 1
+                return None
+            self._metrics["hits"] += 1
+            self._conn.execute("UPDATE fixes SET last_used = ? WHERE fingerprint = ? AND context_hash = ?",
+                               (time.time(), key["fingerprint"], key["context_hash"]))
+        return {"fixed_code": row[0], "response": row[1], "confidence": confidence,
+                "successes": row[2], "failures": row[3]}
+
+    def similar(self, key: Dict[str, Any], limit: int = 3) -> List[Dict[str, Any]]:
+        """同一错误指纹在其他代码中的已验证修复, 可作为提示交给LLM"""
+        if not key["exception"]:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fixed_code, successes, failures FROM fixes WHERE fingerprint = ? AND context_hash != ? "
+                "AND successes > 0 ORDER BY successes DESC, last_used DESC LIMIT ?",
+                (key["fingerprint"], key["context_hash"], limit),
+            ).fetchall()
+        return [{"fixed_code": row[0], "confidence": self.confidence(row[1], row[2])} for row in rows]
+
+    def propose(self, notebook_id: str, key: Dict[str, Any], response: str) -> None:
+        """登记一个待验证的修复, 等同一notebook的下一次执行结果"""
+        fixed_code = extract_fixed_code(response)
+        if not notebook_id or not fixed_code or not key["exception"]:
+            return
+        with self._lock:
+            self._pending[notebook_id] = {"key": key, "fixed_code": fixed_code, "response": response,
+                                          "created": time.time()}
+
+    def verify(self, notebook_id: str, code: str, succeeded: bool) -> Optional[bool]:
+        """
+        用一次执行结果验证该notebook的待验证修复
+
+        只有执行的代码就是修复后的代码时才计数; 返回验证结果, 无对应修复时返回None
+        """
+        with self._lock:
+            pending = self._pending.get(notebook_id)
+            if pending is None:
+                return None
+            if time.time() - pending["created"] > PENDING_TTL:
+                del self._pending[notebook_id]
+                return None
+            if normalize_code(pending["fixed_code"]) not in normalize_code(code):
+                return None
+            del self._pending[notebook_id]
+            key = pending["key"]
+            now = time.time()
+            try:
+                if succeeded:
+                    self._conn.execute(
+                        "INSERT INTO fixes (fingerprint, context_hash, exception, template, fixed_code, response, "
+                        "successes, failures, created, last_used) VALUES (?, ?, ?, ?, ?, ?, 1, 0, ?, ?) "
+                        "ON CONFLICT (fingerprint, context_hash) DO UPDATE SET successes = successes + 1, "
+                        "fixed_code = excluded.fixed_code, response = excluded.response, last_used = excluded.last_used",
+                        (key["fingerprint"], key["context_hash"], key["exception"], key["template"],
+                         pending["fixed_code"], pending["response"], now, now),
+                    )
+                    self._metrics["verified"] += 1
+                else:
+                    # 新修复失败不入库; 缓存中的修复失败则降低置信度
+                    self._conn.execute("UPDATE fixes SET failures = failures + 1 WHERE fingerprint = ? AND context_hash = ?",
+                                       (key["fingerprint"], key["context_hash"]))
+                    self._metrics["rejected"] += 1
+            except sqlite3.Error as e:
+                logging.warning(f"Fix cache write failed: {e}")
+        return succeeded
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM fixes").fetchone()[0]
+            return dict(self._metrics, entries=entries, pending=len(self._pending))
+
+
+_shared_cache: Optional[FixCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_fix_cache() -> FixCache:
+    """进程内共享的修复库(DebugAgent登记修复, /execute验证修复)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FixCache()
+        return _shared_cache
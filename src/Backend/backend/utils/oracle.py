@@ -3,8 +3,10 @@ import os
 import logging
 import asyncio
 import json
+import time
 from typing import AsyncGenerator, Dict, Any, Optional, List
 from .parallel import ParallelProcessor
+from .session_capture import PROBE_HEADER, get_session_recorder
 import dotenv
 
 dotenv.load_dotenv()
@@ -13,7 +15,15 @@ dotenv.load_dotenv()
 logging.getLogger("openai").setLevel(logging.ERROR)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+def _rejects_stream_options(error: BaseException) -> bool:
+    """Whether an API error says the provider does not support stream_options."""
+    return "stream_options" in str(error) or "include_usage" in str(error)
+
+
 class Oracle(ParallelProcessor):
+    # (base_url, model) pairs whose provider rejected stream_options; streamed without usage afterwards
+    _stream_usage_unsupported = set()
+
     # enum for model names
     SUPPORTED_MODELS = {
         "doubao-1-5-lite-32k-250115": 32768,
@@ -22,28 +32,72 @@ class Oracle(ParallelProcessor):
         "o4-mini": 200000,
     }
 
-    def __init__(self, model, apikey=None, base_url=None):
+    def __init__(self, model, apikey=None, base_url=None, capture=None):
+        """
+        Args:
+            capture: JSONL file that records every upstream call for the LLM emulator to replay.
+                None uses ORACLE_CAPTURE_PATH (off when unset), False disables capture.
+        """
         super().__init__()
         self.model = model
         self.apikey = os.environ.get("OPENAI_API_KEY") if apikey is None else apikey
         self.base_url = os.environ.get("BASE_URL") if base_url is None else base_url
         self.client = OpenAI(api_key=self.apikey, base_url=self.base_url)
+        # token usage of the last streamed completion (None when the provider reports none)
+        self.last_usage = None
+        self.recorder = None if capture is False else get_session_recorder(capture or None)
+    
+    def create_stream(self, model: str, messages: List[Dict[str, Any]], **params):
+        """
+        Open a chat completion stream that reports token usage in its last chunk
+        (needed to measure provider-side prompt cache hits). Falls back to a plain
+        stream when the provider rejects stream_options. Recorded when capture is on.
+        """
+        start = time.monotonic()
+        stream = self._open_stream(model, messages, **params)
+        if self.recorder is None:
+            return stream
+        return self.recorder.capture(stream, model, messages, params, start)
+
+    def _open_stream(self, model: str, messages: List[Dict[str, Any]], **params):
+        key = (self.base_url, model)
+        if key not in self._stream_usage_unsupported:
+            try:
+                return self.client.chat.completions.create(
+                    model=model, messages=messages, stream=True,
+                    stream_options={"include_usage": True}, **params)
+            except Exception as e:
+                if not _rejects_stream_options(e):
+                    raise
+                self._stream_usage_unsupported.add(key)
+        return self.client.chat.completions.create(model=model, messages=messages, stream=True, **params)
     
     def get_model_info(self):
         return self.client.models.retrieve(self.model)
     
     def _get_prompt_tokens_length(self, prompt):
-        return self.client.chat.completions.create(
+        """通过一次探测调用获取提示词token数; 探测请求带标记头, LLM模拟器会立即返回"""
+        messages = [{"role": "user", "content": prompt}]
+        start = time.monotonic()
+        completion = self.client.chat.completions.create(
             model=self.model,
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
             stream=False,
-        ).usage.prompt_tokens
+            extra_headers={PROBE_HEADER: "1"},
+        )
+        if self.recorder is not None:
+            text = completion.choices[0].message.content if completion.choices and completion.choices[0].message else ""
+            self.recorder.record(self.model, messages, {}, text or "", duration=time.monotonic() - start,
+                                 usage=completion.usage, probe=True)
+        return completion.usage.prompt_tokens
     
     def _check_token_limits(self, prompt_sys, prompt_user, model):
-        if self._get_prompt_tokens_length(prompt_sys) + self._get_prompt_tokens_length(prompt_user) > self.SUPPORTED_MODELS[model]:
+        # token数与候选模型无关, 只统计一次
+        prompt_tokens = self._get_prompt_tokens_length(prompt_sys) + self._get_prompt_tokens_length(prompt_user)
+        if prompt_tokens > self.SUPPORTED_MODELS[model]:
             # check and get a better model
             for model in self.SUPPORTED_MODELS:
-                if self._get_prompt_tokens_length(prompt_sys) + self._get_prompt_tokens_length(prompt_user) <= self.SUPPORTED_MODELS[model]:
+                if prompt_tokens <= self.SUPPORTED_MODELS[model]:
                     return model
             return model
         return model
@@ -71,12 +125,16 @@ class Oracle(ParallelProcessor):
             "stream": False,
         }
         
+        start = time.monotonic()
         completion = self.client.chat.completions.create(**request_params)
 
         response_result = ""
         # for chunk in stream:
         if completion.choices[0].message and completion.choices[0].message.content:
             response_result = completion.choices[0].message.content
+        if self.recorder is not None:
+            self.recorder.record(request_params["model"], request_params["messages"], {}, response_result,
+                                 duration=time.monotonic() - start, usage=getattr(completion, "usage", None))
         
         return response_result
 
@@ -111,12 +169,14 @@ class Oracle(ParallelProcessor):
         except Exception as e:
             yield f"STREAM_ERROR: {str(e)}"
 
-    async def query_stream_async(self, prompt_sys: str, prompt_user: str) -> AsyncGenerator[str, None]:
+    async def query_stream_async(self, prompt_sys: str, prompt_user: str, prompt_context: Optional[str] = None) -> AsyncGenerator[str, None]:
         """
         Async query the model with streaming response.
         Args:
             prompt_sys (str): System prompt.
             prompt_user (str): User prompt.
+            prompt_context (str): Volatile system context (memory, current focus), sent after
+                the stable system prompt so it does not break the provider's prompt cache.
             temp (float): Temperature for the model (optional, some models don't support it).
             top_p (float): Top-p sampling parameter.
             query_key (str): Key for the query.
@@ -124,21 +184,19 @@ class Oracle(ParallelProcessor):
             str: Streaming response chunks.
         """
         try:
-            # Build request parameters
-            request_params = {
-                "model": self._check_token_limits(prompt_sys, prompt_user, self.model),
-                "messages": [
-                    {"role": "system", "content": prompt_sys},
-                    {"role": "user", "content": prompt_user},
-                ],
-                "stream": True,
-            }
+            messages = [{"role": "system", "content": prompt_sys}]
+            if prompt_context:
+                messages.append({"role": "system", "content": prompt_context})
+            messages.append({"role": "user", "content": prompt_user})
             
             # Create streaming request - note: this is synchronous in OpenAI SDK
-            stream = self.client.chat.completions.create(**request_params)
+            self.last_usage = None
+            stream = self.create_stream(self._check_token_limits(prompt_sys, prompt_user, self.model), messages)
 
             # Process stream chunks - use regular for loop, not async for
             for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    self.last_usage = chunk.usage
                 if chunk.choices and len(chunk.choices) > 0:
                     delta = chunk.choices[0].delta
                     if delta and delta.content is not None:
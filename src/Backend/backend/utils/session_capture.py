@@ -0,0 +1,23 @@
+"""
+会话录制 - 与DCLS Oracle共用同一个模块
+
+录制格式由LLM模拟器回放, 两个服务必须写出完全相同的记录, 因此这里不再单独实现,
+直接复用 dcls_senario/DCLSAgents/utils/session_capture.py (SessionRecorder.capture透传原始chunk,
+capture_stream透传文本片段)。
+"""
+
+import os
+import sys
+
+_DCLS_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                          "dcls_senario")
+if _DCLS_ROOT not in sys.path:
+    sys.path.append(_DCLS_ROOT)
+
+from DCLSAgents.utils.session_capture import (  # noqa: E402
+    PROBE_HEADER,
+    SessionRecorder,
+    get_session_recorder,
+)
+
+__all__ = ["PROBE_HEADER", "SessionRecorder", "get_session_recorder"]
@@ -1,5 +1,10 @@
+from .hedging import Hedger
 from .logger import ModernLogger
 from .oracle import Oracle
 from .parallel import ParallelProcessor
+from .rate_limiter import configure_rate_limits
+from .response_cache import ResponseCache
+from .session_capture import SessionRecorder
+from .single_flight import SingleFlight
 
-__all__ = ["ModernLogger", "Oracle", "ParallelProcessor"]
\ No newline at end of file
+__all__ = ["Hedger", "ModernLogger", "Oracle", "ParallelProcessor", "ResponseCache", "SessionRecorder", "SingleFlight", "configure_rate_limits"]
\ No newline at end of file
@@ -0,0 +1,257 @@
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# recent first-token latencies kept per (model, mode)
+LATENCY_WINDOW = 200
+# no hedging until this many latencies have been observed
+MIN_SAMPLES = 20
+
+# the racer whose upstream request runs on the current thread (see on_cancel)
+_current = threading.local()
+
+
+def on_cancel(callback: Callable[[], Any]) -> None:
+    """
+    Register ``callback`` (e.g. closing the HTTP stream) to run when the hedged request running on
+    this thread loses the race. An opener calls this as soon as it holds the upstream connection, so
+    a loser still waiting for its first token is closed instead of running to completion.
+    Outside a hedged request this is a no-op.
+    """
+    racer = getattr(_current, "racer", None)
+    if racer is not None:
+        racer.add_closer(callback)
+
+
+class LatencyTracker:
+    """Sliding window of recent time-to-first-token samples."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """``pct``-th percentile of the window, or None while it has fewer than MIN_SAMPLES samples."""
+        with self._lock:
+            if len(self.samples) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Caps hedges at ``ratio`` extra upstream calls per primary call (e.g. 0.05 = at most 5% extra)."""
+
+    def __init__(self, ratio: float):
+        self.ratio = ratio
+        self.primaries = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def record_primary(self) -> None:
+        with self._lock:
+            self.primaries += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.ratio * self.primaries:
+                return False
+            self.hedges += 1
+            return True
+
+
+class _Racer:
+    """Runs one upstream request in a thread and posts its chunks to the shared event queue."""
+
+    def __init__(self, index: int, model: str, opener: Callable[[str], Iterator[str]], events: "queue.Queue"):
+        self.index = index
+        self.model = model
+        self.opener = opener
+        self.events = events
+        self.cancelled = threading.Event()
+        self.started = time.monotonic()
+        self._closers: List[Callable[[], Any]] = []
+        self._closers_lock = threading.Lock()
+        threading.Thread(target=self._run, name=f"hedge-{model}-{index}", daemon=True).start()
+
+    def _run(self) -> None:
+        _current.racer = self
+        upstream = None
+        try:
+            upstream = self.opener(self.model)
+            for chunk in upstream:
+                if self.cancelled.is_set():
+                    return
+                self.events.put((self.index, "chunk", chunk))
+            self.events.put((self.index, "end", None))
+        except Exception as e:
+            # a cancelled request fails because its connection was closed under it; nobody waits for it
+            if not self.cancelled.is_set():
+                self.events.put((self.index, "error", e))
+        finally:
+            _current.racer = None
+            if upstream is not None and hasattr(upstream, "close"):
+                # closing the generator releases the losing HTTP stream
+                upstream.close()
+
+    def add_closer(self, callback: Callable[[], Any]) -> None:
+        with self._closers_lock:
+            if not self.cancelled.is_set():
+                self._closers.append(callback)
+                return
+        self._close(callback)
+
+    def cancel(self) -> None:
+        """Stop relaying chunks and close the upstream connection registered through on_cancel."""
+        with self._closers_lock:
+            self.cancelled.set()
+            closers, self._closers = self._closers, []
+        for callback in closers:
+            self._close(callback)
+
+    @staticmethod
+    def _close(callback: Callable[[], Any]) -> None:
+        try:
+            callback()
+        except Exception:
+            pass
+
+
+class Hedger:
+    """
+    Races a duplicate request against a slow one.
+
+    The primary request starts immediately. If its first chunk has not arrived
+    after the ``percentile``-th percentile of recent first-chunk latencies
+    (tracked per model and mode), and the budget allows, a hedge request goes
+    out to ``hedge_model`` (or the same model). Whichever request produces
+    its first chunk first wins; the other one is cancelled. If one request
+    fails before producing anything, the other one may still win.
+
+    Cancelling a streamed loser closes its upstream connection (registered by
+    the opener through ``on_cancel``), even while it is still waiting for its
+    first token. Blocking-mode ('complete') hedges are not cancelled: the
+    losing call has no stream to close and runs to completion, so its tokens
+    are spent.
+    """
+
+    def __init__(self, percentile: float = 95.0, budget_ratio: float = 0.05, min_delay: float = 0.05):
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._trackers: Dict[Tuple[str, str], LatencyTracker] = {}
+        self._budgets: Dict[str, HedgeBudget] = {}
+        self._metrics = {"requests": 0, "hedged": 0, "hedge_wins": 0, "budget_denied": 0}
+
+    def tracker(self, model: str, mode: str) -> LatencyTracker:
+        with self._lock:
+            return self._trackers.setdefault((model, mode), LatencyTracker())
+
+    def budget(self, model: str) -> HedgeBudget:
+        with self._lock:
+            return self._budgets.setdefault(model, HedgeBudget(self.budget_ratio))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._metrics[name] += 1
+
+    def run(self, opener: Callable[[str], Iterator[str]], model: str, hedge_model: Optional[str] = None,
+            mode: str = "stream") -> Iterator[str]:
+        """
+        Yield the chunks of whichever of the primary and the hedge request answers first
+
+        Args:
+            opener: Opens the upstream request for a model name and returns its chunk iterator
+            model: Primary model
+            hedge_model: Model for the hedge request (default: the primary model)
+            mode: Latency class, e.g. 'stream' (first token) or 'complete' (whole response)
+        """
+        tracker = self.tracker(model, mode)
+        budget = self.budget(model)
+        budget.record_primary()
+        self._count("requests")
+
+        threshold = tracker.percentile(self.percentile)
+        delay = max(threshold, self.min_delay) if threshold is not None else None
+
+        events: "queue.Queue" = queue.Queue()
+        racers = [_Racer(0, model, opener, events)]
+        failures: Dict[int, BaseException] = {}
+        winner = None
+        first = None
+        try:
+            while winner is None:
+                timeout = None
+                if delay is not None and len(racers) == 1:
+                    timeout = max(0.0, racers[0].started + delay - time.monotonic())
+                try:
+                    index, kind, value = events.get(timeout=timeout)
+                except queue.Empty:
+                    if budget.try_spend():
+                        racers.append(_Racer(1, hedge_model or model, opener, events))
+                        self._count("hedged")
+                    else:
+                        self._count("budget_denied")
+                    delay = None
+                    continue
+
+                if kind == "error":
+                    failures[index] = value
+                    # wait for the other request unless every launched request failed
+                    # (a hedge is not a retry: a primary failing early is raised as is)
+                    if len(failures) == len(racers):
+                        raise failures.get(0, value)
+                    continue
+                winner, first = racers[index], (kind, value)
+
+            for racer in racers:
+                if racer is not winner:
+                    racer.cancel()
+            now = time.monotonic()
+            if winner.index == 1:
+                self._count("hedge_wins")
+                # the primary's latency is at least what it had taken so far; keep it so the
+                # window is not biased towards fast requests
+                tracker.record(now - racers[0].started)
+            self.tracker(winner.model, mode).record(now - winner.started)
+
+            kind, value = first
+            while kind == "chunk":
+                yield value
+                index, kind, value = events.get()
+                while index != winner.index:
+                    index, kind, value = events.get()
+            if kind == "error":
+                raise value
+        finally:
+            for racer in racers:
+                racer.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+            thresholds = {f"{model}/{mode}": t.percentile(self.percentile) for (model, mode), t in self._trackers.items()}
+        metrics["hedge_ratio"] = round(metrics["hedged"] / metrics["requests"], 4) if metrics["requests"] else 0.0
+        metrics["thresholds"] = thresholds
+        return metrics
+
+
+_shared_hedgers: Dict[Tuple[float, float], Hedger] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_hedger(percentile: float = 95.0, budget_ratio: float = 0.05) -> Hedger:
+    """Process-wide hedger per setting, so latency history and budgets are shared across Oracle instances."""
+    with _shared_lock:
+        key = (percentile, budget_ratio)
+        if key not in _shared_hedgers:
+            _shared_hedgers[key] = Hedger(percentile, budget_ratio)
+        return _shared_hedgers[key]
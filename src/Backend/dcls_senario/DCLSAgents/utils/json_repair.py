@@ -0,0 +1,285 @@
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+_CLOSERS = {"{": "}", "[": "]"}
+_FENCED = re.compile(r"```(?:json)?\s*\n(.*?)(?:\n```|$)", re.DOTALL)
+# a string literal, or outside of strings a Python literal or a number with a bare trailing dot ("1.")
+_PY_LITERALS = re.compile(r'"(?:[^"\\]|\\.)*"|\b(True|False|None)\b|(?<![\w.])(-?\d+)\.(?![\w.])')
+_JSON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+# further values tried when the first one in a response is not the answer
+_MAX_CANDIDATES = 8
+# a literal or number cut off by the end of a truncated response
+_PARTIAL_SCALAR = re.compile(r"(?<=[\[:,\s])(t|tr|tru|f|fa|fal|fals|n|nu|nul|-?\d+(?:\.\d*)?(?:[eE][+-]?)?|-)$")
+_COMPLETIONS = {"t": "true", "f": "false", "n": "null"}
+# a dangling object key at the end of a truncated object
+_DANGLING_KEY = re.compile(r',?\s*"(?:[^"\\]|\\.)*"\s*$')
+
+
+class JSONRepairError(ValueError):
+    """The response holds no JSON value that can be repaired, or the value does not match the schema."""
+
+
+class IncrementalJSONParser:
+    """
+    Tolerant JSON parser that is fed a response chunk by chunk.
+
+    Text before the first ``{`` / ``[`` (prose, a markdown fence) is skipped
+    and everything after the top-level value is ignored while streaming;
+    ``result()`` goes back to that text when the first value is not the answer.
+    While feeding, the common LLM defects are repaired: trailing commas, raw
+    newlines inside strings, bare trailing decimal points and mismatched closing
+    brackets. ``text()`` closes an unterminated string and any open containers,
+    so a truncated response still parses.
+    """
+
+    def __init__(self):
+        self.raw: List[str] = []
+        self._out: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self.started = False
+        self.complete = False
+        # offsets in the raw text where the top-level value starts and where it ended
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+        self._pos = 0
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk; True once the top-level value is complete."""
+        self.raw.append(chunk)
+        for ch in chunk:
+            if self.complete:
+                break
+            self._pos += 1
+            if not self.started:
+                if ch in _CLOSERS:
+                    self.started = True
+                    self.start = self._pos - 1
+                    self._stack.append(ch)
+                    self._out.append(ch)
+                continue
+            if self._in_string:
+                self._feed_string(ch)
+            else:
+                self._feed_structure(ch)
+                if self.complete:
+                    self.end = self._pos
+        return self.complete
+
+    def _feed_string(self, ch: str) -> None:
+        if self._escape:
+            self._escape = False
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+        elif ch in "\n\r\t":
+            ch = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}[ch]
+        self._out.append(ch)
+
+    def _feed_structure(self, ch: str) -> None:
+        if ch == '"':
+            self._in_string = True
+        elif ch in _CLOSERS:
+            self._stack.append(ch)
+        elif ch in "}]":
+            self._strip_trailing(self._out)
+            # a mismatched bracket closes the container that is actually open
+            ch = _CLOSERS[self._stack.pop()]
+            if not self._stack:
+                self.complete = True
+        elif ch == "`":
+            # a closing markdown fence: the model stopped before finishing the value
+            self.complete = True
+            return
+        self._out.append(ch)
+
+    @staticmethod
+    def _strip_trailing(out: List[str]) -> None:
+        while out and out[-1] in " \t\r\n,":
+            out.pop()
+
+    def text(self) -> str:
+        """The repaired JSON text seen so far (a snapshot; feeding can continue)."""
+        if not self.started:
+            return ""
+        out = list(self._out)
+        if self._in_string:
+            if self._escape:
+                out.pop()
+            out.append('"')
+            text = "".join(out)
+        else:
+            self._strip_trailing(out)
+            text = _PARTIAL_SCALAR.sub(_complete_scalar, "".join(out)).rstrip(" \t\r\n,")
+        if self._stack and self._stack[-1] == "{" and not text.endswith(("{", ":")) and not _ends_with_value(text):
+            text = _DANGLING_KEY.sub("", text)
+        if text.endswith(":"):
+            text += " null"
+        text += "".join(_CLOSERS[opener] for opener in reversed(self._stack))
+        return _PY_LITERALS.sub(_json_literal, text)
+
+    def snapshot(self) -> Any:
+        """Best-effort value of the partial response, or None if it does not parse yet."""
+        try:
+            return json.loads(self.text())
+        except json.JSONDecodeError:
+            return None
+
+    def result(self, schema: Optional[Dict[str, Any]] = None, expected: Optional[str] = None) -> Any:
+        """
+        Parse the response fed so far.
+
+        The first bracket of a response is not always the start of the answer
+        (``Note [1]: result is {...}``), so when the first value does not parse,
+        fails ``schema`` or is not of the ``expected`` container type ('object'
+        or 'array'; default: the schema's type, else 'object'), the content of a
+        markdown ``json`` fence and then the values that follow it are tried.
+        A valid value of another container type is returned only when no
+        candidate has the expected one. Raises JSONRepairError when nothing
+        parses or no value matches ``schema``.
+        """
+        expected = expected or (schema or {}).get("type") or "object"
+        raw = "".join(self.raw)
+        error = "no JSON value in the response"
+        fallback = None
+        for candidate in self._candidates(raw):
+            if not candidate:
+                continue
+            try:
+                value = json.loads(candidate)
+            except json.JSONDecodeError as e:
+                error = f"unrepairable JSON ({e})"
+                continue
+            problems = validate(value, schema) if schema else []
+            if problems:
+                error = "schema mismatch: " + "; ".join(problems[:5])
+            elif expected not in _TYPES or _is_type(value, expected):
+                return value
+            elif fallback is None:
+                fallback = (value,)
+        if fallback is not None:
+            return fallback[0]
+        raise JSONRepairError(error)
+
+    def _candidates(self, raw: str) -> Iterator[str]:
+        """Repaired texts of the first value, fenced blocks, then each later top-level value."""
+        yield self.text()
+        for block in _FENCED.findall(raw):
+            yield repair_json(block)
+        if self.start is None:
+            return
+        # after a complete value, continue behind it; an unterminated one may hide the answer inside it
+        pos = self.end if self.end is not None else self.start + 1
+        for _ in range(_MAX_CANDIDATES):
+            parser = IncrementalJSONParser()
+            parser.feed(raw[pos:])
+            if parser.start is None:
+                return
+            yield parser.text()
+            pos += parser.end if parser.end is not None else parser.start + 1
+
+
+def _json_literal(match: "re.Match") -> str:
+    if match.group(1):
+        return _JSON_LITERALS[match.group(1)]
+    if match.group(2):
+        return match.group(2) + ".0"
+    return match.group(0)
+
+
+def _complete_scalar(match: "re.Match") -> str:
+    token = match.group(1)
+    if token[0] in _COMPLETIONS:
+        return _COMPLETIONS[token[0]]
+    return token.rstrip(".eE+-")
+
+
+def _ends_with_value(text: str) -> bool:
+    """Whether the last member of a truncated object has a value (i.e. is not a bare key)."""
+    in_string, escape, last_colon, last_comma = False, False, -1, -1
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            last_colon = last_comma = i
+        elif ch == ":":
+            last_colon = i
+        elif ch == ",":
+            last_comma = i
+    return last_colon > last_comma
+
+
+def repair_json(text: str) -> str:
+    """Repaired JSON text of a complete response (empty string when it holds no JSON value)."""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.text()
+
+
+def parse_json(text: str, schema: Optional[Dict[str, Any]] = None) -> Any:
+    """Parse a (possibly fenced, truncated or slightly malformed) JSON response; see IncrementalJSONParser."""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.result(schema)
+
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+def _is_type(value: Any, name: str) -> bool:
+    if name == "integer":
+        return isinstance(value, int) and not isinstance(value, bool)
+    if name == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, _TYPES.get(name, object))
+
+
+def validate(value: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    Check ``value`` against the JSON Schema subset used for LLM responses
+    (type, enum, properties, required, additionalProperties, items, minItems, maxItems).
+    Returns the list of problems (empty when the value is valid).
+    """
+    expected = schema.get("type")
+    if expected is not None:
+        names = expected if isinstance(expected, list) else [expected]
+        if not any(_is_type(value, name) for name in names):
+            return [f"{path}: expected {'/'.join(names)}, got {type(value).__name__}"]
+    problems: List[str] = []
+    if "enum" in schema and value not in schema["enum"]:
+        problems.append(f"{path}: {value!r} is not one of {schema['enum']}")
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in value:
+                problems.append(f"{path}: missing required key '{key}'")
+        for key, item in value.items():
+            if key in properties:
+                problems.extend(validate(item, properties[key], f"{path}.{key}"))
+            elif schema.get("additionalProperties") is False:
+                problems.append(f"{path}: unexpected key '{key}'")
+    elif isinstance(value, list):
+        if "minItems" in schema and len(value) < schema["minItems"]:
+            problems.append(f"{path}: expected at least {schema['minItems']} items, got {len(value)}")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            problems.append(f"{path}: expected at most {schema['maxItems']} items, got {len(value)}")
+        if isinstance(schema.get("items"), dict):
+            for i, item in enumerate(value):
+                problems.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    return problems
@@ -3,8 +3,16 @@ import os
 import logging
 import asyncio
 import json
-from typing import AsyncGenerator, Dict, Any, Optional, List
+import sqlite3
+import time
+from typing import AsyncGenerator, Callable, Dict, Any, Iterator, Optional, List, Union
 from .parallel import ParallelProcessor
+from .response_cache import ResponseCache, get_shared_cache
+from .single_flight import SingleFlight, get_shared_flights
+from .rate_limiter import classify_error, get_model_limiter, retry_after_seconds
+from .hedging import Hedger, get_shared_hedger, on_cancel
+from .json_repair import IncrementalJSONParser, JSONRepairError
+from .session_capture import PROBE_HEADER, SessionRecorder, get_session_recorder
 import dotenv
 
 dotenv.load_dotenv()
@@ -13,6 +21,16 @@ dotenv.load_dotenv()
 logging.getLogger("openai").setLevel(logging.ERROR)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+def _rejects_response_format(error: BaseException) -> bool:
+    """Whether a provider error says the response_format parameter is not supported."""
+    message = str(error).lower()
+    return getattr(error, "status_code", 400) == 400 and any(
+        word in message for word in ("response_format", "json_schema", "json_object", "structured output"))
+
+def _rejects_stream_options(error: BaseException) -> bool:
+    """Whether a provider error says stream_options (usage in streams) is not supported."""
+    return "stream_options" in str(error) or "include_usage" in str(error)
+
 class Oracle(ParallelProcessor):
     # enum for model names
     SUPPORTED_MODELS = {
@@ -21,35 +39,275 @@ class Oracle(ParallelProcessor):
         "gpt-4o": 128000,
         "o4-mini": 200000,
     }
-
-    def __init__(self, model, apikey=None, base_url=None):
+    # (base_url, model) pairs whose provider rejected response_format; they get prompt-only JSON
+    _json_mode_unsupported: set = set()
+    # (base_url, model) pairs whose provider rejected stream_options; captured streams are recorded without usage
+    _stream_usage_unsupported: set = set()
+
+    def __init__(self, model, apikey=None, base_url=None, cache: Union[ResponseCache, str, bool, None] = None,
+                 coalesce: bool = True, hedge: bool = False, hedge_percentile: float = 95.0,
+                 hedge_budget: float = 0.05, hedge_model: Optional[str] = None,
+                 capture: Union[str, bool, None] = None):
+        """
+        Args:
+            model (str): Model name.
+            apikey (str): API key (defaults to OPENAI_API_KEY).
+            base_url (str): API base URL (defaults to BASE_URL).
+            cache: Response cache. None uses the shared on-disk cache (ORACLE_CACHE_PATH,
+                disabled with ORACLE_CACHE=0), a str is a cache file path, False disables caching.
+            coalesce (bool): Let identical concurrent requests share one upstream call
+                (process-wide, across Oracle instances).
+            hedge (bool): Send a duplicate request when the first token (or, for blocking calls, the
+                response) is slower than the hedge_percentile of recent latencies; the first to answer wins.
+            hedge_percentile (float): Latency percentile that triggers a hedge.
+            hedge_budget (float): Maximum extra upstream calls from hedging, as a fraction of requests.
+            hedge_model (str): Model for hedge requests: None for the same model, "auto" for a fallback
+                from SUPPORTED_MODELS with at least the same context window, or a model name.
+            capture: Record every upstream call (request, response and chunk timing) to a JSONL file
+                that the LLM emulator can replay. None uses ORACLE_CAPTURE_PATH (off when unset),
+                a str is a capture file path, False disables capture.
+        """
         super().__init__()
         self.model = model
         self.apikey = os.environ.get("OPENAI_API_KEY") if apikey is None else apikey
         self.base_url = os.environ.get("BASE_URL") if base_url is None else base_url
         self.client = OpenAI(api_key=self.apikey, base_url=self.base_url)
+
+        try:
+            if cache is None and os.environ.get("ORACLE_CACHE", "1").lower() not in ("0", "false", "off"):
+                cache = get_shared_cache()
+            elif isinstance(cache, str):
+                cache = get_shared_cache(cache)
+        except (OSError, sqlite3.Error) as e:
+            # a cache that cannot be opened disables caching instead of failing the agent
+            logging.warning(f"Response cache unavailable, caching disabled: {e}")
+            cache = None
+        self.cache: Optional[ResponseCache] = cache or None
+        self.coalesce = coalesce
+        self.flights: SingleFlight = get_shared_flights()
+        self.hedger: Optional[Hedger] = get_shared_hedger(hedge_percentile, hedge_budget) if hedge else None
+        self.hedge_model = self._fallback_model() if hedge_model == "auto" else hedge_model
+        self.recorder: Optional[SessionRecorder] = None if capture is False else get_session_recorder(capture or None)
+
+    def _fallback_model(self) -> str:
+        """First other supported model whose context window is at least as large as this model's."""
+        window = self.SUPPORTED_MODELS.get(self.model, 0)
+        for name, size in self.SUPPORTED_MODELS.items():
+            if name != self.model and size >= window:
+                return name
+        return self.model
+
+    def _open_stream(self, open_stream: Callable[[str], Iterator[str]]) -> Iterator[str]:
+        """Upstream stream for this model, hedged when hedging is on."""
+        if self.hedger is None:
+            return open_stream(self.model)
+        return self.hedger.run(open_stream, self.model, self.hedge_model, mode="stream")
+
+    def _fetch(self, fetch: Callable[[str], str]) -> str:
+        """
+        Upstream blocking call for this model, hedged when hedging is on.
+        A losing blocking hedge is not cancelled: it runs to completion upstream.
+        """
+        if self.hedger is None:
+            return fetch(self.model)
+        return "".join(self.hedger.run(lambda model: iter([fetch(model)]), self.model, self.hedge_model, mode="complete"))
+
+    def _cache_key(self, messages: List[Dict[str, str]], temp: float, top_p: float, use_cache: Optional[bool],
+                   **params: Any) -> Optional[str]:
+        """
+        Cache key of a request, or None when it must not be cached.
+        By default only deterministic calls (temp == 0) are cached; use_cache=True/False overrides that.
+        ``params`` are further request options that change the response (e.g. a response schema).
+        """
+        if self.cache is None or use_cache is False or (use_cache is None and temp != 0):
+            return None
+        return self.cache.make_key(self.model, messages, temperature=temp, top_p=top_p, **params)
+
+    def _flight_key(self, messages: List[Dict[str, str]], temp: float, top_p: float, coalesce: Optional[bool],
+                    **params: Any) -> Optional[str]:
+        """
+        Single-flight key of a request, or None when it must not be coalesced.
+        Like caching, only deterministic calls are shared by default; coalesce=True/False overrides that.
+        """
+        if not self.coalesce or coalesce is False or (coalesce is None and temp != 0):
+            return None
+        return ResponseCache.make_key(self.model, messages, temperature=temp, top_p=top_p, **params)
+
+    def _serve(self, messages: List[Dict[str, str]], temp: float, top_p: float, use_cache: Optional[bool],
+               cache_ttl: Optional[float], coalesce: Optional[bool], fetch: Callable[[str], str]) -> str:
+        """Answer a blocking request from the cache, an identical in-flight call, or ``fetch``."""
+        cache_key = self._cache_key(messages, temp, top_p, use_cache)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached["response"]
+
+        def call():
+            start = time.perf_counter()
+            response = self._fetch(fetch)
+            if cache_key and response:
+                self.cache.put(cache_key, self.model, response, ttl=cache_ttl, latency=time.perf_counter() - start)
+            return response
+
+        flight_key = self._flight_key(messages, temp, top_p, coalesce)
+        return self.flights.call(flight_key, call) if flight_key else call()
+
+    def _stream_producer(self, cache_key: Optional[str], cache_ttl: Optional[float],
+                         open_stream: Callable[[str], Iterator[str]]) -> Callable[[], Iterator[str]]:
+        def produce():
+            start = time.perf_counter()
+            chunks = []
+            for piece in self._open_stream(open_stream):
+                chunks.append(piece)
+                yield piece
+            # only complete streams are cached (an abandoned generator never gets here)
+            if cache_key and chunks:
+                self.cache.put(cache_key, self.model, "".join(chunks), chunks, cache_ttl, time.perf_counter() - start)
+        return produce
+
+    def _serve_stream(self, messages: List[Dict[str, str]], temp: float, top_p: float, use_cache: Optional[bool],
+                      cache_ttl: Optional[float], coalesce: Optional[bool], open_stream: Callable[[str], Iterator[str]],
+                      key_params: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Stream a request from the cache, an identical in-flight stream (same chunk sequence), or ``open_stream``.
+        Closing the returned iterator leaves a shared stream; the upstream stops once nobody listens.
+        """
+        key_params = key_params or {}
+        cache_key = self._cache_key(messages, temp, top_p, use_cache, **key_params)
+        cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            return self.cache.replay(cached)
+        produce = self._stream_producer(cache_key, cache_ttl, open_stream)
+        flight_key = self._flight_key(messages, temp, top_p, coalesce, **key_params)
+        return self.flights.stream(flight_key, produce) if flight_key else produce()
+
+    async def _serve_stream_async(self, messages: List[Dict[str, str]], temp: float, top_p: float, use_cache: Optional[bool],
+                                  cache_ttl: Optional[float], coalesce: Optional[bool],
+                                  open_stream: Callable[[str], Iterator[str]]) -> AsyncGenerator[str, None]:
+        """Async variant of ``_serve_stream``; a shared upstream is consumed off the event loop."""
+        cache_key = self._cache_key(messages, temp, top_p, use_cache)
+        cached = self.cache.get(cache_key) if cache_key else None
+        produce = self._stream_producer(cache_key, cache_ttl, open_stream)
+        flight_key = self._flight_key(messages, temp, top_p, coalesce)
+        if cached is None and flight_key:
+            async for piece in self.flights.stream_async(flight_key, produce):
+                yield piece
+            return
+        for piece in (self.cache.replay(cached) if cached is not None else produce()):
+            yield piece
+            # Allow other coroutines to run
+            await asyncio.sleep(0)
+
+    def _completion_text(self, model: str, messages: List[Dict[str, str]],
+                         usage_sink: Optional[List[Optional[int]]] = None, **params) -> str:
+        """
+        Blocking completion text. With ``usage_sink`` the call's total tokens (None when the provider
+        reports none) are appended to it; the list is passed explicitly because hedged calls run on
+        racer threads.
+        """
+        start = time.monotonic()
+        completion = self.client.chat.completions.create(model=model, messages=messages, stream=False, **params)
+        usage = getattr(completion, "usage", None)
+        if usage_sink is not None:
+            usage_sink.append(getattr(usage, "total_tokens", None))
+        text = ""
+        if completion.choices[0].message and completion.choices[0].message.content:
+            text = completion.choices[0].message.content
+        if self.recorder is not None:
+            self.recorder.record(model, messages, params, text, duration=time.monotonic() - start, usage=usage)
+        return text
+
+    def _stream_text(self, model: str, messages: List[Dict[str, str]], **params) -> Iterator[str]:
+        if self.recorder is None:
+            yield from self._stream_pieces(model, messages, **params)
+            return
+        # Timing starts before the request so the recorded first offset is the time to first token
+        start = time.monotonic()
+        usage: Dict[str, Any] = {}
+        pieces = self._stream_pieces(model, messages, usage_sink=usage, **params)
+        yield from self.recorder.capture_stream(model, messages, params, pieces, start, usage=usage)
+
+    def _stream_pieces(self, model: str, messages: List[Dict[str, str]],
+                       usage_sink: Optional[Dict[str, Any]] = None, **params) -> Iterator[str]:
+        """Stream text pieces; with ``usage_sink`` the provider is asked for usage, stored under "usage"."""
+        stream = None
+        if usage_sink is not None and (self.base_url, model) not in self._stream_usage_unsupported:
+            try:
+                stream = self.client.chat.completions.create(model=model, messages=messages, stream=True,
+                                                             stream_options={"include_usage": True}, **params)
+            except Exception as e:
+                if not _rejects_stream_options(e):
+                    raise
+                self._stream_usage_unsupported.add((self.base_url, model))
+        if stream is None:
+            stream = self.client.chat.completions.create(model=model, messages=messages, stream=True, **params)
+        # a hedged request that loses the race closes the HTTP stream even before its first token
+        if hasattr(stream, "close"):
+            on_cancel(stream.close)
+        try:
+            for chunk in stream:
+                if usage_sink is not None and getattr(chunk, "usage", None) is not None:
+                    usage_sink["usage"] = chunk.usage
+                if chunk.choices and len(chunk.choices) > 0:
+                    delta = chunk.choices[0].delta
+                    if delta and delta.content is not None:
+                        yield delta.content
+        finally:
+            if hasattr(stream, "close"):
+                stream.close()
+
+    @staticmethod
+    def _guard_stream(chunks: Iterator[str], error_prefix: str) -> Iterator[str]:
+        try:
+            yield from chunks
+        except Exception as e:
+            yield f"{error_prefix}: {str(e)}"
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics of the response cache (empty when caching is disabled)."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def hedge_stats(self) -> Dict[str, Any]:
+        """Hedging counters and current latency thresholds (empty when hedging is off)."""
+        return self.hedger.stats() if self.hedger is not None else {}
+
+    def flight_stats(self) -> Dict[str, int]:
+        """Counters of the single-flight layer (led and coalesced calls/streams, cancellations)."""
+        return self.flights.stats()
     
     def get_model_info(self):
         return self.client.models.retrieve(self.model)
     
     def _get_prompt_tokens_length(self, prompt):
-        return self.client.chat.completions.create(
+        """Prompt token count from a probe completion; the probe is marked so the LLM emulator answers it at once."""
+        messages = [{"role": "user", "content": prompt}]
+        start = time.monotonic()
+        completion = self.client.chat.completions.create(
             model=self.model,
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
             stream=False,
-        ).usage.prompt_tokens
+            extra_headers={PROBE_HEADER: "1"},
+        )
+        if self.recorder is not None:
+            text = completion.choices[0].message.content if completion.choices and completion.choices[0].message else ""
+            self.recorder.record(self.model, messages, {}, text or "", duration=time.monotonic() - start,
+                                 usage=completion.usage, probe=True)
+        return completion.usage.prompt_tokens
     
     def _check_token_limits(self, prompt_sys, prompt_user, model):
-        if self._get_prompt_tokens_length(prompt_sys) + self._get_prompt_tokens_length(prompt_user) > self.SUPPORTED_MODELS[model]:
+        # Count once; the count does not depend on the candidate model
+        prompt_tokens = self._get_prompt_tokens_length(prompt_sys) + self._get_prompt_tokens_length(prompt_user)
+        if prompt_tokens > self.SUPPORTED_MODELS[model]:
             # check and get a better model
             for model in self.SUPPORTED_MODELS:
-                if self._get_prompt_tokens_length(prompt_sys) + self._get_prompt_tokens_length(prompt_user) <= self.SUPPORTED_MODELS[model]:
+                if prompt_tokens <= self.SUPPORTED_MODELS[model]:
                     return model
             return model
         return model
     
     # for chat completion
-    def query(self, prompt_sys, prompt_user, temp=0.0, top_p=0.9, logprobs=True, query_key=None):
+    def query(self, prompt_sys, prompt_user, temp=0.0, top_p=0.9, logprobs=True, query_key=None, use_cache=None, cache_ttl=None,
+              coalesce=None):
         """
         Query the model with a system prompt and user prompt.
         Args:
@@ -59,31 +317,33 @@ class Oracle(ParallelProcessor):
             top_p (float): Top-p sampling parameter.
             logprobs (bool): Whether to return log probabilities.
             query_key (str): Key for the query.
+            use_cache (bool): Serve from / store in the response cache (default: only when temp == 0).
+            cache_ttl (float): Seconds the cached response stays valid (default: the cache's TTL).
+            coalesce (bool): Share one upstream call with identical concurrent queries (default: only when temp == 0).
         Returns:
             dict: Dictionary containing the query, answer, and log probabilities.
         """
-        completion = self.client.chat.completions.create(
-            model=self._check_token_limits(prompt_sys, prompt_user, self.model),
-            messages=[
-                {"role": "system", "content": prompt_sys},
-                {"role": "user", "content": prompt_user},
-            ],
-            stream=False,
-            temperature=temp,
-            top_p=top_p,
-            logprobs=logprobs,
+        return self._query(prompt_sys, prompt_user, temp, top_p, logprobs, query_key, use_cache, cache_ttl, coalesce)
+
+    def _query(self, prompt_sys, prompt_user, temp=0.0, top_p=0.9, logprobs=True, query_key=None, use_cache=None,
+               cache_ttl=None, coalesce=None, usage_sink: Optional[List[Optional[int]]] = None):
+        """``query`` that appends the total tokens of every upstream completion it makes to ``usage_sink``."""
+        messages = [
+            {"role": "system", "content": prompt_sys},
+            {"role": "user", "content": prompt_user},
+        ]
+        response_result = self._serve(
+            messages, temp, top_p, use_cache, cache_ttl, coalesce,
+            lambda model: self._completion_text(self._check_token_limits(prompt_sys, prompt_user, model), messages,
+                                                usage_sink, temperature=temp, top_p=top_p, logprobs=logprobs),
         )
 
-        response_result = ""
-        # for chunk in stream:
-        if completion.choices[0].message and completion.choices[0].message.content:
-            response_result = completion.choices[0].message.content
-        
         if not query_key:
             query_key = prompt_user
         return response_result
 
-    def query_stream(self, prompt_sys: str, prompt_user: str, temp: float = 0.0, top_p: float = 0.9, query_key: Optional[str] = None):
+    def query_stream(self, prompt_sys: str, prompt_user: str, temp: float = 0.0, top_p: float = 0.9, query_key: Optional[str] = None,
+                     use_cache: Optional[bool] = None, cache_ttl: Optional[float] = None, coalesce: Optional[bool] = None):
         """
         Query the model with streaming response.
         Args:
@@ -92,31 +352,27 @@ class Oracle(ParallelProcessor):
             temp (float): Temperature for the model.
             top_p (float): Top-p sampling parameter.
             query_key (str): Key for the query.
+            use_cache (bool): Replay from / store in the response cache (default: only when temp == 0).
+            cache_ttl (float): Seconds the cached response stays valid (default: the cache's TTL).
+            coalesce (bool): Share one upstream stream with identical concurrent queries (default: only when temp == 0).
         Yields:
             str: Streaming response chunks.
         """
-        try:
-            stream = self.client.chat.completions.create(
-                model=self._check_token_limits(prompt_sys, prompt_user, self.model),
-                messages=[
-                    {"role": "system", "content": prompt_sys},
-                    {"role": "user", "content": prompt_user},
-                ],
-                stream=True,
-                temperature=temp,
-                top_p=top_p,
-            )
+        messages = [
+            {"role": "system", "content": prompt_sys},
+            {"role": "user", "content": prompt_user},
+        ]
 
-            for chunk in stream:
-                if chunk.choices and len(chunk.choices) > 0:
-                    delta = chunk.choices[0].delta
-                    if delta and delta.content is not None:
-                        yield delta.content
+        def open_stream(model):
+            return self._stream_text(self._check_token_limits(prompt_sys, prompt_user, model), messages,
+                                     temperature=temp, top_p=top_p)
 
-        except Exception as e:
-            yield f"STREAM_ERROR: {str(e)}"
+        chunks = self._serve_stream(messages, temp, top_p, use_cache, cache_ttl, coalesce, open_stream)
+        yield from self._guard_stream(chunks, "STREAM_ERROR")
 
-    async def query_stream_async(self, prompt_sys: str, prompt_user: str, temp: float = 0.0, top_p: float = 0.9, query_key: Optional[str] = None) -> AsyncGenerator[str, None]:
+    async def query_stream_async(self, prompt_sys: str, prompt_user: str, temp: float = 0.0, top_p: float = 0.9, query_key: Optional[str] = None,
+                                 use_cache: Optional[bool] = None, cache_ttl: Optional[float] = None,
+                                 coalesce: Optional[bool] = None) -> AsyncGenerator[str, None]:
         """
         Async query the model with streaming response.
         Args:
@@ -125,35 +381,106 @@ class Oracle(ParallelProcessor):
             temp (float): Temperature for the model.
             top_p (float): Top-p sampling parameter.
             query_key (str): Key for the query.
+            use_cache (bool): Replay from / store in the response cache (default: only when temp == 0).
+            cache_ttl (float): Seconds the cached response stays valid (default: the cache's TTL).
+            coalesce (bool): Share one upstream stream with identical concurrent queries (default: only when temp == 0).
         Yields:
             str: Streaming response chunks.
         """
-        try:
-            # Create streaming request directly
-            stream = self.client.chat.completions.create(
-                model=self._check_token_limits(prompt_sys, prompt_user, self.model),
-                messages=[
-                    {"role": "system", "content": prompt_sys},
-                    {"role": "user", "content": prompt_user},
-                ],
-                stream=True,
-                temperature=temp,
-                top_p=top_p,
-            )
+        messages = [
+            {"role": "system", "content": prompt_sys},
+            {"role": "user", "content": prompt_user},
+        ]
 
-            # Process stream chunks
-            for chunk in stream:
-                if chunk.choices and len(chunk.choices) > 0:
-                    delta = chunk.choices[0].delta
-                    if delta and delta.content is not None:
-                        yield delta.content
-                        # Allow other coroutines to run
-                        await asyncio.sleep(0)
+        def open_stream(model):
+            return self._stream_text(self._check_token_limits(prompt_sys, prompt_user, model), messages,
+                                     temperature=temp, top_p=top_p)
 
+        try:
+            async for piece in self._serve_stream_async(messages, temp, top_p, use_cache, cache_ttl, coalesce, open_stream):
+                yield piece
         except Exception as e:
             yield f"ASYNC_STREAM_ERROR: {str(e)}"
 
-    def chat_with_history(self, messages: List[Dict[str, str]], temp: float = 0.0, top_p: float = 0.9, stream: bool = False):
+    def _response_format(self, model: str, schema: Optional[Dict[str, Any]], json_mode: Optional[bool]) -> Optional[Dict[str, Any]]:
+        """
+        Provider-side JSON mode for a request, or None to rely on the prompt alone.
+        A schema becomes a structured-output request (wrapped in an object when its top level is not one);
+        without a schema the plain JSON-object mode is used only when asked for, since it rules out arrays.
+        """
+        if json_mode is False or (self.base_url, model) in Oracle._json_mode_unsupported:
+            return None
+        if schema is not None:
+            if schema.get("type") != "object":
+                schema = {"type": "object", "properties": {"value": schema}, "required": ["value"]}
+            return {"type": "json_schema", "json_schema": {"name": "response", "schema": schema}}
+        return {"type": "json_object"} if json_mode else None
+
+    def query_json(self, prompt_sys: str, prompt_user: str, schema: Optional[Dict[str, Any]] = None,
+                   json_mode: Optional[bool] = None, temp: float = 0.0, top_p: float = 0.9,
+                   use_cache: Optional[bool] = None, cache_ttl: Optional[float] = None, coalesce: Optional[bool] = None) -> Any:
+        """
+        Query the model for a JSON value and parse it while it streams in.
+
+        The provider's structured-output mode is used when a schema is given (or its JSON-object mode
+        with json_mode=True); providers that reject it fall back to the prompt alone and are remembered.
+        The response is parsed incrementally with local repair of common defects (markdown fences,
+        trailing commas, unterminated strings and containers), then validated against ``schema``.
+        Args:
+            prompt_sys (str): System prompt.
+            prompt_user (str): User prompt (should ask for JSON).
+            schema (dict): Optional JSON Schema (subset, see ``json_repair.validate``) the value must match.
+            json_mode (bool): None = provider mode only with a schema, True = always, False = never.
+            temp, top_p, use_cache, cache_ttl, coalesce: As for ``query_stream``.
+        Returns:
+            The parsed value.
+        Raises:
+            JSONRepairError: The response holds no repairable JSON value or it does not match the schema.
+        """
+        messages = [
+            {"role": "system", "content": prompt_sys},
+            {"role": "user", "content": prompt_user},
+        ]
+
+        def open_stream(model):
+            model = self._check_token_limits(prompt_sys, prompt_user, model)
+            response_format = self._response_format(model, schema, json_mode)
+            params = dict(temperature=temp, top_p=top_p)
+            started = False
+            try:
+                for piece in self._stream_text(model, messages, **params,
+                                               **({"response_format": response_format} if response_format else {})):
+                    started = True
+                    yield piece
+            except Exception as e:
+                if started or response_format is None or not _rejects_response_format(e):
+                    raise
+                logging.info(f"{model} rejected response_format, falling back to prompt-only JSON: {e}")
+                Oracle._json_mode_unsupported.add((self.base_url, model))
+                yield from self._stream_text(model, messages, **params)
+
+        key_params = {"schema": schema, "json_mode": json_mode}
+        parser = IncrementalJSONParser()
+        for piece in self._serve_stream(messages, temp, top_p, use_cache, cache_ttl, coalesce, open_stream, key_params):
+            parser.feed(piece)
+        try:
+            try:
+                value = parser.result(schema)
+            except JSONRepairError:
+                if schema is None or schema.get("type") == "object":
+                    raise
+                # a structured-output response wraps a non-object value (see _response_format)
+                value = parser.result({"type": "object", "properties": {"value": schema}, "required": ["value"]})["value"]
+        except JSONRepairError:
+            # an unusable response must not be replayed to the retry
+            cache_key = self._cache_key(messages, temp, top_p, use_cache, **key_params)
+            if cache_key:
+                self.cache.delete(cache_key)
+            raise
+        return value
+
+    def chat_with_history(self, messages: List[Dict[str, str]], temp: float = 0.0, top_p: float = 0.9, stream: bool = False,
+                          use_cache: Optional[bool] = None, cache_ttl: Optional[float] = None, coalesce: Optional[bool] = None):
         """
         Chat with conversation history.
         Args:
@@ -161,45 +488,27 @@ class Oracle(ParallelProcessor):
             temp (float): Temperature for the model.
             top_p (float): Top-p sampling parameter.
             stream (bool): Whether to stream the response.
+            use_cache (bool): Serve from / store in the response cache (default: only when temp == 0).
+            cache_ttl (float): Seconds the cached response stays valid (default: the cache's TTL).
+            coalesce (bool): Share one upstream call with identical concurrent requests (default: only when temp == 0).
         Returns:
             str or generator: Response content or streaming generator.
         """
         try:
             if stream:
-                stream_response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    stream=True,
-                    temperature=temp,
-                    top_p=top_p,
+                chunks = self._serve_stream(
+                    messages, temp, top_p, use_cache, cache_ttl, coalesce,
+                    lambda model: self._stream_text(model, messages, temperature=temp, top_p=top_p),
                 )
-
-                def stream_generator():
-                    for chunk in stream_response:
-                        if chunk.choices and len(chunk.choices) > 0:
-                            delta = chunk.choices[0].delta
-                            if delta and delta.content is not None:
-                                yield delta.content
-
-                return stream_generator()
-            else:
-                completion = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    stream=False,
-                    temperature=temp,
-                    top_p=top_p,
-                )
-
-                if completion.choices[0].message and completion.choices[0].message.content:
-                    return completion.choices[0].message.content
-                return ""
+                return self._guard_stream(chunks, "CHAT_ERROR")
+            return self._serve(
+                messages, temp, top_p, use_cache, cache_ttl, coalesce,
+                lambda model: self._completion_text(model, messages, temperature=temp, top_p=top_p),
+            )
 
         except Exception as e:
             if stream:
-                def error_generator():
-                    yield f"CHAT_ERROR: {str(e)}"
-                return error_generator()
+                return iter([f"CHAT_ERROR: {str(e)}"])
             else:
                 return f"CHAT_ERROR: {str(e)}"
 
@@ -349,19 +658,26 @@ class Oracle(ParallelProcessor):
         return clean_content
 
     
-    def query_all(self, prompt_sys, prompt_user_all, workers=None, temp=0.0, top_p=0.9, query_key_list=[], batch_size=10, max_retries=2, timeout=3000, **kwargs):
+    def query_all(self, prompt_sys, prompt_user_all, workers=None, temp=0.0, top_p=0.9, query_key_list=[], batch_size=10, max_retries=2, timeout=3000,
+                  use_cache=None, cache_ttl=None, **kwargs):
         """
         Query all prompts in parallel using ThreadPoolExecutor with optimized performance.
+
+        Requests go through the process-wide rate limiter of the model (see ``rate_limiter``):
+        request/token budgets, AIMD concurrency that backs off on throttling and timeouts, and
+        retries with jittered exponential backoff for throttled, timed out and transient failures.
         Args:
             prompt_sys (str): System prompt.
             prompt_user_all (list): List of user prompts.
-            workers (int): Number of worker threads. If None, will use min(32, os.cpu_count() * 4)
+            workers (int): Number of worker threads. If None, the model's maximum concurrency is used
             temp (float): Temperature for the model.
             top_p (float): Top-p sampling parameter.
             query_key_list (list): List of query keys for each prompt.
             batch_size (int): Size of batches to process for better performance.
-            max_retries (int): Maximum number of retries for failed queries.
+            max_retries (int): Maximum number of retries for a failed query.
             timeout (int): Timeout in seconds for each query.
+            use_cache (bool): Response cache opt-in/out for every query (default: only when temp == 0).
+            cache_ttl (float): Seconds cached responses stay valid.
         Returns:
             list: List of results from the model.
         """
@@ -370,19 +686,32 @@ class Oracle(ParallelProcessor):
             key = query_key_list[i] if query_key_list and i < len(query_key_list) else None
             query_items.append((prompt, key))
         
+        limiter = get_model_limiter(self.model)
+
         # Define process function for a single query
         def process_func(item, prompt_sys=prompt_sys, temp=temp, top_p=top_p):
             prompt, key = item
-            try:
-                if key:
-                    return self.query(prompt_sys, prompt, temp, top_p, query_key=key)
-                else:
-                    return self.query(prompt_sys, prompt, temp, top_p)
-            except Exception as e:
-                return f"QUERY_FAILED: {str(e)}"
+            estimate = limiter.estimate_tokens(prompt_sys, prompt)
+            for attempt in range(max_retries + 1):
+                with limiter.acquire(estimate) as permit:
+                    try:
+                        # stays empty for cache hits and coalesced calls, which use no upstream tokens;
+                        # a hedged call reports both racers that reached the provider
+                        usage: List[Optional[int]] = []
+                        result = self._query(prompt_sys, prompt, temp, top_p, query_key=key,
+                                             use_cache=use_cache, cache_ttl=cache_ttl, usage_sink=usage)
+                        # None (provider reported no usage) keeps the estimate
+                        permit.succeeded(None if None in usage else sum(usage))
+                        return result
+                    except Exception as e:
+                        kind = classify_error(e)
+                        permit.failed(kind, retry_after_seconds(e))
+                        if kind == "fatal" or attempt == max_retries:
+                            return f"QUERY_FAILED: {str(e)}"
+                time.sleep(limiter.backoff(attempt))
         
-        # Use the parallel processor base class
-        workers = min(32, (os.cpu_count() or 4) * 4) if workers is None else workers
+        # Use the parallel processor base class; the limiter decides how many requests actually run
+        workers = limiter.max_concurrency if workers is None else workers
         
         return self.parallel_process(
             items=query_items,
@@ -392,4 +721,8 @@ class Oracle(ParallelProcessor):
             max_retries=max_retries,
             timeout=timeout,
             task_description="Processing queries"
-        )
\ No newline at end of file
+        )
+
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        """Counters and current concurrency limit of this model's shared rate limiter."""
+        return get_model_limiter(self.model).stats()
\ No newline at end of file
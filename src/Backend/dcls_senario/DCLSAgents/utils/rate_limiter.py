@@ -0,0 +1,222 @@
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# defaults for models without an explicit configuration (overridable with ORACLE_RPM / ORACLE_TPM /
+# ORACLE_MAX_CONCURRENCY)
+DEFAULT_LIMITS = {
+    "rpm": 600,
+    "tpm": 1_000_000,
+    "max_concurrency": 32,
+    "initial_concurrency": 8,
+}
+
+# rough completion size charged up front; settled against actual usage when it is known
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+class TokenBucket:
+    """Classic token bucket: ``capacity`` tokens, refilled continuously at ``rate`` tokens/second."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)."""
+        self._refill(time.monotonic())
+        # a request larger than the whole bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill(time.monotonic())
+        self.tokens -= amount
+
+    def give(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class Permit:
+    """One admitted request; report its outcome with ``succeeded`` or ``failed``."""
+
+    def __init__(self, limiter: "ModelLimiter", tokens: float):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.admitted = time.monotonic()
+        self.released = False
+
+    def succeeded(self, actual_tokens: Optional[float] = None) -> None:
+        self.limiter._release(self, "ok", actual_tokens)
+
+    def failed(self, kind: str, retry_after: Optional[float] = None) -> None:
+        self.limiter._release(self, kind, None, retry_after)
+
+    def __enter__(self) -> "Permit":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self.released:
+            self.limiter._release(self, "error", None)
+
+
+class ModelLimiter:
+    """
+    Request/token budget and adaptive concurrency for one model.
+
+    Admission waits for a concurrency slot, then for the request (RPM) and
+    token (TPM) buckets. The concurrency limit follows AIMD: it grows by about
+    one slot per window of successful requests and is halved on a throttle
+    (HTTP 429) or timeout. Failures of requests admitted before the last
+    decrease are ignored, so a batch failing together counts as one
+    congestion signal. A ``Retry-After`` from the provider pauses all
+    admissions of the model until it has passed.
+    """
+
+    def __init__(self, model: str, rpm: float, tpm: float, max_concurrency: int, initial_concurrency: int,
+                 min_concurrency: int = 1, decrease_factor: float = 0.5,
+                 backoff_base: float = 0.5, backoff_cap: float = 30.0):
+        self.model = model
+        self.requests = TokenBucket(max(1.0, rpm / 60.0), rpm / 60.0)
+        self.token_budget = TokenBucket(tpm / 60.0 * 10, tpm / 60.0)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.decrease_factor = decrease_factor
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        self._metrics = {"admitted": 0, "succeeded": 0, "throttled": 0, "timeouts": 0, "errors": 0,
+                         "decreases": 0, "wait_seconds": 0.0}
+
+    @staticmethod
+    def estimate_tokens(*texts: str, completion_tokens: int = DEFAULT_COMPLETION_TOKENS) -> int:
+        """Cheap prompt size estimate (~4 characters per token) plus the expected completion."""
+        return sum(len(t or "") for t in texts) // 4 + completion_tokens
+
+    def acquire(self, tokens: float = 0.0) -> Permit:
+        """Block until a request of ``tokens`` tokens may be sent."""
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self.in_flight < int(self.limit) and now >= self.paused_until:
+                    wait = max(self.requests.wait_time(1), self.token_budget.wait_time(tokens))
+                    if wait == 0:
+                        break
+                else:
+                    wait = max(self.paused_until - now, 0.0) or None
+                self._cond.wait(timeout=wait)
+
+            self.requests.take(1)
+            self.token_budget.take(tokens)
+            self.in_flight += 1
+            self._metrics["admitted"] += 1
+            self._metrics["wait_seconds"] += time.monotonic() - start
+        return Permit(self, tokens)
+
+    def _release(self, permit: Permit, kind: str, actual_tokens: Optional[float],
+                 retry_after: Optional[float] = None) -> None:
+        with self._cond:
+            if permit.released:
+                return
+            permit.released = True
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            if kind == "ok":
+                self._metrics["succeeded"] += 1
+                # additive increase: about +1 slot per window of `limit` successes
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+                if actual_tokens is not None:
+                    self.token_budget.give(permit.tokens - actual_tokens)
+            elif kind in ("throttled", "timeout"):
+                self._metrics["throttled" if kind == "throttled" else "timeouts"] += 1
+                if permit.admitted > self._last_decrease:
+                    self.limit = max(float(self.min_concurrency), self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self._metrics["decreases"] += 1
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+            else:
+                self._metrics["errors"] += 1
+            self._cond.notify_all()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return dict(self._metrics, model=self.model, concurrency_limit=round(self.limit, 2),
+                        in_flight=self.in_flight, wait_seconds=round(self._metrics["wait_seconds"], 3))
+
+
+def classify_error(error: BaseException) -> str:
+    """'throttled', 'timeout', 'transient' (retry without backing off concurrency) or 'fatal'."""
+    status = getattr(error, "status_code", None)
+    name = type(error).__name__
+    message = str(error).lower()
+    if status == 429 or name == "RateLimitError" or "rate limit" in message or "too many requests" in message:
+        return "throttled"
+    if isinstance(error, TimeoutError) or "Timeout" in name or "timed out" in message:
+        return "timeout"
+    if (status is not None and status >= 500) or name in ("APIConnectionError", "InternalServerError", "ConnectionError"):
+        return "transient"
+    return "fatal"
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Retry-After hint of a provider error, if it carries one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for name in ("retry-after-ms", "retry-after"):
+        value = headers.get(name) if hasattr(headers, "get") else None
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            continue
+        return seconds / 1000.0 if name == "retry-after-ms" else seconds
+    return None
+
+
+_limiters: Dict[str, ModelLimiter] = {}
+_limits: Dict[str, Dict[str, Any]] = {}
+_registry_lock = threading.Lock()
+
+
+def configure_rate_limits(model: str, **limits: Any) -> None:
+    """
+    Set limits for ``model`` (rpm, tpm, max_concurrency, initial_concurrency, ...).
+    Takes effect for limiters created afterwards; an existing limiter is replaced.
+    """
+    with _registry_lock:
+        _limits[model] = dict(_limits.get(model, {}), **limits)
+        _limiters.pop(model, None)
+
+
+def get_model_limiter(model: str) -> ModelLimiter:
+    """Process-wide limiter for ``model``, shared by every Oracle instance."""
+    with _registry_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limits = dict(DEFAULT_LIMITS)
+            for key, env in (("rpm", "ORACLE_RPM"), ("tpm", "ORACLE_TPM"), ("max_concurrency", "ORACLE_MAX_CONCURRENCY")):
+                if os.environ.get(env):
+                    limits[key] = type(DEFAULT_LIMITS[key])(float(os.environ[env]))
+            limits.update(_limits.get(model, {}))
+            limiter = _limiters[model] = ModelLimiter(model, **limits)
+        return limiter
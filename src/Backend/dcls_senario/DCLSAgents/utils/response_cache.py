@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "easy-notebook", "oracle_cache.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# size of the pieces a non-streamed response is cut into when replayed as a stream
+REPLAY_CHUNK_CHARS = 16
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    chunks TEXT,
+    size INTEGER NOT NULL,
+    latency REAL NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    expires REAL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of LLM responses with a size-bounded LRU and optional TTL.
+
+    Entries are keyed by (model, messages, sampling params), so a byte-identical
+    request is answered from disk. Streamed responses keep their chunks and are
+    replayed chunk by chunk; plain responses are replayed in small pieces.
+    One file can be shared by several processes (WAL journal).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 default_ttl: Optional[float] = None):
+        self.path = path or os.environ.get("ORACLE_CACHE_PATH") or DEFAULT_CACHE_PATH
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0, "errors": 0,
+                         "saved_seconds": 0.0}
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], **params: Any) -> str:
+        """Cache key of a chat completion request."""
+        payload = json.dumps({"model": model, "messages": messages, "params": params},
+                             sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for ``key`` (``response``, ``chunks``, ``model``), or None on a miss."""
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT response, chunks, model, latency, expires FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[4] is not None and row[4] <= now:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._metrics["expired"] += 1
+                    row = None
+                if row is not None:
+                    self._conn.execute("UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            except sqlite3.Error as e:
+                # a broken cache must never fail the call it is serving
+                logging.warning(f"Response cache read failed: {e}")
+                self._metrics["errors"] += 1
+                row = None
+            if row is None:
+                self._metrics["misses"] += 1
+                return None
+            self._metrics["hits"] += 1
+            self._metrics["saved_seconds"] += row[3]
+        return {"response": row[0], "chunks": json.loads(row[1]) if row[1] else None, "model": row[2]}
+
+    def put(self, key: str, model: str, response: str, chunks: Optional[List[str]] = None,
+            ttl: Optional[float] = None, latency: float = 0.0) -> None:
+        """Store a response (and its stream chunks), then evict least recently used entries over budget."""
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        chunks_json = json.dumps(chunks, ensure_ascii=False) if chunks else None
+        size = len(response.encode("utf-8")) + (len(chunks_json.encode("utf-8")) if chunks_json else 0)
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, chunks, size, latency, created, last_access, expires) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, model, response, chunks_json, size, latency, now, now, now + ttl if ttl else None),
+                )
+                self._metrics["stores"] += 1
+                self._evict(now)
+            except sqlite3.Error as e:
+                logging.warning(f"Response cache write failed: {e}")
+                self._metrics["errors"] += 1
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._metrics["evictions"] += len(victims)
+
+    @staticmethod
+    def replay(entry: Dict[str, Any]) -> Iterator[str]:
+        """Yield a cached entry as stream chunks."""
+        if entry.get("chunks"):
+            yield from entry["chunks"]
+            return
+        response = entry["response"]
+        for i in range(0, len(response), REPLAY_CHUNK_CHARS):
+            yield response[i:i + REPLAY_CHUNK_CHARS]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            except sqlite3.Error as e:
+                logging.warning(f"Response cache delete failed: {e}")
+                self._metrics["errors"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM responses")
+            except sqlite3.Error as e:
+                logging.warning(f"Response cache clear failed: {e}")
+                self._metrics["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics of this instance plus the current size of the cache file."""
+        with self._lock:
+            try:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            except sqlite3.Error as e:
+                logging.warning(f"Response cache stats failed: {e}")
+                self._metrics["errors"] += 1
+                entries, size = None, None
+            metrics = dict(self._metrics)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics.update(
+            hit_rate=round(metrics["hits"] / lookups, 4) if lookups else 0.0,
+            saved_seconds=round(metrics["saved_seconds"], 3),
+            entries=entries,
+            bytes=size,
+            max_bytes=self.max_bytes,
+            path=self.path,
+        )
+        return metrics
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_shared_caches: Dict[str, ResponseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache(path: Optional[str] = None) -> ResponseCache:
+    """
+    Process-wide cache instance per file, so all Oracle instances share metrics and one connection.
+    Size and TTL defaults come from ORACLE_CACHE_MAX_MB and ORACLE_CACHE_TTL (seconds).
+    """
+    path = path or os.environ.get("ORACLE_CACHE_PATH") or DEFAULT_CACHE_PATH
+    with _shared_lock:
+        if path not in _shared_caches:
+            max_mb = os.environ.get("ORACLE_CACHE_MAX_MB")
+            ttl = os.environ.get("ORACLE_CACHE_TTL")
+            _shared_caches[path] = ResponseCache(
+                path,
+                max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES,
+                default_ttl=float(ttl) if ttl else None,
+            )
+        return _shared_caches[path]
@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Request header marking a prompt-token-count probe; the LLM emulator answers these at once
+PROBE_HEADER = "X-Oracle-Probe"
+
+
+class SessionRecorder:
+    """
+    Appends real upstream LLM calls to a JSONL capture file.
+
+    One line per call: the request (model, messages, sampling params), the
+    response text, its usage and, for streams, every chunk with its offset in
+    seconds from the request, so the LLM emulator (src/Backend/llm_emulator)
+    can replay the session with the original token timing. Prompt-token-count
+    probes are flagged with ``"probe": true`` so replay never mistakes them for
+    real completions. The backend Oracle records through this same module
+    (re-exported by backend/utils/session_capture.py), so both services write
+    one capture format.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def record(self, model: str, messages: List[Dict[str, Any]], params: Dict[str, Any], response: str,
+               chunks: Optional[List[Tuple[float, str]]] = None, duration: float = 0.0,
+               usage: Any = None, probe: bool = False) -> None:
+        entry = {
+            "created": time.time(),
+            "model": model,
+            "messages": messages,
+            "params": params,
+            "stream": chunks is not None,
+            "response": response,
+            "chunks": [[round(offset, 4), text] for offset, text in chunks] if chunks is not None else None,
+            "ttft": round(chunks[0][0], 4) if chunks else round(duration, 4),
+            "duration": round(duration, 4),
+            "usage": _usage_dict(usage),
+            "probe": probe,
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                logging.warning(f"Session capture write failed: {e}")
+
+    def capture(self, stream: Iterable[Any], model: str, messages: List[Dict[str, Any]],
+                params: Dict[str, Any], start: float) -> Iterator[Any]:
+        """
+        Pass raw chat-completion chunks through, recording the stream once it has been fully consumed.
+
+        The usage is taken from the chunk that carries it (``stream_options.include_usage``);
+        a stream abandoned half-way is not recorded.
+        """
+        chunks: List[Tuple[float, str]] = []
+        usage = None
+        for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                chunks.append((time.monotonic() - start, chunk.choices[0].delta.content))
+            yield chunk
+        self.record(model, messages, params, "".join(text for _, text in chunks), chunks,
+                    time.monotonic() - start, usage)
+
+    def capture_stream(self, model: str, messages: List[Dict[str, Any]], params: Dict[str, Any],
+                       pieces: Iterator[str], start: float, usage: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Pass a text stream through, recording it once it has been fully consumed.
+
+        ``usage`` is a dict the producer fills with the stream's usage (key "usage")
+        by the time the stream ends.
+        """
+        chunks: List[Tuple[float, str]] = []
+        for piece in pieces:
+            chunks.append((time.monotonic() - start, piece))
+            yield piece
+        self.record(model, messages, params, "".join(text for _, text in chunks), chunks,
+                    time.monotonic() - start, (usage or {}).get("usage"))
+
+
+def _usage_dict(usage: Any) -> Optional[Dict[str, Any]]:
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return usage
+    if hasattr(usage, "model_dump"):
+        return usage.model_dump()
+    return {name: getattr(usage, name, None) for name in ("prompt_tokens", "completion_tokens", "total_tokens")}
+
+
+_recorders: Dict[str, SessionRecorder] = {}
+_recorders_lock = threading.Lock()
+
+
+def get_session_recorder(path: Optional[str] = None) -> Optional[SessionRecorder]:
+    """Process-wide recorder for ``path`` (default: ORACLE_CAPTURE_PATH); None when capture is off."""
+    path = path or os.environ.get("ORACLE_CAPTURE_PATH")
+    if not path:
+        return None
+    with _recorders_lock:
+        if path not in _recorders:
+            _recorders[path] = SessionRecorder(path)
+        return _recorders[path]
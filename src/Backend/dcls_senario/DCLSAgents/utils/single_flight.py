@@ -0,0 +1,234 @@
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+_CHUNK, _END = "chunk", "end"
+
+
+class _Call:
+    """One in-flight blocking call; followers wait for the leader's result."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _QueueSink:
+    def __init__(self):
+        self.queue: "queue.Queue" = queue.Queue()
+
+    def put(self, item) -> None:
+        self.queue.put(item)
+
+
+class _AsyncSink:
+    """Delivers items from the producer thread into a subscriber's event loop."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def put(self, item) -> None:
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+
+
+class _StreamFlight:
+    """
+    One upstream stream fanned out to any number of subscribers.
+
+    The upstream is consumed by a background thread. A subscriber first gets
+    the chunks produced so far, then the live ones, so late joiners see the
+    same sequence as the first caller. When the last subscriber leaves before
+    the stream ends, the upstream is cancelled.
+    """
+
+    def __init__(self, owner: "SingleFlight", key: str, producer: Callable[[], Iterator[str]]):
+        self.owner = owner
+        self.key = key
+        self.producer = producer
+        self.chunks: List[str] = []
+        self.sinks: set = set()
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name=f"single-flight-{self.key[:8]}", daemon=True).start()
+
+    def _run(self) -> None:
+        upstream = None
+        error = None
+        try:
+            upstream = self.producer()
+            for chunk in upstream:
+                if self.cancelled.is_set():
+                    break
+                with self.lock:
+                    self.chunks.append(chunk)
+                    self._publish((_CHUNK, chunk))
+        except Exception as e:
+            error = e
+        finally:
+            if upstream is not None and hasattr(upstream, "close"):
+                # closing the generator releases the HTTP stream when cancelled mid-way
+                upstream.close()
+            with self.lock:
+                self.finished = True
+                self.error = error
+                self._publish((_END, error))
+                self.sinks.clear()
+            self.owner._forget(self.key, self)
+
+    def _publish(self, item) -> None:
+        for sink in list(self.sinks):
+            try:
+                sink.put(item)
+            except RuntimeError:
+                # the subscriber's event loop is gone
+                self.sinks.discard(sink)
+
+    def subscribe(self, sink) -> bool:
+        """Attach a subscriber; False when the flight was cancelled (it would end early)."""
+        with self.lock:
+            if self.cancelled.is_set():
+                return False
+            for chunk in self.chunks:
+                sink.put((_CHUNK, chunk))
+            if self.finished:
+                sink.put((_END, self.error))
+            else:
+                self.sinks.add(sink)
+            return True
+
+    def unsubscribe(self, sink) -> None:
+        with self.lock:
+            if sink not in self.sinks:
+                return
+            self.sinks.discard(sink)
+            if self.sinks or self.finished:
+                return
+            self.cancelled.set()
+        self.owner._cancelled(self.key, self)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent requests into one upstream call.
+
+    ``call`` shares the result (or exception) of a blocking call between all
+    callers that arrive while it runs. ``stream`` / ``stream_async`` share one
+    upstream stream between all subscribers. Nothing is kept once a flight
+    ends; use the response cache for reuse across time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._streams: Dict[str, _StreamFlight] = {}
+        self._metrics = {"calls": 0, "coalesced_calls": 0, "streams": 0, "coalesced_streams": 0, "cancelled_streams": 0}
+
+    def call(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` once for all concurrent callers with the same key."""
+        with self._lock:
+            flight = self._calls.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._calls[key] = _Call()
+                self._metrics["calls"] += 1
+            else:
+                self._metrics["coalesced_calls"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            flight.done.set()
+
+    def _join(self, key: str, producer: Callable[[], Iterator[str]], sink) -> _StreamFlight:
+        """
+        Subscribe ``sink`` to the running flight for ``key``, or start a new one.
+        Joining and subscribing happen under the registry lock, so a flight whose last
+        subscriber just left (cancelled, not yet forgotten) is replaced, never joined.
+        """
+        with self._lock:
+            flight = self._streams.get(key)
+            if flight is not None and flight.subscribe(sink):
+                self._metrics["coalesced_streams"] += 1
+                return flight
+            flight = self._streams[key] = _StreamFlight(self, key, producer)
+            flight.subscribe(sink)
+            self._metrics["streams"] += 1
+        flight.start()
+        return flight
+
+    def stream(self, key: str, producer: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """
+        Subscribe to the shared stream for ``key``, starting ``producer`` if none is running.
+        Upstream errors are re-raised in every subscriber; closing this generator unsubscribes.
+        """
+        sink = _QueueSink()
+        flight = self._join(key, producer, sink)
+        try:
+            while True:
+                kind, value = sink.queue.get()
+                if kind == _CHUNK:
+                    yield value
+                elif value is not None:
+                    raise value
+                else:
+                    return
+        finally:
+            flight.unsubscribe(sink)
+
+    async def stream_async(self, key: str, producer: Callable[[], Iterator[str]]) -> AsyncIterator[str]:
+        """Async variant of ``stream``; the upstream runs off the event loop."""
+        sink = _AsyncSink()
+        flight = self._join(key, producer, sink)
+        try:
+            while True:
+                kind, value = await sink.queue.get()
+                if kind == _CHUNK:
+                    yield value
+                elif value is not None:
+                    raise value
+                else:
+                    return
+        finally:
+            flight.unsubscribe(sink)
+
+    def _forget(self, key: str, flight: _StreamFlight) -> None:
+        with self._lock:
+            if self._streams.get(key) is flight:
+                del self._streams[key]
+
+    def _cancelled(self, key: str, flight: _StreamFlight) -> None:
+        with self._lock:
+            self._metrics["cancelled_streams"] += 1
+        # new identical requests must start a fresh upstream, not join the cancelled one
+        self._forget(key, flight)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._metrics, in_flight=len(self._calls) + len(self._streams))
+
+
+_shared_flights = SingleFlight()
+
+
+def get_shared_flights() -> SingleFlight:
+    """Process-wide registry, so identical requests coalesce across Oracle instances."""
+    return _shared_flights
@@ -11,6 +11,7 @@ from app.utils.helpers import get_chapter_or_abort, validate_section_id, create_
 from app.stages import get_sequence_generator
 from app.stages import general_response
 from app.utils.logger import ModernLogger
+from app.models.FoKn import get_prompt_cache_stats
 
 logger = ModernLogger("planner", level="info")
 router = APIRouter()
@@ -242,4 +243,9 @@ async def generate_response(request: GenerateRequest):
     """
     生成响应
     """
-    return await general_response(request.issue, request.context)
\ No newline at end of file
+    return await general_response(request.issue, request.context)
+
+@router.get("/prompt_cache_stats")
+async def prompt_cache_stats():
+    """各Agent请求的服务端提示词缓存命中率(cached_tokens / prompt_tokens)"""
+    return get_prompt_cache_stats().stats()
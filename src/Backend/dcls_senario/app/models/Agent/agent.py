@@ -7,7 +7,7 @@ from ..Behavior import Behavior
 from ...utils.oracle import Oracle
 from ..Token import Token
 from ...utils.logger import ModernLogger
-from ..FoKn import FoKn
+from ..FoKn import FoKn, PromptLayout, get_prompt_cache_stats, prefix_hash
 from .Ability import ability, AgentAbilityMixin
 
 load_dotenv()
@@ -356,7 +356,8 @@ class Agent(ABC, Oracle, Token, AgentAbilityMixin):
             "base_description": self.fokn.base_description,
             "has_memory": bool(self.agent_memory),
             "workflow_context": bool(self.workflow_context),
-            "available_workflows": len(self.available_workflows)
+            "available_workflows": len(self.available_workflows),
+            "prompt_tokens": self.fokn.prompt_token_count()
         }
     
     def _sync_abilities_to_fokn(self):
@@ -509,6 +510,10 @@ class Agent(ABC, Oracle, Token, AgentAbilityMixin):
         
     def _build_memory_aware_prompt(self) -> str:
         """Build a memory-aware system prompt using new ability system and FoKn framework."""
+        return self._build_prompt_layout().render()
+    
+    def _build_prompt_layout(self) -> PromptLayout:
+        """Build the memory-aware prompt as tiers: static prefix first, per-turn context last."""
         # 重新初始化FoKn以确保干净的状态
         self._setup_fokn_integration()
         
@@ -525,8 +530,8 @@ class Agent(ABC, Oracle, Token, AgentAbilityMixin):
         self.fokn.add_available_agent("text-to-image", "专门绘制复杂图片或视频的智能体") \
                .add_available_agent("text-to-video", "专门创建视频内容的智能体")
         
-        # 生成最终的高质量提示词
-        return self.fokn.generate_high_quality_prompt()
+        # 生成最终的高质量提示词(分层布局)
+        return self.fokn.generate_prompt_layout()
     
     def _sync_memory_to_fokn(self):
         """将智能体记忆同步到FoKn框架"""
@@ -578,7 +583,8 @@ class Agent(ABC, Oracle, Token, AgentAbilityMixin):
         # 6) 终止警告
         should_terminate, terminate_reason = self._should_terminate()
         if should_terminate:
-            self.fokn.add_constraint(f"IMPORTANT WARNING: {terminate_reason}")
+            # 放在限制中(每轮变化的部分), 不改变静态的约束部分
+            self.fokn.add_limitation(f"IMPORTANT WARNING: {terminate_reason}")
     
     def _sync_context_to_fokn(self):
         """将上下文信息同步到FoKn框架"""
@@ -621,9 +627,8 @@ class Agent(ABC, Oracle, Token, AgentAbilityMixin):
                 "content": f"The task has reached its limit: {terminate_reason}. Please summarize the current issue and suggest next steps instead of continuing."
             }]
             
-        # 使用记忆感知的提示词
-        memory_aware_prompt = self._build_memory_aware_prompt()
-        return [{"role": "system", "content": memory_aware_prompt}]
+        # 使用记忆感知的提示词: 稳定前缀一条系统消息, 每轮变化的上下文另一条
+        return self._build_prompt_layout().messages()
         
     def _add_user_message(self, content: str):
         """Append user message."""
@@ -858,9 +863,10 @@ class Agent(ABC, Oracle, Token, AgentAbilityMixin):
             
             # Fetch LLM output via async streaming
             chunk_count = 0
+            # Per-turn context goes after the stable system prompt, next to the query
             async for chunk in self.query_stream_async(
                 prompt_sys=messages[0]["content"], 
-                prompt_user=query
+                prompt_user="\n\n".join([m["content"] for m in messages[1:]] + [query])
             ):
                 chunk_count += 1
                 self.logger.debug(f"Received chunk {chunk_count}: '{chunk[:60]}...'")
@@ -883,6 +889,8 @@ class Agent(ABC, Oracle, Token, AgentAbilityMixin):
                     yield json.dumps(processed_action) + "\n"
             
             self.logger.info(f"Stream completed, processed {chunk_count} chunks")
+            # provider-side prompt cache hits of the stable system prompt (usage from the stream's last chunk)
+            get_prompt_cache_stats().record(type(self).__name__, self.last_usage, prefix_hash(messages[0]["content"]))
             
             # Flush remaining buffered content via Token-based parser
             final_actions = self.finalize()
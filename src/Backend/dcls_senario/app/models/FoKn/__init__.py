@@ -12,7 +12,11 @@ from .core import (
     KnowledgeTree,
     StructuredKnowledgeTree,
     KnowledgeArea,
-    KnowledgeForest
+    KnowledgeForest,
+    PromptLayout,
+    PromptCacheStats,
+    get_prompt_cache_stats,
+    prefix_hash
 )
 
 from .agent_identity import (
@@ -89,6 +93,10 @@ __all__ = [
     "StructuredKnowledgeTree", 
     "KnowledgeArea",
     "KnowledgeForest",
+    "PromptLayout",
+    "PromptCacheStats",
+    "get_prompt_cache_stats",
+    "prefix_hash",
     
     # Agent Identity trees
     "RoleKnowledgeTree",
@@ -10,10 +10,15 @@ from .forest_base import (
     KnowledgeArea,
     KnowledgeForest
 )
+from .prompt_layout import PromptLayout, PromptCacheStats, get_prompt_cache_stats, prefix_hash
 
 __all__ = [
     "KnowledgeTree",
     "StructuredKnowledgeTree",
     "KnowledgeArea", 
-    "KnowledgeForest"
+    "KnowledgeForest",
+    "PromptLayout",
+    "PromptCacheStats",
+    "get_prompt_cache_stats",
+    "prefix_hash"
 ]
\ No newline at end of file
@@ -8,10 +8,13 @@ This module provides the foundational architecture for the FoKn framework,
 implementing a hierarchical knowledge management system for AI agent instruction building.
 """
 
+import json
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from collections import OrderedDict
 
+from .prompt_layout import estimate_tokens
+
 
 class KnowledgeTree(ABC):
     """
@@ -19,6 +22,9 @@ class KnowledgeTree(ABC):
     
     A knowledge tree represents a specific domain of knowledge within a knowledge area.
     Each tree is responsible for storing, managing, and formatting its knowledge items.
+    
+    Every change bumps ``version``; the formatted section and its token count are
+    cached per version, so unchanged trees are not re-formatted or re-counted.
     """
     
     def __init__(self, tree_name: str, tree_description: str = ""):
@@ -32,11 +38,31 @@ class KnowledgeTree(ABC):
         self.tree_name = tree_name
         self.tree_description = tree_description
         self.knowledge_items: List[str] = []
+        self.version = 0
+        self._item_keys: Set[str] = set()
+        self._section_cache: Optional[Tuple[int, str, int]] = None
+    
+    def touch(self) -> 'KnowledgeTree':
+        """
+        Mark this tree as changed.
+        
+        Subclasses that keep state outside knowledge_items call this after
+        changing it, so the cached section is rebuilt.
+        
+        Returns:
+            Self for method chaining
+        """
+        self.version += 1
+        return self
     
     def add_knowledge(self, knowledge: str) -> 'KnowledgeTree':
         """
         Add a knowledge item to this tree.
         
+        An item that is already in the tree is not added again (an O(1) set
+        lookup) and does not change the version, so re-syncing the same
+        sources every turn keeps the cached prompt valid.
+        
         Args:
             knowledge: The knowledge item to add
             
@@ -44,7 +70,11 @@ class KnowledgeTree(ABC):
             Self for method chaining
         """
         if knowledge and knowledge.strip():
-            self.knowledge_items.append(knowledge.strip())
+            item = knowledge.strip()
+            if item not in self._item_keys:
+                self._item_keys.add(item)
+                self.knowledge_items.append(item)
+                self.touch()
         return self
     
     def get_knowledge_items(self) -> List[str]:
@@ -63,7 +93,10 @@ class KnowledgeTree(ABC):
         Returns:
             Self for method chaining
         """
-        self.knowledge_items.clear()
+        if self.knowledge_items:
+            self.knowledge_items.clear()
+            self._item_keys.clear()
+            self.touch()
         return self
     
     @abstractmethod
@@ -78,6 +111,30 @@ class KnowledgeTree(ABC):
         """
         pass
     
+    def formatted_section(self) -> str:
+        """
+        Formatted section of this tree, cached until the tree changes.
+        
+        Returns:
+            The output of format_knowledge_section() for the current version
+        """
+        return self._cached_section()[0]
+    
+    def section_tokens(self) -> int:
+        """
+        Estimated token count of the formatted section, cached with it.
+        
+        Returns:
+            Token count of formatted_section()
+        """
+        return self._cached_section()[1]
+    
+    def _cached_section(self) -> Tuple[str, int]:
+        if self._section_cache is None or self._section_cache[0] != self.version:
+            section = self.format_knowledge_section()
+            self._section_cache = (self.version, section, estimate_tokens(section))
+        return self._section_cache[1], self._section_cache[2]
+    
     def is_empty(self) -> bool:
         """
         Check if this knowledge tree contains any knowledge items.
@@ -115,10 +172,11 @@ class StructuredKnowledgeTree(KnowledgeTree):
         """
         super().__init__(tree_name, tree_description)
         self.structured_items: List[Dict[str, Any]] = []
+        self._structured_keys: Set[str] = set()
     
     def add_structured_knowledge(self, knowledge_data: Dict[str, Any]) -> 'StructuredKnowledgeTree':
         """
-        Add structured knowledge data to this tree.
+        Add structured knowledge data to this tree (identical data is kept once).
         
         Args:
             knowledge_data: Dictionary containing structured knowledge
@@ -127,7 +185,11 @@ class StructuredKnowledgeTree(KnowledgeTree):
             Self for method chaining
         """
         if knowledge_data:
-            self.structured_items.append(knowledge_data.copy())
+            key = json.dumps(knowledge_data, sort_keys=True, default=str)
+            if key not in self._structured_keys:
+                self._structured_keys.add(key)
+                self.structured_items.append(knowledge_data.copy())
+                self.touch()
         return self
     
     def get_structured_items(self) -> List[Dict[str, Any]]:
@@ -146,7 +208,10 @@ class StructuredKnowledgeTree(KnowledgeTree):
         Returns:
             Self for method chaining
         """
-        self.structured_items.clear()
+        if self.structured_items:
+            self.structured_items.clear()
+            self._structured_keys.clear()
+            self.touch()
         return self
     
     def is_empty(self) -> bool:
@@ -178,6 +243,18 @@ class KnowledgeArea:
         self.area_name = area_name
         self.area_description = area_description
         self.knowledge_trees: OrderedDict[str, KnowledgeTree] = OrderedDict()
+        self._structure_version = 0
+        self._output_cache: Optional[Tuple[Tuple, str]] = None
+    
+    @property
+    def version(self) -> Tuple:
+        """
+        Version of this area: changes whenever a tree is added, removed or changed.
+        
+        Returns:
+            Tuple of the area's structure version and its trees' versions
+        """
+        return (self._structure_version,) + tuple(tree.version for tree in self.knowledge_trees.values())
     
     def add_knowledge_tree(self, tree: KnowledgeTree) -> 'KnowledgeArea':
         """
@@ -190,6 +267,7 @@ class KnowledgeArea:
             Self for method chaining
         """
         self.knowledge_trees[tree.tree_name] = tree
+        self._structure_version += 1
         return self
     
     def get_knowledge_tree(self, tree_name: str) -> Optional[KnowledgeTree]:
@@ -214,27 +292,37 @@ class KnowledgeArea:
         Returns:
             Self for method chaining
         """
-        self.knowledge_trees.pop(tree_name, None)
+        if self.knowledge_trees.pop(tree_name, None) is not None:
+            self._structure_version += 1
         return self
     
     def format_area_output(self) -> str:
         """
         Format all non-empty knowledge trees in this area.
         
+        Only trees that changed since the last call are re-formatted; the
+        joined output is reused while the area version stays the same.
+        
         Returns:
             Formatted string representation of all trees in this area
         """
         if not self.knowledge_trees:
             return ""
         
+        version = self.version
+        if self._output_cache is not None and self._output_cache[0] == version:
+            return self._output_cache[1]
+        
         output_parts = []
         for tree in self.knowledge_trees.values():
             if not tree.is_empty():
-                formatted_section = tree.format_knowledge_section()
+                formatted_section = tree.formatted_section()
                 if formatted_section:
                     output_parts.append(formatted_section)
         
-        return "\n".join(output_parts)
+        output = "\n".join(output_parts)
+        self._output_cache = (version, output)
+        return output
     
     def is_empty(self) -> bool:
         """
@@ -273,6 +361,19 @@ class KnowledgeForest:
         self.forest_name = forest_name
         self.knowledge_areas: OrderedDict[str, KnowledgeArea] = OrderedDict()
         self.base_description = ""
+        self._structure_version = 0
+        self._output_cache: Optional[Tuple[Tuple, str]] = None
+    
+    @property
+    def version(self) -> Tuple:
+        """
+        Version of the whole forest: changes whenever any area or tree changes.
+        
+        Returns:
+            Tuple of the forest's structure version, base description and area versions
+        """
+        return (self._structure_version, self.base_description) + tuple(
+            area.version for area in self.knowledge_areas.values())
     
     def add_knowledge_area(self, area: KnowledgeArea) -> 'KnowledgeForest':
         """
@@ -285,6 +386,7 @@ class KnowledgeForest:
             Self for method chaining
         """
         self.knowledge_areas[area.area_name] = area
+        self._structure_version += 1
         return self
     
     def get_knowledge_area(self, area_name: str) -> Optional[KnowledgeArea]:
@@ -309,7 +411,8 @@ class KnowledgeForest:
         Returns:
             Self for method chaining
         """
-        self.knowledge_areas.pop(area_name, None)
+        if self.knowledge_areas.pop(area_name, None) is not None:
+            self._structure_version += 1
         return self
     
     def set_base_description(self, description: str) -> 'KnowledgeForest':
@@ -335,6 +438,10 @@ class KnowledgeForest:
         Returns:
             Complete formatted knowledge output
         """
+        version = self.version
+        if self._output_cache is not None and self._output_cache[0] == version:
+            return self._output_cache[1]
+        
         output_parts = []
         
         # Add base description if provided
@@ -348,7 +455,9 @@ class KnowledgeForest:
                 if area_output:
                     output_parts.append(area_output)
         
-        return "\n".join(filter(None, output_parts))
+        output = "\n".join(filter(None, output_parts))
+        self._output_cache = (version, output)
+        return output
     
     def is_empty(self) -> bool:
         """
@@ -5,8 +5,9 @@ FoKn高质量格式化器 - 生成优化的提示词格式
 符合生产环境的实际需求。
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from .forest_base import KnowledgeForest
+from .prompt_layout import PromptLayout, STATIC, SESSION, TURN, estimate_tokens
 
 
 class HighQualityFormatter:
@@ -16,6 +17,28 @@ class HighQualityFormatter:
     专门用于生成简洁、实用、高质量的AI Agent提示词。
     """
     
+    # 分段顺序: (层级, 分段名, 标题, 来源知识树(区域名, 树名), 格式化方法); 来源为None的分段由参数给出
+    SECTIONS = [
+        (STATIC, "base_description", None, None, None),
+        (STATIC, "identity", "## Who you are", [("agent_identity", "Your Identity")], "_format_identity"),
+        (STATIC, "ability", "## Ability", [("agent_identity", "Your Capabilities")], "_format_abilities"),
+        (STATIC, "policy", "## Policy", [("agent_identity", "Your Behavior Policy")], "_format_policies"),
+        (STATIC, "rules", "## Rules", [("behavioral_rules", "Rules You Must Follow")], "_format_rules"),
+        (STATIC, "constraints", "## Constraints", [("behavioral_rules", "Your Constraints")], "_format_constraints"),
+        (STATIC, "output_format", "## You output must following format to express your answer:",
+         [("communication", "Your Output Format Requirements")], "_format_output_requirements"),
+        (STATIC, "communication", "## Communication(you must use the correct agent name in the tag)",
+         [("communication", "How to Communicate with Other Agents")], "_format_communication"),
+        (SESSION, "workflow", "## Workflow Guidelines", None, None),
+        (SESSION, "domain_knowledge", "## Domain Knowledge", [("knowledge_context", "Domain Knowledge")], "_format_domain_knowledge"),
+        (SESSION, "background_knowledge", "## Background Knowledge", None, None),
+        (TURN, "current_context", "## Current Context", [("knowledge_context", "Your Current Context")], "_format_current_context"),
+        (TURN, "limitations", "## Limitations", [("behavioral_rules", "Limitations")], "_format_limitations"),
+        (TURN, "memory", "## Memory & Experience",
+         [("knowledge_context", "Memory & History"), ("learning_experience", "Best Practices")], "_format_memory_and_experience"),
+        (TURN, "important_notes", "## Important Notes", None, None),
+    ]
+    
     def __init__(self, forest: KnowledgeForest):
         """
         初始化格式化器
@@ -24,6 +47,10 @@ class HighQualityFormatter:
             forest: 知识森林实例
         """
         self.forest = forest
+        # 分段缓存: 分段名 -> (来源版本或参数内容, 文本, token数)
+        self._sections: Dict[str, Tuple[Any, str, int]] = {}
+        self._layout_cache: Optional[Tuple[Tuple, PromptLayout]] = None
+        self.metrics = {"compiled": 0, "reused": 0, "sections_formatted": 0}
     
     def format_agent_prompt(self, 
                           base_description: str = "",
@@ -42,63 +69,101 @@ class HighQualityFormatter:
         Returns:
             格式化的高质量提示词
         """
-        output_parts = []
-        
-        # 基础描述
-        if base_description:
-            output_parts.append(base_description)
-        
-        # Who you are 部分
-        identity_content = self._format_identity()
-        if identity_content:
-            output_parts.append(f"\n## Who you are\n{identity_content}")
-        
-        # Ability 部分
-        ability_content = self._format_abilities()
-        if ability_content:
-            output_parts.append(f"\n## Ability\n{ability_content}")
-        
-        # Policy 部分
-        policy_content = self._format_policies()
-        if policy_content:
-            output_parts.append(f"\n## Policy\n{policy_content}")
-        
-        # Rules 部分
-        rules_content = self._format_rules()
-        if rules_content:
-            output_parts.append(f"\n## Rules\n{rules_content}")
-        
-        # Constraints 部分
-        constraints_content = self._format_constraints()
-        if constraints_content:
-            output_parts.append(f"\n## Constraints\n{constraints_content}")
-        
-        # Output Format 部分
-        output_format_content = self._format_output_requirements()
-        if output_format_content:
-            output_parts.append(f"\n## You output must following format to express your answer:\n{output_format_content}")
-        
-        # Communication 部分
-        communication_content = self._format_communication()
-        if communication_content:
-            output_parts.append(f"\n## Communication(you must use the correct agent name in the tag)\n{communication_content}")
-        
-        # Context 和其他重要信息
-        context_content = self._format_context_info()
-        if context_content:
-            output_parts.append(context_content)
-        
-        # 添加自定义sections
-        if workflow_section:
-            output_parts.append(f"\n## Workflow Guidelines\n{workflow_section}")
-        
-        if background_knowledge:
-            output_parts.append(f"\n## Background Knowledge\n{background_knowledge}")
-        
-        if things_you_should_know:
-            output_parts.append(f"\n## Important Notes\n{things_you_should_know}")
-        
-        return "\n".join(filter(None, output_parts))
+        return self.layout_agent_prompt(
+            base_description=base_description,
+            workflow_section=workflow_section,
+            background_knowledge=background_knowledge,
+            things_you_should_know=things_you_should_know
+        ).render()
+    
+    def layout_agent_prompt(self, 
+                          base_description: str = "",
+                          workflow_section: str = "",
+                          background_knowledge: str = "",
+                          things_you_should_know: str = "") -> PromptLayout:
+        """
+        生成分层的Agent提示词布局
+        
+        身份、能力、规则、输出格式等静态部分在前, 工作流和领域/背景知识(会话级)在中间,
+        当前上下文、限制、记忆和应知事项(每轮变化)在最后, 以便服务端缓存提示词前缀。
+        
+        每个分段按其来源知识树的版本缓存, 只有来源变化的分段会重新格式化和估算token;
+        所有来源和参数都没有变化时直接返回上一次的布局(调用方不应修改返回的布局)。
+        
+        Args:
+            base_description: 基础描述
+            workflow_section: 工作流部分
+            background_knowledge: 背景知识
+            things_you_should_know: 应知事项
+            
+        Returns:
+            提示词布局
+        """
+        args = {
+            "base_description": base_description,
+            "workflow": workflow_section,
+            "background_knowledge": background_knowledge,
+            "important_notes": things_you_should_know,
+        }
+        key = (tuple(self._source_key(sources) for _, _, _, sources, _ in self.SECTIONS), tuple(args.values()))
+        if self._layout_cache is not None and self._layout_cache[0] == key:
+            self.metrics["reused"] += 1
+            return self._layout_cache[1]
+        
+        layout = PromptLayout()
+        for tier, name, title, sources, formatter in self.SECTIONS:
+            if sources is None:
+                text, tokens = self._argument_section(name, title, args[name])
+            else:
+                text, tokens = self._tree_section(name, title, sources, getattr(self, formatter))
+            layout.add(tier, name, text, tokens)
+        
+        self.metrics["compiled"] += 1
+        self._layout_cache = (key, layout)
+        return layout
+    
+    def _source_key(self, sources: Optional[List[Tuple[str, str]]]) -> Optional[Tuple]:
+        """分段来源知识树的版本(树被替换时id也会变化)"""
+        if sources is None:
+            return None
+        key = []
+        for area_name, tree_name in sources:
+            area = self.forest.get_knowledge_area(area_name)
+            tree = area.get_knowledge_tree(tree_name) if area else None
+            key.append((id(tree), tree.version) if tree else None)
+        return tuple(key)
+    
+    def _tree_section(self, name: str, title: str, sources: List[Tuple[str, str]],
+                      formatter: Callable[[], str]) -> Tuple[str, int]:
+        """由知识树生成的分段, 来源版本不变时复用缓存的文本和token数"""
+        key = self._source_key(sources)
+        cached = self._sections.get(name)
+        if cached is None or cached[0] != key:
+            content = formatter()
+            text = f"{title}\n{content}".strip() if content else ""
+            cached = (key, text, estimate_tokens(text))
+            self._sections[name] = cached
+            self.metrics["sections_formatted"] += 1
+        return cached[1], cached[2]
+    
+    def _argument_section(self, name: str, title: Optional[str], content: str) -> Tuple[str, int]:
+        """由参数直接给出的分段, 内容不变时复用缓存的token数"""
+        cached = self._sections.get(name)
+        if cached is None or cached[0] != content:
+            text = (f"{title}\n{content}" if title else content).strip() if content else ""
+            cached = (content, text, estimate_tokens(text))
+            self._sections[name] = cached
+            self.metrics["sections_formatted"] += 1
+        return cached[1], cached[2]
+    
+    def token_count(self, **kwargs) -> int:
+        """
+        编译后提示词的token数(由缓存的分段token数相加, 不重新估算未变化的部分)
+        
+        Args:
+            kwargs: 与layout_agent_prompt相同的参数
+        """
+        return self.layout_agent_prompt(**kwargs).token_count()
     
     def _format_identity(self) -> str:
         """格式化身份部分"""
@@ -181,30 +246,23 @@ class HighQualityFormatter:
     
     def _format_constraints(self) -> str:
         """格式化约束部分"""
+        return self._format_rules_tree("Your Constraints")
+    
+    def _format_limitations(self) -> str:
+        """格式化限制部分(阻塞、应避免的方法等, 随记忆变化)"""
+        return self._format_rules_tree("Limitations")
+    
+    def _format_rules_tree(self, tree_name: str) -> str:
+        """格式化行为规则区域中的一棵树"""
         rules_area = self.forest.get_knowledge_area("behavioral_rules")
         if not rules_area:
             return ""
         
-        constraint_tree = rules_area.get_knowledge_tree("Your Constraints")
-        limitation_tree = rules_area.get_knowledge_tree("Limitations")
-        
-        constraints = []
-        
-        if constraint_tree and not constraint_tree.is_empty():
-            constraints.extend(constraint_tree.get_knowledge_items())
-        
-        if limitation_tree and not limitation_tree.is_empty():
-            constraints.extend(limitation_tree.get_knowledge_items())
-        
-        if not constraints:
+        tree = rules_area.get_knowledge_tree(tree_name)
+        if not tree or tree.is_empty():
             return ""
         
-        formatted_constraints = []
-        for constraint in constraints:
-            if constraint.strip():
-                formatted_constraints.append(f"- {constraint}")
-        
-        return "\n".join(formatted_constraints)
+        return "\n".join(f"- {item}" for item in tree.get_knowledge_items() if item.strip())
     
     def _format_output_requirements(self) -> str:
         """格式化输出要求部分"""
@@ -266,27 +324,6 @@ class HighQualityFormatter:
         
         return "\n".join(formatted_comms)
     
-    def _format_context_info(self) -> str:
-        """格式化上下文信息"""
-        context_parts = []
-        
-        # Domain Knowledge
-        domain_content = self._format_domain_knowledge()
-        if domain_content:
-            context_parts.append(f"\n## Domain Knowledge\n{domain_content}")
-        
-        # Current Context
-        current_context = self._format_current_context()
-        if current_context:
-            context_parts.append(f"\n## Current Context\n{current_context}")
-        
-        # Memory & Experience
-        memory_content = self._format_memory_and_experience()
-        if memory_content:
-            context_parts.append(f"\n## Memory & Experience\n{memory_content}")
-        
-        return "\n".join(context_parts)
-    
     def _format_domain_knowledge(self) -> str:
         """格式化领域知识"""
         context_area = self.forest.get_knowledge_area("knowledge_context")
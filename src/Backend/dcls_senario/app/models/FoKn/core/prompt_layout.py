@@ -0,0 +1,199 @@
+"""
+提示词布局 - 按变化频率分层排列提示词, 并统计服务端提示词缓存命中
+
+服务端提示词缓存按请求前缀匹配, 前缀中任何一个字节变化都会让后面的内容无法命中。
+这个模块把提示词分成静态、会话、轮次三层, 静态部分始终排在最前面并保持字节稳定。
+backend/utils/prompt_layout.py 与 dcls_senario/app/models/FoKn/core/prompt_layout.py
+内容保持一致, 两边的Agent得到同样的分段、分隔符和消息结构。
+"""
+
+import hashlib
+import math
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 静态: 角色、能力、规则等, 同一个Agent的每次请求都相同
+STATIC = "static"
+# 会话: 工作流、领域知识、历史记忆, 同一会话内很少变化
+SESSION = "session"
+# 轮次: 当前上下文、限制和应知事项, 每次请求都可能变化
+TURN = "turn"
+TIERS = (STATIC, SESSION, TURN)
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算token数: ASCII约4字符一个token, 其余字符(中文等)约一个字符一个token"""
+    if not text:
+        return 0
+    non_ascii = len(text) - len(text.encode("ascii", "ignore"))
+    return math.ceil((len(text) - non_ascii) / 4) + non_ascii
+
+
+def prefix_hash(text: str) -> str:
+    """前缀指纹, 用于发现本应不变的前缀发生了变化"""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()[:12]
+
+
+class PromptLayout:
+    """
+    分层提示词布局
+
+    各层内按添加顺序排列, 同名分段只保留最后一次的内容, 文本去掉首尾空白, 输出顺序固定为
+    静态 -> 会话 -> 轮次, 因此易变内容的增减不会改变前面的部分。每个分段记录自己的token数
+    (可由调用方传入缓存值), 整体token数由各分段相加得到, 不需要重新计算未变化的部分。
+    """
+
+    def __init__(self, separator: str = "\n\n"):
+        """
+        初始化布局
+
+        Args:
+            separator: 分段之间的分隔符
+        """
+        self.separator = separator
+        self._segments: Dict[str, List[Tuple[str, str, int]]] = {tier: [] for tier in TIERS}
+
+    def add(self, tier: str, name: str, text: str, tokens: Optional[int] = None) -> "PromptLayout":
+        """
+        添加(或替换同名)分段, 空内容忽略
+
+        Args:
+            tier: 层级(STATIC / SESSION / TURN)
+            name: 分段名称
+            text: 分段内容
+            tokens: 分段的token数(已缓存时传入, 否则现场估算)
+        """
+        if tier not in self._segments:
+            raise ValueError(f"Unknown prompt tier: {tier}")
+        text = (text or "").strip()
+        if not text:
+            return self
+        segment = (name, text, estimate_tokens(text) if tokens is None else tokens)
+        segments = self._segments[tier]
+        for i, existing in enumerate(segments):
+            if existing[0] == name:
+                segments[i] = segment
+                return self
+        segments.append(segment)
+        return self
+
+    def tier_text(self, tier: str) -> str:
+        """某一层的全部内容"""
+        return self.separator.join(segment[1] for segment in self._segments[tier])
+
+    def token_count(self, tier: Optional[str] = None) -> int:
+        """
+        提示词(或某一层)的token数, 由各分段的token数相加(分隔符按一个token计)
+
+        Args:
+            tier: 层级, 为None时统计整个提示词
+        """
+        segments = [segment for t in ((tier,) if tier else TIERS) for segment in self._segments[t]]
+        return sum(segment[2] for segment in segments) + max(len(segments) - 1, 0)
+
+    def render(self) -> str:
+        """完整提示词(静态 -> 会话 -> 轮次)"""
+        return self.separator.join(filter(None, (self.tier_text(tier) for tier in TIERS)))
+
+    def prefix(self) -> str:
+        """可被服务端缓存的稳定前缀(静态和会话部分)"""
+        return self.separator.join(filter(None, (self.tier_text(tier) for tier in (STATIC, SESSION))))
+
+    def prefix_hash(self) -> str:
+        """稳定前缀的指纹, 用于确认前缀在多次请求之间没有变化"""
+        return prefix_hash(self.prefix())
+
+    def messages(self, role: str = "system") -> List[Dict[str, str]]:
+        """
+        生成消息列表: 稳定前缀一条, 轮次内容一条(为空时省略)
+
+        Returns:
+            聊天消息列表
+        """
+        return [{"role": role, "content": text} for text in (self.prefix(), self.tier_text(TURN)) if text]
+
+
+def _field(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def cached_tokens(usage: Any) -> Optional[int]:
+    """
+    usage中命中服务端提示词缓存的token数
+
+    OpenAI兼容接口: prompt_tokens_details.cached_tokens; DeepSeek: prompt_cache_hit_tokens。
+    服务端没有返回该字段时为None(与"命中0个token"区分)
+    """
+    value = _field(_field(usage, "prompt_tokens_details"), "cached_tokens")
+    if value is None:
+        value = _field(usage, "prompt_cache_hit_tokens")
+    return None if value is None else int(value)
+
+
+class PromptCacheStats:
+    """
+    按Agent统计服务端提示词缓存的命中情况
+
+    记录每次请求的prompt token数和其中命中缓存的token数, 以及稳定前缀的哈希:
+    同一个Agent的前缀哈希变化次数(prefix_changes)越多, 说明前缀越不稳定, 缓存越难命中。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._agents: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, agent: str, usage: Any, prefix_hash: Optional[str] = None) -> None:
+        prompt_tokens = _field(usage, "prompt_tokens")
+        if prompt_tokens is None:
+            return
+        cached = cached_tokens(usage)
+        with self._lock:
+            entry = self._agents.setdefault(agent, {"requests": 0, "reported": 0, "prompt_tokens": 0,
+                                                    "cached_tokens": 0, "prefix_changes": 0, "prefix": None})
+            entry["requests"] += 1
+            entry["prompt_tokens"] += int(prompt_tokens)
+            if cached is not None:
+                entry["reported"] += 1
+                entry["cached_tokens"] += cached
+            if prefix_hash:
+                if entry["prefix"] not in (None, prefix_hash):
+                    entry["prefix_changes"] += 1
+                entry["prefix"] = prefix_hash
+
+    def track(self, stream: Iterable[Any], agent: str, prefix_hash: Optional[str] = None) -> Iterator[Any]:
+        """透传流式响应, 从带usage的(最后一个)chunk中记录缓存命中"""
+        for chunk in stream:
+            usage = getattr(chunk, "usage", None)
+            if usage is not None:
+                self.record(agent, usage, prefix_hash)
+            yield chunk
+
+    @staticmethod
+    def _ratio(cached: int, prompt: int) -> float:
+        return round(cached / prompt, 3) if prompt else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """每个Agent和总体的缓存命中率(cached_tokens / prompt_tokens)"""
+        with self._lock:
+            agents = {name: dict({k: v for k, v in entry.items() if k != "prefix"},
+                                 cached_ratio=self._ratio(entry["cached_tokens"], entry["prompt_tokens"]))
+                      for name, entry in self._agents.items()}
+        prompt = sum(entry["prompt_tokens"] for entry in agents.values())
+        cached = sum(entry["cached_tokens"] for entry in agents.values())
+        return {"agents": agents, "prompt_tokens": prompt, "cached_tokens": cached,
+                "cached_ratio": self._ratio(cached, prompt)}
+
+
+_shared_stats: Optional[PromptCacheStats] = None
+_shared_lock = threading.Lock()
+
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    """进程内共享的缓存命中统计"""
+    global _shared_stats
+    with _shared_lock:
+        if _shared_stats is None:
+            _shared_stats = PromptCacheStats()
+        return _shared_stats
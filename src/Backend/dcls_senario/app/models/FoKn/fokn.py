@@ -8,6 +8,7 @@ while using the new knowledge forest architecture for the core functionality.
 from typing import Dict, Any, List, Set
 from .core import KnowledgeForest, KnowledgeArea
 from .core.high_quality_formatter import HighQualityFormatter
+from .core.prompt_layout import PromptLayout
 from .agent_identity import (
     RoleKnowledgeTree,
     PolicyKnowledgeTree, 
@@ -688,13 +689,34 @@ class FoKn:
         Returns:
             High-quality formatted agent instruction prompt
         """
-        return self._high_quality_formatter.format_agent_prompt(
+        return self.generate_prompt_layout().render()
+    
+    def generate_prompt_layout(self) -> PromptLayout:
+        """
+        Generate the high-quality prompt split into static, per-session and per-turn tiers.
+        
+        The static part (identity, abilities, rules, output format) comes first and stays
+        byte-stable across requests, so provider-side prompt caches can reuse it.
+        
+        Returns:
+            Tiered prompt layout (``render()`` gives the same text as generate_high_quality_prompt)
+        """
+        return self._high_quality_formatter.layout_agent_prompt(
             base_description=self.base_description,
             workflow_section=self.workflow_section,
             background_knowledge=self.background_knowledge,
             things_you_should_know=self.things_you_should_know
         )
     
+    def prompt_token_count(self) -> int:
+        """
+        Estimated token count of the high-quality prompt.
+        
+        Summed from the cached per-section counts, so only sections whose
+        knowledge trees changed since the last call are counted again.
+        """
+        return self.generate_prompt_layout().token_count()
+    
     def __str__(self) -> str:
         """Generate complete agent instruction set."""
         return self.generate_knowledge_output()
@@ -77,7 +77,9 @@ class RequirementKnowledgeTree(StructuredKnowledgeTree):
         Returns:
             Self for method chaining
         """
-        self._required_variables.add(variable_name)
+        if variable_name not in self._required_variables:
+            self._required_variables.add(variable_name)
+            self.touch()
         
         if description or validation_rule:
             req_data = {
@@ -102,7 +104,9 @@ class RequirementKnowledgeTree(StructuredKnowledgeTree):
         Returns:
             Self for method chaining
         """
-        self._optional_variables.add(variable_name)
+        if variable_name not in self._optional_variables:
+            self._optional_variables.add(variable_name)
+            self.touch()
         
         if description or default_value is not None:
             opt_data = {
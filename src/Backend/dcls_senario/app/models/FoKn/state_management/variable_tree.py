@@ -85,7 +85,7 @@ class VariableKnowledgeTree(StructuredKnowledgeTree):
             "description": description,
             "type": var_type
         }
-        return self
+        return self.touch()
     
     def get_variable(self, name: str) -> Any:
         """
@@ -113,6 +113,7 @@ class VariableKnowledgeTree(StructuredKnowledgeTree):
         """
         if name in self._variables:
             self._variables[name]["value"] = value
+            self.touch()
         else:
             self.add_variable(name, value)
         return self
@@ -133,7 +134,7 @@ class VariableKnowledgeTree(StructuredKnowledgeTree):
             "depends_on": depends_on,
             "description": description
         }
-        return self
+        return self.touch()
     
     def add_state_variable(self, name: str, value: Any, description: str = "") -> 'VariableKnowledgeTree':
         """
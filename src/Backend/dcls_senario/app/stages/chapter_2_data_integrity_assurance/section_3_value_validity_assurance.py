@@ -328,13 +328,9 @@ print("Basic invalid value cleaning completed")'''
             + "    if 'Cannot use median strategy with non-numeric data' in str(e):\n"
             + f"        CSV_PATH = '{self.get_full_csv_path()}'\n"
             + f"        OUTPUT_FILE = '{output_file}'\n"
-            + "        from vdstools import DataCleaning\n"
-            + "        import pandas as pd\n"
-            + "        tk = DataCleaning()\n"
-            + "        tk.fill_missing_values(CSV_PATH)\n"
-            + "        tmp_path = CSV_PATH.replace('.csv', '_missing_values_fixed.csv')\n"
-            + "        df_tmp = pd.read_csv(tmp_path)\n"
-            + "        df_tmp.to_csv(OUTPUT_FILE, index=False)\n"
+            + "        from vdstools import CleaningPipeline\n"
+            + "        # Use stable VDS cleaning fallback, written straight to the expected output path\n"
+            + "        CleaningPipeline(CSV_PATH, output_path=OUTPUT_FILE).fill_missing_values().run(raise_errors=True)\n"
             + "    else:\n"
             + "        raise\n"
         )
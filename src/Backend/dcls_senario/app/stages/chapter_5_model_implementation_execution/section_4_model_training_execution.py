@@ -48,12 +48,11 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
-from sklearn.preprocessing import StandardScaler, LabelEncoder, OneHotEncoder
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, OneHotEncoder
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 from sklearn.impute import SimpleImputer
+from vdstools import search_models, ModelStore
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -182,9 +181,13 @@ preprocessing_results'''
         try:
             dataset_info = self.get_variable("dataset_info", {})
             target_variable = dataset_info.get("target_variable", "SalePrice")
+            csv_file_path = dataset_info.get("csv_file_path", self.get_variable("csv_file_path", ""))
+            # shared with the stability chapter so its model store lookups use the same key inputs
+            pipeline_spec = self.get_variable("model_pipeline_spec", {"impute": "median/most_frequent", "encode": "top10_onehot"})
+            self.add_variable("model_pipeline_spec", pipeline_spec)
 
             self.add_text("🤖 **Step 3: Model Training and Evaluation**")
-            self.add_text("Training multiple machine learning models and evaluating their performance...")
+            self.add_text("Searching candidate models and hyperparameters with successive halving, then evaluating the best configuration of each model...")
 
             model_training_code = f'''# Model Training and Evaluation
 print("\\n" + "="*50)
@@ -199,53 +202,43 @@ X_train, X_test, y_train, y_test = train_test_split(
 print(f"Training set size: {{X_train.shape[0]}}")
 print(f"Test set size: {{X_test.shape[0]}}")
 
-# Scale features for linear models
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-
-# Define models to train
-models = {{
-    'Linear Regression': LinearRegression(),
-    'Ridge Regression': Ridge(alpha=1.0),
-    'Lasso Regression': Lasso(alpha=1.0),
-    'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42),
-    'Gradient Boosting': GradientBoostingRegressor(n_estimators=100, random_state=42)
-}}
-
-# Train and evaluate models
-results = {{}}
-print("\\nTraining models...")
-
-for name, model in models.items():
-    print(f"\\nTraining {{name}}...")
-
-    # Use scaled data for linear models, original data for tree-based models
-    if name in ['Linear Regression', 'Ridge Regression', 'Lasso Regression']:
-        X_train_use = X_train_scaled
-        X_test_use = X_test_scaled
-    else:
-        X_train_use = X_train
-        X_test_use = X_test
+# Successive-halving search over candidate models and parameter grids:
+# every configuration starts on a small subsample of each CV fold and only the
+# best third is promoted to the next, larger budget. Linear models are scaled
+# inside their pipelines, so the returned estimators take raw features.
+search = search_models(
+    X_train, y_train,
+    problem_type='regression',
+    scoring='neg_root_mean_squared_error',
+    cv_folds=5,
+    strategy='halving',
+    refit='all',
+    n_jobs=-1,
+    # fitted models are stored by (data, pipeline, model, params, seed) and tagged with this stage,
+    # so the stability chapter loads them for the same training split instead of refitting
+    model_store=ModelStore(),
+    pipeline_spec={pipeline_spec!r},
+    source="{csv_file_path}",
+    store_tags={{'stage': 'model_training'}}
+)
 
-    # Train the model
-    model.fit(X_train_use, y_train)
+print("\\nSearch leaderboard:")
+print(search['leaderboard'].head(10))
+print(f"\\n{{search['n_configs']}} configurations, {{search['n_fits']}} fits in {{search['seconds']:.1f}}s")
 
-    # Make predictions
-    y_pred_train = model.predict(X_train_use)
-    y_pred_test = model.predict(X_test_use)
+# Evaluate the best configuration of every model family on the test set
+results = {{}}
+for name, info in search['best_per_model'].items():
+    model = info['estimator']
+    y_pred_train = model.predict(X_train)
+    y_pred_test = model.predict(X_test)
 
-    # Calculate metrics
     train_rmse = np.sqrt(mean_squared_error(y_train, y_pred_train))
     test_rmse = np.sqrt(mean_squared_error(y_test, y_pred_test))
     train_r2 = r2_score(y_train, y_pred_train)
     test_r2 = r2_score(y_test, y_pred_test)
     test_mae = mean_absolute_error(y_test, y_pred_test)
-
-    # Cross-validation score
-    cv_scores = cross_val_score(model, X_train_use, y_train, cv=5,
-                               scoring='neg_root_mean_squared_error')
-    cv_rmse = -cv_scores.mean()
+    cv_rmse = -info['score']
 
     results[name] = {{
         'train_rmse': train_rmse,
@@ -254,13 +247,15 @@ for name, model in models.items():
         'test_r2': test_r2,
         'test_mae': test_mae,
         'cv_rmse': cv_rmse,
+        'params': info['params'],
         'model': model
     }}
 
+    print(f"\\n{{name}} {{info['params']}}")
     print(f"  Train RMSE: {{train_rmse:.2f}}")
     print(f"  Test RMSE: {{test_rmse:.2f}}")
     print(f"  Test R²: {{test_r2:.4f}}")
-    print(f"  CV RMSE: {{cv_rmse:.2f}}")
+    print(f"  CV RMSE (budget {{info['resource']}} rows): {{cv_rmse:.2f}}")
 
 print("\\n✅ Model training completed!")
 results'''
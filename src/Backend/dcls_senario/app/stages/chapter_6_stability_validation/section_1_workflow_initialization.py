@@ -533,25 +533,28 @@ print(result)'''
             return self.end_event()
     
     def _generate_fallback_variations_code(self, csv_file_path, variations):
-        """Generate fallback code for dataset variations"""
+        """Generate fallback code for dataset variations (written as lazy *.variation.json specs)"""
         code = f'''import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
-from sklearn.impute import SimpleImputer
-import os
+from vdstools import create_variation_spec, save_variation_spec
 
 # Load original dataset
 print("Loading original dataset for variation generation...")
 original_data = pd.read_csv("{csv_file_path}")
 print(f"Original dataset shape: {{original_data.shape}}")
 
-# Create directory for dataset variations
+# Variations are saved as small specs referencing the original dataset, not as full copies
 variations_dir = "stability_variations"
-os.makedirs(variations_dir, exist_ok=True)
+numeric_cols = original_data.select_dtypes(include=[np.number]).columns.tolist()
+shape = [int(original_data.shape[0]), int(original_data.shape[1])]
 
 # Initialize variation results
 variation_results = []
 
+def add_variation(name, transforms):
+    spec = create_variation_spec("{csv_file_path}", transforms, name=name, shape=shape)
+    variation_results.append({{"name": name, "path": save_variation_spec(spec, variations_dir), "shape": shape}})
+
 # Generate dataset variations
 print("\\n=== Generating Dataset Variations for Stability Testing ===")
 '''
@@ -565,49 +568,31 @@ print("\\n=== Generating Dataset Variations for Stability Testing ===")
                     code += f'''
 # {variation_name}: Standard scaling
 print("Creating {variation_name}...")
-data_std = original_data.copy()
-scaler_std = StandardScaler()
-numeric_cols = data_std.select_dtypes(include=[np.number]).columns
-data_std[numeric_cols] = scaler_std.fit_transform(data_std[numeric_cols])
-std_path = os.path.join(variations_dir, "{variation_name}.csv")
-data_std.to_csv(std_path, index=False)
-variation_results.append({{"variation": "{variation_name}", "path": std_path, "shape": data_std.shape}})
+add_variation("{variation_name}", [{{"op": "standard_scale", "columns": numeric_cols}}])
 '''
                 elif "MinMax" in variation_name:
                     code += f'''
 # {variation_name}: MinMax scaling
 print("Creating {variation_name}...")
-data_minmax = original_data.copy()
-scaler_minmax = MinMaxScaler()
-numeric_cols = data_minmax.select_dtypes(include=[np.number]).columns
-data_minmax[numeric_cols] = scaler_minmax.fit_transform(data_minmax[numeric_cols])
-minmax_path = os.path.join(variations_dir, "{variation_name}.csv")
-data_minmax.to_csv(minmax_path, index=False)
-variation_results.append({{"variation": "{variation_name}", "path": minmax_path, "shape": data_minmax.shape}})
+add_variation("{variation_name}", [{{"op": "minmax_scale", "columns": numeric_cols}}])
 '''
                 elif "Imputation" in variation_name:
                     strategy = "mean" if "Mean" in variation_name else "median"
                     code += f'''
 # {variation_name}: {strategy.title()} imputation
 print("Creating {variation_name}...")
-data_imputed = original_data.copy()
-imputer = SimpleImputer(strategy='{strategy}')
-numeric_cols = data_imputed.select_dtypes(include=[np.number]).columns
-data_imputed[numeric_cols] = imputer.fit_transform(data_imputed[numeric_cols])
-imputed_path = os.path.join(variations_dir, "{variation_name}.csv")
-data_imputed.to_csv(imputed_path, index=False)
-variation_results.append({{"variation": "{variation_name}", "path": imputed_path, "shape": data_imputed.shape}})
+add_variation("{variation_name}", [{{"op": "impute", "columns": numeric_cols, "strategy": "{strategy}"}}])
 '''
         
         code += '''
 # Summary of created variations
 print("\\n=== Dataset Variation Generation Results ===")
 for result in variation_results:
-    print(f"✅ {result['variation']}: {result['shape'][0]} rows × {result['shape'][1]} columns")
-    print(f"   📁 Saved to: {result['path']}")
+    print(f"✅ {result['name']}: {result['shape'][0]} rows × {result['shape'][1]} columns")
+    print(f"   📁 Spec saved to: {result['path']}")
 
 print(f"\\n🎉 Successfully created {len(variation_results)} dataset variations for stability testing")
-variation_results'''
+{"created": variation_results, "output_dir": variations_dir}'''
         
         return code
     
@@ -616,7 +601,7 @@ variation_results'''
         return f'''# Basic dataset variation generation (fallback)
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
+from vdstools import create_variation_spec, save_variation_spec
 
 print("Basic dataset variation generation due to error: {error_msg}")
 
@@ -624,18 +609,15 @@ print("Basic dataset variation generation due to error: {error_msg}")
 original_data = pd.read_csv("{csv_file_path}")
 print(f"Original dataset shape: {{original_data.shape}}")
 
-# Create basic variation with standard scaling
-data_scaled = original_data.copy()
-scaler = StandardScaler()
-numeric_cols = data_scaled.select_dtypes(include=[np.number]).columns
-if len(numeric_cols) > 0:
-    data_scaled[numeric_cols] = scaler.fit_transform(data_scaled[numeric_cols])
-
-# Save basic variation
-data_scaled.to_csv("basic_stability_variation.csv", index=False)
-print("✅ Created basic stability variation: basic_stability_variation.csv")
+# Create basic variation with standard scaling, saved as a spec referencing the original dataset
+numeric_cols = original_data.select_dtypes(include=[np.number]).columns.tolist()
+shape = [int(original_data.shape[0]), int(original_data.shape[1])]
+spec = create_variation_spec("{csv_file_path}", [{{"op": "standard_scale", "columns": numeric_cols}}],
+                             name="basic_stability_variation", shape=shape)
+spec_path = save_variation_spec(spec, "stability_variations")
+print(f"✅ Created basic stability variation: {{spec_path}}")
 
-"Basic variation created successfully"'''
+{{"created": [{{"name": "basic_stability_variation", "path": spec_path, "shape": shape}}], "output_dir": "stability_variations"}}'''
     
     @finnish("variations_code_generated") 
     def variations_code_generated(self):
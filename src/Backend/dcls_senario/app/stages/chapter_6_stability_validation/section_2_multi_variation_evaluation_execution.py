@@ -31,6 +31,8 @@ class MultiVariationEvaluationExecution(Behavior):
             csv_file_path = self.get_variable("csv_file_path", "")
             target_variable = self.get_variable("target_variable", "SalePrice")
             problem_name = self.get_variable("problem_name", "Model Stability Validation")
+            # same pipeline spec as the model training chapter, so its stored fits are found
+            pipeline_spec = self.get_variable("model_pipeline_spec", {"impute": "median/most_frequent", "encode": "top10_onehot"})
 
             if not csv_file_path:
                 return self.conclusion("no_data_path", {
@@ -51,6 +53,7 @@ from sklearn.linear_model import LinearRegression, Ridge, Lasso
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.impute import SimpleImputer
+from vdstools import ModelStore, data_fingerprint
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
@@ -89,7 +92,13 @@ if categorical_columns:
 else:
     X_encoded = X.copy()
 
-print(f"Processed features shape: {{X_encoded.shape}}")'''
+print(f"Processed features shape: {{X_encoded.shape}}")
+
+# Fitted models are shared with the other chapters through the notebook's model store:
+# a fit with the same data, pipeline, model, params and seed is loaded instead of recomputed
+model_store = ModelStore()
+PIPELINE_SPEC = {pipeline_spec!r}
+DATA_SOURCE = "{csv_file_path}"'''
 
             self.add_code(stability_code)
 
@@ -169,6 +178,25 @@ print("\\n" + "="*50)
 print("ROBUSTNESS TESTING")
 print("="*50)
 
+# Test 0: models from the model training chapter, loaded from the model store (no refit)
+print("\\n🧪 Test 0: Holdout Stability of the Trained Models")
+X_train_full, X_test_full, y_train_full, y_test_full = train_test_split(
+    X_encoded, y, test_size=0.2, random_state=42
+)
+trained_models = model_store.load(data_fingerprint(X_train_full, y_train_full), PIPELINE_SPEC, stage='model_training')
+trained_model_stability = {{}}
+bootstrap_rng = np.random.RandomState(42)
+for model_name, fitted in trained_models.items():
+    rmse_samples = []
+    for _ in range(20):
+        idx = bootstrap_rng.randint(0, len(X_test_full), len(X_test_full))
+        y_pred = fitted.predict(X_test_full.iloc[idx])
+        rmse_samples.append(np.sqrt(mean_squared_error(y_test_full.iloc[idx], y_pred)))
+    trained_model_stability[model_name] = {{'mean_rmse': float(np.mean(rmse_samples)), 'std_rmse': float(np.std(rmse_samples))}}
+    print(f"   {{model_name}}: holdout RMSE = {{np.mean(rmse_samples):.2f}} ± {{np.std(rmse_samples):.2f}} (20 bootstrap samples)")
+if not trained_models:
+    print("   No stored models from the model training chapter for this data; skipped")
+
 # Test 1: Performance on different data subsets
 print("\\n🧪 Test 1: Performance on Different Data Subsets")
 subset_sizes = [0.5, 0.7, 0.9]  # Different training set sizes
@@ -191,8 +219,8 @@ for model_name, model in models.items():
             X_subset, y_subset, test_size=0.2, random_state=42
         )
 
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
+        fitted = model_store.fit(model, X_train, y_train, pipeline_spec=PIPELINE_SPEC, source=DATA_SOURCE)
+        y_pred = fitted.predict(X_test)
 
         rmse = np.sqrt(mean_squared_error(y_test, y_pred))
         r2 = r2_score(y_test, y_pred)
@@ -211,8 +239,8 @@ rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
 # Multiple runs with different random states
 importance_stability = []
 for seed in [42, 123, 456, 789, 999]:
-    rf_temp = RandomForestRegressor(n_estimators=100, random_state=seed)
-    rf_temp.fit(X_encoded, y)
+    rf_temp = model_store.fit(RandomForestRegressor(n_estimators=100, random_state=seed), X_encoded, y,
+                              pipeline_spec=PIPELINE_SPEC, seed=seed, source=DATA_SOURCE)
     importance_stability.append(rf_temp.feature_importances_)
 
 importance_stability = np.array(importance_stability)
@@ -251,6 +279,7 @@ print(f"   Stability Score: {{stability_scores[most_stable_model]:.4f}}")
 stability_validation_results = {{
     'cv_results': cv_results,
     'robustness_results': robustness_results,
+    'trained_model_stability': trained_model_stability,
     'stability_scores': stability_scores,
     'most_stable_model': most_stable_model,
     'validation_completed': True
@@ -262,6 +291,7 @@ print(f"   - Most stable model: {{most_stable_model}}")
 print(f"   - Stability score: {{stability_scores[most_stable_model]:.4f}}")
 print(f"   - All models tested across multiple conditions")
 print(f"   - Robustness validated on different data subsets")
+print(f"   - Model store: {{model_store.hits}} fits reused, {{model_store.misses}} computed")
 
 stability_validation_results'''
 
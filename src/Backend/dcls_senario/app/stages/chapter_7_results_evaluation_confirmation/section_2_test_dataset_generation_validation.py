@@ -382,6 +382,7 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.impute import SimpleImputer
+from vdstools import create_variation_spec, save_variation_spec
 import os
 import warnings
 warnings.filterwarnings('ignore')
@@ -467,8 +468,11 @@ if "Independent_Test" in test_datasets:
             scaler = StandardScaler()
             test_scaled[numeric_cols] = scaler.fit_transform(test_scaled[numeric_cols])
             
-            scaled_path = os.path.join(test_datasets_dir, "test_standardscaled.csv")
-            test_scaled.to_csv(scaled_path, index=False)
+            # Store a lazy variation spec (base test set + transform) instead of a full copy
+            scaled_path = save_variation_spec(create_variation_spec(
+                test_path, [{{"op": "standard_scale", "columns": numeric_cols}}],
+                name="test_standardscaled", shape=list(test_scaled.shape)
+            ), test_datasets_dir)
             test_datasets["StandardScaled_Test"] = test_scaled
             
             test_generation_results.append({{
@@ -502,8 +506,10 @@ if "Independent_Test" in test_datasets:
             scaler = MinMaxScaler()
             test_minmax[numeric_cols] = scaler.fit_transform(test_minmax[numeric_cols])
             
-            minmax_path = os.path.join(test_datasets_dir, "test_minmaxscaled.csv")
-            test_minmax.to_csv(minmax_path, index=False)
+            minmax_path = save_variation_spec(create_variation_spec(
+                test_path, [{{"op": "minmax_scale", "columns": numeric_cols}}],
+                name="test_minmaxscaled", shape=list(test_minmax.shape)
+            ), test_datasets_dir)
             test_datasets["MinMaxScaled_Test"] = test_minmax
             
             test_generation_results.append({{
@@ -544,8 +550,13 @@ if "Independent_Test" in test_datasets:
             imputer = SimpleImputer(strategy='mean')
             test_imputed[numeric_cols] = imputer.fit_transform(test_imputed[numeric_cols])
             
-            imputed_path = os.path.join(test_datasets_dir, "test_meanimputed.csv")
-            test_imputed.to_csv(imputed_path, index=False)
+            imputed_path = save_variation_spec(create_variation_spec(
+                test_path, [
+                    {{"op": "inject_missing", "columns": numeric_cols, "fraction": 0.05, "max_columns": 2, "seed": 42}},
+                    {{"op": "impute", "columns": numeric_cols, "strategy": "mean"}}
+                ],
+                name="test_meanimputed", shape=list(test_imputed.shape)
+            ), test_datasets_dir)
             test_datasets["MeanImputed_Test"] = test_imputed
             
             test_generation_results.append({{
@@ -1,6 +1,8 @@
 from openai import OpenAI
 import os
 import logging
+import asyncio
+from typing import AsyncGenerator, Any, Dict, List, Optional
 from .parallel import ParallelProcessor
 import dotenv
 
@@ -10,7 +12,15 @@ dotenv.load_dotenv()
 logging.getLogger("openai").setLevel(logging.ERROR)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+def _rejects_stream_options(error: BaseException) -> bool:
+    """Whether an API error says the provider does not support stream_options."""
+    return "stream_options" in str(error) or "include_usage" in str(error)
+
+
 class Oracle(ParallelProcessor):
+    # (base_url, model) pairs whose provider rejected stream_options; streamed without usage afterwards
+    _stream_usage_unsupported = set()
+
     # enum for model names
     SUPPORTED_MODELS = {
         "doubao-1-5-lite-32k-250115": 32768,
@@ -25,6 +35,26 @@ class Oracle(ParallelProcessor):
         self.apikey = os.environ.get("OPENAI_API_KEY") if apikey is None else apikey
         self.base_url = os.environ.get("BASE_URL") if base_url is None else base_url
         self.client = OpenAI(api_key=self.apikey, base_url=self.base_url)
+        # token usage of the last streamed completion (None when the provider reports none)
+        self.last_usage = None
+
+    def create_stream(self, model: str, messages: List[Dict[str, Any]], **params):
+        """
+        Open a chat completion stream that reports token usage in its last chunk
+        (needed to measure provider-side prompt cache hits). Falls back to a plain
+        stream when the provider rejects stream_options.
+        """
+        key = (self.base_url, model)
+        if key not in self._stream_usage_unsupported:
+            try:
+                return self.client.chat.completions.create(
+                    model=model, messages=messages, stream=True,
+                    stream_options={"include_usage": True}, **params)
+            except Exception as e:
+                if not _rejects_stream_options(e):
+                    raise
+                self._stream_usage_unsupported.add(key)
+        return self.client.chat.completions.create(model=model, messages=messages, stream=True, **params)
     
     def get_model_info(self):
         return self.client.models.retrieve(self.model)
@@ -93,6 +123,41 @@ class Oracle(ParallelProcessor):
                 "answer": f"QUERY_FAILED:{e}"
             }
     
+    async def query_stream_async(self, prompt_sys: str, prompt_user: str,
+                                 prompt_context: Optional[str] = None) -> AsyncGenerator[str, None]:
+        """
+        Async query the model with streaming response; the usage of the stream is kept in ``last_usage``.
+        Args:
+            prompt_sys (str): Stable system prompt (kept first so the provider can cache it).
+            prompt_user (str): User prompt.
+            prompt_context (str): Volatile system context sent after the stable system prompt.
+        Yields:
+            str: Streaming response chunks.
+        """
+        try:
+            messages = [{"role": "system", "content": prompt_sys}]
+            if prompt_context:
+                messages.append({"role": "system", "content": prompt_context})
+            messages.append({"role": "user", "content": prompt_user})
+
+            # Create streaming request - note: this is synchronous in OpenAI SDK
+            self.last_usage = None
+            stream = self.create_stream(self._check_token_limits(prompt_sys, prompt_user, self.model), messages)
+
+            # Process stream chunks - use regular for loop, not async for
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    self.last_usage = chunk.usage
+                if chunk.choices and len(chunk.choices) > 0:
+                    delta = chunk.choices[0].delta
+                    if delta and delta.content is not None:
+                        yield delta.content
+                        # Allow other coroutines to run
+                        await asyncio.sleep(0.001)
+
+        except Exception as e:
+            yield f"ASYNC_STREAM_ERROR: {str(e)}"
+    
     def query_all(self, prompt_sys, prompt_user_all, workers=None, temp=0.0, top_p=0.9, query_key_list=[], batch_size=10, max_retries=2, timeout=3000, **kwargs):
         """
         Query all prompts in parallel using ThreadPoolExecutor with optimized performance.
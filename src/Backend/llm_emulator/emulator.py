@@ -0,0 +1,211 @@
+"""
+LLM模拟器 - 回放录制的会话或合成回复
+
+录制文件由Oracle的录制模式(ORACLE_CAPTURE_PATH)生成, 每行一次上游调用:
+model / messages / params / response / chunks([[偏移秒数, 文本], ...]) / ttft / duration / usage。
+回放时按 模型+消息 -> 仅消息 -> 最后一条用户消息 的顺序匹配录制记录, 同一请求有多条记录时轮流使用;
+找不到匹配或处于合成模式时, 按配置的首token延迟(TTFT)和每秒token数(TPS)合成回复。
+提示词token计数探测(请求头X-Oracle-Probe: 1, 录制记录中"probe": true)不参与回复匹配,
+立即返回录制的usage(没有录制时按字符数估算), 不会按合成节奏等待。
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+REPLAY = "replay"
+SYNTHETIC = "synthetic"
+PROBE = "probe"
+# 标记提示词token计数探测请求的请求头(与Oracle的session_capture.PROBE_HEADER一致)
+PROBE_HEADER = "X-Oracle-Probe"
+# 合成回复按约4个字符一个token切分
+CHARS_PER_TOKEN = 4
+SYNTHETIC_SENTENCE = "This is a synthetic response from the local LLM emulator. "
+
+
+def _content_text(content: Any) -> str:
+    """消息内容统一为文本(多模态消息只取文本部分)"""
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content if isinstance(content, str) else ""
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def request_keys(model: str, messages: List[Dict[str, Any]]) -> List[str]:
+    """请求的匹配键, 从精确到宽松: 模型+消息, 仅消息, 最后一条用户消息"""
+    normalized = [[m.get("role"), _content_text(m.get("content"))] for m in messages]
+    last_user = next((content for role, content in reversed(normalized) if role == "user"), None)
+    keys = [_digest(["full", model, normalized]), _digest(["messages", normalized])]
+    if last_user is not None:
+        keys.append(_digest(["user", last_user]))
+    return keys
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def split_tokens(text: str) -> List[str]:
+    return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+
+class LLMEmulator:
+    """
+    本地LLM模拟器
+
+    plan()为一次请求给出完整的回复计划(文本、带时间偏移的chunk、usage), 由服务层按偏移发送,
+    因此同一份逻辑同时支持流式和非流式接口。
+    """
+
+    def __init__(self, mode: str = REPLAY, ttft: float = 0.5, tps: float = 50.0, speed: float = 1.0,
+                 synthetic_tokens: int = 200):
+        """
+        初始化模拟器
+
+        Args:
+            mode: replay(优先回放录制记录, 无匹配时合成) 或 synthetic(始终合成)
+            ttft: 合成回复的首token延迟(秒)
+            tps: 合成回复每秒输出的token数
+            speed: 回放速度倍数(2表示按原始节奏的两倍速回放)
+            synthetic_tokens: 合成回复的默认token数(请求带max_tokens时取较小值)
+        """
+        if mode not in (REPLAY, SYNTHETIC):
+            raise ValueError(f"Unknown emulator mode: {mode}")
+        self.mode = mode
+        self.ttft = ttft
+        self.tps = tps
+        self.speed = speed if speed > 0 else 1.0
+        self.synthetic_tokens = synthetic_tokens
+        self._index: Dict[str, List[Dict[str, Any]]] = {}
+        # 探测请求的录制usage, 以模型+消息的精确键索引
+        self._probes: Dict[str, Dict[str, Any]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._metrics = {"recordings": 0, "replayed": 0, "synthesized": 0, "misses": 0, "probes": 0}
+
+    def load(self, path: str) -> int:
+        """
+        加载录制文件(JSONL文件或包含*.jsonl的目录)
+
+        Returns:
+            加载的记录数
+        """
+        files = [path]
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".jsonl"))
+        loaded = 0
+        for file in files:
+            with open(file, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.add(record)
+                    loaded += 1
+        return loaded
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """登记一条录制记录, 以它的每个匹配键建立索引; 探测记录单独登记"""
+        keys = request_keys(record.get("model", ""), record.get("messages") or [])
+        with self._lock:
+            if record.get("probe"):
+                if record.get("usage"):
+                    self._probes[keys[0]] = record["usage"]
+            else:
+                for key in keys:
+                    self._index.setdefault(key, []).append(record)
+            self._metrics["recordings"] += 1
+
+    def match(self, model: str, messages: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """最精确的匹配记录, 同一键有多条记录时轮流返回"""
+        with self._lock:
+            for key in request_keys(model, messages):
+                records = self._index.get(key)
+                if records:
+                    cursor = self._cursor.get(key, 0)
+                    self._cursor[key] = cursor + 1
+                    return records[cursor % len(records)]
+        return None
+
+    def plan(self, model: str, messages: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None,
+             probe: bool = False) -> Dict[str, Any]:
+        """
+        生成一次请求的回复计划
+
+        Args:
+            probe: 是否为提示词token计数探测; 探测不消耗录制记录的轮转, 立即返回空回复和usage
+
+        Returns:
+            {"source": replay/synthetic/probe, "text": 回复文本, "chunks": [(偏移秒数, 文本), ...], "usage": usage}
+        """
+        params = params or {}
+        if probe:
+            return self._probe_plan(model, messages)
+        record = self.match(model, messages) if self.mode == REPLAY else None
+        with self._lock:
+            if self.mode == REPLAY and record is None:
+                self._metrics["misses"] += 1
+            self._metrics["replayed" if record is not None else "synthesized"] += 1
+        if record is not None:
+            text, chunks = self._replay_chunks(record)
+            source = REPLAY
+        else:
+            text, chunks = self._synthetic_chunks(params)
+            source = SYNTHETIC
+        prompt_tokens = sum(estimate_tokens(_content_text(m.get("content"))) for m in messages)
+        completion_tokens = estimate_tokens(text)
+        usage = (record or {}).get("usage") or {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        return {"source": source, "text": text, "chunks": chunks, "usage": usage}
+
+    def _probe_plan(self, model: str, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        key = request_keys(model, messages)[0]
+        with self._lock:
+            self._metrics["probes"] += 1
+            usage = self._probes.get(key)
+        if usage is None:
+            prompt_tokens = sum(estimate_tokens(_content_text(m.get("content"))) for m in messages)
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": 0, "total_tokens": prompt_tokens}
+        return {"source": PROBE, "text": "", "chunks": [], "usage": usage}
+
+    def _replay_chunks(self, record: Dict[str, Any]) -> Tuple[str, List[Tuple[float, str]]]:
+        """按录制时的偏移回放; 非流式录制只有总耗时, token均匀分布在这段时间内"""
+        text = record.get("response") or ""
+        if record.get("chunks"):
+            chunks = [(float(offset), piece) for offset, piece in record["chunks"]]
+        else:
+            pieces = split_tokens(text) or [""]
+            duration = float(record.get("duration") or 0.0)
+            chunks = [(duration * (i + 1) / len(pieces), piece) for i, piece in enumerate(pieces)]
+        return text, [(offset / self.speed, piece) for offset, piece in chunks]
+
+    def _synthetic_chunks(self, params: Dict[str, Any]) -> Tuple[str, List[Tuple[float, str]]]:
+        """按TTFT和TPS合成回复; 要求JSON输出时返回空对象"""
+        response_format = params.get("response_format") or {}
+        if response_format.get("type") in ("json_object", "json_schema"):
+            text = "{}"
+        else:
+            tokens = self.synthetic_tokens
+            if params.get("max_tokens"):
+                tokens = min(tokens, int(params["max_tokens"]))
+            length = tokens * CHARS_PER_TOKEN
+            text = (SYNTHETIC_SENTENCE * (length // len(SYNTHETIC_SENTENCE) + 1))[:length]
+        interval = 1.0 / self.tps if self.tps > 0 else 0.0
+        return text, [(self.ttft + i * interval, piece) for i, piece in enumerate(split_tokens(text))]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._metrics, mode=self.mode, ttft=self.ttft, tps=self.tps, speed=self.speed)
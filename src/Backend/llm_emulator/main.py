@@ -0,0 +1,122 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+import uvicorn
+
+from emulator import PROBE_HEADER, LLMEmulator
+
+# 配置日志
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("llm_emulator")
+
+# 模拟器配置: 录制文件(或目录)、模式、合成回复的首token延迟和每秒token数、回放速度
+emulator = LLMEmulator(
+    mode=os.environ.get("LLM_EMULATOR_MODE", "replay"),
+    ttft=float(os.environ.get("LLM_EMULATOR_TTFT", "0.5")),
+    tps=float(os.environ.get("LLM_EMULATOR_TPS", "50")),
+    speed=float(os.environ.get("LLM_EMULATOR_SPEED", "1.0")),
+    synthetic_tokens=int(os.environ.get("LLM_EMULATOR_TOKENS", "200")),
+)
+recordings = os.environ.get("LLM_EMULATOR_RECORDINGS")
+if recordings and os.path.exists(recordings):
+    logger.info(f"Loaded {emulator.load(recordings)} recorded calls from {recordings}")
+
+app = FastAPI(title="LLM模拟器", description="兼容OpenAI chat completions协议的本地LLM模拟器, 用于离线基准测试和压测")
+
+# 配置CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+async def _sleep_until(start: float, offset: float) -> None:
+    delay = start + offset - time.monotonic()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+def _chunk(completion_id: str, created: int, model: str, delta: Dict[str, Any], finish_reason=None) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+async def _stream(plan: Dict[str, Any], model: str, include_usage: bool, start: float):
+    """按计划中的时间偏移逐个发送SSE chunk"""
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    yield _chunk(completion_id, created, model, {"role": "assistant", "content": ""})
+    for offset, piece in plan["chunks"]:
+        await _sleep_until(start, offset)
+        yield _chunk(completion_id, created, model, {"content": piece})
+    yield _chunk(completion_id, created, model, {}, "stop")
+    if include_usage:
+        payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                   "model": model, "choices": [], "usage": plan["usage"]}
+        yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    start = time.monotonic()
+    body = await request.json()
+    model = body.get("model", "emulator")
+    # token计数探测(Oracle带PROBE_HEADER发出)立即返回, chunks为空
+    probe = request.headers.get(PROBE_HEADER) == "1"
+    plan = emulator.plan(model, body.get("messages") or [], body, probe=probe)
+    headers = {"X-Emulator-Source": plan["source"]}
+
+    if body.get("stream"):
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        return StreamingResponse(_stream(plan, model, include_usage, start),
+                                 media_type="text/event-stream", headers=headers)
+
+    # 非流式: 等到最后一个token的时间点再一次性返回
+    if plan["chunks"]:
+        await _sleep_until(start, plan["chunks"][-1][0])
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": plan["text"]}, "finish_reason": "stop"}],
+        "usage": plan["usage"],
+    }
+
+
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "emulator", "object": "model", "owned_by": "llm_emulator"}]}
+
+
+@app.get("/v1/emulator/stats")
+async def emulator_stats():
+    """回放/合成次数和未匹配到录制记录的次数"""
+    return emulator.stats()
+
+
+@app.get("/v2/health")
+async def health_check():
+    return {"status": "ok", "message": "LLM模拟器正常运行"}
+
+if __name__ == "__main__":
+    logger.info("服务地址: http://0.0.0.0:38600 (将BASE_URL设置为 http://localhost:38600/v1)")
+    uvicorn.run("main:app", host="0.0.0.0", port=38600, reload=True)
@@ -1,8 +1,8 @@
 from DCLSAgents.utils.oracle import Oracle
 from DCLSAgents.utils.logger import ModernLogger
-from typing import List
+from DCLSAgents.utils.json_repair import JSONRepairError, parse_json
+from typing import Any, Dict, List, Optional
 import re
-import json
 
 class BaseAgent(ModernLogger):
     def __init__(self, name:str, model:str="", system_prompt:str=None):
@@ -36,46 +36,14 @@ class BaseAgent(ModernLogger):
         responses = self.model.query_all(self.system_prompt, questions)
         return responses
     
-    def _parse_json(self, response):
-        """Parse JSON data from LLM response with multiple fallback strategies"""
+    def _parse_json(self, response, schema: Optional[Dict[str, Any]] = None):
+        """Parse JSON data from LLM response, repairing fences, trailing commas and truncation locally"""
         self.info(f"Parsing JSON from response: {response}")
-        
-        # Strategy 1: Try standard markdown code block format
-        code_match = re.search(r"```json\n(.*?)\n```", response, re.DOTALL)
-        if code_match:
-            try:
-                json_str = code_match.group(1).strip()
-                return json.loads(json_str)
-            except json.JSONDecodeError as e:
-                self.error(f"JSON decode error in markdown block: {e}")
-        
-        # Strategy 2: Try without markdown formatting (direct JSON)
         try:
-            # Remove potential markdown artifacts and whitespace
-            cleaned_response = response.strip()
-            if cleaned_response.startswith('```json'):
-                cleaned_response = cleaned_response[7:]
-            if cleaned_response.endswith('```'):
-                cleaned_response = cleaned_response[:-3]
-            cleaned_response = cleaned_response.strip()
-            
-            return json.loads(cleaned_response)
-        except json.JSONDecodeError:
-            self.error(f"JSON decode error in markdown block: {e}")
-        
-        # Strategy 3: Extract JSON-like content using regex
-        json_pattern = r'\{.*\}'
-        json_match = re.search(json_pattern, response, re.DOTALL)
-        if json_match:
-            try:
-                json_str = json_match.group(0)
-                return json.loads(json_str)
-            except json.JSONDecodeError:
-                self.error(f"JSON decode error in regex: {e}")
-        
-        # All strategies failed
-        self.error(f"Failed to parse JSON from response using all strategies. Response: {response[:500]}...")
-        return None
+            return parse_json(response, schema)
+        except JSONRepairError as e:
+            self.error(f"Failed to parse JSON from response: {e}. Response: {response[:500]}...")
+            return None
     
     def _parse_code(self, response):
         code_match = re.search(r"```python\n(.*)\n```", response, re.DOTALL)
@@ -90,29 +58,22 @@ class BaseAgent(ModernLogger):
             response = self.answer(question)
         return self._parse_code(response)
     
-    def analyzing(self, question:str) -> str:
+    def analyzing(self, question:str, schema: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Ask for a JSON answer. Malformed JSON is repaired locally, so the call is repeated only
+        when the query fails or the content itself is wrong (no JSON value, or it does not match schema).
+        """
         max_retries = 3
         for attempt in range(max_retries):
-            response = self.answer(question)
-            
-            # If query failed, try again
-            if response.startswith('QUERY_FAILED:'):
-                self.warning(f"Query failed on attempt {attempt + 1}: {response}")
-                if attempt < max_retries - 1:
-                    continue
-                else:
+            try:
+                return self.model.query_json(self.system_prompt, question, schema=schema)
+            except JSONRepairError as e:
+                self.warning(f"JSON response unusable on attempt {attempt + 1}: {e}")
+            except Exception as e:
+                self.warning(f"Query failed on attempt {attempt + 1}: {e}")
+                if attempt == max_retries - 1:
                     self.error(f"All {max_retries} query attempts failed")
-                    raise ValueError(f"Model query failed after {max_retries} attempts: {response}")
-            
-            # Try to parse JSON response
-            parsed_result = self._parse_json(response)
-            if parsed_result is not None:
-                return parsed_result
-            
-            # If JSON parsing failed, log and retry
-            self.warning(f"JSON parsing failed on attempt {attempt + 1}")
-            if attempt < max_retries - 1:
-                continue
+                    raise ValueError(f"Model query failed after {max_retries} attempts: {e}")
         
         # All attempts failed
         self.error(f"JSON parsing failed completely after {max_retries} attempts for question: {question[:100]}...")
@@ -11,100 +11,101 @@ This package provides class-based toolkits for data science workflows:
 Each toolkit includes comprehensive help() functions for agent integration.
 """
 
-# Import class-based toolkits (primary interface)
-from .src.data_preview import DataPreview, datapreview, build_semantic_context, create_basic_variations
-from .src.data_cleaning import DataCleaning
-from .src.eda_tools import EDAToolkit
-from .src.feature_engineering import FeatureEngineering
-from .src.stability import evaluate_variations
-
-# Import HTML output utilities
-from .src.html_output import (
-    display_html, html_output, print_html,
-    HTMLRenderer, render_html, render_vds_container, render_vds_table,
-    quick_display_html, quick_display_vds, help_html_output
-)
-
-# Import legacy function-based interfaces for backward compatibility
-from .src.data_preview import enhanced_data_preview, smart_data_info, get_column_list
-from .src.data_cleaning import (
-    apply_cleaning_method,
-    advanced_fill_missing_values,
-    remove_columns_advanced,
-    advanced_outlier_detection,
-    categorical_encoding_advanced
-)
-from .src.eda_tools import (
-    generate_correlation_analysis, 
-    generate_distribution_analysis,
-    generate_missing_value_analysis,
-    generate_advanced_statistics,
-    generate_data_quality_report,
-    generate_feature_importance_analysis
-)
-from .src.feature_engineering import (
-    advanced_feature_transformation,
-    advanced_dimensionality_reduction,
-    advanced_feature_selection,
-    create_polynomial_features_advanced,
-    discretize_features_advanced
-)
+import importlib
 
 __version__ = "2.0.0"
 
-# Primary class-based interface
-__all__ = [
-    "DataPreview",
-    "DataCleaning",
-    "EDAToolkit",
-    "FeatureEngineering",
+# Exported names and the submodule that defines them. Submodules are only
+# imported on first attribute access (PEP 562), so ``import vdstools`` stays
+# cheap and e.g. ``from vdstools import DataPreview`` never loads sklearn/scipy.
+_LAZY_IMPORTS = {
+    # Primary class-based interface
+    "DataPreview": ".src.data_preview",
+    "DataCleaning": ".src.data_cleaning",
+    "CleaningPipeline": ".src.cleaning_pipeline",
+    "EDAToolkit": ".src.eda_tools",
+    "FeatureEngineering": ".src.feature_engineering",
     # Agent-oriented structured utilities
-    "build_semantic_context",
-    "create_basic_variations",
-    "evaluate_variations",
-    
+    "build_semantic_context": ".src.data_preview",
+    "create_basic_variations": ".src.data_preview",
+    "evaluate_variations": ".src.stability",
+    "search_models": ".src.model_search",
+    "default_search_space": ".src.model_search",
+    "ModelStore": ".src.model_store",
+    "data_fingerprint": ".src.model_store",
+    "create_variation_spec": ".src.variations",
+    "save_variation_spec": ".src.variations",
+    "apply_variation": ".src.variations",
+    "load_dataset": ".src.variations",
+    "materialize_variation": ".src.variations",
+    "profile_dataset": ".src.profiling",
+    "profile_csv": ".src.profiling",
+    "clear_profile_cache": ".src.profiling",
+    "detect_datetime_format": ".src.profiling",
+    "parse_datetime_column": ".src.profiling",
+    "reduce_dimensions_incremental": ".core.ml_tools",
+    "transform_with_cached_reducer": ".core.ml_tools",
+
     # HTML Output Utilities
-    "display_html",
-    "html_output", 
-    "print_html",
-    "HTMLRenderer",
-    "render_html",
-    "render_vds_container",
-    "render_vds_table",
-    "quick_display_html",
-    "quick_display_vds",
-    "help_html_output",
-    
+    "display_html": ".src.html_output",
+    "html_output": ".src.html_output",
+    "print_html": ".src.html_output",
+    "HTMLRenderer": ".src.html_output",
+    "render_html": ".src.html_output",
+    "render_vds_container": ".src.html_output",
+    "render_vds_table": ".src.html_output",
+    "render_frame_table": ".src.html_output",
+    "render_info_table": ".src.html_output",
+    "css_block": ".src.html_output",
+    "quick_display_html": ".src.html_output",
+    "quick_display_vds": ".src.html_output",
+    "help_html_output": ".src.html_output",
+
     # Legacy function interface
-    "datapreview",
-    
+    "datapreview": ".src.data_preview",
+
     # Data Preview Functions (Legacy)
-    "enhanced_data_preview", 
-    "smart_data_info",
-    "get_column_list",
-    
+    "enhanced_data_preview": ".src.data_preview",
+    "smart_data_info": ".src.data_preview",
+    "get_column_list": ".src.data_preview",
+
     # Data Cleaning Functions (Legacy)
-    "apply_cleaning_method",
-    "advanced_fill_missing_values",
-    "remove_columns_advanced", 
-    "advanced_outlier_detection",
-    "categorical_encoding_advanced",
-    
+    "apply_cleaning_method": ".src.data_cleaning",
+    "advanced_fill_missing_values": ".src.data_cleaning",
+    "remove_columns_advanced": ".src.data_cleaning",
+    "advanced_outlier_detection": ".src.data_cleaning",
+    "categorical_encoding_advanced": ".src.data_cleaning",
+
     # EDA Functions (Legacy)
-    "generate_correlation_analysis",
-    "generate_distribution_analysis", 
-    "generate_missing_value_analysis",
-    "generate_advanced_statistics",
-    "generate_data_quality_report",
-    "generate_feature_importance_analysis",
+    "generate_correlation_analysis": ".src.eda_tools",
+    "generate_distribution_analysis": ".src.eda_tools",
+    "generate_missing_value_analysis": ".src.eda_tools",
+    "generate_advanced_statistics": ".src.eda_tools",
+    "generate_data_quality_report": ".src.eda_tools",
+    "generate_feature_importance_analysis": ".src.eda_tools",
 
     # Feature Engineering Functions (Legacy)
-    "advanced_feature_transformation",
-    "advanced_dimensionality_reduction",
-    "advanced_feature_selection",
-    "create_polynomial_features_advanced",
-    "discretize_features_advanced",
-]
+    "advanced_feature_transformation": ".src.feature_engineering",
+    "advanced_dimensionality_reduction": ".src.feature_engineering",
+    "advanced_feature_selection": ".src.feature_engineering",
+    "create_polynomial_features_advanced": ".src.feature_engineering",
+    "discretize_features_advanced": ".src.feature_engineering",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value  # cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 
 # Quick access functions for common operations
@@ -116,6 +117,8 @@ def quick_preview(csv_file_path: str, n_rows: int = 5):
         csv_file_path: Path to CSV file
         n_rows: Number of rows to preview
     """
+    from .src.data_preview import DataPreview
+
     toolkit = DataPreview()
     if n_rows == 5:
         toolkit.top5line(csv_file_path)
@@ -132,6 +135,8 @@ def quick_clean(csv_file_path: str, operation: str = "missing_values"):
         csv_file_path: Path to CSV file
         operation: Type of cleaning ('missing_values', 'duplicates', 'outliers', 'invalid_values')
     """
+    from .src.data_cleaning import DataCleaning
+
     toolkit = DataCleaning()
     if operation == "missing_values":
         toolkit.fill_missing_values(csv_file_path)
@@ -153,6 +158,8 @@ def quick_eda(csv_file_path: str, analysis: str = "quality"):
         csv_file_path: Path to CSV file
         analysis: Type of analysis ('quality', 'missing', 'stats', 'correlation')
     """
+    from .src.eda_tools import EDAToolkit
+
     toolkit = EDAToolkit()
     if analysis == "quality":
         toolkit.data_quality_report(csv_file_path)
@@ -0,0 +1,14 @@
+"""
+Benchmarks for vdstools hot paths.
+
+Run a benchmark module directly, e.g.::
+
+    python -m vdstools.benchmarks.outliers --groups 100000
+    python -m vdstools.benchmarks.import_time
+
+The full suite times and memory-profiles every public entry point on
+reproducible synthetic datasets and compares runs against a baseline::
+
+    python -m vdstools.benchmarks.suite --preset small --output base.json
+    python -m vdstools.benchmarks.suite --preset small --baseline base.json --fail-on-regression
+"""
@@ -0,0 +1,162 @@
+"""
+Reproducible synthetic datasets for the vdstools benchmark suite.
+
+A dataset is fully described by its spec (rows, columns, missingness,
+categorical cardinality, outlier rate, problem type, seed): the same spec
+always produces byte-identical CSV content, so results from different runs
+and machines are comparable. Rows are generated and written in fixed-size
+chunks, which keeps generation memory flat up to 10M rows.
+
+Layout of a dataset with ``n_cols`` columns::
+
+    num_0 .. num_k     float features (with missing values and outliers)
+    cat_0 .. cat_m     string categories (~20% of the columns, Zipf-distributed)
+    event_time         daily timestamps, ISO formatted
+    target             regression value or class label
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DATA_DIR = ".vds_bench_data"
+
+# rows per generated chunk; part of the data definition (changing it changes the data)
+CHUNK_ROWS = 250_000
+
+# named sizes covering the supported range (10k-10M rows, 10-1,000 columns)
+PRESETS: Dict[str, List[Dict[str, int]]] = {
+    "smoke": [{"n_rows": 10_000, "n_cols": 10}],
+    "small": [{"n_rows": 10_000, "n_cols": 10}, {"n_rows": 100_000, "n_cols": 50}],
+    "medium": [{"n_rows": 1_000_000, "n_cols": 20}, {"n_rows": 100_000, "n_cols": 200}],
+    "large": [{"n_rows": 10_000_000, "n_cols": 10}, {"n_rows": 100_000, "n_cols": 1_000}],
+}
+
+
+def dataset_spec(n_rows: int = 10_000, n_cols: int = 10, missing_rate: float = 0.05,
+                 cardinality: int = 20, outlier_rate: float = 0.01,
+                 problem_type: str = "regression", seed: int = 0) -> Dict[str, Any]:
+    """Validated dataset spec with column names filled in."""
+    if n_cols < 4:
+        raise ValueError("n_cols must be at least 4 (numeric, categorical, time and target columns)")
+    if not 0 <= missing_rate < 1 or not 0 <= outlier_rate < 1:
+        raise ValueError("missing_rate and outlier_rate must be in [0, 1)")
+    if problem_type not in ("regression", "classification"):
+        raise ValueError("problem_type must be 'regression' or 'classification'")
+
+    n_features = n_cols - 2
+    n_categorical = max(1, n_features // 5)
+    n_numeric = n_features - n_categorical
+    return {
+        "n_rows": int(n_rows),
+        "n_cols": int(n_cols),
+        "missing_rate": float(missing_rate),
+        "cardinality": int(cardinality),
+        "outlier_rate": float(outlier_rate),
+        "problem_type": problem_type,
+        "seed": int(seed),
+        "numeric_columns": [f"num_{i}" for i in range(n_numeric)],
+        "categorical_columns": [f"cat_{i}" for i in range(n_categorical)],
+        "time_column": "event_time",
+        "target_column": "target",
+    }
+
+
+def dataset_name(spec: Dict[str, Any]) -> str:
+    """Stable file stem for a spec."""
+    return (f"synthetic_{spec['n_rows']}x{spec['n_cols']}_m{spec['missing_rate']:g}"
+            f"_c{spec['cardinality']}_o{spec['outlier_rate']:g}_{spec['problem_type'][:3]}_s{spec['seed']}")
+
+
+def _generate_chunk(spec: Dict[str, Any], coef: np.ndarray, start: int, n: int) -> pd.DataFrame:
+    rng = np.random.default_rng([spec["seed"], start // CHUNK_ROWS])
+    numeric = rng.standard_normal((n, len(spec["numeric_columns"])))
+
+    signal = numeric[:, :len(coef)] @ coef
+    noise = rng.standard_normal(n) * 0.5
+    if spec["problem_type"] == "regression":
+        target = signal * 10 + 100 + noise
+    else:
+        target = (signal + noise > 0).astype(np.int64)
+
+    # outliers and missing values are injected after the target is computed
+    if spec["outlier_rate"] > 0:
+        spikes = rng.random(numeric.shape) < spec["outlier_rate"]
+        numeric[spikes] += rng.choice([-1.0, 1.0], int(spikes.sum())) * rng.uniform(8, 25, int(spikes.sum()))
+    if spec["missing_rate"] > 0:
+        numeric[rng.random(numeric.shape) < spec["missing_rate"]] = np.nan
+
+    frame = pd.DataFrame(numeric, columns=spec["numeric_columns"])
+
+    # Zipf-like category frequencies: a few dominant levels and a long tail
+    weights = 1.0 / np.arange(1, spec["cardinality"] + 1)
+    weights /= weights.sum()
+    levels = np.array([f"c{k}" for k in range(spec["cardinality"])], dtype=object)
+    for col in spec["categorical_columns"]:
+        values = levels[rng.choice(spec["cardinality"], n, p=weights)]
+        if spec["missing_rate"] > 0:
+            values[rng.random(n) < spec["missing_rate"]] = None
+        frame[col] = values
+
+    days = (start + np.arange(n)) % 3650
+    frame[spec["time_column"]] = (np.datetime64("2015-01-01") + days.astype("timedelta64[D]")).astype(str)
+    frame[spec["target_column"]] = target
+    return frame
+
+
+def generate_dataset(spec: Dict[str, Any]) -> pd.DataFrame:
+    """Generate the dataset described by ``spec`` in memory."""
+    return pd.concat(list(_iter_dataset(spec)), ignore_index=True)
+
+
+def _iter_dataset(spec: Dict[str, Any]):
+    coef = np.random.default_rng(spec["seed"]).uniform(-1, 1, min(5, len(spec["numeric_columns"])))
+    for start in range(0, spec["n_rows"], CHUNK_ROWS):
+        yield _generate_chunk(spec, coef, start, min(CHUNK_ROWS, spec["n_rows"] - start))
+
+
+def write_dataset(spec: Dict[str, Any], data_dir: Optional[str] = None, overwrite: bool = False) -> str:
+    """
+    Write the dataset for ``spec`` as CSV (plus a ``.json`` spec sidecar) and return its path
+
+    An existing file with the same spec is reused unless ``overwrite`` is set.
+    """
+    data_dir = data_dir or DEFAULT_DATA_DIR
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, dataset_name(spec) + ".csv")
+    meta_path = path[:-4] + ".json"
+    if os.path.exists(path) and os.path.exists(meta_path) and not overwrite:
+        return path
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    for i, chunk in enumerate(_iter_dataset(spec)):
+        chunk.to_csv(tmp_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+    os.replace(tmp_path, path)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(spec, f, indent=2)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--cardinality", type=int, default=20)
+    parser.add_argument("--outlier-rate", type=float, default=0.01)
+    parser.add_argument("--problem-type", default="regression", choices=["regression", "classification"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args()
+    spec = dataset_spec(args.rows, args.cols, args.missing_rate, args.cardinality,
+                        args.outlier_rate, args.problem_type, args.seed)
+    print(write_dataset(spec, args.data_dir, args.overwrite))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark the cost of importing vdstools in a fresh interpreter.
+
+Each statement runs in its own subprocess (like the first cell of a new
+kernel) and reports wall time plus which heavy dependencies got loaded.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+STATEMENTS = [
+    "import vdstools",
+    "from vdstools import DataPreview",
+    "from vdstools import DataCleaning",
+    "from vdstools import EDAToolkit",
+    "from vdstools import evaluate_variations",
+]
+
+HEAVY_MODULES = ["pandas", "sklearn", "scipy", "IPython"]
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, repeats: int = 3) -> Dict[str, Any]:
+    """Best-of-``repeats`` import time for ``statement`` in a fresh interpreter."""
+    runs = []
+    for _ in range(repeats):
+        probe = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda r: r["seconds"])
+    return {"statement": statement, "seconds": round(best["seconds"], 4), "loaded": best["loaded"]}
+
+
+def run(statements: List[str] = STATEMENTS, repeats: int = 3) -> Dict[str, Any]:
+    return {"python": sys.version.split()[0], "results": [measure(s, repeats) for s in statements]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(repeats=args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark group-wise outlier handling in ``core.ml_tools.handle_outliers_tools``.
+
+Compares the vectorized / group-parallel implementation against the previous
+per-group ``groupby().transform(detect_outliers_tools)`` path.
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ..core.ml_tools import detect_outliers_tools, handle_outliers_tools
+
+
+def make_grouped_data(n_groups: int = 100_000, rows_per_group: int = 10, seed: int = 0) -> pd.DataFrame:
+    """Synthetic data: one numeric column with a few injected outliers per group."""
+    rng = np.random.default_rng(seed)
+    n_rows = n_groups * rows_per_group
+    group = np.repeat(np.arange(n_groups), rows_per_group)
+    value = rng.normal(loc=group % 100, scale=1.0, size=n_rows)
+    spikes = rng.random(n_rows) < 0.01
+    value[spikes] += rng.choice([-1, 1], spikes.sum()) * 25
+    return pd.DataFrame({"group": group, "value": value})
+
+
+def _legacy_mask(df: pd.DataFrame, method: str, params: Dict[str, Any]) -> pd.Series:
+    return df.groupby(["group"])["value"].transform(
+        lambda x: detect_outliers_tools(x, method=method, params=params)
+    )
+
+
+def run(n_groups: int = 100_000, rows_per_group: int = 10,
+        methods: List[str] = ("zscore", "mad", "isolation_forest", "dbscan"),
+        legacy_groups: int = 2_000, model_groups: int = 5_000) -> Dict[str, Any]:
+    """
+    Time each method on ``n_groups`` groups. The legacy path is timed on
+    ``legacy_groups`` groups and linearly extrapolated (0 disables it).
+    Model-based detectors fit one estimator per group, so they run on the
+    first ``model_groups`` groups only.
+    """
+    df = make_grouped_data(n_groups, rows_per_group)
+    results: Dict[str, Any] = {"groups": n_groups, "rows": int(len(df)), "methods": {}}
+
+    for method in methods:
+        data = df if method in ("zscore", "mad") else df[df["group"] < model_groups]
+        start = time.perf_counter()
+        out = handle_outliers_tools(data, "value", method=method, strategy="remove", group_columns="group")
+        elapsed = time.perf_counter() - start
+        entry = {
+            "groups": int(data["group"].nunique()),
+            "seconds": round(elapsed, 3),
+            "rows_removed": int(len(data) - len(out)),
+        }
+
+        if legacy_groups and method in ("zscore", "mad"):
+            subset = df[df["group"] < legacy_groups]
+            params = {"threshold": 3.0 if method == "zscore" else 3.5}
+            start = time.perf_counter()
+            _legacy_mask(subset, method, params)
+            legacy = (time.perf_counter() - start) * n_groups / legacy_groups
+            entry["legacy_seconds_estimated"] = round(legacy, 3)
+            entry["speedup"] = round(legacy / max(elapsed, 1e-9), 1)
+        results["methods"][method] = entry
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--groups", type=int, default=100_000)
+    parser.add_argument("--rows-per-group", type=int, default=10)
+    parser.add_argument("--methods", nargs="+", default=["zscore", "mad", "isolation_forest", "dbscan"])
+    parser.add_argument("--legacy-groups", type=int, default=2_000)
+    parser.add_argument("--model-groups", type=int, default=5_000)
+    args = parser.parse_args()
+    results = run(args.groups, args.rows_per_group, args.methods, args.legacy_groups, args.model_groups)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""
+Time and memory benchmark of the public vdstools entry points.
+
+Every public DataPreview, DataCleaning, EDAToolkit and FeatureEngineering
+method (HTML output captured instead of displayed) and the stability entry
+points run on reproducible synthetic datasets (see ``benchmarks.datasets``).
+Each case is timed ``--repeats`` times with in-process caches cleared before
+every run, then run once more under ``tracemalloc`` for its peak Python-heap
+allocation (work done in worker processes is not included).
+
+Results are written as JSON; pass a previous result file as ``--baseline``
+to flag time or memory regressions::
+
+    python -m vdstools.benchmarks.suite --preset small --output base.json
+    python -m vdstools.benchmarks.suite --preset small --baseline base.json --fail-on-regression
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, List, Optional
+
+from .datasets import DEFAULT_DATA_DIR, PRESETS, dataset_name, dataset_spec, write_dataset
+
+RESULT_VERSION = 1
+
+
+def _capturing(tool_cls: Any, sink: List[Any]) -> Any:
+    """Tool instance whose ``show`` collects the HTML instead of displaying it."""
+    tool = tool_cls()
+    tool.show = sink.append
+    return tool
+
+
+def entry_points(path: str, spec: Dict[str, Any], workdir: str,
+                 sink: List[Any]) -> Dict[str, Callable[[], Any]]:
+    """
+    Benchmark cases for one dataset, as zero-argument callables keyed by entry point name
+
+    Args:
+        path: CSV path of the dataset (outputs are written next to it)
+        spec: Dataset spec from ``datasets.dataset_spec``
+        workdir: Scratch directory for files created by the cases
+        sink: List receiving HTML passed to ``show``
+    """
+    from ..src.data_cleaning import DataCleaning
+    from ..src.data_preview import DataPreview, create_basic_variations
+    from ..src.eda_tools import EDAToolkit
+    from ..src.feature_engineering import FeatureEngineering
+    from ..src.stability import evaluate_variations
+
+    preview = _capturing(DataPreview, sink)
+    cleaning = _capturing(DataCleaning, sink)
+    eda = _capturing(EDAToolkit, sink)
+    features = _capturing(FeatureEngineering, sink)
+
+    numeric = spec["numeric_columns"]
+    categorical = spec["categorical_columns"]
+    target = spec["target_column"]
+    some_numeric = numeric[:5]
+    variations_dir = os.path.join(workdir, "variations")
+
+    def variation_files() -> List[str]:
+        if not os.path.isdir(variations_dir):
+            create_basic_variations(path, variations_dir)
+        return [os.path.join(variations_dir, name) for name in sorted(os.listdir(variations_dir))]
+
+    return {
+        "DataPreview.column_range": lambda: preview.column_range(path),
+        "DataPreview.top5line": lambda: preview.top5line(path),
+        "DataPreview.top10line": lambda: preview.top10line(path),
+        "DataPreview.custom_preview": lambda: preview.custom_preview(path, n_rows=20),
+        "DataPreview.data_info": lambda: preview.data_info(path),
+        "DataPreview.column_list": lambda: preview.column_list(path),
+        "DataPreview.remove_columns": lambda: preview.remove_columns(
+            path, [numeric[-1]], os.path.join(workdir, "removed.csv")),
+
+        "DataCleaning.clean_invalid_values": lambda: cleaning.clean_invalid_values(path),
+        "DataCleaning.fill_missing_values": lambda: cleaning.fill_missing_values(path),
+        "DataCleaning.remove_outliers": lambda: cleaning.remove_outliers(path),
+        "DataCleaning.remove_duplicates": lambda: cleaning.remove_duplicates(path),
+        "DataCleaning.optimize_data_types": lambda: cleaning.optimize_data_types(path),
+        "DataCleaning.advanced_missing_fill": lambda: cleaning.advanced_missing_fill(
+            path, some_numeric, method="median", group_columns=categorical[0]),
+        "DataCleaning.advanced_column_removal": lambda: cleaning.advanced_column_removal(
+            path, strategy=["missing", "constant", "correlation"], exclude_columns=[target]),
+        "DataCleaning.advanced_outlier_handling": lambda: cleaning.advanced_outlier_handling(
+            path, some_numeric, method="iqr", group_columns=categorical[0]),
+        "DataCleaning.encode_categorical_data": lambda: cleaning.encode_categorical_data(path, categorical),
+
+        "EDAToolkit.correlation_analysis": lambda: eda.correlation_analysis(path, target),
+        "EDAToolkit.distribution_analysis": lambda: eda.distribution_analysis(path, numeric[0]),
+        "EDAToolkit.missing_value_analysis": lambda: eda.missing_value_analysis(path),
+        "EDAToolkit.statistical_summary": lambda: eda.statistical_summary(path),
+        "EDAToolkit.data_quality_report": lambda: eda.data_quality_report(path),
+        "EDAToolkit.feature_importance_analysis": lambda: eda.feature_importance_analysis(path, target),
+        "EDAToolkit.basic_data_audit": lambda: eda.basic_data_audit(path),
+        "EDAToolkit.data_type_analysis": lambda: eda.data_type_analysis(path),
+        "EDAToolkit.temporal_analysis": lambda: eda.temporal_analysis(path),
+        "EDAToolkit.spatial_analysis": lambda: eda.spatial_analysis(path),
+        "EDAToolkit.multicollinearity_analysis": lambda: eda.multicollinearity_analysis(path),
+        "EDAToolkit.multi_column_distribution": lambda: eda.multi_column_distribution(path, some_numeric),
+        "EDAToolkit.comparative_analysis": lambda: eda.comparative_analysis(path, categorical[0], some_numeric),
+
+        "FeatureEngineering.transform_features": lambda: features.transform_features(path, some_numeric),
+        "FeatureEngineering.reduce_dimensions": lambda: features.reduce_dimensions(path, target_column=target),
+        "FeatureEngineering.select_features": lambda: features.select_features(path, target),
+        "FeatureEngineering.create_polynomial_features": lambda: features.create_polynomial_features(
+            path, some_numeric, target_column=target),
+        "FeatureEngineering.discretize_features": lambda: features.discretize_features(path, some_numeric),
+
+        "stability.create_basic_variations": lambda: create_basic_variations(
+            path, os.path.join(workdir, "variations_timed")),
+        "stability.evaluate_variations": lambda: evaluate_variations(variation_files(), target_column=target),
+    }
+
+
+def _reset_caches() -> None:
+    """Clear in-process caches so every run measures a cold call."""
+    from ..core import ml_tools
+    from ..src.profiling import clear_datetime_format_cache, clear_profile_cache
+
+    clear_profile_cache()
+    clear_datetime_format_cache()
+    ml_tools._REDUCER_CACHE.clear()
+    gc.collect()
+
+
+def _find_error(output: Any) -> Optional[str]:
+    """Error message reported by an entry point's output, if any."""
+    if isinstance(output, str):
+        return "error report returned" if "<vds-error-panel" in output else None
+    if isinstance(output, dict):
+        if output.get("error"):
+            return str(output["error"])
+        for value in output.values():
+            message = _find_error(value)
+            if message:
+                return message
+    if isinstance(output, (list, tuple)):
+        for value in output:
+            message = _find_error(value)
+            if message:
+                return message
+    return None
+
+
+def _run_case(func: Callable[[], Any], sink: List[Any]) -> Any:
+    with warnings.catch_warnings():
+        # data-dependent warnings of the tools are expected on synthetic data
+        warnings.simplefilter("ignore")
+        result = func()
+    return [result] + sink
+
+
+def benchmark_case(func: Callable[[], Any], sink: List[Any], repeats: int = 3,
+                   memory: bool = True) -> Dict[str, Any]:
+    """Time ``func`` ``repeats`` times and measure its peak traced memory once."""
+    runs: List[float] = []
+    entry: Dict[str, Any] = {"status": "ok"}
+    try:
+        for _ in range(max(1, repeats)):
+            sink.clear()
+            _reset_caches()
+            start = time.perf_counter()
+            outputs = _run_case(func, sink)
+            runs.append(time.perf_counter() - start)
+            error = _find_error(outputs)
+            if error:
+                entry.update(status="error", error=error[:500])
+                break
+
+        if memory and entry["status"] == "ok":
+            sink.clear()
+            _reset_caches()
+            tracemalloc.start()
+            try:
+                _run_case(func, sink)
+                entry["peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 2)
+            finally:
+                tracemalloc.stop()
+    except Exception as e:
+        entry.update(status="error", error=f"{type(e).__name__}: {e}"[:500])
+
+    if runs:
+        entry.update(seconds=round(min(runs), 4), seconds_median=round(statistics.median(runs), 4),
+                     runs=[round(r, 4) for r in runs])
+    return entry
+
+
+def _environment() -> Dict[str, Any]:
+    import numpy as np
+    import pandas as pd
+    import sklearn
+
+    from .. import __version__
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "vdstools": __version__,
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scikit-learn": sklearn.__version__,
+    }
+
+
+def run(datasets: List[Dict[str, Any]], include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None, repeats: int = 3, memory: bool = True,
+        data_dir: Optional[str] = None, verbose: bool = True) -> Dict[str, Any]:
+    """
+    Run the benchmark suite
+
+    Args:
+        datasets: Dataset specs (``datasets.dataset_spec``)
+        include: Glob patterns of entry point names to run (default: all)
+        exclude: Glob patterns of entry point names to skip
+        repeats: Timed runs per case (the minimum is reported as ``seconds``)
+        memory: Also measure peak traced memory with one extra run
+        data_dir: Directory caching the generated datasets
+        verbose: Print one line per case
+
+    Returns:
+        JSON-serializable result dict
+    """
+    results: List[Dict[str, Any]] = []
+    started = time.time()
+    sink: List[Any] = []
+
+    for spec in datasets:
+        base_path = write_dataset(spec, data_dir)
+        workdir = tempfile.mkdtemp(prefix="vds_bench_")
+        try:
+            path = os.path.join(workdir, os.path.basename(base_path))
+            try:
+                os.symlink(os.path.abspath(base_path), path)
+            except OSError:
+                shutil.copyfile(base_path, path)
+
+            for name, func in entry_points(path, spec, workdir, sink).items():
+                if include and not any(fnmatch.fnmatch(name, p) for p in include):
+                    continue
+                if exclude and any(fnmatch.fnmatch(name, p) for p in exclude):
+                    continue
+                entry = {"case": name, "dataset": dataset_name(spec),
+                         "n_rows": spec["n_rows"], "n_cols": spec["n_cols"]}
+                entry.update(benchmark_case(func, sink, repeats, memory))
+                results.append(entry)
+                if verbose:
+                    print(f"{entry['dataset']:<48} {name:<46} {entry.get('seconds', float('nan')):>9.3f}s "
+                          f"{entry.get('peak_memory_mb', float('nan')):>9.1f}MB  {entry['status']}", flush=True)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "version": RESULT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+        "environment": _environment(),
+        "config": {"repeats": repeats, "memory": memory, "include": include, "exclude": exclude,
+                   "datasets": [{k: v for k, v in s.items() if not k.endswith("_columns")} for s in datasets]},
+        "seconds": round(time.time() - started, 2),
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], time_tolerance: float = 0.2,
+            memory_tolerance: float = 0.2, min_seconds: float = 0.05,
+            min_memory_mb: float = 5.0) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Compare two result dicts case by case
+
+    A case regresses when it now fails, or when its time (memory) grew by more
+    than ``time_tolerance`` (``memory_tolerance``) relative to the baseline and
+    by more than the absolute noise floor ``min_seconds`` (``min_memory_mb``).
+
+    Returns:
+        Dict with ``regressions``, ``improvements``, ``new`` and ``missing`` case lists
+    """
+    def index(result: Dict[str, Any]) -> Dict[tuple, Dict[str, Any]]:
+        return {(r["case"], r["dataset"]): r for r in result.get("results", [])}
+
+    now, before = index(current), index(baseline)
+    report: Dict[str, List[Dict[str, Any]]] = {"regressions": [], "improvements": [], "new": [], "missing": []}
+
+    for key, entry in now.items():
+        base = before.get(key)
+        if base is None:
+            report["new"].append({"case": key[0], "dataset": key[1]})
+            continue
+        if base["status"] == "ok" and entry["status"] != "ok":
+            report["regressions"].append({"case": key[0], "dataset": key[1], "metric": "status",
+                                          "baseline": "ok", "current": entry.get("error", entry["status"])})
+            continue
+
+        for metric, tolerance, floor in (("seconds", time_tolerance, min_seconds),
+                                         ("peak_memory_mb", memory_tolerance, min_memory_mb)):
+            old, new = base.get(metric), entry.get(metric)
+            if old is None or new is None:
+                continue
+            change = {"case": key[0], "dataset": key[1], "metric": metric, "baseline": old, "current": new,
+                      "ratio": round(new / old, 3) if old else None}
+            if new > old * (1 + tolerance) and new - old > floor:
+                report["regressions"].append(change)
+            elif new < old * (1 - tolerance) and old - new > floor:
+                report["improvements"].append(change)
+
+    report["missing"] = [{"case": k[0], "dataset": k[1]} for k in before if k not in now]
+    return report
+
+
+def format_comparison(report: Dict[str, List[Dict[str, Any]]]) -> str:
+    """Plain-text summary of ``compare`` output."""
+    lines = []
+    for section in ("regressions", "improvements"):
+        lines.append(f"{section.capitalize()}: {len(report[section])}")
+        for c in report[section]:
+            ratio = f" (x{c['ratio']})" if c.get("ratio") else ""
+            lines.append(f"  {c['case']} [{c['dataset']}] {c['metric']}: {c['baseline']} -> {c['current']}{ratio}")
+    lines.append(f"New cases: {len(report['new'])}, missing cases: {len(report['missing'])}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", default="smoke", choices=sorted(PRESETS))
+    parser.add_argument("--rows", type=int, help="Custom dataset rows (overrides --preset)")
+    parser.add_argument("--cols", type=int, default=10, help="Custom dataset columns (with --rows)")
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--cardinality", type=int, default=20)
+    parser.add_argument("--outlier-rate", type=float, default=0.01)
+    parser.add_argument("--problem-type", default="regression", choices=["regression", "classification"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--include", nargs="+", help="Glob patterns of entry points to run")
+    parser.add_argument("--exclude", nargs="+", help="Glob patterns of entry points to skip")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--time-tolerance", type=float, default=0.2)
+    parser.add_argument("--memory-tolerance", type=float, default=0.2)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [{"n_rows": args.rows, "n_cols": args.cols}] if args.rows else PRESETS[args.preset]
+    specs = [dataset_spec(size["n_rows"], size["n_cols"], args.missing_rate, args.cardinality,
+                          args.outlier_rate, args.problem_type, args.seed) for size in sizes]
+    results = run(specs, args.include, args.exclude, args.repeats, not args.no_memory, args.data_dir)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        report = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+        results["comparison"] = report
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        print(format_comparison(report))
+        if args.fail_on_regression and report["regressions"]:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
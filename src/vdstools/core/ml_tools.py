@@ -1,18 +1,157 @@
 import pandas as pd
 import numpy as np
 from typing import Union, List, Optional, Dict, Any, Tuple
-from sklearn.preprocessing import LabelEncoder, StandardScaler, MinMaxScaler, RobustScaler, PowerTransformer
 import warnings
-from scipy import stats
-from sklearn.decomposition import PCA
-from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
-from sklearn.feature_selection import SelectKBest, mutual_info_classif, mutual_info_regression
-from sklearn.feature_selection import VarianceThreshold, RFE
-from sklearn.linear_model import Lasso, LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from itertools import combinations
+import hashlib
 import json
-from sklearn.impute import KNNImputer
+import os
+from collections import OrderedDict
+
+from .utils import dataset_fingerprint, file_fingerprint
+
+def _knn_impute_joint(
+    df: pd.DataFrame,
+    target_columns: List[str],
+    features: List[str],
+    params: Dict[str, Any]
+) -> pd.DataFrame:
+    """
+    联合KNN填充：所有目标列共用一次近邻拟合和一次近邻查询
+
+    - 特征矩阵只编码、标准化一次
+    - 特征（包括其他目标列）含缺失值时（填充场景的常见情况）强制使用暴力搜索
+      （algorithm='brute'，nan_euclidean距离，与KNNImputer一致，只比较双方都有值的维度），
+      查询代价与参考集行数成正比；只有特征矩阵完整时才使用sklearn NearestNeighbors的
+      树索引（低维自动选择kd_tree/ball_tree，可通过params['algorithm']指定）
+    - 参考集可通过params['max_reference_rows']按行采样封顶（默认50000），
+      查询按params['chunk_size']分块以限制内存
+    - 每行查询 n_neighbors * params['oversample'] 个近邻，对每个目标列取前n_neighbors个
+      该列非缺失的近邻；不足时仅对这些行在该列的非缺失行上补充查询
+    - 数值列取（加权）均值，分类列取（加权）众数；没有任何特征值的行与KNNImputer
+      一样退化为该列的均值（分类列为众数）
+    """
+    from sklearn.neighbors import NearestNeighbors
+
+    n_neighbors = params.get('n_neighbors', 5)
+    weights = params.get('weights', 'uniform')  # 'uniform' 或 'distance'
+    max_reference_rows = params.get('max_reference_rows', 50000)
+    chunk_size = params.get('chunk_size', 10000)
+    oversample = params.get('oversample', 3)
+    algorithm = params.get('algorithm', 'auto')
+    random_state = params.get('random_state', 42)
+
+    # 编码并标准化特征（只做一次）
+    X = df[features].copy()
+    for cat_col in X.select_dtypes(exclude=[np.number]).columns:
+        X[cat_col] = pd.Categorical(X[cat_col]).codes
+    X = X.to_numpy(dtype=np.float64)
+    mean = np.nanmean(X, axis=0)
+    std = np.nanstd(X, axis=0)
+    std[~np.isfinite(std) | (std == 0)] = 1.0
+    X = (X - np.nan_to_num(mean)) / std
+    metric = 'minkowski'
+    if np.isnan(X).any():
+        algorithm, metric = 'brute', 'nan_euclidean'
+    has_features = ~np.isnan(X).all(axis=1)
+
+    missing = df[target_columns].isna().to_numpy()
+    query_rows = np.flatnonzero(missing.any(axis=1))
+    if len(query_rows) == 0:
+        return df
+
+    # 参考集：至少有一个目标列非缺失、且至少有一个特征值的行，按需采样封顶
+    reference_rows = np.flatnonzero(~missing.all(axis=1) & has_features)
+    if max_reference_rows and len(reference_rows) > max_reference_rows:
+        rng = np.random.RandomState(random_state)
+        reference_rows = np.sort(rng.choice(reference_rows, max_reference_rows, replace=False))
+    if len(reference_rows) == 0:
+        raise ValueError("No observed values available for KNN imputation")
+
+    def search(ref_rows: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, len(ref_rows))
+        index = NearestNeighbors(n_neighbors=k, algorithm=algorithm, metric=metric).fit(X[ref_rows])
+        dist_parts, idx_parts = [], []
+        for start in range(0, len(rows), chunk_size):
+            dist, idx = index.kneighbors(X[rows[start:start + chunk_size]])
+            dist_parts.append(dist)
+            idx_parts.append(ref_rows[idx])
+        return np.vstack(dist_parts), np.vstack(idx_parts)
+
+    # 没有任何特征值的行无法计算距离，按列均值/众数填充
+    blank_rows = query_rows[~has_features[query_rows]]
+    query_rows = query_rows[has_features[query_rows]]
+    for j, col in enumerate(target_columns):
+        rows = blank_rows[missing[blank_rows, j]]
+        if len(rows) == 0:
+            continue
+        if pd.api.types.is_numeric_dtype(df[col]):
+            fill_val = df[col].mean()
+        else:
+            mode = df[col].mode()
+            fill_val = mode.iloc[0] if not mode.empty else None
+        if fill_val is not None:
+            df.loc[df.index[rows], col] = fill_val
+    if len(query_rows) == 0:
+        return df
+
+    dist, nbrs = search(reference_rows, query_rows, n_neighbors * oversample)
+
+    def aggregate(col: str, dist: np.ndarray, nbrs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """对每个查询行取前n_neighbors个该列非缺失的近邻，返回(填充值, 是否有足够近邻)"""
+        # nan_euclidean下与查询行没有共同特征的近邻距离为NaN，不参与
+        observed = ~df[col].isna().to_numpy()[nbrs] & np.isfinite(dist)
+        use = observed & (np.cumsum(observed, axis=1) <= n_neighbors)
+        if weights == 'distance':
+            w = np.where(use, 1.0 / np.maximum(dist, 1e-12), 0.0)
+        else:
+            w = use.astype(np.float64)
+        found = use.any(axis=1)
+
+        if pd.api.types.is_numeric_dtype(df[col]):
+            values = np.nan_to_num(df[col].to_numpy(dtype=np.float64)[nbrs])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                filled = (w * values).sum(axis=1) / w.sum(axis=1)
+            return filled, found
+
+        # 分类列：加权投票
+        codes, categories = pd.factorize(df[col])
+        votes = pd.DataFrame({
+            'row': np.repeat(np.arange(nbrs.shape[0]), nbrs.shape[1])[use.ravel()],
+            'code': codes[nbrs][use],
+            'weight': w[use],
+        })
+        winner = votes.groupby(['row', 'code'])['weight'].sum().reset_index()
+        winner = winner.loc[winner.groupby('row')['weight'].idxmax()]
+        filled = np.empty(nbrs.shape[0], dtype=object)
+        filled[winner['row'].to_numpy()] = categories[winner['code'].to_numpy()]
+        return filled, found
+
+    for j, col in enumerate(target_columns):
+        col_missing = missing[query_rows, j]
+        if not col_missing.any():
+            continue
+        rows = query_rows[col_missing]
+        filled, found = aggregate(col, dist[col_missing], nbrs[col_missing])
+
+        # 过采样后仍无足够近邻的行：在该列非缺失行上补充查询
+        if not found.all():
+            donors = np.flatnonzero(~missing[:, j] & has_features)
+            if max_reference_rows and len(donors) > max_reference_rows:
+                rng = np.random.RandomState(random_state)
+                donors = np.sort(rng.choice(donors, max_reference_rows, replace=False))
+            if len(donors):
+                retry = np.flatnonzero(~found)
+                extra_dist, extra_nbrs = search(donors, rows[retry], n_neighbors)
+                extra_filled, extra_found = aggregate(col, extra_dist, extra_nbrs)
+                filled[retry] = extra_filled
+                found[retry] = extra_found
+
+        target_index = df.index[rows[found]]
+        df.loc[target_index, col] = filled[found]
+
+    return df
+
 
 def fill_missing_values_tools(
     data: pd.DataFrame,
@@ -36,16 +175,19 @@ def fill_missing_values_tools(
             - 'ffill','bfill': 前向/后向填充
             - 'interpolate': 插值填充
             - 'constant': 常数填充
-            - 'knn': 基于相似样本填充
+            - 'knn': 基于相似样本填充（默认所有目标列联合填充，只做一次近邻搜索）
         group_columns: 分组列,用于分组填充
         time_column: 时间列,用于时序相关填充
         fill_value: 使用constant方法时的填充值
         max_group_null_ratio: 分组内最大允许的缺失比例
-        **params: 其他参数
+        **params: 其他参数；knn方法支持n_neighbors, weights, joint（默认True）,
+            max_reference_rows, chunk_size, oversample, algorithm, random_state
         
     Returns:
         填充后的数据框
     """
+    from sklearn.impute import KNNImputer
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
     if isinstance(params, str):
         try:
             params = json.loads(params)
@@ -57,6 +199,26 @@ def fill_missing_values_tools(
         target_columns = [target_columns]
     if isinstance(group_columns, str):
         group_columns = [group_columns]
+
+    # KNN默认联合填充：所有目标列共用一次近邻搜索（params['joint']=False时逐列填充）
+    if method == 'knn' and params.get('joint', True):
+        for target_col in target_columns:
+            if target_col not in df.columns:
+                raise ValueError(f"Column {target_col} not found in data")
+        target_columns = [c for c in target_columns if df[c].isna().any()]
+        if not target_columns:
+            return df
+        for target_col in target_columns:
+            if pd.api.types.is_numeric_dtype(df[target_col]):
+                df[target_col] = df[target_col].astype(float)
+        # 其他目标列也作为特征（含缺失值时按nan_euclidean距离只比较双方都有值的维度）
+        if group_columns:
+            features = [c for c in group_columns if c not in target_columns]
+        else:
+            features = df.select_dtypes(include=[np.number]).columns.tolist()
+        if not features:
+            raise ValueError("No features available for KNN imputation")
+        return _knn_impute_joint(df, target_columns, features, params)
         
     for target_col in target_columns:
         # 检查列是否存在
@@ -353,7 +515,8 @@ def handle_outliers_tools(
             - 'medium': 中等阈值（默认）
             - 'high': 严格的阈值，检测更多的异常值
         group_columns: 分组列
-        params: 各方法的参数字典
+        params: 各方法的参数字典；分组模式下isolation_forest/dbscan额外支持
+            'n_jobs'（并行进程数）和'min_group_size'（参与检测的最小分组样本数）
     """
     # 定义不同敏感度下的参数配置
     sensitivity_params = {
@@ -483,15 +646,14 @@ def handle_outliers_tools(
                     df = df.loc[~outlier_mask]
                     
             else:
-                # 对于其他方法，使用transform计算每个组的异常值掩码
-                def detect_group_outliers(x):
-                    return detect_outliers_tools(x, method=method, params=params)
-                
-                outlier_mask = df.groupby(group_columns)[target_col].transform(detect_group_outliers)
+                outlier_mask = _detect_group_outliers(df, group_columns, target_col, method, params)
                 
                 if strategy == 'clip':
-                    # 计算每个组的正常值均值
-                    normal_values = df[~outlier_mask].groupby(group_columns)[target_col].transform('mean')
+                    # 计算每个组的正常值均值（异常值先置为NaN，再按组求均值）
+                    normal_values = (
+                        df[target_col].where(~outlier_mask)
+                        .groupby([df[c] for c in group_columns]).transform('mean')
+                    )
                     # 一次性替换所有异常值
                     df.loc[outlier_mask, target_col] = normal_values[outlier_mask]
                 else:  # remove
@@ -524,6 +686,91 @@ def handle_outliers_tools(
                 
     return df
 
+# 模型类检测器在单个分组上所需的最小样本数，低于该值的分组不做检测
+_MODEL_MIN_GROUP_SIZE = {'isolation_forest': 8, 'dbscan': None}
+
+
+def _detect_outlier_chunk(
+    values: np.ndarray,
+    groups: List[np.ndarray],
+    method: str,
+    params: Dict[str, Any]
+) -> np.ndarray:
+    """在一批分组上依次运行模型类检测器，返回异常值的行位置"""
+    flagged = []
+    for positions in groups:
+        mask = detect_outliers_tools(pd.Series(values[positions]), method=method, params=params)
+        flagged.append(positions[np.asarray(mask, dtype=bool)])
+    return np.concatenate(flagged) if flagged else np.empty(0, dtype=np.intp)
+
+
+def _detect_group_outliers(
+    df: pd.DataFrame,
+    group_columns: List[str],
+    target_col: str,
+    method: str,
+    params: Dict[str, Any]
+) -> pd.Series:
+    """
+    分组异常值检测，返回与df对齐的布尔序列
+
+    - zscore / mad: 通过groupby transform聚合一次性向量化计算
+    - isolation_forest / dbscan: 按分组批量并行执行，样本数不足
+      params['min_group_size']（默认: isolation_forest为8，dbscan为min_samples）的分组不做检测
+      并行度由params['n_jobs']控制（默认-1）
+    """
+    series = df[target_col]
+    grouped = series.groupby([df[c] for c in group_columns])
+
+    if method == 'zscore':
+        threshold = params.get('threshold', 3)
+        mean = grouped.transform('mean')
+        std = grouped.transform('std', ddof=0)
+        z_scores = (series - mean).abs() / std
+        return (z_scores > threshold).fillna(False).astype(bool)
+
+    if method == 'mad':
+        threshold = params.get('threshold', 3.5)
+        median = grouped.transform('median')
+        deviation = series - median
+        mad = deviation.abs().groupby([df[c] for c in group_columns]).transform('median')
+        modified_zscore = 0.6745 * deviation / mad
+        return (modified_zscore.abs() > threshold).fillna(False).astype(bool)
+
+    if method not in _MODEL_MIN_GROUP_SIZE:
+        raise ValueError(f"Unknown method: {method}")
+
+    from joblib import Parallel, delayed, cpu_count
+
+    detector_params = {k: v for k, v in params.items() if k not in ('n_jobs', 'min_group_size')}
+    min_group_size = params.get('min_group_size', _MODEL_MIN_GROUP_SIZE[method])
+    if min_group_size is None:
+        min_group_size = detector_params.get('min_samples', 5)
+
+    values = series.to_numpy(dtype=np.float64)
+    groups = [pos for pos in grouped.indices.values() if len(pos) >= min_group_size]
+    mask = np.zeros(len(df), dtype=bool)
+    if not groups:
+        return pd.Series(mask, index=df.index)
+
+    n_jobs = params.get('n_jobs', -1)
+    n_workers = cpu_count() if n_jobs is None or n_jobs < 0 else max(1, n_jobs)
+    # 按行数均衡地把分组切成批次，避免每个分组单独调度的开销
+    n_chunks = min(len(groups), n_workers * 4)
+    sizes = np.cumsum([len(pos) for pos in groups])
+    bounds = np.searchsorted(sizes, np.linspace(0, sizes[-1], n_chunks + 1)[1:-1], side='right')
+    chunks = [c for c in np.split(np.arange(len(groups)), bounds) if len(c)]
+
+    if n_workers == 1 or len(chunks) == 1:
+        flagged = [_detect_outlier_chunk(values, groups, method, detector_params)]
+    else:
+        flagged = Parallel(n_jobs=n_workers)(
+            delayed(_detect_outlier_chunk)(values, [groups[i] for i in chunk], method, detector_params)
+            for chunk in chunks
+        )
+    mask[np.concatenate(flagged)] = True
+    return pd.Series(mask, index=df.index)
+
 def detect_outliers_tools(
     series: pd.Series,
     method: str = 'iqr',
@@ -540,6 +787,7 @@ def detect_outliers_tools(
     Returns:
         布尔序列,True表示异常值
     """
+    from scipy import stats
     params = params or {}
     
     if method == 'iqr':
@@ -580,12 +828,108 @@ def detect_outliers_tools(
     else:
         raise ValueError(f"Unknown method: {method}")
 
+def _onehot_block(series: pd.Series, prefix: str, sparse: bool) -> pd.DataFrame:
+    """一次性构建one-hot列块；sparse=True时经scipy CSR生成SparseDtype列"""
+    codes, categories = pd.factorize(series, sort=True)
+    names = [f"{prefix}_{c}" for c in categories]
+    if not sparse:
+        block = np.zeros((len(series), len(categories)), dtype=bool)
+        observed = np.flatnonzero(codes >= 0)
+        block[observed, codes[observed]] = True
+        return pd.DataFrame(block, columns=names, index=series.index)
+
+    from scipy import sparse as sp
+    observed = np.flatnonzero(codes >= 0)
+    matrix = sp.csr_matrix(
+        (np.ones(len(observed), dtype=np.uint8), (observed, codes[observed])),
+        shape=(len(series), len(categories))
+    )
+    return pd.DataFrame.sparse.from_spmatrix(matrix, index=series.index, columns=names)
+
+
+def _hash_block(series: pd.Series, prefix: str, n_features: int, sparse: bool) -> pd.DataFrame:
+    """固定宽度的带符号特征哈希编码，缺失值编码为全0"""
+    values = series.astype(str).to_numpy(dtype=object)
+    hashed = pd.util.hash_array(values, categorize=True)
+    bucket = (hashed % np.uint64(n_features)).astype(np.intp)
+    sign = np.where((hashed >> np.uint64(63)) == 0, 1, -1).astype(np.int8)
+    sign[series.isna().to_numpy()] = 0
+    names = [f"{prefix}_hash_{i}" for i in range(n_features)]
+    if sparse:
+        from scipy import sparse as sp
+        nonzero = np.flatnonzero(sign)
+        matrix = sp.csr_matrix((sign[nonzero], (nonzero, bucket[nonzero])), shape=(len(series), n_features))
+        return pd.DataFrame.sparse.from_spmatrix(matrix, index=series.index, columns=names)
+    block = np.zeros((len(series), n_features), dtype=np.int8)
+    block[np.arange(len(series)), bucket] = sign
+    return pd.DataFrame(block, columns=names, index=series.index)
+
+
+def _target_encode_block(series: pd.Series, target_values: pd.Series, target_col: str,
+                         smoothing: float, folds: int, random_state: int) -> pd.DataFrame:
+    """
+    平滑目标均值编码（折外）
+
+    每行的编码只由其他折的样本计算: 类别和全局的和/计数一次bincount得到, 再减去本折的部分,
+    因此编码值不包含该行自身的标签。folds < 2 时退化为全样本编码。
+    """
+    codes, _ = pd.factorize(series)
+    n_categories = max(int(codes.max(initial=-1)) + 1, 1)
+    y = target_values.to_numpy(dtype=float, na_value=np.nan)
+    labelled = ~np.isnan(y)
+    y_filled = np.where(labelled, y, 0.0)
+    known = (codes >= 0) & labelled
+
+    folds = min(int(folds), int(labelled.sum())) if folds else 0
+    if folds < 2:
+        fold_ids = np.zeros(len(series), dtype=np.int64)
+        folds = 1
+    else:
+        fold_ids = np.random.RandomState(random_state).permutation(len(series)) % folds
+
+    # 每折每类别的目标和/计数 (folds × n_categories)
+    flat = fold_ids[known] * n_categories + codes[known]
+    fold_sum = np.bincount(flat, weights=y_filled[known], minlength=folds * n_categories).reshape(folds, n_categories)
+    fold_count = np.bincount(flat, minlength=folds * n_categories).reshape(folds, n_categories)
+    fold_total = np.bincount(fold_ids[labelled], weights=y_filled[labelled], minlength=folds)
+    fold_rows = np.bincount(fold_ids[labelled], minlength=folds)
+
+    if folds == 1:
+        # 全样本编码: 不扣除任何部分
+        prior = fold_total / np.maximum(fold_rows, 1)
+        cat_sum, cat_count = fold_sum[0], fold_count[0]
+        row_prior = np.full(len(series), prior[0])
+        safe_codes = np.maximum(codes, 0)
+        row_sum, row_count = cat_sum[safe_codes], cat_count[safe_codes]
+    else:
+        # 折外: 总量减去本折
+        other_rows = fold_rows.sum() - fold_rows
+        prior = (fold_total.sum() - fold_total) / np.maximum(other_rows, 1)
+        prior = np.where(other_rows > 0, prior, np.nanmean(y) if labelled.any() else 0.0)
+        row_prior = prior[fold_ids]
+        safe_codes = np.maximum(codes, 0)
+        row_sum = fold_sum.sum(axis=0)[safe_codes] - fold_sum[fold_ids, safe_codes]
+        row_count = fold_count.sum(axis=0)[safe_codes] - fold_count[fold_ids, safe_codes]
+
+    encoded = (row_sum + smoothing * row_prior) / np.maximum(row_count + smoothing, 1e-12)
+    # 缺失类别和没有其他样本的类别取先验
+    encoded = np.where((codes < 0) | (row_count == 0), row_prior, encoded)
+    return pd.DataFrame({f"{target_col}_target": encoded}, index=series.index)
+
+
 def encode_categorical_tools(data: pd.DataFrame, 
                       target_columns: Union[str, List[str]], 
                       method: str = 'auto',
                       group_columns: Optional[Union[str, List[str]]] = None,
                       handle_unknown: str = 'ignore',
-                      keep_original: bool = True) -> pd.DataFrame:
+                      keep_original: bool = True,
+                      max_onehot_cardinality: int = 50,
+                      sparse: bool = False,
+                      hash_features: int = 32,
+                      target: Optional[Union[str, pd.Series]] = None,
+                      smoothing: float = 10.0,
+                      target_folds: int = 5,
+                      random_state: int = 42) -> pd.DataFrame:
     """
     通用的类别特征编码函数
     
@@ -593,21 +937,39 @@ def encode_categorical_tools(data: pd.DataFrame,
         data: 输入数据框
         target_columns: 需要编码的目标列
         method: 编码方法
-            - 'auto': 自动选择(默认使用one-hot编码)
+            - 'auto': 按基数自动选择：不超过max_onehot_cardinality用one-hot；
+              更高基数时，提供target则用目标编码，近似ID列（唯一值占比>50%）用频率编码，否则用哈希编码
             - 'label': 标签编码
-            - 'onehot': One-hot编码
+            - 'onehot': One-hot编码（基数超过max_onehot_cardinality时自动输出稀疏列）
             - 'frequency': 频率编码
             - 'count': 计数编码
+            - 'hash': 固定宽度（hash_features列）的特征哈希编码
+            - 'target': 平滑目标均值编码（需提供target），按target_folds折做折外(out-of-fold)编码，
+              每行只使用其他折的目标值，避免标签泄漏
         group_columns: 分组列(用于分组编码)
         handle_unknown: 处理未知类别的方式
         keep_original: 是否保留原始类别列，默认为True
+        max_onehot_cardinality: 'auto'下使用one-hot的最大类别数
+        sparse: one-hot/哈希编码是否输出稀疏列(SparseDtype)
+        hash_features: 哈希编码的输出列数
+        target: 目标列名或目标序列（用于目标编码）
+        smoothing: 目标编码的平滑强度（向全局均值收缩的等效样本数）
+        target_folds: 目标编码的折数；小于2时使用全部样本编码（会泄漏标签，仅用于推断/已划分的数据）
+        random_state: 目标编码划分折时的随机种子
         
     Returns:
-        编码后的数据框
+        编码后的数据框（所有新列一次性拼接）
     """
     df = data.copy()
     if isinstance(target_columns, str):
         target_columns = [target_columns]
+
+    target_values = None
+    if target is not None:
+        target_values = df[target] if isinstance(target, str) else pd.Series(target, index=df.index)
+        if not pd.api.types.is_numeric_dtype(target_values):
+            warnings.warn("Target encoding requires a numeric target; target will be ignored")
+            target_values = None
     
     # 过滤出真正需要编码的列
     columns_to_encode = []
@@ -618,47 +980,74 @@ def encode_categorical_tools(data: pd.DataFrame,
             continue
             
         # 检查列的类型
-        if df[col].dtype == 'object':
-            # 对象类型直接加入编码列表
+        if not pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            # 对象/字符串/类别类型直接加入编码列表
             columns_to_encode.append(col)
         elif pd.api.types.is_numeric_dtype(df[col]):
             # 数值类型需要检查是否为分类变量
             unique_count = df[col].nunique()
             if unique_count < len(df[col]) * 0.05:  # 如果不同值的数量小于5%，认为是分类变量
                 columns_to_encode.append(col)
-                df[col] = df[col].astype(str)  # 转换为字符串
     
+    new_blocks = []
+    encoded_columns = []
     for target_col in columns_to_encode:
         try:
-            if method == 'auto' or method == 'onehot':
-                dummies = pd.get_dummies(df[target_col], prefix=target_col, drop_first=False)
-                df = pd.concat([df, dummies], axis=1)
-                if not keep_original:
-                    df.drop(columns=[target_col], inplace=True)
+            series = df[target_col]
+            col_method = method
+            cardinality = series.nunique()
+            if col_method == 'auto':
+                if cardinality <= max_onehot_cardinality:
+                    col_method = 'onehot'
+                elif target_values is not None:
+                    col_method = 'target'
+                elif cardinality > 0.5 * len(series):
+                    col_method = 'frequency'
+                else:
+                    col_method = 'hash'
+
+            if col_method == 'onehot':
+                # 数值型分类列按字符串取值命名，与原先的字符串转换保持一致
+                values = series.astype(str).where(series.notna()) if pd.api.types.is_numeric_dtype(series) else series
+                new_blocks.append(_onehot_block(values, target_col, sparse or cardinality > max_onehot_cardinality))
                     
-            elif method == 'label':
-                encoder = LabelEncoder()
-                df[f"{target_col}_encoded"] = encoder.fit_transform(df[target_col].astype(str))
-                if not keep_original:
-                    df.drop(columns=[target_col], inplace=True)
+            elif col_method == 'label':
+                codes, _ = pd.factorize(series.astype(str), sort=True)
+                new_blocks.append(pd.DataFrame({f"{target_col}_encoded": codes}, index=df.index))
                     
-            elif method == 'frequency':
-                freq = df[target_col].value_counts(normalize=True)
-                df[f"{target_col}_freq"] = df[target_col].map(freq)
-                if not keep_original:
-                    df.drop(columns=[target_col], inplace=True)
+            elif col_method == 'frequency':
+                freq = series.value_counts(normalize=True)
+                new_blocks.append(series.map(freq).rename(f"{target_col}_freq").to_frame())
                     
-            elif method == 'count':
+            elif col_method == 'count':
                 if group_columns:
-                    df[f"{target_col}_count"] = df.groupby(group_columns)[target_col].transform('count')
+                    counts = df.groupby(group_columns)[target_col].transform('count')
                 else:
-                    df[f"{target_col}_count"] = df[target_col].map(df[target_col].value_counts())
-                if not keep_original:
-                    df.drop(columns=[target_col], inplace=True)
+                    counts = series.map(series.value_counts())
+                new_blocks.append(counts.rename(f"{target_col}_count").to_frame())
+
+            elif col_method == 'hash':
+                new_blocks.append(_hash_block(series, target_col, hash_features, sparse))
+
+            elif col_method == 'target':
+                if target_values is None:
+                    raise ValueError("Target encoding requires a numeric 'target'")
+                new_blocks.append(_target_encode_block(series, target_values, target_col, smoothing,
+                                                       target_folds, random_state))
+
+            else:
+                raise ValueError(f"Unknown encoding method: {col_method}")
+
+            encoded_columns.append(target_col)
                     
         except Exception as e:
             warnings.warn(f"Error encoding column {target_col}: {str(e)}")
             continue
+
+    if not keep_original and encoded_columns:
+        df = df.drop(columns=encoded_columns)
+    if new_blocks:
+        df = pd.concat([df] + new_blocks, axis=1)
                 
     return df
 
@@ -693,6 +1082,7 @@ def transform_features(data: pd.DataFrame,
     返回:
         Tuple[pd.DataFrame, object]: (转换后的数据框, 使用的scaler)
     """
+    from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler, PowerTransformer
     # 统一输入格式和验证
     columns = [columns] if isinstance(columns, str) else columns
     if missing := set(columns) - set(data.columns):
@@ -810,11 +1200,84 @@ def transform_features(data: pd.DataFrame,
     
     return result, scaler
 
+# 已拟合的降维器缓存：{缓存键: {'reducer': 拟合对象, 'columns': 输入列, 'prefix': 输出列前缀}}
+# 按最近使用顺序保留最多_REDUCER_CACHE_SIZE个，更早的只保留在cache_dir中（如有）
+_REDUCER_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_REDUCER_CACHE_SIZE = 16
+
+
+def _remember_reducer(key: str, entry: Dict[str, Any]) -> None:
+    _REDUCER_CACHE[key] = entry
+    _REDUCER_CACHE.move_to_end(key)
+    while len(_REDUCER_CACHE) > _REDUCER_CACHE_SIZE:
+        _REDUCER_CACHE.popitem(last=False)
+
+
+def _store_reducer(key: str, entry: Dict[str, Any], cache_dir: Optional[str]) -> None:
+    _remember_reducer(key, entry)
+    if cache_dir:
+        import joblib
+        os.makedirs(cache_dir, exist_ok=True)
+        joblib.dump(entry, os.path.join(cache_dir, f"reducer_{key}.joblib"))
+
+
+def get_cached_reducer(key: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    按缓存键获取已拟合的降维器（先查内存，再查cache_dir）
+    
+    返回:
+        {'reducer', 'columns', 'prefix'} 或 None
+    """
+    if key in _REDUCER_CACHE:
+        _REDUCER_CACHE.move_to_end(key)
+        return _REDUCER_CACHE[key]
+    if cache_dir:
+        path = os.path.join(cache_dir, f"reducer_{key}.joblib")
+        if os.path.exists(path):
+            import joblib
+            entry = joblib.load(path)
+            _remember_reducer(key, entry)
+            return entry
+    return None
+
+
+def transform_with_cached_reducer(data: pd.DataFrame,
+                                  key: str,
+                                  cache_dir: Optional[str] = None,
+                                  keep_original: bool = True) -> pd.DataFrame:
+    """
+    使用已缓存的降维器变换新的数据划分（不重新拟合）
+    
+    参数:
+        data (pd.DataFrame): 待变换数据，需包含拟合时的输入列
+        key (str): reduce_dimensions返回结果attrs['reducer_key']中的缓存键
+        cache_dir (str, optional): 磁盘缓存目录
+        keep_original (bool): 是否保留原始特征列
+    """
+    entry = get_cached_reducer(key, cache_dir)
+    if entry is None:
+        raise ValueError(f"No cached reducer found for key: {key}")
+    features = data[entry['columns']]
+    if not hasattr(entry['reducer'], 'feature_names_in_'):
+        # 流式拟合的降维器基于numpy数组，不带列名
+        features = features.to_numpy(dtype=np.float64)
+    transformed = entry['reducer'].transform(features)
+    cols = [f"{entry['prefix']}{i+1}" for i in range(transformed.shape[1])]
+    transformed_df = pd.DataFrame(transformed, columns=cols, index=data.index)
+    if keep_original:
+        return pd.concat([data, transformed_df], axis=1)
+    return transformed_df
+
+
 def reduce_dimensions(data: pd.DataFrame,
                      method: str = 'pca',
                      n_components: Union[int, float] = 0.95,
                      target: Optional[pd.Series] = None,
-                     keep_original: bool = True) -> pd.DataFrame:
+                     keep_original: bool = True,
+                     svd_solver: Optional[str] = None,
+                     random_state: int = 42,
+                     use_cache: bool = True,
+                     cache_dir: Optional[str] = None) -> pd.DataFrame:
     """
     使用PCA或LDA进行降维。
     
@@ -827,13 +1290,21 @@ def reduce_dimensions(data: pd.DataFrame,
             注意：对于LDA，组件数不能超过min(特征数量, 类别数-1)
         target (pd.Series, optional): 目标变量，LDA方法需要
         keep_original (bool): 是否保留原始特征列，默认为True
+        svd_solver (str, optional): PCA求解器；默认自动选择——整数n_components
+            远小于特征数（不超过min(样本数, 特征数)的10%）时使用随机化SVD
+        random_state (int): 随机化SVD的随机种子
+        use_cache (bool): 是否按数据指纹复用已拟合的降维器
+        cache_dir (str, optional): 降维器的磁盘缓存目录（跨会话/跨章节复用）
     
     返回:
-        pd.DataFrame: 降维后的数据框，如果keep_original=True，则包含原始特征
+        pd.DataFrame: 降维后的数据框，如果keep_original=True，则包含原始特征；
+            attrs['reducer_key']为缓存键，可配合transform_with_cached_reducer变换新数据
         
     异常:
         ValueError: 当指定了无效的方法或参数时
     """
+    from sklearn.decomposition import PCA
+    from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
     if method not in ['pca', 'lda']:
         raise ValueError("Method must be 'pca' or 'lda'")
         
@@ -851,33 +1322,148 @@ def reduce_dimensions(data: pd.DataFrame,
     non_numeric = data.select_dtypes(exclude=['number']).columns
     if len(non_numeric):
         raise ValueError(f"Non-numeric columns found: {non_numeric}")
+
+    if method == 'pca' and svd_solver is None:
+        is_int = isinstance(n_components, (int, np.integer)) and not isinstance(n_components, bool)
+        svd_solver = 'randomized' if is_int and n_components <= 0.1 * min(data.shape) else 'auto'
+
+    key = None
+    if use_cache:
+        key_parts = [dataset_fingerprint(data), method, repr(n_components), str(svd_solver), str(random_state)]
+        if method == 'lda':
+            key_parts.append(dataset_fingerprint(pd.DataFrame({'target': np.asarray(target)})))
+        key = hashlib.sha1('|'.join(key_parts).encode()).hexdigest()
+    entry = get_cached_reducer(key, cache_dir) if key else None
         
     if method == 'pca':
-        reducer = PCA(n_components=n_components)
-        transformed = reducer.fit_transform(data)
+        if entry is not None:
+            transformed = entry['reducer'].transform(data)
+        else:
+            reducer = PCA(n_components=n_components, svd_solver=svd_solver,
+                          random_state=random_state if svd_solver == 'randomized' else None)
+            # fit后再transform，保证与缓存命中时的结果一致（随机化SVD的fit_transform是近似投影）
+            transformed = reducer.fit(data).transform(data)
         
         # Create column names
         cols = [f'PC{i+1}' for i in range(transformed.shape[1])]
         
     else:  # LDA
-        reducer = LinearDiscriminantAnalysis(n_components=n_components)
-        transformed = reducer.fit_transform(data, target)
+        if entry is not None:
+            transformed = entry['reducer'].transform(data)
+        else:
+            reducer = LinearDiscriminantAnalysis(n_components=n_components)
+            transformed = reducer.fit_transform(data, target)
         
         # Create column names  
         cols = [f'LD{i+1}' for i in range(transformed.shape[1])]
+
+    if key and entry is None:
+        _store_reducer(key, {'reducer': reducer, 'columns': list(data.columns),
+                             'prefix': 'PC' if method == 'pca' else 'LD'}, cache_dir)
     
     # 创建降维后的数据框
     transformed_df = pd.DataFrame(transformed, columns=cols, index=data.index)
     
     # 如果需要保留原始特征，则合并原始特征和降维特征
     if keep_original:
-        return pd.concat([data, transformed_df], axis=1)
+        result = pd.concat([data, transformed_df], axis=1)
+    else:
+        result = transformed_df
+    result.attrs['reducer_key'] = key
+    return result
+
+
+def _iter_source_chunks(source: str, columns: Optional[List[str]], chunksize: int):
+    """按块读取CSV或Parquet文件"""
+    if source.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
     else:
-        return transformed_df
+        for chunk in pd.read_csv(source, usecols=columns, chunksize=chunksize):
+            yield chunk
+
+
+def reduce_dimensions_incremental(source: str,
+                                  n_components: int,
+                                  columns: Optional[List[str]] = None,
+                                  chunksize: int = 50000,
+                                  output_path: Optional[str] = None,
+                                  use_cache: bool = True,
+                                  cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    使用IncrementalPCA对超出内存的数据集进行流式降维。
+    
+    参数:
+        source (str): CSV或Parquet文件路径，按chunksize分块读取
+        n_components (int): 保留的组件数（正整数，不超过列数和总行数；行数不足的块与相邻块合并后再拟合）
+        columns (List[str], optional): 参与降维的数值列，默认使用第一块中的全部数值列
+        chunksize (int): 每块行数
+        output_path (str, optional): 若提供，第二遍流式变换并把PC列追加写入该CSV
+        use_cache (bool): 是否按文件指纹复用已拟合的降维器
+        cache_dir (str, optional): 降维器的磁盘缓存目录
+    
+    返回:
+        dict: reducer_key, n_samples, explained_variance_ratio, output_path
+    """
+    from sklearn.decomposition import IncrementalPCA
+
+    if isinstance(n_components, bool) or not isinstance(n_components, (int, np.integer)) or n_components < 1:
+        raise ValueError(f"n_components must be a positive integer for incremental PCA, got {n_components!r}")
+    if columns is None:
+        first = next(_iter_source_chunks(source, None, min(chunksize, 1000)))
+        columns = first.select_dtypes(include=[np.number]).columns.tolist()
+    if not columns:
+        raise ValueError("No numeric columns found for dimensionality reduction")
+    if n_components > len(columns):
+        raise ValueError(f"n_components={n_components} exceeds the number of columns ({len(columns)})")
+
+    key = None
+    entry = None
+    if use_cache:
+        key_parts = [file_fingerprint(source), 'ipca', repr(n_components), ','.join(map(str, columns))]
+        key = hashlib.sha1('|'.join(key_parts).encode()).hexdigest()
+        entry = get_cached_reducer(key, cache_dir)
+
+    if entry is None:
+        reducer = IncrementalPCA(n_components=n_components)
+        # IncrementalPCA要求每块样本数不少于组件数：块延后一步拟合，过小的块（含尾块）并入前一块
+        held = None
+        for chunk in _iter_source_chunks(source, columns, chunksize):
+            values = chunk.fillna(chunk.mean()).to_numpy(dtype=np.float64)
+            if held is not None and len(held) >= n_components and len(values) >= n_components:
+                reducer.partial_fit(held)
+                held = values
+            else:
+                held = values if held is None else np.vstack([held, values])
+        if held is None or len(held) < n_components:
+            raise ValueError(f"n_components={n_components} exceeds the number of rows "
+                             f"({0 if held is None else len(held)}) in {source}")
+        reducer.partial_fit(held)
+        entry = {'reducer': reducer, 'columns': list(columns), 'prefix': 'PC'}
+        if key:
+            _store_reducer(key, entry, cache_dir)
+    reducer = entry['reducer']
+
+    if output_path:
+        cols = [f'PC{i+1}' for i in range(reducer.n_components_)]
+        header = True
+        for chunk in _iter_source_chunks(source, columns, chunksize):
+            chunk = chunk.fillna(chunk.mean())
+            transformed = pd.DataFrame(reducer.transform(chunk.to_numpy(dtype=np.float64)), columns=cols)
+            transformed.to_csv(output_path, mode='w' if header else 'a', header=header, index=False)
+            header = False
+
+    return {
+        'reducer_key': key,
+        'n_samples': int(reducer.n_samples_seen_),
+        'explained_variance_ratio': reducer.explained_variance_ratio_.tolist(),
+        'output_path': output_path,
+    }
 
 from multiprocessing import cpu_count
 from functools import partial
-from sklearn.linear_model import LassoCV
 
 def select_features(data: pd.DataFrame,
                    target: Optional[pd.Series] = None,
@@ -916,6 +1502,12 @@ def select_features(data: pd.DataFrame,
     异常:
         ValueError: 当指定了无效的方法或缺少必需参数时
     """
+    from scipy import stats
+    from sklearn.preprocessing import LabelEncoder
+    from sklearn.feature_selection import SelectKBest, mutual_info_classif, mutual_info_regression
+    from sklearn.feature_selection import VarianceThreshold, RFE
+    from sklearn.linear_model import Lasso, LassoCV, LogisticRegression
+    from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
     params = params or {}
     n_jobs = params.get('n_jobs', -1)
     if n_jobs == -1:
@@ -1073,28 +1665,127 @@ def select_features(data: pd.DataFrame,
 
     return selected_columns
 
+def _polynomial_candidates(columns: List[str], degree: int,
+                           interaction_only: bool) -> List[Tuple[str, Tuple[int, ...]]]:
+    """列出待生成的多项式/交互项：[(特征名, 参与相乘的列下标)]，顺序与逐列生成时一致"""
+    candidates = []
+    if not interaction_only:
+        for i, col in enumerate(columns):
+            # 始终从2次项开始，因为1次项就是原始列
+            for d in range(2, degree + 1):
+                candidates.append((f"{col}^{d}", (i,) * d))
+    if len(columns) > 1:
+        seen = set()
+        for d in range(2, degree + 1):
+            for combo in combinations(range(len(columns)), min(d, len(columns))):
+                if combo not in seen:
+                    seen.add(combo)
+                    candidates.append((' * '.join(columns[i] for i in combo), combo))
+    return candidates
+
+
+def estimate_polynomial_features(n_rows: int,
+                                 n_columns: int,
+                                 degree: int = 2,
+                                 interaction_only: bool = False,
+                                 dtype: str = 'float64') -> Dict[str, Any]:
+    """
+    在生成之前估算多项式特征的数量和稠密输出的内存占用。
+    
+    返回:
+        dict: n_features（新增特征数）, bytes（稠密存储字节数）, mb
+    """
+    columns = [str(i) for i in range(n_columns)]
+    n_features = len(_polynomial_candidates(columns, degree, interaction_only))
+    n_bytes = int(n_rows) * n_features * np.dtype(dtype).itemsize
+    return {'n_features': n_features, 'bytes': n_bytes, 'mb': n_bytes / 1024 ** 2}
+
+
+def _screen_polynomial_candidates(base: np.ndarray,
+                                  candidates: List[Tuple[str, Tuple[int, ...]]],
+                                  target: pd.Series,
+                                  method: str,
+                                  sample_size: int,
+                                  block_size: int,
+                                  random_state: int = 42) -> np.ndarray:
+    """在行样本上分块计算每个候选特征与目标的相关性/互信息得分"""
+    valid = target.notna().to_numpy()
+    rows = np.flatnonzero(valid)
+    if len(rows) > sample_size:
+        rows = np.sort(np.random.RandomState(random_state).choice(rows, sample_size, replace=False))
+    sample = base[rows].astype(np.float64)
+    y = target.to_numpy()[rows]
+    is_classification = not pd.api.types.is_numeric_dtype(target) or target.nunique() <= 20
+    if not pd.api.types.is_numeric_dtype(target):
+        y = pd.factorize(y)[0]
+    y = y.astype(np.float64)
+
+    scores = np.zeros(len(candidates))
+    for start in range(0, len(candidates), block_size):
+        block = candidates[start:start + block_size]
+        values = np.column_stack([sample[:, list(idx)].prod(axis=1) for _, idx in block])
+        # 缺失值用列均值填充，避免单个缺失拖垮整列得分
+        col_means = np.nanmean(values, axis=0)
+        nan_rows, nan_cols = np.where(np.isnan(values))
+        values[nan_rows, nan_cols] = np.nan_to_num(col_means[nan_cols])
+        if method == 'mutual_info':
+            from sklearn.feature_selection import mutual_info_classif, mutual_info_regression
+            mi = mutual_info_classif if is_classification else mutual_info_regression
+            scores[start:start + len(block)] = mi(values, y.astype(int) if is_classification else y,
+                                                  random_state=random_state)
+        else:
+            centered = values - values.mean(axis=0)
+            y_centered = y - y.mean()
+            denom = np.sqrt((centered ** 2).sum(axis=0) * (y_centered ** 2).sum())
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr = np.abs(centered.T @ y_centered) / denom
+            scores[start:start + len(block)] = np.nan_to_num(corr)
+    return scores
+
+
 def create_polynomial_features(data: pd.DataFrame,
                              columns: Union[str, List[str]],
                              degree: int = 2,
                              interaction_only: bool = False,
-                             keep_original: bool = True) -> pd.DataFrame:
+                             keep_original: bool = True,
+                             max_memory_mb: Optional[float] = 1024,
+                             dtype: str = 'float64',
+                             sparse: bool = False,
+                             target: Optional[Union[str, pd.Series]] = None,
+                             screening: Optional[str] = None,
+                             max_features: Optional[int] = None,
+                             block_size: int = 256,
+                             screening_sample: int = 5000) -> pd.DataFrame:
     """
     创建多项式和交互特征。
     
+    生成前先估算输出大小；候选特征按列块逐块计算，不会一次性展开成一个巨大的稠密数组。
+    
     参数:
         data (pd.DataFrame): 输入数据框
         columns (Union[str, List[str]]): 用于创建多项式的列
         degree (int): 最高多项式次数
         interaction_only (bool): 如果为True，则只创建交互特征
         keep_original (bool): 是否保留原始列，默认为True
+        max_memory_mb (float, optional): 新增特征的内存预算（MB），None表示不限制。
+            超出预算时：若提供了target则自动筛选到预算内的最佳特征，否则抛出ValueError
+        dtype (str): 新增特征的数据类型，'float64'或'float32'
+        sparse (bool): 是否以稀疏列输出新增特征（适合大量零值的数据）
+        target (Union[str, pd.Series], optional): 目标变量（列名或Series），用于候选特征筛选
+        screening (str, optional): 筛选方式，'correlation'（绝对相关系数）或'mutual_info'（互信息）；
+            提供target但未指定时默认为'correlation'
+        max_features (int, optional): 筛选后最多保留的新增特征数
+        block_size (int): 每个列块包含的候选特征数
+        screening_sample (int): 筛选时使用的最大样本行数
         
     返回:
         pd.DataFrame: 数据框
             - 如果keep_original=True，包含原始特征和新增多项式特征
             - 如果keep_original=False，只包含非指定原始列和新增多项式特征
+            attrs['polynomial_info']记录候选数、保留数和估算内存
         
     异常:
-        ValueError: 当参数无效或列不是数值类型时
+        ValueError: 当参数无效、列不是数值类型或超出内存预算时
     """
     if isinstance(columns, str):
         columns = [columns]
@@ -1111,44 +1802,80 @@ def create_polynomial_features(data: pd.DataFrame,
         
     if degree < 1:
         raise ValueError("Degree must be >= 1")
-        
-    # 创建结果DataFrame
-    result = data.copy()
-    
-    # 创建多项式特征
-    poly_features = pd.DataFrame(index=data.index)
-    
-    # Create single column polynomials
-    if not interaction_only:
-        for col in columns:
-            # 始终从2次项开始，因为1次项就是原始列
-            start_degree = 2
-            for d in range(start_degree, degree + 1):
-                poly_features[f"{col}^{d}"] = data[col] ** d
-            
-            # 如果保留原始列，添加1次项（即原始列的副本）
-            if keep_original:
-                poly_features[col] = data[col]
-                
-    # Create interactions
-    if len(columns) > 1:
-        for d in range(2, degree + 1):
-            for combo in combinations(columns, min(d, len(columns))):
-                name = ' * '.join(combo)
-                poly_features[name] = data[list(combo)].prod(axis=1)
-    
+
+    if dtype not in ('float64', 'float32'):
+        raise ValueError("dtype must be 'float64' or 'float32'")
+
+    if screening not in (None, 'correlation', 'mutual_info'):
+        raise ValueError("screening must be 'correlation' or 'mutual_info'")
+
+    if isinstance(target, str):
+        if target not in data.columns:
+            raise ValueError(f"Target column not found: {target}")
+        target = data[target]
+    if screening is not None and target is None:
+        raise ValueError("Target required for candidate screening")
+    if target is not None and screening is None:
+        screening = 'correlation'
+
+    candidates = _polynomial_candidates(list(map(str, columns)), degree, interaction_only)
+    n_candidates = len(candidates)
+    itemsize = np.dtype(dtype).itemsize
+    n_rows = len(data)
+    estimated_mb = n_rows * len(candidates) * itemsize / 1024 ** 2
+
+    base = data[columns].to_numpy(dtype=np.float64)
+    keep = max_features if max_features is not None else len(candidates)
+    if max_memory_mb is not None and n_rows > 0:
+        budget_features = int(max_memory_mb * 1024 ** 2 // (n_rows * itemsize))
+        if budget_features < min(keep, len(candidates)):
+            if screening is None:
+                raise ValueError(
+                    f"Polynomial expansion would create {len(candidates)} features "
+                    f"(~{estimated_mb:.0f} MB), exceeding max_memory_mb={max_memory_mb}. "
+                    f"Reduce columns/degree, use dtype='float32', or pass target/max_features to screen candidates."
+                )
+            keep = budget_features
+
+    if screening is not None and keep < len(candidates):
+        scores = _screen_polynomial_candidates(base, candidates, target, screening,
+                                               screening_sample, block_size)
+        # 保留得分最高的特征，但维持原始生成顺序
+        selected = np.sort(np.argsort(-scores, kind='stable')[:max(keep, 0)])
+        candidates = [candidates[i] for i in selected]
+    elif keep < len(candidates):
+        candidates = candidates[:max(keep, 0)]
+
+    # 按列块生成新增特征
+    blocks = []
+    for start in range(0, len(candidates), block_size):
+        block = candidates[start:start + block_size]
+        values = np.empty((n_rows, len(block)), dtype=dtype)
+        for j, (_, idx) in enumerate(block):
+            values[:, j] = base[:, list(idx)].prod(axis=1)
+        names = [name for name, _ in block]
+        if sparse:
+            from scipy import sparse as sp
+            blocks.append(pd.DataFrame.sparse.from_spmatrix(sp.csc_matrix(values), index=data.index, columns=names))
+        else:
+            blocks.append(pd.DataFrame(values, index=data.index, columns=names))
+
     # 如果不保留原始列，从结果中删除这些列
-    if not keep_original:
-        result = result.drop(columns=columns)
-    
-    # 将多项式特征添加到结果中
-    result = pd.concat([result, poly_features], axis=1)
-    
-    # 确保不重复添加原始列
-    if keep_original:
-        # 删除可能重复的列（保留第一个出现的）
-        result = result.loc[:, ~result.columns.duplicated()]
-                
+    result = data if keep_original else data.drop(columns=columns)
+
+    # 将多项式特征一次性添加到结果中
+    result = pd.concat([result] + blocks, axis=1)
+
+    # 确保不重复添加原始列（保留第一个出现的）
+    result = result.loc[:, ~result.columns.duplicated()]
+    result.attrs['polynomial_info'] = {
+        'estimated_mb': round(estimated_mb, 2),
+        'candidates': n_candidates,
+        'created': len(candidates),
+        'screening': screening,
+        'dtype': dtype,
+        'sparse': sparse,
+    }
     return result
 
 def discretize_features(data: pd.DataFrame,
@@ -2,6 +2,7 @@
 Utility functions for VDS Tools
 """
 
+import hashlib
 import pandas as pd
 import numpy as np
 import os
@@ -101,6 +102,21 @@ def create_summary_stats(data: pd.DataFrame, column: str) -> Dict[str, Any]:
         }
 
 
+def dataset_fingerprint(data: pd.DataFrame) -> str:
+    """Content hash of a DataFrame (columns, dtypes and values; index ignored)"""
+    digest = hashlib.sha1()
+    digest.update(repr((data.shape, list(map(str, data.columns)), list(map(str, data.dtypes)))).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def file_fingerprint(file_path: str) -> str:
+    """Cheap fingerprint of a file on disk (absolute path, size and modification time)"""
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
 def generate_correlation_matrix(data: pd.DataFrame, method: str = 'pearson') -> pd.DataFrame:
     """Generate correlation matrix for numeric columns"""
     numeric_data = data.select_dtypes(include=[np.number])
@@ -131,58 +147,25 @@ def detect_outliers_zscore(series: pd.Series, threshold: float = 3.0) -> pd.Seri
 
 def create_html_table(data: pd.DataFrame, title: str = "", max_rows: int = 100) -> str:
     """Create HTML table with VDS styling"""
+    from ..src.html_output import render_frame_table
+    
     if len(data) > max_rows:
-        data = data.head(max_rows)
         truncated_note = f"<p class='vds-note'>Showing first {max_rows} rows of {len(data)} total rows</p>"
     else:
         truncated_note = ""
     
-    html = f"""
+    table_html = render_frame_table(
+        data,
+        max_rows=max_rows,
+        max_cols=data.shape[1],
+        table_class="vds-data-table",
+        sci_format=None,
+    )
+    
+    return f"""
     <vds-section>
         <vds-title>{title}</vds-title>
         {truncated_note}
-        <vds-table class="vds-data-table">
-            <vds-thead>
-                <vds-tr>
-    """
-    
-    # Add headers
-    for col in data.columns:
-        html += f'<vds-th class="vds-col-header">{col}</vds-th>'
-    
-    html += """
-                </vds-tr>
-            </vds-thead>
-            <vds-tbody>
-    """
-    
-    # Add data rows
-    for idx, row in data.iterrows():
-        html += '<vds-tr>'
-        for col in data.columns:
-            value = row[col]
-            cell_class = "vds-cell"
-            
-            if pd.isna(value):
-                formatted_value = '<span class="vds-null">NULL</span>'
-                cell_class += " vds-missing"
-            elif isinstance(value, (int, float)):
-                cell_class += " vds-numeric"
-                if isinstance(value, float):
-                    formatted_value = f"{value:.3f}"
-                else:
-                    formatted_value = str(value)
-            else:
-                cell_class += " vds-categorical"
-                formatted_value = str(value)
-            
-            html += f'<vds-td class="{cell_class}">{formatted_value}</vds-td>'
-        html += '</vds-tr>'
-    
-    html += """
-            </vds-tbody>
-        </vds-table>
+        {table_html}
     </vds-section>
     """
-    
-    return html
\ No newline at end of file
@@ -14,7 +14,7 @@ setup(
     description="Simple data science toolkit for DCLS workflow",
     long_description=long_description,
     long_description_content_type="text/markdown",
-    packages=["vdstools", "vdstools.src", "vdstools.core", "vdstools.utils"],
+    packages=["vdstools", "vdstools.src", "vdstools.core", "vdstools.utils", "vdstools.benchmarks"],
     package_dir={"vdstools": "."},
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -35,6 +35,7 @@ setup(
         "seaborn>=0.11.0",
         "scipy>=1.7.0",
         "scikit-learn>=1.0.0",
+        "joblib>=1.4",
     ],
     extras_require={
         "dev": [
@@ -0,0 +1,304 @@
+"""
+Lazy cleaning pipeline
+Queue cleaning, imputation, encoding and feature operations on one in-memory
+frame and write the result once, instead of one CSV round trip per step.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from ..utils.display import Display
+from ..core.ml_tools import (
+    fill_missing_values_tools,
+    remove_columns_tools,
+    handle_outliers_tools,
+    encode_categorical_tools,
+    transform_features,
+    create_polynomial_features,
+)
+from .data_cleaning import (
+    _clean_invalid_values,
+    _clean_missing_values,
+    _clean_outliers,
+    _clean_duplicates,
+    _clean_data_types,
+    _create_error_report,
+)
+from .html_output import css_block, render_frame_table, render_info_table
+
+StepFunction = Callable[..., Union[pd.DataFrame, Tuple[Any, ...]]]
+
+
+class CleaningPipeline(Display):
+    """
+    VDS Tools Cleaning Pipeline - Lazy multi-step cleaning with a single write
+
+    Steps are only recorded when added; ``run()`` reads the CSV once, applies
+    every step to the same frame, records per-step diagnostics, writes the
+    output once and returns an HTML report. With ``checkpoint_dir`` set, the
+    frame is saved after each successful step so a re-run after a failure
+    resumes from the last completed step.
+
+    Example:
+        pipeline = CleaningPipeline("data.csv", checkpoint_dir=".vds_checkpoints")
+        pipeline.clean_invalid_values().remove_duplicates() \\
+                .fill_missing("age", method="median") \\
+                .encode_categorical(["city"], method="onehot")
+        pipeline.run()
+    """
+
+    def __init__(self, csv_file_path: str, output_path: Optional[str] = None,
+                 checkpoint_dir: Optional[str] = None):
+        """
+        Initialize CleaningPipeline
+
+        Args:
+            csv_file_path: Path to the source CSV file
+            output_path: Where to write the result (default: <name>_cleaned.csv)
+            checkpoint_dir: Optional directory for per-step checkpoints
+        """
+        super().__init__()
+        self.csv_file_path = csv_file_path
+        self.output_path = output_path or csv_file_path.replace('.csv', '_cleaned.csv')
+        self.checkpoint_dir = checkpoint_dir
+        self.steps: List[Dict[str, Any]] = []
+        self.diagnostics: List[Dict[str, Any]] = []
+        self.data: Optional[pd.DataFrame] = None
+
+    # ------------------------------------------------------------------
+    # Step builders
+    # ------------------------------------------------------------------
+    def add_step(self, name: str, func: StepFunction, **kwargs) -> "CleaningPipeline":
+        """
+        Queue a custom step
+
+        Args:
+            name: Step name shown in the report
+            func: Callable ``func(df, **kwargs)`` returning a DataFrame, or a tuple whose
+                  first element is the DataFrame and (optionally) second a list of issue strings
+            **kwargs: Keyword arguments passed to ``func``
+        """
+        self.steps.append({"name": name, "func": func, "kwargs": kwargs})
+        return self
+
+    def clean_invalid_values(self, **kwargs) -> "CleaningPipeline":
+        return self.add_step("Invalid Values Cleaning", _clean_invalid_values, **kwargs)
+
+    def fill_missing_values(self, **kwargs) -> "CleaningPipeline":
+        return self.add_step("Missing Values Cleaning", _clean_missing_values, **kwargs)
+
+    def remove_outliers(self, **kwargs) -> "CleaningPipeline":
+        return self.add_step("Outliers Cleaning", _clean_outliers, **kwargs)
+
+    def remove_duplicates(self, **kwargs) -> "CleaningPipeline":
+        return self.add_step("Duplicate Removal", _clean_duplicates, **kwargs)
+
+    def optimize_data_types(self, **kwargs) -> "CleaningPipeline":
+        return self.add_step("Data Type Optimization", _clean_data_types, **kwargs)
+
+    def fill_missing(self, target_columns: Union[str, List[str]], **kwargs) -> "CleaningPipeline":
+        return self.add_step("Advanced Missing Fill", fill_missing_values_tools,
+                             target_columns=target_columns, **kwargs)
+
+    def remove_columns(self, **kwargs) -> "CleaningPipeline":
+        return self.add_step("Column Removal", remove_columns_tools, **kwargs)
+
+    def handle_outliers(self, target_columns: Union[str, List[str]], **kwargs) -> "CleaningPipeline":
+        return self.add_step("Outlier Handling", handle_outliers_tools,
+                             target_columns=target_columns, **kwargs)
+
+    def encode_categorical(self, target_columns: Union[str, List[str]], **kwargs) -> "CleaningPipeline":
+        return self.add_step("Categorical Encoding", encode_categorical_tools,
+                             target_columns=target_columns, **kwargs)
+
+    def transform(self, columns: Union[str, List[str]], **kwargs) -> "CleaningPipeline":
+        return self.add_step("Feature Transformation", transform_features, columns=columns, **kwargs)
+
+    def polynomial_features(self, columns: Union[str, List[str]], **kwargs) -> "CleaningPipeline":
+        return self.add_step("Polynomial Features", create_polynomial_features, columns=columns, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+    def _source_signature(self) -> Dict[str, Any]:
+        stat = os.stat(self.csv_file_path)
+        return {"path": os.path.abspath(self.csv_file_path), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+    def _checkpoint_keys(self) -> List[str]:
+        """Cumulative key per step: source file + every step spec up to and including it."""
+        digest = hashlib.sha1(json.dumps(self._source_signature(), sort_keys=True).encode())
+        keys = []
+        for step in self.steps:
+            func = step["func"]
+            spec = {
+                "name": step["name"],
+                "func": f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}",
+                "kwargs": step["kwargs"],
+            }
+            digest.update(json.dumps(spec, sort_keys=True, default=repr).encode())
+            keys.append(digest.copy().hexdigest()[:16])
+        return keys
+
+    def _checkpoint_path(self, key: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"step_{key}.pkl")
+
+    def _restore_checkpoint(self, keys: List[str]) -> Tuple[int, Optional[pd.DataFrame]]:
+        """Return (number of completed steps, frame) from the latest usable checkpoint."""
+        if not self.checkpoint_dir:
+            return 0, None
+        for i in range(len(keys) - 1, -1, -1):
+            path = self._checkpoint_path(keys[i])
+            if os.path.exists(path):
+                try:
+                    return i + 1, pd.read_pickle(path)
+                except Exception:
+                    continue
+        return 0, None
+
+    @staticmethod
+    def _call_step(step: Dict[str, Any], data: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+        result = step["func"](data, **step["kwargs"])
+        if isinstance(result, tuple):
+            issues = result[1] if len(result) > 1 and isinstance(result[1], list) else []
+            return result[0], issues
+        return result, []
+
+    def execute(self) -> pd.DataFrame:
+        """
+        Apply all queued steps in memory without writing the output
+
+        Returns:
+            The resulting DataFrame (also kept on ``self.data``)
+
+        Raises:
+            RuntimeError: If a step fails; completed steps stay checkpointed
+        """
+        keys = self._checkpoint_keys()
+        completed, data = self._restore_checkpoint(keys)
+        if data is None:
+            data = pd.read_csv(self.csv_file_path)
+        if self.checkpoint_dir:
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+        self.diagnostics = [
+            {"step": i + 1, "name": step["name"], "status": "restored", "rows_before": None,
+             "rows_after": None, "cols_before": None, "cols_after": None,
+             "missing_before": None, "missing_after": None, "seconds": 0.0, "issues": []}
+            for i, step in enumerate(self.steps[:completed])
+        ]
+
+        for i in range(completed, len(self.steps)):
+            step = self.steps[i]
+            entry = {
+                "step": i + 1,
+                "name": step["name"],
+                "rows_before": int(data.shape[0]),
+                "cols_before": int(data.shape[1]),
+                "missing_before": int(data.isnull().values.sum()),
+            }
+            start = time.perf_counter()
+            try:
+                data, issues = self._call_step(step, data)
+            except Exception as e:
+                entry.update({"status": "failed", "seconds": time.perf_counter() - start,
+                              "rows_after": None, "cols_after": None, "missing_after": None,
+                              "issues": [str(e)]})
+                self.diagnostics.append(entry)
+                self.data = data
+                raise RuntimeError(f"Step {i + 1} ({step['name']}) failed: {e}") from e
+
+            entry.update({
+                "status": "done",
+                "seconds": time.perf_counter() - start,
+                "rows_after": int(data.shape[0]),
+                "cols_after": int(data.shape[1]),
+                "missing_after": int(data.isnull().values.sum()),
+                "issues": issues,
+            })
+            self.diagnostics.append(entry)
+            if self.checkpoint_dir:
+                data.to_pickle(self._checkpoint_path(keys[i]))
+
+        self.data = data
+        return data
+
+    def run(self, output_path: Optional[str] = None, raise_errors: bool = False) -> str:
+        """
+        Execute the pipeline, write the output once and show an HTML report
+
+        Args:
+            output_path: Optional override for the output CSV path
+            raise_errors: Re-raise a failed step or write after showing the error report,
+                          so callers that depend on the output file cannot miss the failure
+
+        Returns:
+            HTML formatted pipeline report
+        """
+        output_path = output_path or self.output_path
+        try:
+            data = self.execute()
+            data.to_csv(output_path, index=False)
+            html_content = _create_pipeline_report(self.diagnostics, output_path, data.shape)
+        except Exception as e:
+            html_content = _create_pipeline_report(self.diagnostics, None, None) + _create_error_report(str(e))
+            self.show(html_content)
+            if raise_errors:
+                raise
+            return html_content
+        self.show(html_content)
+        return html_content
+
+    def clear_checkpoints(self) -> None:
+        """Remove this pipeline's checkpoint files"""
+        if not self.checkpoint_dir or not self.steps:
+            return
+        for key in self._checkpoint_keys():
+            path = self._checkpoint_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _create_pipeline_report(diagnostics: List[Dict[str, Any]], output_path: Optional[str],
+                            shape: Optional[Tuple[int, int]]) -> str:
+    """Create HTML report with one row of diagnostics per pipeline step"""
+    rows = pd.DataFrame([
+        {
+            "Step": d["step"],
+            "Operation": d["name"],
+            "Status": d["status"],
+            "Rows": "" if d["rows_after"] is None else f"{d['rows_before']:,} → {d['rows_after']:,}",
+            "Columns": "" if d["cols_after"] is None else f"{d['cols_before']} → {d['cols_after']}",
+            "Missing": "" if d["missing_after"] is None else f"{d['missing_before']:,} → {d['missing_after']:,}",
+            "Seconds": round(d["seconds"], 3),
+            "Issues": "; ".join(d["issues"]) if d["issues"] else "",
+        }
+        for d in diagnostics
+    ], columns=["Step", "Operation", "Status", "Rows", "Columns", "Missing", "Seconds", "Issues"])
+    steps_table = render_frame_table(rows, max_rows=max(len(rows), 1), table_class="vds-report-table",
+                                     null_text="",
+                                     row_classes=["vds-row-high" if d["status"] == "failed" else ""
+                                                  for d in diagnostics])
+
+    info = {"Steps": len(diagnostics)}
+    if output_path is not None:
+        info["Output File"] = output_path
+        info["Final Shape"] = f"{shape[0]:,} × {shape[1]}"
+
+    return f"""
+    <vds-cleaning-report>
+        {css_block()}
+        <vds-title>Cleaning Pipeline Report</vds-title>
+        <vds-info-panel>
+            {render_info_table(info)}
+        </vds-info-panel>
+        <vds-section>
+            <vds-title>Step Diagnostics</vds-title>
+            {steps_table}
+        </vds-section>
+    </vds-cleaning-report>
+    """
@@ -5,8 +5,9 @@ Provide stable data processing methods for common data issues
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from ..utils.display import Display
+from .html_output import css_block, render_frame_table, render_info_table
 
 from ..core.ml_tools import (
     fill_missing_values_tools,
@@ -164,23 +165,33 @@ class DataCleaning(Display):
     
     def encode_categorical_data(self, csv_file_path: str, target_columns: Union[str, List[str]],
                                method: str = 'auto', group_columns: Optional[Union[str, List[str]]] = None,
-                               handle_unknown: str = 'ignore', keep_original: bool = True):
+                               handle_unknown: str = 'ignore', keep_original: bool = True,
+                               max_onehot_cardinality: int = 50, sparse: bool = False, hash_features: int = 32,
+                               target: Optional[str] = None, smoothing: float = 10.0, target_folds: int = 5):
         """
         Advanced categorical encoding
         
         Args:
             csv_file_path: Path to CSV file
             target_columns: Columns to encode
-            method: Encoding method ('auto', 'label', 'onehot', 'frequency', 'count')
+            method: Encoding method ('auto', 'label', 'onehot', 'frequency', 'count', 'hash', 'target')
             group_columns: Grouping columns for group-based encoding
             handle_unknown: How to handle unknown categories
             keep_original: Whether to keep original columns
+            max_onehot_cardinality: Largest cardinality 'auto' still one-hot encodes
+            sparse: Emit one-hot/hash columns as sparse columns
+            hash_features: Number of output columns for hash encoding
+            target: Numeric target column for target encoding
+            smoothing: Target encoding shrinkage towards the global mean
+            target_folds: Folds for out-of-fold target encoding (< 2 encodes in-sample and leaks the label)
             
         Returns:
             HTML formatted report with encoding results
         """
         return categorical_encoding_advanced(
-            csv_file_path, target_columns, method, group_columns, handle_unknown, keep_original
+            csv_file_path, target_columns, method, group_columns, handle_unknown, keep_original,
+            max_onehot_cardinality=max_onehot_cardinality, sparse=sparse, hash_features=hash_features,
+            target=target, smoothing=smoothing, target_folds=target_folds
         )
     
     def help(self):
@@ -327,10 +338,17 @@ class DataCleaning(Display):
         PARAMETERS:
         - csv_file_path (str): Path to CSV file
         - target_columns (str|List[str]): Columns to encode
-        - method (str): 'auto', 'label', 'onehot', 'frequency', 'count' (default: 'auto')
+        - method (str): 'auto', 'label', 'onehot', 'frequency', 'count', 'hash', 'target' (default: 'auto';
+          'auto' one-hot encodes low-cardinality columns and target-, frequency- or hash-encodes the rest)
         - group_columns (str|List[str], optional): Grouping columns
         - handle_unknown (str): How to handle new categories (default: 'ignore')
         - keep_original (bool): Keep original columns (default: True)
+        - max_onehot_cardinality (int): Largest cardinality 'auto' one-hot encodes (default: 50)
+        - sparse (bool): Sparse one-hot/hash columns (default: False)
+        - hash_features (int): Output width of hash encoding (default: 32)
+        - target (str, optional): Numeric target column, enables 'target' encoding
+        - smoothing (float): Target encoding shrinkage (default: 10.0)
+        - target_folds (int): Out-of-fold target encoding folds, so no row sees its own label (default: 5)
         OUTPUT: HTML report with encoding results and new columns
         EXAMPLE:
         result = toolkit.encode_categorical_data("data.csv", ["category", "region"], method="onehot")
@@ -369,6 +387,17 @@ class DataCleaning(Display):
         result2 = toolkit.advanced_missing_fill("data_duplicates_removed.csv", 
                                                ["important_col"], method="median")
         
+        5. MULTI-STEP CLEANING WITHOUT INTERMEDIATE FILES:
+        When a plan has several steps, queue them on one in-memory frame and
+        write the result once (per-step diagnostics are included in the report):
+        from vdstools import CleaningPipeline
+        pipeline = CleaningPipeline("data.csv", checkpoint_dir=".vds_checkpoints")
+        pipeline.clean_invalid_values().remove_duplicates().fill_missing_values() \
+                .encode_categorical(["category"], method="onehot")
+        pipeline.run()   # writes data_cleaned.csv once
+        # With checkpoint_dir set, re-running after a failed step resumes
+        # from the last completed step instead of starting over.
+        
         OUTPUT FORMAT:
         ==============
         All methods return HTML strings using custom vds- tags:
@@ -438,37 +467,38 @@ def apply_cleaning_method(csv_file_path: str, method: str, **kwargs) -> str:
         return _create_error_report(f"Error in cleaning process: {str(e)}")
 
 
-def _handle_invalid_values(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
-    """Handle invalid values in dataset"""
+def _clean_invalid_values(data: pd.DataFrame, **kwargs) -> Tuple[pd.DataFrame, List[str]]:
+    """Fix invalid values in memory, returning the frame and the issues fixed"""
     issues_fixed = []
     
-    # Check for common invalid value patterns
-    for col in data.columns:
-        if pd.api.types.is_numeric_dtype(data[col]):
-            # Check for negative values in columns that should be positive
-            if col.lower() in ['age', 'price', 'amount', 'count', 'area', 'size']:
-                negative_count = (data[col] < 0).sum()
-                if negative_count > 0:
-                    data[col] = data[col].abs()  # Convert to absolute values
-                    issues_fixed.append(f"Fixed {negative_count} negative values in {col}")
-            
-            # Check for extremely large values (potential data entry errors)
-            q99 = data[col].quantile(0.99)
-            q75 = data[col].quantile(0.75)
-            if q99 > q75 * 10:  # If 99th percentile is 10x larger than 75th percentile
-                outlier_count = (data[col] > q99).sum()
-                data.loc[data[col] > q99, col] = q99  # Cap at 99th percentile
-                issues_fixed.append(f"Capped {outlier_count} extreme values in {col}")
+    # Check for negative values in columns that should be positive
+    numeric_cols = data.select_dtypes(include=[np.number]).columns
+    positive_cols = [col for col in numeric_cols
+                     if str(col).lower() in ['age', 'price', 'amount', 'count', 'area', 'size']]
+    if positive_cols:
+        negative_counts = (data[positive_cols] < 0).sum()
+        for col, negative_count in negative_counts[negative_counts > 0].items():
+            data[col] = data[col].abs()  # Convert to absolute values
+            issues_fixed.append(f"Fixed {negative_count} negative values in {col}")
     
-    # Save cleaned data
-    output_path = csv_file_path.replace('.csv', '_invalid_values_fixed.csv')
-    data.to_csv(output_path, index=False)
+    # Check for extremely large values (potential data entry errors), computing
+    # both quantiles for all numeric columns in one batched call
+    if len(numeric_cols):
+        quantiles = data[numeric_cols].quantile([0.75, 0.99])
+        # If 99th percentile is 10x larger than 75th percentile
+        extreme_cols = quantiles.columns[quantiles.loc[0.99] > quantiles.loc[0.75] * 10]
+        if len(extreme_cols):
+            q99 = quantiles.loc[0.99, extreme_cols].astype(float)
+            above = data[extreme_cols].gt(q99)
+            for col, outlier_count in above.sum().items():
+                data.loc[above[col], col] = q99[col]  # Cap at 99th percentile
+                issues_fixed.append(f"Capped {outlier_count} extreme values in {col}")
     
-    return _create_cleaning_report("Invalid Values Cleaning", issues_fixed, output_path)
+    return data, issues_fixed
 
 
-def _handle_missing_values(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
-    """Handle missing values using ml_tools"""
+def _clean_missing_values(data: pd.DataFrame, **kwargs) -> Tuple[pd.DataFrame, List[str]]:
+    """Fill or drop missing values in memory using ml_tools"""
     issues_fixed = []
     
     try:
@@ -476,7 +506,7 @@ def _handle_missing_values(data: pd.DataFrame, csv_file_path: str, **kwargs) ->
         missing_cols = data.columns[data.isnull().any()].tolist()
         
         if not missing_cols:
-            return _create_info_report("No missing values found in dataset")
+            return data, []
         
         # Apply different strategies based on column type and missing ratio
         for col in missing_cols:
@@ -514,15 +544,11 @@ def _handle_missing_values(data: pd.DataFrame, csv_file_path: str, **kwargs) ->
     except Exception as e:
         issues_fixed.append(f"Error in missing value handling: {str(e)}")
     
-    # Save cleaned data
-    output_path = csv_file_path.replace('.csv', '_missing_values_fixed.csv')
-    data.to_csv(output_path, index=False)
-    
-    return _create_cleaning_report("Missing Values Cleaning", issues_fixed, output_path)
+    return data, issues_fixed
 
 
-def _handle_outliers(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
-    """Handle outliers using ml_tools"""
+def _clean_outliers(data: pd.DataFrame, **kwargs) -> Tuple[pd.DataFrame, List[str]]:
+    """Clip outliers in memory using ml_tools"""
     issues_fixed = []
     
     try:
@@ -558,30 +584,22 @@ def _handle_outliers(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
     except Exception as e:
         issues_fixed.append(f"Error in outlier handling: {str(e)}")
     
-    # Save cleaned data
-    output_path = csv_file_path.replace('.csv', '_outliers_fixed.csv')
-    data.to_csv(output_path, index=False)
-    
-    return _create_cleaning_report("Outliers Cleaning", issues_fixed, output_path)
+    return data, issues_fixed
 
 
-def _handle_duplicates(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
-    """Handle duplicate rows"""
+def _clean_duplicates(data: pd.DataFrame, **kwargs) -> Tuple[pd.DataFrame, List[str]]:
+    """Drop duplicate rows in memory"""
     original_count = len(data)
     data = data.drop_duplicates()
     duplicates_removed = original_count - len(data)
     
     issues_fixed = [f"Removed {duplicates_removed} duplicate rows"] if duplicates_removed > 0 else ["No duplicate rows found"]
     
-    # Save cleaned data
-    output_path = csv_file_path.replace('.csv', '_duplicates_removed.csv')
-    data.to_csv(output_path, index=False)
-    
-    return _create_cleaning_report("Duplicate Removal", issues_fixed, output_path)
+    return data, issues_fixed
 
 
-def _fix_data_types(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
-    """Fix data types for better memory usage and processing"""
+def _clean_data_types(data: pd.DataFrame, **kwargs) -> Tuple[pd.DataFrame, List[str]]:
+    """Optimize data types in memory"""
     issues_fixed = []
     original_memory = data.memory_usage(deep=True).sum()
     
@@ -626,6 +644,60 @@ def _fix_data_types(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
     except Exception as e:
         issues_fixed.append(f"Error in data type optimization: {str(e)}")
     
+    return data, issues_fixed
+
+
+def _handle_invalid_values(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
+    """Handle invalid values in dataset"""
+    data, issues_fixed = _clean_invalid_values(data, **kwargs)
+    
+    # Save cleaned data
+    output_path = csv_file_path.replace('.csv', '_invalid_values_fixed.csv')
+    data.to_csv(output_path, index=False)
+    
+    return _create_cleaning_report("Invalid Values Cleaning", issues_fixed, output_path)
+
+
+def _handle_missing_values(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
+    """Handle missing values using ml_tools"""
+    if not data.isnull().values.any():
+        return _create_info_report("No missing values found in dataset")
+    
+    data, issues_fixed = _clean_missing_values(data, **kwargs)
+    
+    # Save cleaned data
+    output_path = csv_file_path.replace('.csv', '_missing_values_fixed.csv')
+    data.to_csv(output_path, index=False)
+    
+    return _create_cleaning_report("Missing Values Cleaning", issues_fixed, output_path)
+
+
+def _handle_outliers(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
+    """Handle outliers using ml_tools"""
+    data, issues_fixed = _clean_outliers(data, **kwargs)
+    
+    # Save cleaned data
+    output_path = csv_file_path.replace('.csv', '_outliers_fixed.csv')
+    data.to_csv(output_path, index=False)
+    
+    return _create_cleaning_report("Outliers Cleaning", issues_fixed, output_path)
+
+
+def _handle_duplicates(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
+    """Handle duplicate rows"""
+    data, issues_fixed = _clean_duplicates(data, **kwargs)
+    
+    # Save cleaned data
+    output_path = csv_file_path.replace('.csv', '_duplicates_removed.csv')
+    data.to_csv(output_path, index=False)
+    
+    return _create_cleaning_report("Duplicate Removal", issues_fixed, output_path)
+
+
+def _fix_data_types(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
+    """Fix data types for better memory usage and processing"""
+    data, issues_fixed = _clean_data_types(data, **kwargs)
+    
     # Save cleaned data
     output_path = csv_file_path.replace('.csv', '_types_optimized.csv')
     data.to_csv(output_path, index=False)
@@ -635,26 +707,19 @@ def _fix_data_types(data: pd.DataFrame, csv_file_path: str, **kwargs) -> str:
 
 def _create_cleaning_report(title: str, issues_fixed: List[str], output_path: str) -> str:
     """Create HTML report for cleaning operations"""
-    issues_html = ""
-    for issue in issues_fixed:
-        issues_html += f'<tr><td class="vds-issue-item">✓ {issue}</td></tr>'
-    
+    issues = pd.DataFrame({'Issues Fixed': [f"✓ {issue}" for issue in issues_fixed]}, dtype=object)
+    issues_table = render_frame_table(
+        issues, max_rows=len(issues), table_class="vds-report-table",
+        column_classes={'Issues Fixed': 'vds-issue-item'}, header_classes={'Issues Fixed': 'vds-report-header'},
+    )
+    info_table = render_info_table({'Output File': output_path, 'Total Issues': len(issues_fixed)})
     return f"""
     <vds-cleaning-report>
+        {css_block()}
         <vds-title>{title} Report</vds-title>
-        <table class="vds-report-table">
-            <thead>
-                <tr><th class="vds-report-header">Issues Fixed</th></tr>
-            </thead>
-            <tbody>
-                {issues_html}
-            </tbody>
-        </table>
+        {issues_table}
         <vds-info-panel>
-            <table class="vds-info-table">
-                <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                <tr><td class="vds-label">Total Issues</td><td class="vds-value">{len(issues_fixed)}</td></tr>
-            </table>
+            {info_table}
         </vds-info-panel>
     </vds-cleaning-report>
     """
@@ -662,11 +727,11 @@ def _create_cleaning_report(title: str, issues_fixed: List[str], output_path: st
 
 def _create_error_report(error_message: str) -> str:
     """Create HTML error report"""
+    error_table = render_info_table({'Cleaning Error': error_message}, table_class="vds-error-table",
+                                    label_class="vds-error-label", value_class="vds-error-value")
     return f"""
     <vds-error-panel>
-        <table class="vds-error-table">
-            <tr><td class="vds-error-label">Cleaning Error</td><td class="vds-error-value">{error_message}</td></tr>
-        </table>
+        {error_table}
     </vds-error-panel>
     """
 
@@ -675,9 +740,7 @@ def _create_info_report(info_message: str) -> str:
     """Create HTML info report"""
     return f"""
     <vds-info-panel>
-        <table class="vds-info-table">
-            <tr><td class="vds-label">Information</td><td class="vds-value">{info_message}</td></tr>
-        </table>
+        {render_info_table({'Information': info_message})}
     </vds-info-panel>
     """
 
@@ -755,48 +818,37 @@ def advanced_fill_missing_values(csv_file_path: str, target_columns: Union[str,
                         'fill_rate': f"{(filled/original_nulls)*100:.1f}%" if original_nulls > 0 else "0%"
                     })
         
+        fill_results = pd.DataFrame({
+            'Column': [str(info['column']) for info in missing_info],
+            'Original Missing': [f"{info['original_missing']:,}" for info in missing_info],
+            'Filled': [f"{info['filled']:,}" for info in missing_info],
+            'Remaining': [f"{info['remaining']:,}" for info in missing_info],
+            'Fill Rate': [info['fill_rate'] for info in missing_info],
+        }, dtype=object)
+        fill_table = render_frame_table(
+            fill_results, max_rows=len(fill_results), table_class="vds-detailed-table",
+            column_classes={'Column': 'vds-col-name', 'Original Missing': 'vds-missing-count',
+                            'Filled': 'vds-filled-count', 'Remaining': 'vds-remaining-count',
+                            'Fill Rate': 'vds-fill-rate'},
+        )
+        info_table = render_info_table({
+            'Method Used': method,
+            'Total Missing Before': f"{original_missing:,}",
+            'Total Filled': f"{filled_count:,}",
+            'Remaining Missing': f"{final_missing:,}",
+            'Output File': output_path,
+        })
         report_html = f"""
         <vds-cleaning-report>
+            {css_block()}
             <vds-title>Advanced Missing Values Filling Report</vds-title>
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Method Used</td><td class="vds-value">{method}</td></tr>
-                    <tr><td class="vds-label">Total Missing Before</td><td class="vds-value">{original_missing:,}</td></tr>
-                    <tr><td class="vds-label">Total Filled</td><td class="vds-value">{filled_count:,}</td></tr>
-                    <tr><td class="vds-label">Remaining Missing</td><td class="vds-value">{final_missing:,}</td></tr>
-                    <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>Column-wise Filling Results</vds-title>
-                <table class="vds-detailed-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Column</th>
-                            <th class="vds-col-header">Original Missing</th>
-                            <th class="vds-col-header">Filled</th>
-                            <th class="vds-col-header">Remaining</th>
-                            <th class="vds-col-header">Fill Rate</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        for info in missing_info:
-            report_html += f"""
-                        <tr>
-                            <td class="vds-col-name">{info['column']}</td>
-                            <td class="vds-missing-count">{info['original_missing']:,}</td>
-                            <td class="vds-filled-count">{info['filled']:,}</td>
-                            <td class="vds-remaining-count">{info['remaining']:,}</td>
-                            <td class="vds-fill-rate">{info['fill_rate']}</td>
-                        </tr>
-            """
-        
-        report_html += """
-                    </tbody>
-                </table>
+                {fill_table}
             </vds-section>
         </vds-cleaning-report>
         """
@@ -870,29 +922,29 @@ def remove_columns_advanced(csv_file_path: str, strategy: Union[str, List[str],
         output_path = csv_file_path.replace('.csv', '_columns_removed.csv')
         cleaned_data.to_csv(output_path, index=False)
         
+        removed = pd.DataFrame({'Column Name': [str(col) for col in removed_columns]}, dtype=object)
+        removed_table = render_frame_table(
+            removed, max_rows=len(removed), table_class="vds-removed-table",
+            column_classes={'Column Name': 'vds-col-name'},
+        )
+        info_table = render_info_table({
+            'Strategy Used': strategy,
+            'Original Columns': original_count,
+            'Removed Columns': len(removed_columns),
+            'Remaining Columns': remaining_count,
+            'Output File': output_path,
+        })
         return f"""
         <vds-cleaning-report>
+            {css_block()}
             <vds-title>Advanced Column Removal Report</vds-title>
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Strategy Used</td><td class="vds-value">{strategy}</td></tr>
-                    <tr><td class="vds-label">Original Columns</td><td class="vds-value">{original_count}</td></tr>
-                    <tr><td class="vds-label">Removed Columns</td><td class="vds-value">{len(removed_columns)}</td></tr>
-                    <tr><td class="vds-label">Remaining Columns</td><td class="vds-value">{remaining_count}</td></tr>
-                    <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>Removed Columns</vds-title>
-                <table class="vds-removed-table">
-                    <thead>
-                        <tr><th class="vds-col-header">Column Name</th></tr>
-                    </thead>
-                    <tbody>
-                        {''.join([f'<tr><td class="vds-col-name">{col}</td></tr>' for col in removed_columns])}
-                    </tbody>
-                </table>
+                {removed_table}
             </vds-section>
         </vds-cleaning-report>
         """
@@ -971,46 +1023,36 @@ def advanced_outlier_detection(csv_file_path: str, target_columns: Union[str, Li
         output_path = csv_file_path.replace('.csv', '_outliers_handled.csv')
         cleaned_data.to_csv(output_path, index=False)
         
+        outliers = pd.DataFrame({
+            'Column': [str(info['column']) for info in outlier_info],
+            'Outliers Detected': [f"{info['outliers']:,}" for info in outlier_info],
+            'Percentage': [info['percentage'] for info in outlier_info],
+        }, dtype=object)
+        outlier_table = render_frame_table(
+            outliers, max_rows=len(outliers), table_class="vds-outlier-table",
+            column_classes={'Column': 'vds-col-name', 'Outliers Detected': 'vds-outlier-count',
+                            'Percentage': 'vds-outlier-pct'},
+        )
+        info_table = render_info_table({
+            'Method Used': method,
+            'Strategy Used': strategy,
+            'Sensitivity': sensitivity,
+            'Original Rows': f"{original_rows:,}",
+            'Final Rows': f"{final_rows:,}",
+            'Rows Affected': f"{rows_affected:,}",
+            'Output File': output_path,
+        })
         report_html = f"""
         <vds-cleaning-report>
+            {css_block()}
             <vds-title>Advanced Outlier Detection Report</vds-title>
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Method Used</td><td class="vds-value">{method}</td></tr>
-                    <tr><td class="vds-label">Strategy Used</td><td class="vds-value">{strategy}</td></tr>
-                    <tr><td class="vds-label">Sensitivity</td><td class="vds-value">{sensitivity}</td></tr>
-                    <tr><td class="vds-label">Original Rows</td><td class="vds-value">{original_rows:,}</td></tr>
-                    <tr><td class="vds-label">Final Rows</td><td class="vds-value">{final_rows:,}</td></tr>
-                    <tr><td class="vds-label">Rows Affected</td><td class="vds-value">{rows_affected:,}</td></tr>
-                    <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>Outlier Detection Results</vds-title>
-                <table class="vds-outlier-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Column</th>
-                            <th class="vds-col-header">Outliers Detected</th>
-                            <th class="vds-col-header">Percentage</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        for info in outlier_info:
-            report_html += f"""
-                        <tr>
-                            <td class="vds-col-name">{info['column']}</td>
-                            <td class="vds-outlier-count">{info['outliers']:,}</td>
-                            <td class="vds-outlier-pct">{info['percentage']}</td>
-                        </tr>
-            """
-        
-        report_html += """
-                    </tbody>
-                </table>
+                {outlier_table}
             </vds-section>
         </vds-cleaning-report>
         """
@@ -1023,17 +1065,26 @@ def advanced_outlier_detection(csv_file_path: str, target_columns: Union[str, Li
 
 def categorical_encoding_advanced(csv_file_path: str, target_columns: Union[str, List[str]],
                                  method: str = 'auto', group_columns: Optional[Union[str, List[str]]] = None,
-                                 handle_unknown: str = 'ignore', keep_original: bool = True) -> str:
+                                 handle_unknown: str = 'ignore', keep_original: bool = True,
+                                 max_onehot_cardinality: int = 50, sparse: bool = False, hash_features: int = 32,
+                                 target: Optional[str] = None, smoothing: float = 10.0,
+                                 target_folds: int = 5) -> str:
     """
     Advanced categorical encoding with VDS Tools integration
     
     Args:
         csv_file_path: Path to CSV file
         target_columns: Columns to encode
-        method: Encoding method ('auto', 'label', 'onehot', 'frequency', 'count')
+        method: Encoding method ('auto', 'label', 'onehot', 'frequency', 'count', 'hash', 'target')
         group_columns: Grouping columns for group-based encoding
         handle_unknown: How to handle unknown categories
         keep_original: Whether to keep original columns
+        max_onehot_cardinality: Largest cardinality 'auto' still one-hot encodes
+        sparse: Emit one-hot/hash columns as sparse columns
+        hash_features: Number of output columns for hash encoding
+        target: Numeric target column for target encoding
+        smoothing: Target encoding shrinkage towards the global mean
+        target_folds: Folds for out-of-fold target encoding (< 2 encodes in-sample and leaks the label)
         
     Returns:
         HTML formatted report with encoding results
@@ -1050,7 +1101,13 @@ def categorical_encoding_advanced(csv_file_path: str, target_columns: Union[str,
                 method=method,
                 group_columns=group_columns,
                 handle_unknown=handle_unknown,
-                keep_original=keep_original
+                keep_original=keep_original,
+                max_onehot_cardinality=max_onehot_cardinality,
+                sparse=sparse,
+                hash_features=hash_features,
+                target=target,
+                smoothing=smoothing,
+                target_folds=target_folds
             )
         else:
             # Fallback implementation
@@ -1072,31 +1129,32 @@ def categorical_encoding_advanced(csv_file_path: str, target_columns: Union[str,
         output_path = csv_file_path.replace('.csv', '_categorical_encoded.csv')
         encoded_data.to_csv(output_path, index=False)
         
+        # First 20 new columns; the table footer reports how many more there are
+        encoded = pd.DataFrame({'New Column Name': [str(col) for col in new_columns]}, dtype=object)
+        encoded_table = render_frame_table(
+            encoded, max_rows=20, table_class="vds-encoded-table",
+            column_classes={'New Column Name': 'vds-col-name'},
+        )
+        info_table = render_info_table({
+            'Method Used': method,
+            'Original Columns': len(original_columns),
+            'Final Columns': len(encoded_data.columns),
+            'New Columns Added': len(new_columns),
+            'Keep Original': keep_original,
+            'Target Column': target or 'None',
+            'Output File': output_path,
+        })
         return f"""
         <vds-cleaning-report>
+            {css_block()}
             <vds-title>Advanced Categorical Encoding Report</vds-title>
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Method Used</td><td class="vds-value">{method}</td></tr>
-                    <tr><td class="vds-label">Original Columns</td><td class="vds-value">{len(original_columns)}</td></tr>
-                    <tr><td class="vds-label">Final Columns</td><td class="vds-value">{len(encoded_data.columns)}</td></tr>
-                    <tr><td class="vds-label">New Columns Added</td><td class="vds-value">{len(new_columns)}</td></tr>
-                    <tr><td class="vds-label">Keep Original</td><td class="vds-value">{keep_original}</td></tr>
-                    <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>New Encoded Columns</vds-title>
-                <table class="vds-encoded-table">
-                    <thead>
-                        <tr><th class="vds-col-header">New Column Name</th></tr>
-                    </thead>
-                    <tbody>
-                        {''.join([f'<tr><td class="vds-col-name">{col}</td></tr>' for col in new_columns[:20]])}
-                        {f'<tr><td class="vds-info">... and {len(new_columns) - 20} more columns</td></tr>' if len(new_columns) > 20 else ''}
-                    </tbody>
-                </table>
+                {encoded_table}
             </vds-section>
         </vds-cleaning-report>
         """
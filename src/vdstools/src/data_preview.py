@@ -7,7 +7,8 @@ import pandas as pd
 import numpy as np
 from typing import List
 from ..utils.display import Display
-import os
+from .html_output import css_block, render_frame_table, render_info_table
+from .variations import create_variation_spec, save_variation_spec, materialize_variation
 
 class DataPreview(Display):
     """
@@ -125,11 +126,11 @@ class DataPreview(Display):
     
     def _create_error_report(self, error_message: str) -> str:
         """Create HTML error report"""
+        error_table = render_info_table({'Preview Error': error_message}, table_class="vds-error-table",
+                                        label_class="vds-error-label", value_class="vds-error-value")
         return f"""
         <vds-error-panel>
-            <table class="vds-error-table">
-                <tr><td class="vds-error-label">Preview Error</td><td class="vds-error-value">{error_message}</td></tr>
-            </table>
+            {error_table}
         </vds-error-panel>
         """
     
@@ -429,53 +430,22 @@ def data_preview(csv_file_path: str, n_rows: int = 5) -> str:
         data = pd.read_csv(csv_file_path)
         
         # Generate data preview table
-        preview_html = f"""
+        preview_table = render_frame_table(
+            data.head(n_rows),
+            max_rows=n_rows,
+            table_class="vds-data-table",
+            sci_format=None,
+            null_text="NaN",
+        )
+        
+        return f"""
         <vds-container>
+            {css_block()}
             <vds-title>Data Preview - First {n_rows} Rows</vds-title>
-            <vds-table>
-                <table class="vds-data-table">
-                    <thead>
-                        <tr>
-        """
-        
-        # Add column headers
-        for col in data.columns:
-            preview_html += f'<th class="vds-col-header">{col}</th>'
-        
-        preview_html += """
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        # Add data rows
-        preview_data = data.head(n_rows)
-        for idx, row in preview_data.iterrows():
-            preview_html += '<tr>'
-            for col in data.columns:
-                value = row[col]
-                # Handle different data types for display
-                if pd.isna(value):
-                    display_value = '<span class="vds-null">NaN</span>'
-                elif isinstance(value, (int, float)):
-                    if isinstance(value, float):
-                        display_value = f'{value:.3f}' if not pd.isna(value) else 'NaN'
-                    else:
-                        display_value = str(value)
-                else:
-                    display_value = str(value)
-                preview_html += f'<td class="vds-cell">{display_value}</td>'
-            preview_html += '</tr>'
-        
-        preview_html += """
-                    </tbody>
-                </table>
-            </vds-table>
+            {preview_table}
         </vds-container>
         """
         
-        return preview_html
-        
     except FileNotFoundError:
         return '<vds-container><vds-error>Error: File not found</vds-error></vds-container>'
     except pd.errors.EmptyDataError:
@@ -504,64 +474,23 @@ def missing_values_preview(csv_file_path: str) -> str:
         total_missing = missing_stats.sum()
         
         # Build HTML content
+        info_table = render_info_table({
+            'Total Missing Values': f"{total_missing:,} cells",
+            'Dataset Size': f"{data.shape[0]:,} rows × {data.shape[1]} columns",
+            'Overall Missing Percentage': f"{(total_missing / (data.shape[0] * data.shape[1]) * 100):.2f}%",
+        })
         html_content = f"""
         <vds-container>
+            {css_block()}
             <vds-title>Missing Values Analysis</vds-title>
             
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Total Missing Values</td><td class="vds-value">{total_missing:,} cells</td></tr>
-                    <tr><td class="vds-label">Dataset Size</td><td class="vds-value">{data.shape[0]:,} rows × {data.shape[1]} columns</td></tr>
-                    <tr><td class="vds-label">Overall Missing Percentage</td><td class="vds-value">{(total_missing / (data.shape[0] * data.shape[1]) * 100):.2f}%</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-subtitle>Missing Values by Column</vds-subtitle>
-                <vds-table>
-                    <table class="vds-data-table">
-                        <thead>
-                            <tr>
-                                <th class="vds-col-header">Column Name</th>
-                                <th class="vds-col-header">Data Type</th>
-                                <th class="vds-col-header">Missing Count</th>
-                                <th class="vds-col-header">Missing Percentage</th>
-                                <th class="vds-col-header">Status</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-        """
-        
-        # Add rows for each column
-        for col in data.columns:
-            missing_count = missing_stats[col]
-            missing_pct = missing_percentage[col]
-            dtype_str = str(data[col].dtype)
-            
-            # Determine status based on missing percentage
-            if missing_pct == 0:
-                status = '<span class="vds-status-good">Complete</span>'
-            elif missing_pct < 10:
-                status = '<span class="vds-status-warning">Few Missing</span>'
-            elif missing_pct < 50:
-                status = '<span class="vds-status-caution">Many Missing</span>'
-            else:
-                status = '<span class="vds-status-danger">Mostly Missing</span>'
-            
-            html_content += f"""
-                            <tr>
-                                <td class="vds-cell">{col}</td>
-                                <td class="vds-cell">{dtype_str}</td>
-                                <td class="vds-cell">{missing_count:,}</td>
-                                <td class="vds-cell">{missing_pct:.2f}%</td>
-                                <td class="vds-cell">{status}</td>
-                            </tr>
-            """
-        
-        html_content += """
-                        </tbody>
-                    </table>
-                </vds-table>
+                {_render_missing_table(data, missing_stats, missing_percentage)}
             </vds-section>
         </vds-container>
         """
@@ -575,6 +504,34 @@ def missing_values_preview(csv_file_path: str) -> str:
     except Exception as e:
         return f'<vds-container><vds-error>Error reading file: {str(e)}</vds-error></vds-container>'
 
+def _render_missing_table(data: pd.DataFrame, missing_stats: pd.Series, missing_percentage: pd.Series) -> str:
+    """Render the per-column missing value table from precomputed statistics"""
+    status = np.select(
+        [missing_percentage == 0, missing_percentage < 10, missing_percentage < 50],
+        [
+            '<span class="vds-status-good">Complete</span>',
+            '<span class="vds-status-warning">Few Missing</span>',
+            '<span class="vds-status-caution">Many Missing</span>',
+        ],
+        default='<span class="vds-status-danger">Mostly Missing</span>',
+    )
+    table = pd.DataFrame({
+        "Column Name": data.columns.astype(str),
+        "Data Type": data.dtypes.astype(str).to_numpy(),
+        "Missing Count": [f"{count:,}" for count in missing_stats.to_numpy()],
+        "Missing Percentage": [f"{pct:.2f}%" for pct in missing_percentage.to_numpy()],
+        "Status": status,
+    })
+    return render_frame_table(
+        table,
+        max_rows=len(table),
+        table_class="vds-data-table",
+        column_classes={col: "vds-cell" for col in table.columns},
+        header_classes={col: "vds-col-header" for col in table.columns},
+        raw_html_columns=["Status"],
+    )
+
+
 def enhanced_data_preview(csv_file_path: str, n_rows: int = 5) -> str:
     """
     Enhanced data preview function, replacing simple data.head()
@@ -591,113 +548,59 @@ def enhanced_data_preview(csv_file_path: str, n_rows: int = 5) -> str:
         data = pd.read_csv(csv_file_path)
         
         # Basic info table
+        info_table = render_info_table({
+            'File Path': csv_file_path,
+            'Data Shape': f"{data.shape[0]:,} rows × {data.shape[1]} columns",
+            'Memory Usage': f"{data.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB",
+            'Missing Values': f"{data.isnull().sum().sum():,} cells",
+        })
         info_html = f"""
         <vds-info-panel>
-            <table class="vds-info-table">
-                <tr><td class="vds-label">File Path</td><td class="vds-value">{csv_file_path}</td></tr>
-                <tr><td class="vds-label">Data Shape</td><td class="vds-value">{data.shape[0]:,} rows × {data.shape[1]} columns</td></tr>
-                <tr><td class="vds-label">Memory Usage</td><td class="vds-value">{data.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB</td></tr>
-                <tr><td class="vds-label">Missing Values</td><td class="vds-value">{data.isnull().sum().sum():,} cells</td></tr>
-            </table>
+            {info_table}
         </vds-info-panel>
         """
         
-        # Column info table
-        columns_html = """
+        # Column info table (one vectorized pass per metric instead of per column)
+        null_counts = data.isnull().sum()
+        column_info = pd.DataFrame({
+            "Column Name": data.columns.astype(str),
+            "Data Type": data.dtypes.astype(str).to_numpy(),
+            "Missing Values": [
+                f"{count} ({count / len(data) * 100:.1f}%)" if len(data) else f"{count} (0.0%)"
+                for count in null_counts.to_numpy()
+            ],
+            "Unique Values": data.nunique().to_numpy(),
+        })
+        columns_table = render_frame_table(
+            column_info,
+            max_rows=len(column_info),
+            table_class="vds-columns-table",
+            column_classes={
+                "Column Name": "vds-col-name",
+                "Data Type": "vds-col-type",
+                "Missing Values": "vds-col-missing",
+                "Unique Values": "vds-col-unique",
+            },
+            header_classes={col: "vds-col-header" for col in column_info.columns},
+        )
+        columns_html = f"""
         <vds-section>
             <vds-title>Column Information Overview</vds-title>
-            <table class="vds-columns-table">
-                <thead>
-                    <tr>
-                        <th class="vds-col-header">Column Name</th>
-                        <th class="vds-col-header">Data Type</th>
-                        <th class="vds-col-header">Missing Values</th>
-                        <th class="vds-col-header">Unique Values</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
-        for col in data.columns:
-            dtype_str = str(data[col].dtype)
-            null_count = data[col].isnull().sum()
-            unique_count = data[col].nunique()
-            
-            # Add CSS class based on data type
-            dtype_class = "vds-numeric" if dtype_str in ['int64', 'float64'] else "vds-categorical"
-            
-            columns_html += f"""
-                    <tr class="{dtype_class}">
-                        <td class="vds-col-name">{col}</td>
-                        <td class="vds-col-type">{dtype_str}</td>
-                        <td class="vds-col-missing">{null_count} ({null_count/len(data)*100:.1f}%)</td>
-                        <td class="vds-col-unique">{unique_count}</td>
-                    </tr>
-            """
-        
-        columns_html += """
-                </tbody>
-            </table>
+            {columns_table}
         </vds-section>
         """
         
         # Data preview table
+        preview_table = render_frame_table(
+            data.head(n_rows),
+            max_rows=n_rows,
+            table_class="vds-preview-table",
+            show_index=True,
+        )
         preview_html = f"""
         <vds-section>
             <vds-title>Data Preview (First {n_rows} Rows)</vds-title>
-            <vds-table class="vds-preview-table">
-                <vds-thead>
-                    <vds-tr>
-                        <vds-th class="vds-row-header">Row Index</vds-th>
-        """
-        
-        # Add column headers
-        for col in data.columns:
-            dtype_str = str(data[col].dtype)
-            dtype_class = "vds-numeric" if dtype_str in ['int64', 'float64'] else "vds-categorical"
-            preview_html += f'<vds-th class="vds-col-header {dtype_class}">{col}</vds-th>'
-        
-        preview_html += """
-                    </vds-tr>
-                </vds-thead>
-                <vds-tbody>
-        """
-        
-        # Add data rows
-        preview_data = data.head(n_rows)
-        for idx, row in preview_data.iterrows():
-            preview_html += f'<vds-tr><vds-td class="vds-row-index">{idx}</vds-td>'
-            
-            for col in preview_data.columns:
-                value = row[col]
-                cell_class = "vds-cell"
-                
-                if pd.isna(value):
-                    formatted_value = '<span class="vds-null">NULL</span>'
-                    cell_class += " vds-missing"
-                elif isinstance(value, float):
-                    cell_class += " vds-numeric"
-                    if abs(value) > 1e6 or (abs(value) < 1e-3 and value != 0):
-                        formatted_value = f"{value:.2e}"
-                    else:
-                        formatted_value = f"{value:.3f}"
-                elif isinstance(value, str):
-                    cell_class += " vds-categorical"
-                    formatted_value = str(value)  # No truncation
-                else:
-                    if isinstance(value, (int, float)):
-                        cell_class += " vds-numeric"
-                    else:
-                        cell_class += " vds-categorical"
-                    formatted_value = str(value)
-                
-                preview_html += f'<vds-td class="{cell_class}">{formatted_value}</vds-td>'
-            
-            preview_html += '</vds-tr>'
-        
-        preview_html += """
-                </vds-tbody>
-            </vds-table>
+            {preview_table}
         </vds-section>
         """
         
@@ -714,6 +617,7 @@ def enhanced_data_preview(csv_file_path: str, n_rows: int = 5) -> str:
         
         return f"""
         <vds-container>
+            {css_block()}
             {info_html}
             {columns_html}
             {preview_html}
@@ -722,13 +626,14 @@ def enhanced_data_preview(csv_file_path: str, n_rows: int = 5) -> str:
         """
         
     except Exception as e:
+        error_table = render_info_table({
+            'Error Type': type(e).__name__,
+            'Error Message': str(e),
+            'File Path': csv_file_path,
+        }, table_class="vds-error-table", label_class="vds-error-label", value_class="vds-error-value")
         return f"""
         <vds-error-panel>
-            <table class="vds-error-table">
-                <tr><td class="vds-error-label">Error Type</td><td class="vds-error-value">{type(e).__name__}</td></tr>
-                <tr><td class="vds-error-label">Error Message</td><td class="vds-error-value">{str(e)}</td></tr>
-                <tr><td class="vds-error-label">File Path</td><td class="vds-error-value">{csv_file_path}</td></tr>
-            </table>
+            {error_table}
         </vds-error-panel>
         """
 
@@ -752,26 +657,28 @@ def smart_data_info(csv_file_path: str) -> str:
         missing_ratio = data.isnull().sum().sum() / (data.shape[0] * data.shape[1]) * 100
         duplicate_count = data.duplicated().sum()
         
+        stats_table = render_info_table({
+            'Total Rows': f"{data.shape[0]:,}",
+            'Total Columns': data.shape[1],
+            'Numeric Columns': len(numeric_cols),
+            'Categorical Columns': len(categorical_cols),
+            'Missing Ratio': f"{missing_ratio:.2f}%",
+            'Duplicate Rows': duplicate_count,
+        }, table_class="vds-stats-table", label_class="vds-stat-label", value_class="vds-stat-value")
         return f"""
         <vds-info-panel>
+            {css_block()}
             <vds-title>Dataset Statistics</vds-title>
-            <table class="vds-stats-table">
-                <tr><td class="vds-stat-label">Total Rows</td><td class="vds-stat-value">{data.shape[0]:,}</td></tr>
-                <tr><td class="vds-stat-label">Total Columns</td><td class="vds-stat-value">{data.shape[1]}</td></tr>
-                <tr><td class="vds-stat-label">Numeric Columns</td><td class="vds-stat-value">{len(numeric_cols)}</td></tr>
-                <tr><td class="vds-stat-label">Categorical Columns</td><td class="vds-stat-value">{len(categorical_cols)}</td></tr>
-                <tr><td class="vds-stat-label">Missing Ratio</td><td class="vds-stat-value">{missing_ratio:.2f}%</td></tr>
-                <tr><td class="vds-stat-label">Duplicate Rows</td><td class="vds-stat-value">{duplicate_count}</td></tr>
-            </table>
+            {stats_table}
         </vds-info-panel>
         """
         
     except Exception as e:
+        error_table = render_info_table({'Error': str(e)}, table_class="vds-error-table",
+                                        label_class="vds-error-label", value_class="vds-error-value")
         return f"""
         <vds-error-panel>
-            <table class="vds-error-table">
-                <tr><td class="vds-error-label">Error</td><td class="vds-error-value">{str(e)}</td></tr>
-            </table>
+            {error_table}
         </vds-error-panel>
         """
 
@@ -792,49 +699,45 @@ def show_column_range(csv_file_path: str) -> str:
     try:
         data = pd.read_csv(csv_file_path)
         
-        html_content = """
-        <vds-container>
-            <vds-title>Column Value Range Analysis</vds-title>
-            <vds-section>
-                <table class="vds-range-table">
-                    <thead>
-                        <tr>
-                            <th>Column Name</th>
-                            <th>Data Type</th>
-                            <th>Value Range</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
+        # Numeric ranges in one pass over the numeric block
+        numeric_cols = data.select_dtypes(include=[np.number]).columns
+        numeric_min = data[numeric_cols].min()
+        numeric_max = data[numeric_cols].max()
         
+        value_ranges = []
         for col in data.columns:
-            col_data = data[col]
-            dtype = str(col_data.dtype)
-            
-            # Determine value range based on data type
-            if pd.api.types.is_numeric_dtype(col_data):
-                min_val = col_data.min()
-                max_val = col_data.max()
-                value_range = f"{min_val} ~ {max_val}"
+            if col in numeric_min.index:
+                value_ranges.append(f"{numeric_min[col]} ~ {numeric_max[col]}")
             else:
                 # For categorical/object columns
-                unique_values = col_data.dropna().unique()
+                unique_values = data[col].dropna().unique()
                 if len(unique_values) <= 5:
-                    value_range = f"[{', '.join(map(str, unique_values))}]"
+                    value_ranges.append(f"[{', '.join(map(str, unique_values))}]")
                 else:
-                    value_range = f"{len(unique_values)} unique values"
-            
-            html_content += f"""
-                        <tr>
-                            <td class="vds-col-name">{col}</td>
-                            <td class="vds-col-type">{dtype}</td>
-                            <td class="vds-col-range">{value_range}</td>
-                        </tr>
-            """
-        
-        html_content += """
-                    </tbody>
-                </table>
+                    value_ranges.append(f"{len(unique_values)} unique values")
+        
+        range_table = pd.DataFrame({
+            "Column Name": data.columns.astype(str),
+            "Data Type": data.dtypes.astype(str).to_numpy(),
+            "Value Range": value_ranges,
+        })
+        range_html = render_frame_table(
+            range_table,
+            max_rows=len(range_table),
+            table_class="vds-range-table",
+            column_classes={
+                "Column Name": "vds-col-name",
+                "Data Type": "vds-col-type",
+                "Value Range": "vds-col-range",
+            },
+            header_classes={col: "" for col in range_table.columns},
+        )
+        html_content = f"""
+        <vds-container>
+            {css_block()}
+            <vds-title>Column Value Range Analysis</vds-title>
+            <vds-section>
+                {range_html}
             </vds-section>
         </vds-container>
         """
@@ -907,7 +810,8 @@ def build_semantic_context(csv_file_path: str) -> dict:
         }
 
 
-def create_basic_variations(csv_file_path: str, output_dir: str = "stability_variations") -> dict:
+def create_basic_variations(csv_file_path: str, output_dir: str = "stability_variations",
+                            materialize: bool = False) -> dict:
     """
     Create a small set of standard dataset variations for stability testing.
 
@@ -916,48 +820,32 @@ def create_basic_variations(csv_file_path: str, output_dir: str = "stability_var
     - MinMaxScaler on numeric features
     - RobustScaler on numeric features
 
+    Each variation is written as a lightweight ``*.variation.json`` spec that
+    references the base dataset and lists its transforms; consumers such as
+    ``evaluate_variations`` apply it in memory. Pass ``materialize=True`` to also
+    write each variation once to a columnar file.
+
     Returns a dict with keys:
     - created: list[dict{name, path, shape}]
     - output_dir: str
     """
-    from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
-
     try:
         df = pd.read_csv(csv_file_path)
-        os.makedirs(output_dir, exist_ok=True)
         created = []
 
         numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        shape = [int(df.shape[0]), int(df.shape[1])]
 
-        def save_variation(name: str, data: pd.DataFrame):
-            path = os.path.join(output_dir, f"{name}.csv")
-            data.to_csv(path, index=False)
-            created.append({
-                "name": name,
-                "path": path,
-                "shape": [int(data.shape[0]), int(data.shape[1])]
-            })
-
-        # StandardScaler
-        if numeric_cols:
-            data_std = df.copy()
-            scaler = StandardScaler()
-            data_std[numeric_cols] = scaler.fit_transform(data_std[numeric_cols])
-            save_variation("StandardScaler_Variation", data_std)
-
-        # MinMaxScaler
-        if numeric_cols:
-            data_minmax = df.copy()
-            scaler = MinMaxScaler()
-            data_minmax[numeric_cols] = scaler.fit_transform(data_minmax[numeric_cols])
-            save_variation("MinMaxScaler_Variation", data_minmax)
-
-        # RobustScaler
         if numeric_cols:
-            data_robust = df.copy()
-            scaler = RobustScaler()
-            data_robust[numeric_cols] = scaler.fit_transform(data_robust[numeric_cols])
-            save_variation("RobustScaler_Variation", data_robust)
+            for name, op in (("StandardScaler_Variation", "standard_scale"),
+                             ("MinMaxScaler_Variation", "minmax_scale"),
+                             ("RobustScaler_Variation", "robust_scale")):
+                spec = create_variation_spec(csv_file_path, [{"op": op, "columns": numeric_cols}],
+                                             name=name, shape=shape)
+                entry = {"name": name, "path": save_variation_spec(spec, output_dir), "shape": shape}
+                if materialize:
+                    entry["materialized_path"] = materialize_variation(entry["path"], base_cache={spec["base"]: df})
+                created.append(entry)
 
         return {"created": created, "output_dir": output_dir}
     except Exception as e:
@@ -5,9 +5,12 @@ Provide stable visualization and analysis methods for data exploration
 
 import pandas as pd
 import numpy as np
+from html import escape
 from typing import List, Optional
-from scipy import stats
 from ..utils.display import Display
+from .html_output import css_block, render_frame_table, render_info_table
+from ..core.utils import file_fingerprint
+from .profiling import profile_csv, detect_datetime_format, parse_datetime_column
 
 
 class EDAToolkit(Display):
@@ -192,55 +195,41 @@ class EDAToolkit(Display):
                 analysis_results.append(col_info)
             
             # Create HTML report
+            summary = pd.DataFrame({
+                'Column': [info['column'] for info in analysis_results],
+                'Type': [info['dtype'] for info in analysis_results],
+                'Count': [f"{info['count']:,}" for info in analysis_results],
+                'Missing': [f"{info['missing']:,}" for info in analysis_results],
+                'Unique': [f"{info['unique']:,}" for info in analysis_results],
+                'Unique %': [info['unique_pct'] for info in analysis_results],
+                'Key Statistics': [
+                    f"Mean: {info['mean']}, Median: {info['median']}, Std: {info['std']}" if 'mean' in info
+                    else f"Most frequent: {info.get('most_frequent', 'N/A')} ({info.get('most_freq_count', 0)} times)"
+                    for info in analysis_results
+                ],
+            }, dtype=object)
+            summary_table = render_frame_table(
+                summary, max_rows=len(summary), table_class="vds-distribution-table",
+                column_classes={'Column': 'vds-col-name', 'Type': 'vds-dtype', 'Count': 'vds-count',
+                                'Missing': 'vds-missing', 'Unique': 'vds-unique',
+                                'Unique %': 'vds-unique-pct', 'Key Statistics': 'vds-key-stats'},
+            )
+            info_table = render_info_table({
+                'Columns Analyzed': len(analysis_results),
+                'Dataset Rows': f"{len(data):,}",
+                'File Path': csv_file_path,
+            })
             report_html = f"""
             <vds-container>
+                {css_block()}
                 <vds-info-panel>
                     <vds-title>Multi-Column Distribution Analysis</vds-title>
-                    <table class="vds-info-table">
-                        <tr><td class="vds-label">Columns Analyzed</td><td class="vds-value">{len(analysis_results)}</td></tr>
-                        <tr><td class="vds-label">Dataset Rows</td><td class="vds-value">{len(data):,}</td></tr>
-                        <tr><td class="vds-label">File Path</td><td class="vds-value">{csv_file_path}</td></tr>
-                    </table>
+                    {info_table}
                 </vds-info-panel>
                 
                 <vds-section>
                     <vds-title>Column Distribution Summary</vds-title>
-                    <table class="vds-distribution-table">
-                        <thead>
-                            <tr>
-                                <th class="vds-col-header">Column</th>
-                                <th class="vds-col-header">Type</th>
-                                <th class="vds-col-header">Count</th>
-                                <th class="vds-col-header">Missing</th>
-                                <th class="vds-col-header">Unique</th>
-                                <th class="vds-col-header">Unique %</th>
-                                <th class="vds-col-header">Key Statistics</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-            """
-            
-            for info in analysis_results:
-                if 'mean' in info:  # Numeric column
-                    key_stats = f"Mean: {info['mean']}, Median: {info['median']}, Std: {info['std']}"
-                else:  # Categorical column
-                    key_stats = f"Most frequent: {info.get('most_frequent', 'N/A')} ({info.get('most_freq_count', 0)} times)"
-                
-                report_html += f"""
-                            <tr>
-                                <td class="vds-col-name">{info['column']}</td>
-                                <td class="vds-dtype">{info['dtype']}</td>
-                                <td class="vds-count">{info['count']:,}</td>
-                                <td class="vds-missing">{info['missing']:,}</td>
-                                <td class="vds-unique">{info['unique']:,}</td>
-                                <td class="vds-unique-pct">{info['unique_pct']}</td>
-                                <td class="vds-key-stats">{key_stats}</td>
-                            </tr>
-                """
-            
-            report_html += """
-                        </tbody>
-                    </table>
+                    {summary_table}
                 </vds-section>
             </vds-container>
             """
@@ -309,64 +298,43 @@ class EDAToolkit(Display):
                 group_stats.append(group_info)
             
             # Create HTML report
+            def stats_text(group_info, col):
+                stats = group_info['column_stats'].get(col)
+                if stats is None:
+                    return "No data"
+                if 'mean' in stats:  # Numeric
+                    return f"μ={stats['mean']}, σ={stats['std']}, missing={stats['missing']}"
+                return f"Top: {stats['top_value']}, unique={stats['unique_count']}, missing={stats['missing']}"
+            
+            comparison = pd.DataFrame({
+                'Group': [info['group'] for info in group_stats],
+                'Count': [f"{info['count']:,}" for info in group_stats],
+                'Percentage': [info['percentage'] for info in group_stats],
+                **{f"{col} Stats": [stats_text(info, col) for info in group_stats] for col in analysis_columns},
+            }, dtype=object)
+            comparison_table = render_frame_table(
+                comparison, table_class="vds-comparative-table",
+                column_classes=dict({'Group': 'vds-group-name', 'Count': 'vds-group-count',
+                                     'Percentage': 'vds-group-pct'},
+                                    **{f"{col} Stats": 'vds-col-stats' for col in analysis_columns}),
+            )
+            info_table = render_info_table({
+                'Grouping Column': grouping_column,
+                'Number of Groups': len(groups),
+                'Analysis Columns': len(analysis_columns),
+                'Total Records': f"{len(data):,}",
+            })
             report_html = f"""
             <vds-container>
+                {css_block()}
                 <vds-info-panel>
-                    <vds-title>Comparative Analysis by '{grouping_column}'</vds-title>
-                    <table class="vds-info-table">
-                        <tr><td class="vds-label">Grouping Column</td><td class="vds-value">{grouping_column}</td></tr>
-                        <tr><td class="vds-label">Number of Groups</td><td class="vds-value">{len(groups)}</td></tr>
-                        <tr><td class="vds-label">Analysis Columns</td><td class="vds-value">{len(analysis_columns)}</td></tr>
-                        <tr><td class="vds-label">Total Records</td><td class="vds-value">{len(data):,}</td></tr>
-                    </table>
+                    <vds-title>Comparative Analysis by '{escape(str(grouping_column))}'</vds-title>
+                    {info_table}
                 </vds-info-panel>
                 
                 <vds-section>
                     <vds-title>Group Statistics Summary</vds-title>
-                    <table class="vds-comparative-table">
-                        <thead>
-                            <tr>
-                                <th class="vds-col-header">Group</th>
-                                <th class="vds-col-header">Count</th>
-                                <th class="vds-col-header">Percentage</th>
-            """
-            
-            # Add column headers
-            for col in analysis_columns:
-                report_html += f'<th class="vds-col-header">{col} Stats</th>'
-            
-            report_html += """
-                            </tr>
-                        </thead>
-                        <tbody>
-            """
-            
-            # Add group data
-            for group_info in group_stats:
-                report_html += f"""
-                            <tr>
-                                <td class="vds-group-name">{group_info['group']}</td>
-                                <td class="vds-group-count">{group_info['count']:,}</td>
-                                <td class="vds-group-pct">{group_info['percentage']}</td>
-                """
-                
-                for col in analysis_columns:
-                    if col in group_info['column_stats']:
-                        stats = group_info['column_stats'][col]
-                        if 'mean' in stats:  # Numeric
-                            stats_text = f"μ={stats['mean']}, σ={stats['std']}, missing={stats['missing']}"
-                        else:  # Categorical
-                            stats_text = f"Top: {stats['top_value']}, unique={stats['unique_count']}, missing={stats['missing']}"
-                    else:
-                        stats_text = "No data"
-                    
-                    report_html += f'<td class="vds-col-stats">{stats_text}</td>'
-                
-                report_html += "</tr>"
-            
-            report_html += """
-                        </tbody>
-                    </table>
+                    {comparison_table}
                 </vds-section>
             </vds-container>
             """
@@ -378,11 +346,11 @@ class EDAToolkit(Display):
     
     def _create_error_report(self, error_message: str) -> str:
         """Create HTML error report"""
+        error_table = render_info_table({'EDA Error': error_message}, table_class="vds-error-table",
+                                        label_class="vds-error-label", value_class="vds-error-value")
         return f"""
         <vds-error-panel>
-            <table class="vds-error-table">
-                <tr><td class="vds-error-label">EDA Error</td><td class="vds-error-value">{error_message}</td></tr>
-            </table>
+            {error_table}
         </vds-error-panel>
         """
     
@@ -629,42 +597,21 @@ def generate_correlation_analysis(csv_file_path: str, target_column: str = None)
                     })
         
         # Generate correlation table
-        corr_html = """
+        if high_corr_pairs:
+            pairs = pd.DataFrame(high_corr_pairs, dtype=object)
+            corr_table = render_frame_table(
+                pairs, max_rows=len(pairs), table_class="vds-correlation-table",
+                column_classes={'Variable 1': 'vds-var-name', 'Variable 2': 'vds-var-name',
+                                'Correlation': 'vds-corr-value', 'Strength': 'vds-corr-strength'},
+                row_classes=['vds-row-high' if pair['Strength'] == 'Strong' else 'vds-row-medium'
+                             for pair in high_corr_pairs],
+            )
+        else:
+            corr_table = _create_info_report("No strong correlations found (threshold: 0.7)")
+        corr_html = f"""
         <vds-section>
             <vds-title>Correlation Analysis Results</vds-title>
-            <table class="vds-correlation-table">
-                <thead>
-                    <tr>
-                        <th class="vds-col-header">Variable 1</th>
-                        <th class="vds-col-header">Variable 2</th>
-                        <th class="vds-col-header">Correlation</th>
-                        <th class="vds-col-header">Strength</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
-        for pair in high_corr_pairs:
-            corr_class = "vds-strong-corr" if pair['Strength'] == 'Strong' else "vds-moderate-corr"
-            corr_html += f"""
-                    <tr class="{corr_class}">
-                        <td class="vds-var-name">{pair['Variable 1']}</td>
-                        <td class="vds-var-name">{pair['Variable 2']}</td>
-                        <td class="vds-corr-value">{pair['Correlation']}</td>
-                        <td class="vds-corr-strength">{pair['Strength']}</td>
-                    </tr>
-            """
-        
-        if not high_corr_pairs:
-            corr_html += """
-                    <tr>
-                        <td colspan="4" class="vds-no-data">No strong correlations found (threshold: 0.7)</td>
-                    </tr>
-            """
-        
-        corr_html += """
-                </tbody>
-            </table>
+            {corr_table}
         </vds-section>
         """
         
@@ -674,41 +621,30 @@ def generate_correlation_analysis(csv_file_path: str, target_column: str = None)
             target_corrs = corr_matrix[target_column].abs().sort_values(ascending=False)
             target_corrs = target_corrs[target_corrs.index != target_column][:5]  # Top 5 excluding self
             
+            top_corrs = pd.DataFrame({
+                'Variable': [str(var) for var in target_corrs.index],
+                'Correlation': [f"{corr_matrix.loc[var, target_column]:.3f}" for var in target_corrs.index],
+            }, dtype=object)
+            target_table = render_frame_table(
+                top_corrs, table_class="vds-target-corr-table",
+                column_classes={'Variable': 'vds-var-name', 'Correlation': 'vds-corr-value'},
+            )
             target_html = f"""
             <vds-section>
-                <vds-title>Top Correlations with '{target_column}'</vds-title>
-                <table class="vds-target-corr-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Variable</th>
-                            <th class="vds-col-header">Correlation</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-            
-            for var, corr_val in target_corrs.items():
-                original_corr = corr_matrix.loc[var, target_column]
-                target_html += f"""
-                        <tr>
-                            <td class="vds-var-name">{var}</td>
-                            <td class="vds-corr-value">{original_corr:.3f}</td>
-                        </tr>
-                """
-            
-            target_html += """
-                    </tbody>
-                </table>
+                <vds-title>Top Correlations with '{escape(str(target_column))}'</vds-title>
+                {target_table}
             </vds-section>
             """
         
+        info_table = render_info_table({
+            'Numeric Variables': len(numeric_cols),
+            'High Correlations Found': len(high_corr_pairs),
+        })
         return f"""
         <vds-container>
+            {css_block()}
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Numeric Variables</td><td class="vds-value">{len(numeric_cols)}</td></tr>
-                    <tr><td class="vds-label">High Correlations Found</td><td class="vds-value">{len(high_corr_pairs)}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             {corr_html}
             {target_html}
@@ -730,6 +666,7 @@ def generate_distribution_analysis(csv_file_path: str, column_name: str) -> str:
     Returns:
         HTML report with distribution analysis
     """
+    from scipy import stats
     try:
         data = pd.read_csv(csv_file_path)
         
@@ -789,55 +726,30 @@ def generate_distribution_analysis(csv_file_path: str, column_name: str) -> str:
             ])
             
             # Top 5 most frequent values
-            top_5_html = """
+            top_5 = value_counts.head(5)
+            frequency = pd.DataFrame({
+                'Value': [str(value) for value in top_5.index],
+                'Count': [f"{count:,}" for count in top_5.tolist()],
+                'Percentage': [f"{count / len(series) * 100:.1f}%" for count in top_5.tolist()],
+            }, dtype=object)
+            frequency_table = render_frame_table(
+                frequency, table_class="vds-frequency-table",
+                column_classes={'Value': 'vds-cat-value', 'Count': 'vds-count-value', 'Percentage': 'vds-pct-value'},
+            )
+            top_5_html = f"""
             <vds-section>
                 <vds-title>Top 5 Most Frequent Values</vds-title>
-                <table class="vds-frequency-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Value</th>
-                            <th class="vds-col-header">Count</th>
-                            <th class="vds-col-header">Percentage</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-            
-            for value, count in value_counts.head(5).items():
-                percentage = count / len(series) * 100
-                top_5_html += f"""
-                        <tr>
-                            <td class="vds-cat-value">{value}</td>
-                            <td class="vds-count-value">{count:,}</td>
-                            <td class="vds-pct-value">{percentage:.1f}%</td>
-                        </tr>
-                """
-            
-            top_5_html += """
-                    </tbody>
-                </table>
+                {frequency_table}
             </vds-section>
             """
         
         # Create main analysis table
+        analysis_table = render_info_table(analysis_results, table_class="vds-analysis-table",
+                                           label_class="vds-analysis-label", value_class="vds-analysis-value")
         analysis_html = f"""
         <vds-section>
-            <vds-title>Distribution Analysis: '{column_name}'</vds-title>
-            <table class="vds-analysis-table">
-                <tbody>
-        """
-        
-        for label, value in analysis_results:
-            analysis_html += f"""
-                    <tr>
-                        <td class="vds-analysis-label">{label}</td>
-                        <td class="vds-analysis-value">{value}</td>
-                    </tr>
-            """
-        
-        analysis_html += """
-                </tbody>
-            </table>
+            <vds-title>Distribution Analysis: '{escape(str(column_name))}'</vds-title>
+            {analysis_table}
         </vds-section>
         """
         
@@ -847,6 +759,7 @@ def generate_distribution_analysis(csv_file_path: str, column_name: str) -> str:
         
         return f"""
         <vds-container>
+            {css_block()}
             {analysis_html}
         </vds-container>
         """
@@ -866,25 +779,23 @@ def generate_missing_value_analysis(csv_file_path: str) -> str:
         HTML report with missing value analysis
     """
     try:
-        data = pd.read_csv(csv_file_path)
+        profile = profile_csv(csv_file_path)
         
-        # Calculate missing values per column
+        # Missing values per column from the cached profile
         missing_info = []
-        total_cells = len(data) * len(data.columns)
-        total_missing = 0
-        
-        for col in data.columns:
-            missing_count = data[col].isnull().sum()
-            if missing_count > 0:
-                missing_pct = missing_count / len(data) * 100
-                missing_info.append({
-                    'Column': col,
-                    'Missing Count': f"{missing_count:,}",
-                    'Missing Percentage': f"{missing_pct:.1f}%",
-                    'Data Type': str(data[col].dtype),
-                    'Severity': 'High' if missing_pct > 30 else 'Medium' if missing_pct > 10 else 'Low'
-                })
-                total_missing += missing_count
+        total_cells = profile['total_cells']
+        total_missing = profile['missing_cells']
+        
+        missing_cols = profile['columns'][profile['columns']['null_count'] > 0]
+        for col, stats_row in missing_cols.iterrows():
+            missing_pct = stats_row['null_pct']
+            missing_info.append({
+                'Column': col,
+                'Missing Count': f"{int(stats_row['null_count']):,}",
+                'Missing Percentage': f"{missing_pct:.1f}%",
+                'Data Type': stats_row['dtype'],
+                'Severity': 'High' if missing_pct > 30 else 'Medium' if missing_pct > 10 else 'Low'
+            })
         
         if not missing_info:
             return _create_info_report("No missing values found in the dataset")
@@ -894,66 +805,40 @@ def generate_missing_value_analysis(csv_file_path: str) -> str:
         
         # Create summary statistics
         summary_stats = [
-            ('Total Columns', len(data.columns)),
+            ('Total Columns', profile['n_columns']),
             ('Columns with Missing Values', len(missing_info)),
             ('Total Missing Cells', f"{total_missing:,}"),
             ('Overall Missing Percentage', f"{total_missing/total_cells*100:.2f}%")
         ]
         
         # Create HTML report
-        summary_html = """
+        summary_table = render_info_table(summary_stats, table_class="vds-summary-table")
+        summary_html = f"""
         <vds-info-panel>
             <vds-title>Missing Value Summary</vds-title>
-            <table class="vds-summary-table">
-        """
-        
-        for label, value in summary_stats:
-            summary_html += f"""
-                <tr><td class="vds-label">{label}</td><td class="vds-value">{value}</td></tr>
-            """
-        
-        summary_html += """
-            </table>
+            {summary_table}
         </vds-info-panel>
         """
         
         # Create detailed missing value table
-        detail_html = """
+        details = pd.DataFrame(missing_info, dtype=object).rename(columns={'Missing Percentage': 'Missing %'})
+        detail_table = render_frame_table(
+            details, max_rows=len(details), table_class="vds-missing-table",
+            column_classes={'Column': 'vds-col-name', 'Missing Count': 'vds-missing-count',
+                            'Missing %': 'vds-missing-pct', 'Data Type': 'vds-data-type',
+                            'Severity': 'vds-severity'},
+            row_classes=[f"vds-row-{info['Severity'].lower()}" for info in missing_info],
+        )
+        detail_html = f"""
         <vds-section>
             <vds-title>Missing Values by Column</vds-title>
-            <table class="vds-missing-table">
-                <thead>
-                    <tr>
-                        <th class="vds-col-header">Column</th>
-                        <th class="vds-col-header">Missing Count</th>
-                        <th class="vds-col-header">Missing %</th>
-                        <th class="vds-col-header">Data Type</th>
-                        <th class="vds-col-header">Severity</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
-        for info in missing_info:
-            severity_class = f"vds-severity-{info['Severity'].lower()}"
-            detail_html += f"""
-                    <tr class="{severity_class}">
-                        <td class="vds-col-name">{info['Column']}</td>
-                        <td class="vds-missing-count">{info['Missing Count']}</td>
-                        <td class="vds-missing-pct">{info['Missing Percentage']}</td>
-                        <td class="vds-data-type">{info['Data Type']}</td>
-                        <td class="vds-severity">{info['Severity']}</td>
-                    </tr>
-            """
-        
-        detail_html += """
-                </tbody>
-            </table>
+            {detail_table}
         </vds-section>
         """
         
         return f"""
         <vds-container>
+            {css_block()}
             {summary_html}
             {detail_html}
         </vds-container>
@@ -965,11 +850,11 @@ def generate_missing_value_analysis(csv_file_path: str) -> str:
 
 def _create_error_report(error_message: str) -> str:
     """Create HTML error report"""
+    error_table = render_info_table({'Analysis Error': error_message}, table_class="vds-error-table",
+                                    label_class="vds-error-label", value_class="vds-error-value")
     return f"""
     <vds-error-panel>
-        <table class="vds-error-table">
-            <tr><td class="vds-error-label">Analysis Error</td><td class="vds-error-value">{error_message}</td></tr>
-        </table>
+        {error_table}
     </vds-error-panel>
     """
 
@@ -978,9 +863,7 @@ def _create_info_report(info_message: str) -> str:
     """Create HTML info report"""
     return f"""
     <vds-info-panel>
-        <table class="vds-info-table">
-            <tr><td class="vds-label">Information</td><td class="vds-value">{info_message}</td></tr>
-        </table>
+        {render_info_table({'Information': info_message})}
     </vds-info-panel>
     """
 
@@ -996,10 +879,10 @@ def generate_advanced_statistics(csv_file_path: str, columns: Optional[List[str]
     Returns:
         HTML report with comprehensive statistics
     """
+    from scipy import stats
     try:
         import pandas as pd
         import numpy as np
-        from scipy import stats
         data = pd.read_csv(csv_file_path)
         
         # Select columns to analyze
@@ -1037,63 +920,38 @@ def generate_advanced_statistics(csv_file_path: str, columns: Optional[List[str]
                 stats_data.append(basic_stats)
         
         # Generate HTML report
+        stats_frame = pd.DataFrame(stats_data)
+        summary = pd.DataFrame({
+            'Variable': stats_frame['variable'].astype(str),
+            'Count': stats_frame['count'].map('{:,}'.format),
+            'Mean': stats_frame['mean'], 'Std Dev': stats_frame['std'],
+            'Min': stats_frame['min'], 'Q25': stats_frame['q25'],
+            'Median': stats_frame['median'], 'Q75': stats_frame['q75'],
+            'Max': stats_frame['max'], 'Skewness': stats_frame['skewness'],
+            'Kurtosis': stats_frame['kurtosis'],
+            'Missing %': stats_frame['missing_pct'].map('{:.2f}%'.format),
+        })
+        stats_table = render_frame_table(
+            summary, max_rows=len(summary), table_class="vds-data-table",
+            float_format="%.4f", sci_format=None,
+        )
+        info_table = render_info_table({
+            'Dataset': csv_file_path,
+            'Variables Analyzed': len(stats_data),
+            'Total Observations': f"{len(data):,}",
+        })
         html_content = f"""
         <vds-container>
+            {css_block()}
             <vds-title>Advanced Statistical Summary</vds-title>
             
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Dataset</td><td class="vds-value">{csv_file_path}</td></tr>
-                    <tr><td class="vds-label">Variables Analyzed</td><td class="vds-value">{len(stats_data)}</td></tr>
-                    <tr><td class="vds-label">Total Observations</td><td class="vds-value">{len(data):,}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-subtitle>Comprehensive Statistics</vds-subtitle>
-                <vds-table>
-                    <table class="vds-data-table">
-                        <thead>
-                            <tr>
-                                <th class="vds-col-header">Variable</th>
-                                <th class="vds-col-header">Count</th>
-                                <th class="vds-col-header">Mean</th>
-                                <th class="vds-col-header">Std Dev</th>
-                                <th class="vds-col-header">Min</th>
-                                <th class="vds-col-header">Q25</th>
-                                <th class="vds-col-header">Median</th>
-                                <th class="vds-col-header">Q75</th>
-                                <th class="vds-col-header">Max</th>
-                                <th class="vds-col-header">Skewness</th>
-                                <th class="vds-col-header">Kurtosis</th>
-                                <th class="vds-col-header">Missing %</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-        """
-        
-        for stat in stats_data:
-            html_content += f"""
-                            <tr>
-                                <td class="vds-cell">{stat['variable']}</td>
-                                <td class="vds-cell">{stat['count']:,}</td>
-                                <td class="vds-cell">{stat['mean']:.4f}</td>
-                                <td class="vds-cell">{stat['std']:.4f}</td>
-                                <td class="vds-cell">{stat['min']:.4f}</td>
-                                <td class="vds-cell">{stat['q25']:.4f}</td>
-                                <td class="vds-cell">{stat['median']:.4f}</td>
-                                <td class="vds-cell">{stat['q75']:.4f}</td>
-                                <td class="vds-cell">{stat['max']:.4f}</td>
-                                <td class="vds-cell">{stat['skewness']:.4f}</td>
-                                <td class="vds-cell">{stat['kurtosis']:.4f}</td>
-                                <td class="vds-cell">{stat['missing_pct']:.2f}%</td>
-                            </tr>
-            """
-        
-        html_content += """
-                        </tbody>
-                    </table>
-                </vds-table>
+                {stats_table}
             </vds-section>
         </vds-container>
         """
@@ -1186,56 +1044,40 @@ def generate_feature_importance_analysis(csv_file_path: str, target_column: str
         importance_results.sort(key=lambda x: x['composite_score'], reverse=True)
         
         # Build HTML report
+        scores = np.array([result['correlation_importance'] for result in importance_results], dtype=float)
+        levels = np.select(
+            [scores > 0.7, scores > 0.4],
+            ['<span class="vds-status-good">High</span>', '<span class="vds-status-warning">Medium</span>'],
+            default='<span class="vds-status-danger">Low</span>',
+        )
+        rankings = pd.DataFrame({
+            'Feature': [str(result['feature']) for result in importance_results],
+            'Correlation (abs)': scores,
+            'Rank': np.arange(1, len(importance_results) + 1),
+            'Importance Level': levels.astype(object),
+        })
+        rankings_table = render_frame_table(
+            rankings, max_rows=len(rankings), table_class="vds-data-table",
+            float_format="%.4f", sci_format=None, raw_html_columns=('Importance Level',),
+        )
+        info_table = render_info_table({
+            'Dataset': csv_file_path,
+            'Target Variable': target_column,
+            'Features Analyzed': len(features.columns),
+            'Analysis Method': 'Correlation Analysis',
+        })
         html_content = f"""
         <vds-container>
+            {css_block()}
             <vds-title>Feature Importance Analysis Report</vds-title>
             
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Dataset</td><td class="vds-value">{csv_file_path}</td></tr>
-                    <tr><td class="vds-label">Target Variable</td><td class="vds-value">{target_column}</td></tr>
-                    <tr><td class="vds-label">Features Analyzed</td><td class="vds-value">{len(features.columns)}</td></tr>
-                    <tr><td class="vds-label">Analysis Method</td><td class="vds-value">Correlation Analysis</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-subtitle>Feature Importance Rankings</vds-subtitle>
-                <vds-table>
-                    <table class="vds-data-table">
-                        <thead>
-                            <tr>
-                                <th class="vds-col-header">Feature</th>
-                                <th class="vds-col-header">Correlation (abs)</th>
-                                <th class="vds-col-header">Rank</th>
-                                <th class="vds-col-header">Importance Level</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-        """
-        
-        for i, result in enumerate(importance_results):
-            corr_val = result['correlation_importance']
-            if corr_val > 0.7:
-                importance_level = '<span class="vds-status-good">High</span>'
-            elif corr_val > 0.4:
-                importance_level = '<span class="vds-status-warning">Medium</span>'
-            else:
-                importance_level = '<span class="vds-status-danger">Low</span>'
-                
-            html_content += f"""
-                            <tr>
-                                <td class="vds-cell">{result['feature']}</td>
-                                <td class="vds-cell">{corr_val:.4f}</td>
-                                <td class="vds-cell">{i + 1}</td>
-                                <td class="vds-cell">{importance_level}</td>
-                            </tr>
-            """
-        
-        html_content += """
-                        </tbody>
-                    </table>
-                </vds-table>
+                {rankings_table}
             </vds-section>
         </vds-container>
         """
@@ -1243,15 +1085,16 @@ def generate_feature_importance_analysis(csv_file_path: str, target_column: str
         return html_content
         
     except Exception as e:
+        error_table = render_info_table({
+            'Error Type': type(e).__name__,
+            'Error Message': str(e),
+            'File Path': csv_file_path,
+        }, table_class="vds-error-table", label_class="vds-error-label", value_class="vds-error-value")
         return f"""
         <vds-container>
             <vds-error-panel>
                 <vds-title>Feature Importance Analysis Error</vds-title>
-                <table class="vds-error-table">
-                    <tr><td class="vds-error-label">Error Type</td><td class="vds-error-value">{type(e).__name__}</td></tr>
-                    <tr><td class="vds-error-label">Error Message</td><td class="vds-error-value">{str(e)}</td></tr>
-                    <tr><td class="vds-error-label">File Path</td><td class="vds-error-value">{csv_file_path}</td></tr>
-                </table>
+                {error_table}
             </vds-error-panel>
         </vds-container>
         """
@@ -1268,112 +1111,103 @@ def generate_data_quality_report(csv_file_path: str) -> str:
         HTML report with data quality metrics
     """
     try:
-        data = pd.read_csv(csv_file_path)
+        profile = profile_csv(csv_file_path)
+        n_rows = profile['n_rows']
         
         # Overall quality metrics
-        total_cells = len(data) * len(data.columns)
-        missing_cells = data.isnull().sum().sum()
-        duplicate_rows = data.duplicated().sum()
+        total_cells = profile['total_cells']
+        missing_cells = profile['missing_cells']
+        duplicate_rows = profile['duplicate_rows']
         
-        # Column-wise quality assessment
+        # Column-wise quality assessment (rendered from the cached profile)
         quality_info = []
-        for col in data.columns:
+        for col, stats_row in profile['columns'].iterrows():
             col_info = {
                 'column': col,
-                'dtype': str(data[col].dtype),
-                'non_null': data[col].count(),
-                'null_count': data[col].isnull().sum(),
-                'null_pct': f"{(data[col].isnull().sum() / len(data)) * 100:.1f}%",
-                'unique_count': data[col].nunique(),
-                'unique_pct': f"{(data[col].nunique() / len(data)) * 100:.1f}%"
+                'dtype': stats_row['dtype'],
+                'is_numeric': bool(stats_row['is_numeric']),
+                'non_null': int(stats_row['non_null']),
+                'null_count': int(stats_row['null_count']),
+                'null_pct': f"{stats_row['null_pct']:.1f}%",
+                'unique_count': int(stats_row['unique_count']),
+                'unique_pct': f"{stats_row['unique_pct']:.1f}%"
             }
             
             # Data type specific checks
-            if pd.api.types.is_numeric_dtype(data[col]):
-                col_info['zeros'] = (data[col] == 0).sum()
-                col_info['negatives'] = (data[col] < 0).sum() if data[col].dtype in ['int64', 'float64'] else 0
-                col_info['infinites'] = np.isinf(data[col]).sum() if data[col].dtype == 'float64' else 0
+            if col_info['is_numeric']:
+                col_info['zeros'] = int(stats_row['zeros'])
+                col_info['negatives'] = int(stats_row['negatives'])
+                col_info['infinites'] = int(stats_row['infinites'])
             else:
-                col_info['empty_strings'] = (data[col] == '').sum()
-                col_info['whitespace_only'] = data[col].str.strip().eq('').sum() if data[col].dtype == 'object' else 0
+                col_info['empty_strings'] = int(stats_row['empty_strings'])
+                col_info['whitespace_only'] = int(stats_row['whitespace_only'])
             
             # Quality score (0-100)
             quality_score = 100
             if col_info['null_pct'] != '0.0%':
                 quality_score -= float(col_info['null_pct'].rstrip('%'))
-            if pd.api.types.is_numeric_dtype(data[col]) and col_info['infinites'] > 0:
+            if col_info['is_numeric'] and col_info['infinites'] > 0:
                 quality_score -= 10
             
             col_info['quality_score'] = f"{max(0, quality_score):.1f}"
             quality_info.append(col_info)
         
         # Create HTML report
-        report_html = f"""
-        <vds-container>
-            <vds-info-panel>
-                <vds-title>Data Quality Assessment Report</vds-title>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Dataset Shape</td><td class="vds-value">{data.shape[0]:,} rows × {data.shape[1]} columns</td></tr>
-                    <tr><td class="vds-label">Total Cells</td><td class="vds-value">{total_cells:,}</td></tr>
-                    <tr><td class="vds-label">Missing Cells</td><td class="vds-value">{missing_cells:,} ({(missing_cells/total_cells)*100:.2f}%)</td></tr>
-                    <tr><td class="vds-label">Duplicate Rows</td><td class="vds-value">{duplicate_rows:,}</td></tr>
-                    <tr><td class="vds-label">Overall Quality</td><td class="vds-value">{max(0, 100 - (missing_cells/total_cells)*100):.1f}%</td></tr>
-                </table>
-            </vds-info-panel>
-            
-            <vds-section>
-                <vds-title>Column Quality Details</vds-title>
-                <table class="vds-quality-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Column</th>
-                            <th class="vds-col-header">Data Type</th>
-                            <th class="vds-col-header">Non-Null</th>
-                            <th class="vds-col-header">Null Count</th>
-                            <th class="vds-col-header">Null %</th>
-                            <th class="vds-col-header">Unique Count</th>
-                            <th class="vds-col-header">Unique %</th>
-                            <th class="vds-col-header">Issues</th>
-                            <th class="vds-col-header">Quality Score</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
+        issues_column, severity_classes = [], []
         for info in quality_info:
             # Identify issues
             issues = []
             if float(info['null_pct'].rstrip('%')) > 10:
                 issues.append("High missing")
-            if pd.api.types.is_numeric_dtype(data[info['column']]):
+            if info['is_numeric']:
                 if info.get('infinites', 0) > 0:
                     issues.append("Infinite values")
-                if info.get('zeros', 0) > len(data) * 0.5:
+                if info.get('zeros', 0) > n_rows * 0.5:
                     issues.append("Many zeros")
             else:
                 if info.get('empty_strings', 0) > 0:
                     issues.append("Empty strings")
+            issues_column.append(", ".join(issues) if issues else "None")
+            score = float(info['quality_score'])
+            severity_classes.append("vds-row-low" if score >= 90 else "vds-row-medium" if score >= 70 else "vds-row-high")
+        
+        details = pd.DataFrame({
+            'Column': [str(info['column']) for info in quality_info],
+            'Data Type': [str(info['dtype']) for info in quality_info],
+            'Non-Null': [f"{info['non_null']:,}" for info in quality_info],
+            'Null Count': [f"{info['null_count']:,}" for info in quality_info],
+            'Null %': [info['null_pct'] for info in quality_info],
+            'Unique Count': [f"{info['unique_count']:,}" for info in quality_info],
+            'Unique %': [info['unique_pct'] for info in quality_info],
+            'Issues': issues_column,
+            'Quality Score': [f"{info['quality_score']}%" for info in quality_info],
+        }, dtype=object)
+        quality_table = render_frame_table(
+            details, max_rows=len(details), table_class="vds-quality-table",
+            column_classes={'Column': 'vds-col-name', 'Data Type': 'vds-dtype', 'Non-Null': 'vds-count',
+                            'Null Count': 'vds-null-count', 'Null %': 'vds-null-pct',
+                            'Unique Count': 'vds-unique-count', 'Unique %': 'vds-unique-pct',
+                            'Issues': 'vds-issues', 'Quality Score': 'vds-quality-score'},
+            row_classes=severity_classes,
+        )
+        info_table = render_info_table({
+            'Dataset Shape': f"{n_rows:,} rows × {profile['n_columns']} columns",
+            'Total Cells': f"{total_cells:,}",
+            'Missing Cells': f"{missing_cells:,} ({(missing_cells/total_cells)*100:.2f}%)",
+            'Duplicate Rows': f"{duplicate_rows:,}",
+            'Overall Quality': f"{max(0, 100 - (missing_cells/total_cells)*100):.1f}%",
+        })
+        report_html = f"""
+        <vds-container>
+            {css_block()}
+            <vds-info-panel>
+                <vds-title>Data Quality Assessment Report</vds-title>
+                {info_table}
+            </vds-info-panel>
             
-            issues_text = ", ".join(issues) if issues else "None"
-            quality_class = "vds-quality-good" if float(info['quality_score']) >= 90 else "vds-quality-medium" if float(info['quality_score']) >= 70 else "vds-quality-poor"
-            
-            report_html += f"""
-                        <tr class="{quality_class}">
-                            <td class="vds-col-name">{info['column']}</td>
-                            <td class="vds-dtype">{info['dtype']}</td>
-                            <td class="vds-count">{info['non_null']:,}</td>
-                            <td class="vds-null-count">{info['null_count']:,}</td>
-                            <td class="vds-null-pct">{info['null_pct']}</td>
-                            <td class="vds-unique-count">{info['unique_count']:,}</td>
-                            <td class="vds-unique-pct">{info['unique_pct']}</td>
-                            <td class="vds-issues">{issues_text}</td>
-                            <td class="vds-quality-score">{info['quality_score']}%</td>
-                        </tr>
-            """
-        
-        report_html += """
-                    </tbody>
-                </table>
+            <vds-section>
+                <vds-title>Column Quality Details</vds-title>
+                {quality_table}
             </vds-section>
         </vds-container>
         """
@@ -1488,47 +1322,36 @@ def generate_feature_importance_analysis(csv_file_path: str, target_column: Opti
                 })
         
         # Create HTML report
+        rankings = pd.DataFrame({
+            'Rank': [result['rank'] for result in importance_results],
+            'Feature': [str(result['feature']) for result in importance_results],
+            'Importance Score': [result['importance'] for result in importance_results],
+        }, dtype=object)
+        # Top 20 features; the table footer reports how many more there are
+        rankings_table = render_frame_table(
+            rankings, max_rows=20, table_class="vds-importance-table",
+            column_classes={'Rank': 'vds-rank', 'Feature': 'vds-feature-name',
+                            'Importance Score': 'vds-importance-score'},
+            row_classes=["vds-rank-high" if result['rank'] <= 5 else "vds-rank-medium" if result['rank'] <= 10
+                         else "vds-rank-low" for result in importance_results],
+        )
+        info_table = render_info_table({
+            'Target Column': target_column,
+            'Method Used': method,
+            'Features Analyzed': len(feature_cols),
+            'Target Type': 'Numeric' if pd.api.types.is_numeric_dtype(data[target_column]) else 'Categorical',
+        })
         report_html = f"""
         <vds-container>
+            {css_block()}
             <vds-info-panel>
                 <vds-title>Feature Importance Analysis</vds-title>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Target Column</td><td class="vds-value">{target_column}</td></tr>
-                    <tr><td class="vds-label">Method Used</td><td class="vds-value">{method}</td></tr>
-                    <tr><td class="vds-label">Features Analyzed</td><td class="vds-value">{len(feature_cols)}</td></tr>
-                    <tr><td class="vds-label">Target Type</td><td class="vds-value">{'Numeric' if pd.api.types.is_numeric_dtype(data[target_column]) else 'Categorical'}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>Feature Importance Rankings</vds-title>
-                <table class="vds-importance-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Rank</th>
-                            <th class="vds-col-header">Feature</th>
-                            <th class="vds-col-header">Importance Score</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        for result in importance_results[:20]:  # Show top 20 features
-            rank_class = "vds-rank-high" if result['rank'] <= 5 else "vds-rank-medium" if result['rank'] <= 10 else "vds-rank-low"
-            report_html += f"""
-                        <tr class="{rank_class}">
-                            <td class="vds-rank">{result['rank']}</td>
-                            <td class="vds-feature-name">{result['feature']}</td>
-                            <td class="vds-importance-score">{result['importance']}</td>
-                        </tr>
-            """
-        
-        if len(importance_results) > 20:
-            report_html += f"<tr><td colspan='3' class='vds-info'>... and {len(importance_results) - 20} more features</td></tr>"
-        
-        report_html += """
-                    </tbody>
-                </table>
+                {rankings_table}
             </vds-section>
         </vds-container>
         """
@@ -1555,28 +1378,28 @@ def generate_basic_data_audit(csv_file_path: str) -> str:
         # File-level information
         file_size_mb = os.path.getsize(csv_file_path) / (1024 * 1024)
         
-        # Load data
-        data = pd.read_csv(csv_file_path)
-        
-        # Basic checks
-        total_cells = len(data) * len(data.columns)
-        missing_cells = data.isnull().sum().sum()
-        duplicate_rows = data.duplicated().sum()
-        
+        # Basic checks from the cached dataset profile
+        profile = profile_csv(csv_file_path)
+        total_cells = profile['total_cells']
+        missing_cells = profile['missing_cells']
+        duplicate_rows = profile['duplicate_rows']
+        
+        info_table = render_info_table({
+            'Data File Path': csv_file_path,
+            'File Size': f"{file_size_mb:.2f} MB",
+            'Number of Rows': f"{profile['n_rows']:,}",
+            'Number of Columns': profile['n_columns'],
+            'Total Cells': f"{total_cells:,}",
+            'Missing Cells': f"{missing_cells:,} ({(missing_cells/total_cells)*100:.2f}%)",
+            'Duplicate Rows': f"{duplicate_rows:,}",
+            'Data Accessibility': '✓ Normal',
+        })
         return f"""
         <vds-container>
+            {css_block()}
             <vds-info-panel>
                 <vds-title>Basic Data Audit</vds-title>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Data File Path</td><td class="vds-value">{csv_file_path}</td></tr>
-                    <tr><td class="vds-label">File Size</td><td class="vds-value">{file_size_mb:.2f} MB</td></tr>
-                    <tr><td class="vds-label">Number of Rows</td><td class="vds-value">{len(data):,}</td></tr>
-                    <tr><td class="vds-label">Number of Columns</td><td class="vds-value">{len(data.columns)}</td></tr>
-                    <tr><td class="vds-label">Total Cells</td><td class="vds-value">{total_cells:,}</td></tr>
-                    <tr><td class="vds-label">Missing Cells</td><td class="vds-value">{missing_cells:,} ({(missing_cells/total_cells)*100:.2f}%)</td></tr>
-                    <tr><td class="vds-label">Duplicate Rows</td><td class="vds-value">{duplicate_rows:,}</td></tr>
-                    <tr><td class="vds-label">Data Accessibility</td><td class="vds-value">✓ Normal</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
         </vds-container>
         """
@@ -1597,6 +1420,7 @@ def generate_data_type_analysis(csv_file_path: str) -> str:
     """
     try:
         data = pd.read_csv(csv_file_path)
+        fingerprint = file_fingerprint(csv_file_path)
         
         type_analysis = {}
         conversion_suggestions = []
@@ -1612,7 +1436,7 @@ def generate_data_type_analysis(csv_file_path: str) -> str:
             }
             
             # Check for potential type conversions
-            if col_data.dtype == 'object':
+            if col_data.dtype == 'object' or pd.api.types.is_string_dtype(col_data):
                 # Try to convert to numeric
                 try:
                     numeric_converted = pd.to_numeric(col_data, errors='coerce')
@@ -1625,6 +1449,13 @@ def generate_data_type_analysis(csv_file_path: str) -> str:
                 except:
                     pass
                 
+                # Check for dates (sample-based, skips free text immediately)
+                if not analysis.get('numeric_conversion_rate', 0) > 0.8:
+                    datetime_format = detect_datetime_format(data, col, fingerprint)
+                    if datetime_format is not None:
+                        analysis['datetime_format'] = datetime_format
+                        conversion_suggestions.append(f"Suggest converting {col} to datetime type (format: {datetime_format})")
+                
                 # Check if should be categorical
                 if analysis['unique_count'] < len(data) * 0.5:
                     conversion_suggestions.append(f"Suggest converting {col} to categorical type (unique value rate: {analysis['unique_count']/len(data):.1%})")
@@ -1632,56 +1463,48 @@ def generate_data_type_analysis(csv_file_path: str) -> str:
             type_analysis[col] = analysis
         
         # Create HTML report
+        suggestion_column = []
+        for col, info in type_analysis.items():
+            if info.get('potential_numeric', False) and info['numeric_conversion_rate'] > 0.8:
+                suggestion_column.append("→Numeric")
+            elif info.get('datetime_format'):
+                suggestion_column.append("→Datetime")
+            elif info['dtype'] == 'object' and info['unique_count'] < len(data) * 0.5:
+                suggestion_column.append("→Categorical")
+            else:
+                suggestion_column.append("None")
+        
+        details = pd.DataFrame({
+            'Column Name': [str(col) for col in type_analysis],
+            'Data Type': [str(info['dtype']) for info in type_analysis.values()],
+            'Non-null Values': [f"{info['non_null_count']:,}" for info in type_analysis.values()],
+            'Unique Values': [f"{info['unique_count']:,}" for info in type_analysis.values()],
+            'Memory Usage': [f"{info['memory_usage'] / 1024 / 1024:.3f} MB" for info in type_analysis.values()],
+            'Conversion Suggestions': suggestion_column,
+        }, dtype=object)
+        type_table = render_frame_table(
+            details, max_rows=len(details), table_class="vds-type-table",
+            column_classes={'Column Name': 'vds-col-name', 'Data Type': 'vds-dtype',
+                            'Non-null Values': 'vds-count', 'Unique Values': 'vds-count',
+                            'Memory Usage': 'vds-memory', 'Conversion Suggestions': 'vds-suggestion'},
+        )
+        info_table = render_info_table({
+            'Analyzed Columns': len(type_analysis),
+            'Conversion Suggestions': len(conversion_suggestions),
+        })
         report_html = f"""
         <vds-container>
+            {css_block()}
             <vds-info-panel>
                 <vds-title>Data Type Analysis</vds-title>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Analyzed Columns</td><td class="vds-value">{len(type_analysis)}</td></tr>
-                    <tr><td class="vds-label">Conversion Suggestions</td><td class="vds-value">{len(conversion_suggestions)}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>Detailed Type Analysis</vds-title>
-                <table class="vds-type-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Column Name</th>
-                            <th class="vds-col-header">Data Type</th>
-                            <th class="vds-col-header">Non-null Values</th>
-                            <th class="vds-col-header">Unique Values</th>
-                            <th class="vds-col-header">Memory Usage</th>
-                            <th class="vds-col-header">Conversion Suggestions</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        for col, info in type_analysis.items():
-            memory_mb = info['memory_usage'] / 1024 / 1024
-            suggestions = []
-            if info.get('potential_numeric', False) and info['numeric_conversion_rate'] > 0.8:
-                suggestions.append("→Numeric")
-            elif info['dtype'] == 'object' and info['unique_count'] < len(data) * 0.5:
-                suggestions.append("→Categorical")
-            suggestion_text = ", ".join(suggestions) if suggestions else "None"
-            
-            report_html += f"""
-                        <tr>
-                            <td class="vds-col-name">{col}</td>
-                            <td class="vds-dtype">{info['dtype']}</td>
-                            <td class="vds-count">{info['non_null_count']:,}</td>
-                            <td class="vds-count">{info['unique_count']:,}</td>
-                            <td class="vds-memory">{memory_mb:.3f} MB</td>
-                            <td class="vds-suggestion">{suggestion_text}</td>
-                        </tr>
-            """
-        
-        report_html += """
-                    </tbody>
-                </table>
+                {type_table}
             </vds-section>
+        </vds-container>
         """
         return report_html
         
@@ -1704,6 +1527,7 @@ def generate_temporal_analysis(csv_file_path: str) -> str:
         from datetime import datetime
         
         data = pd.read_csv(csv_file_path)
+        fingerprint = file_fingerprint(csv_file_path)
         
         temporal_analysis = {
             'temporal_columns': [],
@@ -1729,13 +1553,15 @@ def generate_temporal_analysis(csv_file_path: str) -> str:
                 
                 col_info = {'column': col, 'type': 'unknown', 'analysis': []}
                 
-                # Try to parse as datetime
+                # Parse as datetime with the format detected on a sample (cached per file and column)
                 try:
-                    if data[col].dtype == 'object':
-                        parsed_dates = pd.to_datetime(data[col], errors='coerce')
-                        if not parsed_dates.isnull().all():
+                    if data[col].dtype == 'object' or pd.api.types.is_string_dtype(data[col]):
+                        parsed_dates = parse_datetime_column(data, col, fingerprint)
+                        if parsed_dates is None:
+                            col_info['analysis'].append("No date format detected in sample")
+                        elif not parsed_dates.isnull().all():
                             col_info['type'] = 'datetime'
-                            col_info['analysis'].append(f"Successfully parsed as date format")
+                            col_info['analysis'].append(f"Successfully parsed as date format ({detect_datetime_format(data, col, fingerprint)})")
                             
                             time_span = (parsed_dates.max() - parsed_dates.min()).days
                             col_info['analysis'].append(f"Time span: {time_span} days")
@@ -1768,54 +1594,44 @@ def generate_temporal_analysis(csv_file_path: str) -> str:
         
         # Create HTML report
         if found_columns:
+            details = pd.DataFrame({
+                'Column Name': [str(col_info['column']) for col_info in found_columns],
+                'Type': [str(col_info['type']) for col_info in found_columns],
+                'Analysis Results': ["; ".join(col_info['analysis']) for col_info in found_columns],
+            }, dtype=object)
+            detail_table = render_frame_table(
+                details, max_rows=len(details), table_class="vds-temporal-table",
+                column_classes={'Column Name': 'vds-col-name', 'Type': 'vds-type', 'Analysis Results': 'vds-analysis'},
+            )
+            info_table = render_info_table({
+                'Time-related Columns Found': len(found_columns),
+                'Total Dataset Rows': f"{len(data):,}",
+            })
             report_html = f"""
             <vds-container>
+                {css_block()}
                 <vds-info-panel>
                     <vds-title>Temporal Dimension Analysis</vds-title>
-                    <table class="vds-info-table">
-                        <tr><td class="vds-label">Time-related Columns Found</td><td class="vds-value">{len(found_columns)}</td></tr>
-                        <tr><td class="vds-label">Total Dataset Rows</td><td class="vds-value">{len(data):,}</td></tr>
-                    </table>
+                    {info_table}
                 </vds-info-panel>
                 
                 <vds-section>
                     <vds-title>Detailed Time Column Analysis</vds-title>
-                    <table class="vds-temporal-table">
-                        <thead>
-                            <tr>
-                                <th class="vds-col-header">Column Name</th>
-                                <th class="vds-col-header">Type</th>
-                                <th class="vds-col-header">Analysis Results</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-            """
-            
-            for col_info in found_columns:
-                analysis_text = "; ".join(col_info['analysis'])
-                report_html += f"""
-                            <tr>
-                                <td class="vds-col-name">{col_info['column']}</td>
-                                <td class="vds-type">{col_info['type']}</td>
-                                <td class="vds-analysis">{analysis_text}</td>
-                            </tr>
-                """
-            
-            report_html += """
-                        </tbody>
-                    </table>
+                    {detail_table}
                 </vds-section>
             </vds-container>
             """
         else:
-            report_html = """
+            info_table = render_info_table({
+                'Time-related Columns': 'Not Found',
+                'Data Type': 'Likely cross-sectional data with no obvious temporal dimension',
+            })
+            report_html = f"""
             <vds-container>
+                {css_block()}
                 <vds-info-panel>
                     <vds-title>Temporal Dimension Analysis</vds-title>
-                    <table class="vds-info-table">
-                        <tr><td class="vds-label">Time-related Columns</td><td class="vds-value">Not Found</td></tr>
-                        <tr><td class="vds-label">Data Type</td><td class="vds-value">Likely cross-sectional data with no obvious temporal dimension</td></tr>
-                    </table>
+                    {info_table}
                 </vds-info-panel>
             </vds-container>
             """
@@ -1885,52 +1701,43 @@ def generate_spatial_analysis(csv_file_path: str) -> str:
         
         # Create HTML report
         if found_columns:
+            details = pd.DataFrame({
+                'Column Name': [str(col_info['column']) for col_info in found_columns],
+                'Analysis Results': ["; ".join(col_info['analysis']) for col_info in found_columns],
+            }, dtype=object)
+            detail_table = render_frame_table(
+                details, max_rows=len(details), table_class="vds-spatial-table",
+                column_classes={'Column Name': 'vds-col-name', 'Analysis Results': 'vds-analysis'},
+            )
+            info_table = render_info_table({
+                'Spatial-related Columns Found': len(found_columns),
+                'Total Dataset Rows': f"{len(data):,}",
+            })
             report_html = f"""
             <vds-container>
+                {css_block()}
                 <vds-info-panel>
                     <vds-title>Spatial Dimension Analysis</vds-title>
-                    <table class="vds-info-table">
-                        <tr><td class="vds-label">Spatial-related Columns Found</td><td class="vds-value">{len(found_columns)}</td></tr>
-                        <tr><td class="vds-label">Total Dataset Rows</td><td class="vds-value">{len(data):,}</td></tr>
-                    </table>
+                    {info_table}
                 </vds-info-panel>
                 
                 <vds-section>
                     <vds-title>Detailed Spatial Column Analysis</vds-title>
-                    <table class="vds-spatial-table">
-                        <thead>
-                            <tr>
-                                <th class="vds-col-header">Column Name</th>
-                                <th class="vds-col-header">Analysis Results</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-            """
-            
-            for col_info in found_columns:
-                analysis_text = "; ".join(col_info['analysis'])
-                report_html += f"""
-                            <tr>
-                                <td class="vds-col-name">{col_info['column']}</td>
-                                <td class="vds-analysis">{analysis_text}</td>
-                            </tr>
-                """
-            
-            report_html += """
-                        </tbody>
-                    </table>
+                    {detail_table}
                 </vds-section>
             </vds-container>
             """
         else:
-            report_html = """
+            info_table = render_info_table({
+                'Spatial-related Columns': 'Not Found',
+                'Data Type': 'Data may have no obvious spatial dimension',
+            })
+            report_html = f"""
             <vds-container>
+                {css_block()}
                 <vds-info-panel>
                     <vds-title>Spatial Dimension Analysis</vds-title>
-                    <table class="vds-info-table">
-                        <tr><td class="vds-label">Spatial-related Columns</td><td class="vds-value">Not Found</td></tr>
-                        <tr><td class="vds-label">Data Type</td><td class="vds-value">Data may have no obvious spatial dimension</td></tr>
-                    </table>
+                    {info_table}
                 </vds-info-panel>
             </vds-container>
             """
@@ -2015,83 +1822,61 @@ def generate_multicollinearity_analysis(csv_file_path: str) -> str:
                 vif_results = [{'note': 'VIF analysis requires statsmodels library'}]
         
         # Create HTML report
+        info_table = render_info_table({
+            'Analyzed Variables': len(numeric_cols),
+            'High Correlation Variable Pairs': f"{len(high_correlation_pairs)} (|r| > {correlation_threshold})",
+            'Correlation Threshold': correlation_threshold,
+        })
         report_html = f"""
         <vds-container>
+            {css_block()}
             <vds-info-panel>
                 <vds-title>Multicollinearity Detection</vds-title>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Analyzed Variables</td><td class="vds-value">{len(numeric_cols)}</td></tr>
-                    <tr><td class="vds-label">High Correlation Variable Pairs</td><td class="vds-value">{len(high_correlation_pairs)} (|r| > {correlation_threshold})</td></tr>
-                    <tr><td class="vds-label">Correlation Threshold</td><td class="vds-value">{correlation_threshold}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
         """
         
         if high_correlation_pairs:
-            report_html += """
+            strong = [abs(pair['correlation']) > 0.95 for pair in high_correlation_pairs]
+            pairs = pd.DataFrame({
+                'Variable 1': [str(pair['var1']) for pair in high_correlation_pairs],
+                'Variable 2': [str(pair['var2']) for pair in high_correlation_pairs],
+                'Correlation': [f"{pair['correlation']:.3f}" for pair in high_correlation_pairs],
+                'Recommendation': ["Consider removal" if is_strong else "Monitor multicollinearity" for is_strong in strong],
+            }, dtype=object)
+            pairs_table = render_frame_table(
+                pairs, max_rows=len(pairs), table_class="vds-correlation-table",
+                column_classes={'Variable 1': 'vds-var-name', 'Variable 2': 'vds-var-name',
+                                'Correlation': 'vds-corr-value', 'Recommendation': 'vds-suggestion'},
+                row_classes=["vds-row-high" if is_strong else "vds-row-medium" for is_strong in strong],
+            )
+            report_html += f"""
             <vds-section>
                 <vds-title>Highly Correlated Variable Pairs</vds-title>
-                <table class="vds-correlation-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Variable 1</th>
-                            <th class="vds-col-header">Variable 2</th>
-                            <th class="vds-col-header">Correlation</th>
-                            <th class="vds-col-header">Recommendation</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-            
-            for pair in high_correlation_pairs:
-                corr_class = "vds-corr-danger" if abs(pair['correlation']) > 0.95 else "vds-corr-warning"
-                suggestion = "Consider removal" if abs(pair['correlation']) > 0.95 else "Monitor multicollinearity"
-                
-                report_html += f"""
-                            <tr class="{corr_class}">
-                                <td class="vds-var-name">{pair['var1']}</td>
-                                <td class="vds-var-name">{pair['var2']}</td>
-                                <td class="vds-corr-value">{pair['correlation']:.3f}</td>
-                                <td class="vds-suggestion">{suggestion}</td>
-                            </tr>
-                """
-            
-            report_html += """
-                    </tbody>
-                </table>
+                {pairs_table}
             </vds-section>
             """
         
         if vif_results and 'note' not in vif_results[0]:
-            report_html += """
+            is_number = [isinstance(result['vif'], (int, float)) for result in vif_results]
+            vif_frame = pd.DataFrame({
+                'Variable': [str(result['variable']) for result in vif_results],
+                'VIF Value': [f"{result['vif']:.2f}" if numeric else str(result['vif'])
+                              for result, numeric in zip(vif_results, is_number)],
+                'Multicollinearity Level': [result['level'] for result in vif_results],
+            }, dtype=object)
+            vif_table = render_frame_table(
+                vif_frame, max_rows=len(vif_frame), table_class="vds-vif-table",
+                column_classes={'Variable': 'vds-var-name', 'VIF Value': 'vds-vif-value',
+                                'Multicollinearity Level': 'vds-vif-level'},
+                row_classes=["vds-row-high" if numeric and result['vif'] > 10
+                             else "vds-row-medium" if numeric and result['vif'] > 5 else "vds-row-low"
+                             for result, numeric in zip(vif_results, is_number)],
+            )
+            report_html += f"""
             <vds-section>
                 <vds-title>Variance Inflation Factor (VIF) Analysis</vds-title>
-                <table class="vds-vif-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Variable</th>
-                            <th class="vds-col-header">VIF Value</th>
-                            <th class="vds-col-header">Multicollinearity Level</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-            
-            for result in vif_results:
-                vif_class = "vds-vif-danger" if isinstance(result['vif'], (int, float)) and result['vif'] > 10 else "vds-vif-warning" if isinstance(result['vif'], (int, float)) and result['vif'] > 5 else "vds-vif-good"
-                vif_display = f"{result['vif']:.2f}" if isinstance(result['vif'], (int, float)) else str(result['vif'])
-                
-                report_html += f"""
-                            <tr class="{vif_class}">
-                                <td class="vds-var-name">{result['variable']}</td>
-                                <td class="vds-vif-value">{vif_display}</td>
-                                <td class="vds-vif-level">{result['level']}</td>
-                            </tr>
-                """
-            
-            report_html += """
-                    </tbody>
-                </table>
+                {vif_table}
             </vds-section>
             """
         
@@ -2111,8 +1896,7 @@ def generate_multicollinearity_analysis(csv_file_path: str) -> str:
                 <p>Found {len(unique_problematic)} variables with multicollinearity issues:</p>
                 <ul class="vds-recommendation-list">
             """
-            for var in unique_problematic:
-                report_html += f"<li>{var}</li>"
+            report_html += "".join(f"<li>{escape(str(var))}</li>" for var in unique_problematic)
             report_html += """
                 </ul>
             </vds-section>
@@ -6,13 +6,14 @@ Provides comprehensive feature engineering capabilities integrated with ml_tools
 import pandas as pd
 import numpy as np
 from typing import List, Optional, Union
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from ..utils.display import Display
+from .html_output import css_block, render_frame_table, render_info_table
 
 try:
     from ..core.ml_tools import (
         transform_features,
         reduce_dimensions,
+        get_cached_reducer,
         select_features,
         create_polynomial_features,
         discretize_features
@@ -64,7 +65,9 @@ class FeatureEngineering(Display):
     def reduce_dimensions(self, csv_file_path: str, method: str = 'pca', 
                          n_components: Union[int, float] = 0.95,
                          target_column: Optional[str] = None,
-                         keep_original: bool = True):
+                         keep_original: bool = True,
+                         svd_solver: Optional[str] = None,
+                         cache_dir: Optional[str] = None):
         """
         Advanced dimensionality reduction with PCA, LDA and other methods
         
@@ -74,13 +77,16 @@ class FeatureEngineering(Display):
             n_components: Number of components to keep (int) or variance to retain (float 0-1)
             target_column: Target column (required for LDA)
             keep_original: Whether to keep original features
+            svd_solver: PCA solver (default: randomized SVD when n_components is a small integer)
+            cache_dir: Optional directory to persist the fitted reducer for later splits
             
         Examples:
             >>> toolkit = FeatureEngineeringToolkit()
             >>> toolkit.reduce_dimensions('data.csv', 'pca', 0.95)
             >>> toolkit.reduce_dimensions('data.csv', 'lda', 5, 'target')
         """
-        html_content = advanced_dimensionality_reduction(csv_file_path, method, n_components, target_column, keep_original)
+        html_content = advanced_dimensionality_reduction(csv_file_path, method, n_components, target_column,
+                                                         keep_original, svd_solver, cache_dir)
         self.show(html_content)
     
     def select_features(self, csv_file_path: str, target_column: str, method: str = 'variance',
@@ -105,7 +111,10 @@ class FeatureEngineering(Display):
     
     def create_polynomial_features(self, csv_file_path: str, columns: Union[str, List[str]],
                                   degree: int = 2, interaction_only: bool = False,
-                                  keep_original: bool = True):
+                                  keep_original: bool = True, max_memory_mb: Optional[float] = 1024,
+                                  dtype: str = 'float64', sparse: bool = False,
+                                  target_column: Optional[str] = None, screening: Optional[str] = None,
+                                  max_features: Optional[int] = None):
         """
         Create polynomial and interaction features from existing columns
         
@@ -115,13 +124,21 @@ class FeatureEngineering(Display):
             degree: Maximum polynomial degree (2-4 recommended)
             interaction_only: Whether to create only interaction features
             keep_original: Whether to keep original columns
+            max_memory_mb: Memory budget for the new features (None = unlimited)
+            dtype: Output dtype of the new features ('float64' or 'float32')
+            sparse: Whether to store the new features as sparse columns
+            target_column: Target used to screen candidate features
+            screening: Screening score ('correlation' or 'mutual_info')
+            max_features: Maximum number of new features to keep after screening
             
         Examples:
             >>> toolkit = FeatureEngineeringToolkit()
             >>> toolkit.create_polynomial_features('data.csv', ['x1', 'x2'], degree=2)
             >>> toolkit.create_polynomial_features('data.csv', 'feature', degree=3, interaction_only=True)
         """
-        html_content = create_polynomial_features_advanced(csv_file_path, columns, degree, interaction_only, keep_original)
+        html_content = create_polynomial_features_advanced(csv_file_path, columns, degree, interaction_only,
+                                                           keep_original, max_memory_mb, dtype, sparse,
+                                                           target_column, screening, max_features)
         self.show(html_content)
     
     def discretize_features(self, csv_file_path: str, columns: Union[str, List[str]],
@@ -222,7 +239,10 @@ class FeatureEngineering(Display):
                         • columns: Column name(s) to create features from<br>
                         • degree: Maximum polynomial degree (default: 2)<br>
                         • interaction_only: Create only interaction terms (default: False)<br>
-                        • keep_original: Keep original columns (default: True)
+                        • keep_original: Keep original columns (default: True)<br>
+                        • max_memory_mb: Memory budget for new features (default: 1024)<br>
+                        • dtype / sparse: 'float32' or sparse output for large expansions<br>
+                        • target_column, screening, max_features: Keep only the candidates most related to the target
                     </vds-method-params>
                     <vds-method-example>
                         Example: toolkit.create_polynomial_features('data.csv', ['x1', 'x2'], degree=2)
@@ -287,6 +307,7 @@ def advanced_feature_transformation(csv_file_path: str, columns: Union[str, List
     Returns:
         HTML formatted report with transformation results
     """
+    from sklearn.preprocessing import StandardScaler, MinMaxScaler
     try:
         data = pd.read_csv(csv_file_path)
         
@@ -367,54 +388,41 @@ def advanced_feature_transformation(csv_file_path: str, columns: Union[str, List
         transformed_data.to_csv(output_path, index=False)
         
         # Create HTML report
+        stats_frame = pd.DataFrame({
+            'Original Column': [str(stat['column']) for stat in transform_stats],
+            'New Column': [str(stat['new_column']) for stat in transform_stats],
+            'Original Mean': [stat['original_mean'] for stat in transform_stats],
+            'New Mean': [stat['new_mean'] for stat in transform_stats],
+            'Original Std': [stat['original_std'] for stat in transform_stats],
+            'New Std': [stat['new_std'] for stat in transform_stats],
+            'Original Range': [stat['original_range'] for stat in transform_stats],
+            'New Range': [stat['new_range'] for stat in transform_stats],
+        }, dtype=object)
+        stats_table = render_frame_table(
+            stats_frame, max_rows=len(stats_frame), table_class="vds-transform-table",
+            column_classes={'Original Column': 'vds-col-name', 'New Column': 'vds-new-col-name',
+                            'Original Mean': 'vds-stat-value', 'New Mean': 'vds-stat-value',
+                            'Original Std': 'vds-stat-value', 'New Std': 'vds-stat-value',
+                            'Original Range': 'vds-range-value', 'New Range': 'vds-range-value'},
+        )
+        info_table = render_info_table({
+            'Transformation Method': method,
+            'Columns Transformed': len(columns),
+            'New Columns Created': len(new_columns),
+            'Keep Original': keep_original,
+            'Output File': output_path,
+        })
         report_html = f"""
         <vds-engineering-report>
+            {css_block()}
             <vds-title>Advanced Feature Transformation Report</vds-title>
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Transformation Method</td><td class="vds-value">{method}</td></tr>
-                    <tr><td class="vds-label">Columns Transformed</td><td class="vds-value">{len(columns)}</td></tr>
-                    <tr><td class="vds-label">New Columns Created</td><td class="vds-value">{len(new_columns)}</td></tr>
-                    <tr><td class="vds-label">Keep Original</td><td class="vds-value">{keep_original}</td></tr>
-                    <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>Transformation Statistics</vds-title>
-                <table class="vds-transform-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Original Column</th>
-                            <th class="vds-col-header">New Column</th>
-                            <th class="vds-col-header">Original Mean</th>
-                            <th class="vds-col-header">New Mean</th>
-                            <th class="vds-col-header">Original Std</th>
-                            <th class="vds-col-header">New Std</th>
-                            <th class="vds-col-header">Original Range</th>
-                            <th class="vds-col-header">New Range</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        for stat in transform_stats:
-            report_html += f"""
-                        <tr>
-                            <td class="vds-col-name">{stat['column']}</td>
-                            <td class="vds-new-col-name">{stat['new_column']}</td>
-                            <td class="vds-stat-value">{stat['original_mean']}</td>
-                            <td class="vds-stat-value">{stat['new_mean']}</td>
-                            <td class="vds-stat-value">{stat['original_std']}</td>
-                            <td class="vds-stat-value">{stat['new_std']}</td>
-                            <td class="vds-range-value">{stat['original_range']}</td>
-                            <td class="vds-range-value">{stat['new_range']}</td>
-                        </tr>
-            """
-        
-        report_html += """
-                    </tbody>
-                </table>
+                {stats_table}
             </vds-section>
         </vds-engineering-report>
         """
@@ -428,7 +436,9 @@ def advanced_feature_transformation(csv_file_path: str, columns: Union[str, List
 def advanced_dimensionality_reduction(csv_file_path: str, method: str = 'pca', 
                                      n_components: Union[int, float] = 0.95,
                                      target_column: Optional[str] = None,
-                                     keep_original: bool = True) -> str:
+                                     keep_original: bool = True,
+                                     svd_solver: Optional[str] = None,
+                                     cache_dir: Optional[str] = None) -> str:
     """
     Advanced dimensionality reduction with VDS Tools integration
     
@@ -438,6 +448,8 @@ def advanced_dimensionality_reduction(csv_file_path: str, method: str = 'pca',
         n_components: Number of components to keep
         target_column: Target column (required for LDA)
         keep_original: Whether to keep original features
+        svd_solver: PCA solver (default: randomized SVD when n_components is a small integer)
+        cache_dir: Optional directory to persist the fitted reducer for later splits
         
     Returns:
         HTML formatted report with reduction results
@@ -457,6 +469,7 @@ def advanced_dimensionality_reduction(csv_file_path: str, method: str = 'pca',
         target = data[target_column] if target_column and target_column in data.columns else None
         
         original_dimensions = len(numeric_cols)
+        reducer_key = None
         
         # Use ml_tools function if available
         if 'reduce_dimensions' in globals():
@@ -465,8 +478,16 @@ def advanced_dimensionality_reduction(csv_file_path: str, method: str = 'pca',
                 method=method,
                 n_components=n_components,
                 target=target,
-                keep_original=keep_original
+                keep_original=keep_original,
+                svd_solver=svd_solver,
+                cache_dir=cache_dir
             )
+            reducer_key = reduced_data.attrs.get('reducer_key')
+            reducer = get_cached_reducer(reducer_key, cache_dir)['reducer'] if reducer_key else None
+            if method == 'pca' and reducer is not None:
+                svd_solver = reducer.svd_solver
+                explained_variance = reducer.explained_variance_ratio_
+                cumulative_variance = np.cumsum(explained_variance)
         else:
             # Fallback implementation
             if method == 'pca':
@@ -504,52 +525,42 @@ def advanced_dimensionality_reduction(csv_file_path: str, method: str = 'pca',
         # Create variance explanation table for PCA
         variance_html = ""
         if method == 'pca' and 'explained_variance' in locals():
-            variance_html = """
+            variance = pd.DataFrame({
+                'Component': [f"PC{i + 1}" for i in range(len(explained_variance))],
+                'Variance Explained': [f"{var:.4f} ({var*100:.2f}%)" for var in explained_variance],
+                'Cumulative Variance': [f"{cum_var:.4f} ({cum_var*100:.2f}%)" for cum_var in cumulative_variance],
+            }, dtype=object)
+            # First 10 components; the table footer reports how many more there are
+            variance_table = render_frame_table(
+                variance, max_rows=10, table_class="vds-variance-table",
+                column_classes={'Component': 'vds-component', 'Variance Explained': 'vds-variance',
+                                'Cumulative Variance': 'vds-cumulative'},
+            )
+            variance_html = f"""
             <vds-section>
                 <vds-title>Explained Variance by Component</vds-title>
-                <table class="vds-variance-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Component</th>
-                            <th class="vds-col-header">Variance Explained</th>
-                            <th class="vds-col-header">Cumulative Variance</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-            
-            for i, (var, cum_var) in enumerate(zip(explained_variance[:10], cumulative_variance[:10])):
-                variance_html += f"""
-                        <tr>
-                            <td class="vds-component">PC{i+1}</td>
-                            <td class="vds-variance">{var:.4f} ({var*100:.2f}%)</td>
-                            <td class="vds-cumulative">{cum_var:.4f} ({cum_var*100:.2f}%)</td>
-                        </tr>
-                """
-            
-            if len(explained_variance) > 10:
-                variance_html += f"<tr><td colspan='3' class='vds-info'>... and {len(explained_variance) - 10} more components</td></tr>"
-            
-            variance_html += """
-                    </tbody>
-                </table>
+                {variance_table}
             </vds-section>
             """
         
         # Create HTML report
+        info_table = render_info_table({
+            'Reduction Method': method.upper(),
+            'Original Dimensions': original_dimensions,
+            'New Dimensions': new_dimensions,
+            'Reduction Ratio': f"{(1 - new_dimensions/original_dimensions)*100:.1f}%",
+            'Target Column': target_column or 'None',
+            'Keep Original': keep_original,
+            'SVD Solver': svd_solver or 'auto',
+            'Reducer Cache Key': reducer_key or 'None',
+            'Output File': output_path,
+        })
         report_html = f"""
         <vds-engineering-report>
+            {css_block()}
             <vds-title>Advanced Dimensionality Reduction Report</vds-title>
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Reduction Method</td><td class="vds-value">{method.upper()}</td></tr>
-                    <tr><td class="vds-label">Original Dimensions</td><td class="vds-value">{original_dimensions}</td></tr>
-                    <tr><td class="vds-label">New Dimensions</td><td class="vds-value">{new_dimensions}</td></tr>
-                    <tr><td class="vds-label">Reduction Ratio</td><td class="vds-value">{(1 - new_dimensions/original_dimensions)*100:.1f}%</td></tr>
-                    <tr><td class="vds-label">Target Column</td><td class="vds-value">{target_column or 'None'}</td></tr>
-                    <tr><td class="vds-label">Keep Original</td><td class="vds-value">{keep_original}</td></tr>
-                    <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             {variance_html}
         </vds-engineering-report>
@@ -648,71 +659,62 @@ def advanced_feature_selection(csv_file_path: str, target_column: str, method: s
         selected_data.to_csv(output_path, index=False)
         
         # Create HTML report
+        show_scores = bool(feature_scores) and method == 'correlation'
+        scores = {score_info['feature']: score_info['score'] for score_info in feature_scores}
+        selected = pd.DataFrame({
+            'Feature Name': [str(feature) for feature in selected_features],
+            'Status': ['Selected'] * len(selected_features),
+        }, dtype=object)
+        if show_scores:
+            selected['Correlation Score'] = [scores.get(feature, 'N/A') for feature in selected_features]
+        feature_classes = {'Feature Name': 'vds-feature-name', 'Status': 'vds-status', 'Correlation Score': 'vds-score'}
+        # First 20 selected features; the table footer reports how many more there are
+        selected_table = render_frame_table(
+            selected, max_rows=20, table_class="vds-selected-table",
+            column_classes=feature_classes, row_classes=['vds-selected'] * len(selected),
+        )
+        
+        # Show some unselected features for comparison
+        unselected_html = ""
+        unselected_shown = [score_info for score_info in feature_scores if not score_info['selected']][:5]
+        if unselected_shown:
+            unselected = pd.DataFrame({
+                'Feature Name': [str(score_info['feature']) for score_info in unselected_shown],
+                'Status': ['Not Selected'] * len(unselected_shown),
+                'Correlation Score': [score_info['score'] for score_info in unselected_shown],
+            }, dtype=object)
+            unselected_table = render_frame_table(
+                unselected, max_rows=len(unselected), table_class="vds-selected-table",
+                column_classes=feature_classes, row_classes=['vds-unselected'] * len(unselected),
+            )
+            unselected_html = f"""
+            <vds-section>
+                <vds-title>Top Unselected Features (for comparison)</vds-title>
+                {unselected_table}
+            </vds-section>
+            """
+        
+        info_table = render_info_table({
+            'Selection Method': method,
+            'Target Column': target_column,
+            'Original Features': original_features,
+            'Selected Features': len(selected_features),
+            'Reduction Ratio': f"{(1 - len(selected_features)/original_features)*100:.1f}%",
+            'Output File': output_path,
+        })
         report_html = f"""
         <vds-engineering-report>
+            {css_block()}
             <vds-title>Advanced Feature Selection Report</vds-title>
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Selection Method</td><td class="vds-value">{method}</td></tr>
-                    <tr><td class="vds-label">Target Column</td><td class="vds-value">{target_column}</td></tr>
-                    <tr><td class="vds-label">Original Features</td><td class="vds-value">{original_features}</td></tr>
-                    <tr><td class="vds-label">Selected Features</td><td class="vds-value">{len(selected_features)}</td></tr>
-                    <tr><td class="vds-label">Reduction Ratio</td><td class="vds-value">{(1 - len(selected_features)/original_features)*100:.1f}%</td></tr>
-                    <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>Selected Features</vds-title>
-                <table class="vds-selected-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Feature Name</th>
-                            <th class="vds-col-header">Status</th>
-        """
-        
-        if feature_scores and method == 'correlation':
-            report_html += '<th class="vds-col-header">Correlation Score</th>'
-        
-        report_html += """
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        # Show selected features first
-        for feature in selected_features[:20]:  # Limit to first 20
-            report_html += f"""
-                        <tr class="vds-selected">
-                            <td class="vds-feature-name">{feature}</td>
-                            <td class="vds-status">Selected</td>
-            """
-            if feature_scores and method == 'correlation':
-                score = next((s['score'] for s in feature_scores if s['feature'] == feature), 'N/A')
-                report_html += f'<td class="vds-score">{score}</td>'
-            report_html += '</tr>'
-        
-        if len(selected_features) > 20:
-            report_html += f"<tr><td colspan='3' class='vds-info'>... and {len(selected_features) - 20} more selected features</td></tr>"
-        
-        # Show some unselected features for comparison
-        if feature_scores:
-            unselected_shown = [s for s in feature_scores if not s['selected']][:5]
-            if unselected_shown:
-                report_html += "<tr><td colspan='3' class='vds-separator'>Top Unselected Features (for comparison)</td></tr>"
-                for score_info in unselected_shown:
-                    report_html += f"""
-                        <tr class="vds-unselected">
-                            <td class="vds-feature-name">{score_info['feature']}</td>
-                            <td class="vds-status">Not Selected</td>
-                            <td class="vds-score">{score_info['score']}</td>
-                        </tr>
-                    """
-        
-        report_html += """
-                    </tbody>
-                </table>
+                {selected_table}
             </vds-section>
+            {unselected_html}
         </vds-engineering-report>
         """
         
@@ -724,7 +726,10 @@ def advanced_feature_selection(csv_file_path: str, target_column: str, method: s
 
 def create_polynomial_features_advanced(csv_file_path: str, columns: Union[str, List[str]],
                                        degree: int = 2, interaction_only: bool = False,
-                                       keep_original: bool = True) -> str:
+                                       keep_original: bool = True, max_memory_mb: Optional[float] = 1024,
+                                       dtype: str = 'float64', sparse: bool = False,
+                                       target_column: Optional[str] = None, screening: Optional[str] = None,
+                                       max_features: Optional[int] = None) -> str:
     """
     Advanced polynomial feature creation with VDS Tools integration
     
@@ -734,6 +739,12 @@ def create_polynomial_features_advanced(csv_file_path: str, columns: Union[str,
         degree: Maximum polynomial degree
         interaction_only: Whether to create only interaction features
         keep_original: Whether to keep original columns
+        max_memory_mb: Memory budget for the new features (None = unlimited)
+        dtype: Output dtype of the new features ('float64' or 'float32')
+        sparse: Whether to store the new features as sparse columns
+        target_column: Target used to screen candidate features
+        screening: Screening score ('correlation' or 'mutual_info')
+        max_features: Maximum number of new features to keep after screening
         
     Returns:
         HTML formatted report with polynomial feature creation results
@@ -753,7 +764,11 @@ def create_polynomial_features_advanced(csv_file_path: str, columns: Union[str,
         if non_numeric_cols:
             return _create_error_report(f"Non-numeric columns: {non_numeric_cols}")
         
+        if target_column and target_column not in data.columns:
+            return _create_error_report(f"Target column not found: {target_column}")
+        
         original_columns = list(data.columns)
+        poly_info = {}
         
         # Use ml_tools function if available
         if 'create_polynomial_features' in globals():
@@ -762,8 +777,15 @@ def create_polynomial_features_advanced(csv_file_path: str, columns: Union[str,
                 columns=columns,
                 degree=degree,
                 interaction_only=interaction_only,
-                keep_original=keep_original
+                keep_original=keep_original,
+                max_memory_mb=max_memory_mb,
+                dtype=dtype,
+                sparse=sparse,
+                target=target_column,
+                screening=screening,
+                max_features=max_features
             )
+            poly_info = poly_data.attrs.get('polynomial_info', {})
         else:
             # Fallback implementation
             from sklearn.preprocessing import PolynomialFeatures
@@ -804,68 +826,59 @@ def create_polynomial_features_advanced(csv_file_path: str, columns: Union[str,
         poly_data.to_csv(output_path, index=False)
         
         # Create HTML report
+        sources = pd.DataFrame({'Column Name': [str(col) for col in columns]}, dtype=object)
+        source_table = render_frame_table(
+            sources, max_rows=len(sources), table_class="vds-source-table",
+            column_classes={'Column Name': 'vds-col-name'},
+        )
+        poly_frame = pd.DataFrame({
+            'Feature Name': [str(analysis['feature']) for analysis in feature_analysis],
+            'Type': [analysis['type'] for analysis in feature_analysis],
+            'Mean': [analysis['mean'] for analysis in feature_analysis],
+            'Std': [analysis['std'] for analysis in feature_analysis],
+            'Min': [analysis['min'] for analysis in feature_analysis],
+            'Max': [analysis['max'] for analysis in feature_analysis],
+        }, dtype=object)
+        poly_table = render_frame_table(
+            poly_frame, max_rows=len(poly_frame), table_class="vds-poly-table",
+            column_classes={'Feature Name': 'vds-feature-name', 'Type': 'vds-feature-type', 'Mean': 'vds-stat-value',
+                            'Std': 'vds-stat-value', 'Min': 'vds-stat-value', 'Max': 'vds-stat-value'},
+            row_classes=["vds-interaction" if analysis['type'] == 'Interaction' else "vds-polynomial"
+                         for analysis in feature_analysis],
+        )
+        more_html = ""
+        if len(new_features) > 20:
+            more_html = f'<p class="vds-info">... and {len(new_features) - 20} more polynomial features</p>'
+        info_table = render_info_table({
+            'Polynomial Degree': degree,
+            'Interaction Only': interaction_only,
+            'Source Columns': len(columns),
+            'Candidate Features': poly_info.get('candidates', len(new_features)),
+            'Estimated Dense Size': f"{poly_info.get('estimated_mb', 'N/A')} MB",
+            'Screening': poly_info.get('screening') or 'None',
+            'Output Storage': f"{dtype}{' (sparse)' if sparse else ''}",
+            'New Features Created': len(new_features),
+            'Total Columns': len(poly_data.columns),
+            'Keep Original': keep_original,
+            'Output File': output_path,
+        })
         report_html = f"""
         <vds-engineering-report>
+            {css_block()}
             <vds-title>Advanced Polynomial Feature Creation Report</vds-title>
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Polynomial Degree</td><td class="vds-value">{degree}</td></tr>
-                    <tr><td class="vds-label">Interaction Only</td><td class="vds-value">{interaction_only}</td></tr>
-                    <tr><td class="vds-label">Source Columns</td><td class="vds-value">{len(columns)}</td></tr>
-                    <tr><td class="vds-label">New Features Created</td><td class="vds-value">{len(new_features)}</td></tr>
-                    <tr><td class="vds-label">Total Columns</td><td class="vds-value">{len(poly_data.columns)}</td></tr>
-                    <tr><td class="vds-label">Keep Original</td><td class="vds-value">{keep_original}</td></tr>
-                    <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>Source Columns</vds-title>
-                <table class="vds-source-table">
-                    <thead>
-                        <tr><th class="vds-col-header">Column Name</th></tr>
-                    </thead>
-                    <tbody>
-                        {''.join([f'<tr><td class="vds-col-name">{col}</td></tr>' for col in columns])}
-                    </tbody>
-                </table>
+                {source_table}
             </vds-section>
             
             <vds-section>
                 <vds-title>New Polynomial Features (Sample)</vds-title>
-                <table class="vds-poly-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Feature Name</th>
-                            <th class="vds-col-header">Type</th>
-                            <th class="vds-col-header">Mean</th>
-                            <th class="vds-col-header">Std</th>
-                            <th class="vds-col-header">Min</th>
-                            <th class="vds-col-header">Max</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        for analysis in feature_analysis:
-            type_class = "vds-interaction" if analysis['type'] == 'Interaction' else "vds-polynomial"
-            report_html += f"""
-                        <tr class="{type_class}">
-                            <td class="vds-feature-name">{analysis['feature']}</td>
-                            <td class="vds-feature-type">{analysis['type']}</td>
-                            <td class="vds-stat-value">{analysis['mean']}</td>
-                            <td class="vds-stat-value">{analysis['std']}</td>
-                            <td class="vds-stat-value">{analysis['min']}</td>
-                            <td class="vds-stat-value">{analysis['max']}</td>
-                        </tr>
-            """
-        
-        if len(new_features) > 20:
-            report_html += f"<tr><td colspan='6' class='vds-info'>... and {len(new_features) - 20} more polynomial features</td></tr>"
-        
-        report_html += """
-                    </tbody>
-                </table>
+                {poly_table}
+                {more_html}
             </vds-section>
         </vds-engineering-report>
         """
@@ -969,56 +982,43 @@ def discretize_features_advanced(csv_file_path: str, columns: Union[str, List[st
         discretized_data.to_csv(output_path, index=False)
         
         # Create HTML report
+        bins = pd.DataFrame({
+            'Original Column': [str(analysis['original_column']) for analysis in discretization_analysis],
+            'New Column': [str(analysis['new_column']) for analysis in discretization_analysis],
+            'Bins Created': [str(analysis['bins_created']) for analysis in discretization_analysis],
+            'Min Bin Size': [str(analysis['min_bin_size']) for analysis in discretization_analysis],
+            'Max Bin Size': [str(analysis['max_bin_size']) for analysis in discretization_analysis],
+            'Avg Bin Size': [analysis['avg_bin_size'] for analysis in discretization_analysis],
+            'Original Range': [analysis['original_range'] for analysis in discretization_analysis],
+            'Original Unique': [str(analysis['unique_values']) for analysis in discretization_analysis],
+        }, dtype=object)
+        bins_table = render_frame_table(
+            bins, max_rows=len(bins), table_class="vds-discretization-table",
+            column_classes={'Original Column': 'vds-col-name', 'New Column': 'vds-new-col-name',
+                            'Bins Created': 'vds-bin-count', 'Min Bin Size': 'vds-bin-size',
+                            'Max Bin Size': 'vds-bin-size', 'Avg Bin Size': 'vds-bin-size',
+                            'Original Range': 'vds-range-value', 'Original Unique': 'vds-unique-count'},
+        )
+        info_table = render_info_table({
+            'Discretization Method': method,
+            'Number of Bins': n_bins,
+            'Columns Processed': len(columns),
+            'New Columns Created': len(new_columns),
+            'Custom Labels': 'Yes' if labels else 'No',
+            'Keep Original': keep_original,
+            'Output File': output_path,
+        })
         report_html = f"""
         <vds-engineering-report>
+            {css_block()}
             <vds-title>Advanced Feature Discretization Report</vds-title>
             <vds-info-panel>
-                <table class="vds-info-table">
-                    <tr><td class="vds-label">Discretization Method</td><td class="vds-value">{method}</td></tr>
-                    <tr><td class="vds-label">Number of Bins</td><td class="vds-value">{n_bins}</td></tr>
-                    <tr><td class="vds-label">Columns Processed</td><td class="vds-value">{len(columns)}</td></tr>
-                    <tr><td class="vds-label">New Columns Created</td><td class="vds-value">{len(new_columns)}</td></tr>
-                    <tr><td class="vds-label">Custom Labels</td><td class="vds-value">{'Yes' if labels else 'No'}</td></tr>
-                    <tr><td class="vds-label">Keep Original</td><td class="vds-value">{keep_original}</td></tr>
-                    <tr><td class="vds-label">Output File</td><td class="vds-value">{output_path}</td></tr>
-                </table>
+                {info_table}
             </vds-info-panel>
             
             <vds-section>
                 <vds-title>Discretization Results</vds-title>
-                <table class="vds-discretization-table">
-                    <thead>
-                        <tr>
-                            <th class="vds-col-header">Original Column</th>
-                            <th class="vds-col-header">New Column</th>
-                            <th class="vds-col-header">Bins Created</th>
-                            <th class="vds-col-header">Min Bin Size</th>
-                            <th class="vds-col-header">Max Bin Size</th>
-                            <th class="vds-col-header">Avg Bin Size</th>
-                            <th class="vds-col-header">Original Range</th>
-                            <th class="vds-col-header">Original Unique</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        for analysis in discretization_analysis:
-            report_html += f"""
-                        <tr>
-                            <td class="vds-col-name">{analysis['original_column']}</td>
-                            <td class="vds-new-col-name">{analysis['new_column']}</td>
-                            <td class="vds-bin-count">{analysis['bins_created']}</td>
-                            <td class="vds-bin-size">{analysis['min_bin_size']}</td>
-                            <td class="vds-bin-size">{analysis['max_bin_size']}</td>
-                            <td class="vds-bin-size">{analysis['avg_bin_size']}</td>
-                            <td class="vds-range-value">{analysis['original_range']}</td>
-                            <td class="vds-unique-count">{analysis['unique_values']}</td>
-                        </tr>
-            """
-        
-        report_html += """
-                    </tbody>
-                </table>
+                {bins_table}
             </vds-section>
         </vds-engineering-report>
         """
@@ -1031,10 +1031,10 @@ def discretize_features_advanced(csv_file_path: str, columns: Union[str, List[st
 
 def _create_error_report(error_message: str) -> str:
     """Create HTML error report"""
+    error_table = render_info_table({'Feature Engineering Error': error_message}, table_class="vds-error-table",
+                                    label_class="vds-error-label", value_class="vds-error-value")
     return f"""
     <vds-error-panel>
-        <table class="vds-error-table">
-            <tr><td class="vds-error-label">Feature Engineering Error</td><td class="vds-error-value">{error_message}</td></tr>
-        </table>
+        {error_table}
     </vds-error-panel>
     """
\ No newline at end of file
@@ -6,8 +6,42 @@ This module provides utilities for outputting raw HTML content in Jupyter notebo
 It includes functions to display HTML content directly without text parsing.
 """
 
-from IPython.display import HTML, display
-from typing import Any, Optional
+from functools import lru_cache
+from html import escape
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from IPython.display import HTML
+
+
+# Default caps applied to rendered tables so that wide/long frames do not
+# produce huge HTML payloads that travel back through /execute
+DEFAULT_MAX_ROWS = 50
+DEFAULT_MAX_COLS = 50
+
+# Style blocks shared by every report. ``:where()`` keeps their specificity at zero,
+# so the frontend stylesheet still wins; plain Jupyter gets a readable table layout.
+_CSS_BLOCKS = {
+    "table": (
+        ":where(vds-table){display:table;border-collapse:collapse;width:100%;margin:6px 0}"
+        ":where(vds-thead){display:table-header-group}:where(vds-tbody){display:table-row-group}"
+        ":where(vds-tr){display:table-row}"
+        ":where(vds-th,vds-td){display:table-cell;padding:4px 8px;border-bottom:1px solid #e5e7eb;text-align:left}"
+        ":where(vds-th){font-weight:600;background:#f8fafc}"
+        ":where(.vds-cell.vds-numeric){text-align:right;font-variant-numeric:tabular-nums}"
+    ),
+    "paging": (
+        ":where(vds-table-more){display:block;margin:2px 0 8px;font-size:12px;color:#6b7280}"
+    ),
+    "rows": (
+        ":where(.vds-row-high) vds-td{background:#fef2f2}"
+        ":where(.vds-row-medium) vds-td{background:#fffbeb}"
+        ":where(.vds-row-low) vds-td{background:#f0fdf4}"
+    ),
+}
 
 
 def display_html(html_content: str) -> None:
@@ -25,10 +59,12 @@ def display_html(html_content: str) -> None:
         >>> html = '<vds-container><vds-title>My Data</vds-title></vds-container>'
         >>> display_html(html)
     """
+    from IPython.display import HTML, display
+
     display(HTML(html_content))
 
 
-def html_output(content: Any) -> HTML:
+def html_output(content: Any) -> "HTML":
     """
     Create an HTML object for direct output
     
@@ -46,10 +82,12 @@ def html_output(content: Any) -> HTML:
         >>> html = '<vds-container><vds-title>My Data</vds-title></vds-container>'
         >>> html_output(html)
     """
+    from IPython.display import HTML
+
     return HTML(str(content))
 
 
-def print_html(html_content: str, return_object: bool = False) -> Optional[HTML]:
+def print_html(html_content: str, return_object: bool = False) -> Optional["HTML"]:
     """
     Print HTML content with option to return HTML object
     
@@ -69,6 +107,8 @@ def print_html(html_content: str, return_object: bool = False) -> Optional[HTML]
         >>> print_html(html)  # Direct output
         >>> obj = print_html(html, return_object=True)  # Get object
     """
+    from IPython.display import HTML, display
+
     html_obj = HTML(html_content)
     display(html_obj)
     
@@ -77,19 +117,79 @@ def print_html(html_content: str, return_object: bool = False) -> Optional[HTML]
     return None
 
 
+@lru_cache(maxsize=256)
+def _cell_tags(tag: str, css_class: str) -> Tuple[str, str]:
+    """Return cached opening/closing tags for a cell class"""
+    open_tag = f'<{tag} class="{css_class}">' if css_class else f"<{tag}>"
+    return open_tag, f"</{tag}>"
+
+
+@lru_cache(maxsize=128)
+def _header_row(headers: Tuple[str, ...], classes: Tuple[str, ...]) -> str:
+    """Return a cached <vds-tr> header row for the given labels and classes"""
+    cells = []
+    for header, css_class in zip(headers, classes):
+        open_tag, close_tag = _cell_tags("vds-th", css_class)
+        cells.append(f"{open_tag}{header}{close_tag}")
+    return "<vds-tr>" + "".join(cells) + "</vds-tr>"
+
+
+@lru_cache(maxsize=32)
+def css_block(*names: str) -> str:
+    """
+    Return a cached <style> block for the named report styles
+
+    Args:
+        *names: Blocks to include ("table", "paging", "rows"); all blocks when empty
+
+    Returns:
+        str: <style> element, built once per combination of names
+    """
+    names = names or tuple(_CSS_BLOCKS)
+    return f'<style data-vds-css="{" ".join(names)}">' + "".join(_CSS_BLOCKS[name] for name in names) + "</style>"
+
+
+def _page_info(total_rows: int, total_cols: int, row_offset: int,
+               shown_rows: int, shown_cols: int) -> Dict[str, int]:
+    """Build "show more" paging metadata for a capped table"""
+    next_offset = row_offset + shown_rows
+    return {
+        "total_rows": int(total_rows),
+        "total_cols": int(total_cols),
+        "row_offset": int(row_offset),
+        "shown_rows": int(shown_rows),
+        "shown_cols": int(shown_cols),
+        "rows_remaining": int(max(total_rows - next_offset, 0)),
+        "cols_remaining": int(max(total_cols - shown_cols, 0)),
+        "next_offset": int(next_offset) if next_offset < total_rows else -1,
+    }
+
+
 class HTMLRenderer:
     """
     HTML rendering utility class for VDS Tools
     
     This class provides methods for rendering various types of content
     as HTML in Jupyter notebooks, with special support for VDS-tagged content.
+    
+    Tables are rendered column by column: each column is formatted and escaped
+    once with vectorized operations, then the rows are assembled with a single
+    join. Rows and columns are capped and the table carries "show more" paging
+    metadata so the frontend can request the next page.
     """
     
-    def __init__(self):
-        """Initialize HTML renderer"""
-        pass
+    def __init__(self, max_rows: int = DEFAULT_MAX_ROWS, max_cols: int = DEFAULT_MAX_COLS):
+        """
+        Initialize HTML renderer
+        
+        Args:
+            max_rows (int): Default row cap for rendered tables
+            max_cols (int): Default column cap for rendered tables
+        """
+        self.max_rows = max_rows
+        self.max_cols = max_cols
     
-    def render(self, content: str) -> HTML:
+    def render(self, content: str) -> "HTML":
         """
         Render content as HTML
         
@@ -99,6 +199,8 @@ class HTMLRenderer:
         Returns:
             HTML: Rendered HTML object
         """
+        from IPython.display import HTML
+
         return HTML(content)
     
     def display(self, content: str) -> None:
@@ -108,6 +210,8 @@ class HTMLRenderer:
         Args:
             content (str): Content to display
         """
+        from IPython.display import HTML, display
+
         display(HTML(content))
     
     def wrap_vds_container(self, inner_content: str, title: str = "") -> str:
@@ -129,59 +233,220 @@ class HTMLRenderer:
         </vds-container>
         """
     
-    def create_vds_table(self, headers: list, rows: list, table_class: str = "") -> str:
+    def create_vds_table(self, headers: list, rows: list, table_class: str = "",
+                         max_rows: Optional[int] = None) -> str:
         """
         Create VDS-styled table
         
         Args:
             headers (list): Table headers
-            rows (list): Table rows (list of lists)
+            rows (list): Table rows (list of lists), cells are inserted as HTML
             table_class (str): Additional CSS class for table
+            max_rows (int): Optional row cap (defaults to no cap for explicit rows)
             
         Returns:
             str: VDS table HTML
         """
-        table_class_attr = f' class="{table_class}"' if table_class else ""
+        total_rows = len(rows)
+        if max_rows is not None:
+            rows = rows[:max_rows]
         
-        # Build header
-        header_html = "<vds-tr>" + "".join(f"<vds-th>{header}</vds-th>" for header in headers) + "</vds-tr>"
+        header_html = _header_row(tuple(str(header) for header in headers), ("",) * len(headers))
+        rows_html = "".join(
+            "<vds-tr>" + "".join(f"<vds-td>{cell}</vds-td>" for cell in row) + "</vds-tr>"
+            for row in rows
+        )
+        info = _page_info(total_rows, len(headers), 0, len(rows), len(headers))
+        return self._assemble_table(header_html, rows_html, table_class, info)
+    
+    def render_frame_table(self, data: pd.DataFrame, max_rows: Optional[int] = None,
+                           max_cols: Optional[int] = None, row_offset: int = 0,
+                           table_class: str = "", show_index: bool = False,
+                           index_label: str = "Row Index", float_format: str = "%.3f",
+                           sci_format: Optional[str] = "%.2e", null_text: str = "NULL",
+                           column_classes: Optional[Dict[Any, str]] = None,
+                           header_classes: Optional[Dict[Any, str]] = None,
+                           raw_html_columns: Optional[Iterable[Any]] = None,
+                           row_classes: Optional[Sequence[str]] = None,
+                           show_header: bool = True) -> str:
+        """
+        Render a DataFrame as a VDS table using the columnar engine
         
-        # Build rows
-        rows_html = ""
-        for row in rows:
-            row_html = "<vds-tr>" + "".join(f"<vds-td>{cell}</vds-td>" for cell in row) + "</vds-tr>"
-            rows_html += row_html
+        Args:
+            data (pd.DataFrame): Frame to render
+            max_rows (int): Row cap (defaults to the renderer's max_rows)
+            max_cols (int): Column cap (defaults to the renderer's max_cols)
+            row_offset (int): First row to render, used for "show more" paging
+            table_class (str): Additional CSS class for table
+            show_index (bool): Whether to render the index as the first column
+            index_label (str): Header label for the index column
+            float_format (str): printf-style format for float cells
+            sci_format (str): printf-style format for very large/small floats (None disables)
+            null_text (str): Text shown for missing values
+            column_classes (dict): Optional cell class override per column
+            header_classes (dict): Optional header class override per column
+            raw_html_columns (iterable): Columns whose values are trusted HTML and not escaped
+            row_classes (sequence): Optional CSS class per row of ``data`` (e.g. severity highlighting)
+            show_header (bool): Whether to render the header row
+            
+        Returns:
+            str: VDS table HTML with paging metadata
+        """
+        max_rows = self.max_rows if max_rows is None else max_rows
+        max_cols = self.max_cols if max_cols is None else max_cols
+        column_classes = column_classes or {}
+        header_classes = header_classes or {}
+        raw_html_columns = set(raw_html_columns or ())
         
-        return f"""
-        <vds-table{table_class_attr}>
-            <vds-thead>
-                {header_html}
-            </vds-thead>
-            <vds-tbody>
-                {rows_html}
-            </vds-tbody>
-        </vds-table>
+        total_rows, total_cols = data.shape
+        row_offset = max(0, min(row_offset, total_rows))
+        view = data.iloc[row_offset:row_offset + max_rows, :max_cols]
+        
+        headers: List[str] = []
+        classes: List[str] = []
+        columns_cells: List[List[str]] = []
+        
+        if show_index:
+            open_tag, close_tag = _cell_tags("vds-td", "vds-row-index")
+            headers.append(escape(str(index_label)))
+            classes.append("vds-row-header")
+            columns_cells.append([open_tag + escape(str(idx)) + close_tag for idx in view.index])
+        
+        for position, col in enumerate(view.columns):
+            series = view.iloc[:, position]
+            is_numeric = (pd.api.types.is_numeric_dtype(series)
+                          and not pd.api.types.is_bool_dtype(series))
+            kind = "vds-numeric" if is_numeric else "vds-categorical"
+            headers.append(escape(str(col)))
+            classes.append(header_classes.get(col, f"vds-col-header {kind}"))
+            columns_cells.append(self._render_column(
+                series,
+                cell_class=column_classes.get(col, f"vds-cell {kind}"),
+                float_format=float_format,
+                sci_format=sci_format,
+                null_text=null_text,
+                escape_values=col not in raw_html_columns and not is_numeric,
+            ))
+        
+        header_html = _header_row(tuple(headers), tuple(classes)) if show_header else ""
+        if row_classes is None:
+            row_tags = ["<vds-tr>"] * len(view)
+        else:
+            row_tags = [_cell_tags("vds-tr", css_class or "")[0]
+                        for css_class in list(row_classes)[row_offset:row_offset + len(view)]]
+        rows_html = "".join(
+            row_tag + "".join(row_cells) + "</vds-tr>" for row_tag, row_cells in zip(row_tags, zip(*columns_cells))
+        )
+        info = _page_info(total_rows, total_cols, row_offset, len(view), view.shape[1])
+        return self._assemble_table(header_html, rows_html, table_class, info)
+    
+    def render_info_table(self, items: Union[Dict[Any, Any], Iterable[Tuple[Any, Any]]],
+                          table_class: str = "vds-info-table", label_class: str = "vds-label",
+                          value_class: str = "vds-value", raw_html: bool = False) -> str:
+        """
+        Render label/value pairs (info, summary and error panels) as a headerless VDS table
+        
+        Args:
+            items (dict or iterable): Labels mapped to (already formatted) values
+            table_class (str): CSS class for the table
+            label_class (str): Cell class of the label column
+            value_class (str): Cell class of the value column
+            raw_html (bool): Whether values are trusted HTML and not escaped
+            
+        Returns:
+            str: VDS table HTML
         """
+        pairs = list(items.items()) if isinstance(items, dict) else list(items)
+        frame = pd.DataFrame({
+            "label": [str(label) for label, _ in pairs],
+            "value": [str(value) for _, value in pairs],
+        }, dtype=object)
+        return self.render_frame_table(
+            frame, max_rows=len(frame), max_cols=2, table_class=table_class, show_header=False,
+            null_text="", column_classes={"label": label_class, "value": value_class},
+            raw_html_columns=("value",) if raw_html else (),
+        )
+    
+    def _render_column(self, series: pd.Series, cell_class: str, float_format: str,
+                       sci_format: Optional[str], null_text: str, escape_values: bool) -> List[str]:
+        """Format, escape and wrap one column of cells in a single pass"""
+        null_mask = series.isna().to_numpy()
+        
+        if pd.api.types.is_float_dtype(series):
+            values = np.where(null_mask, 0.0, series.to_numpy(dtype=float, na_value=np.nan))
+            text = [float_format % value for value in values.tolist()]
+            if sci_format:
+                magnitude = np.abs(values)
+                use_sci = (magnitude > 1e6) | ((magnitude < 1e-3) & (values != 0))
+                for position in np.flatnonzero(use_sci).tolist():
+                    text[position] = sci_format % values[position]
+        else:
+            text = series.to_numpy(dtype=object).astype(str).tolist()
+            if escape_values:
+                text = [escape(value, quote=False) for value in text]
+        
+        open_tag, close_tag = _cell_tags("vds-td", cell_class)
+        if not null_mask.any():
+            return [open_tag + value + close_tag for value in text]
+        
+        missing_open, _ = _cell_tags("vds-td", f"{cell_class} vds-missing")
+        missing_cell = f'{missing_open}<span class="vds-null">{null_text}</span>{close_tag}'
+        return [missing_cell if is_null else open_tag + value + close_tag
+                for value, is_null in zip(text, null_mask)]
+    
+    def _assemble_table(self, header_html: str, rows_html: str, table_class: str,
+                        info: Dict[str, int]) -> str:
+        """Wrap rendered header and rows with paging attributes and footer"""
+        table_class_attr = f' class="{table_class}"' if table_class else ""
+        paging_attrs = (
+            f' data-total-rows="{info["total_rows"]}" data-total-cols="{info["total_cols"]}"'
+            f' data-row-offset="{info["row_offset"]}" data-shown-rows="{info["shown_rows"]}"'
+            f' data-shown-cols="{info["shown_cols"]}"'
+        )
+        more_html = ""
+        if info["rows_remaining"] or info["cols_remaining"]:
+            more_html = (
+                f'<vds-table-more data-next-offset="{info["next_offset"]}"'
+                f' data-rows-remaining="{info["rows_remaining"]}"'
+                f' data-cols-remaining="{info["cols_remaining"]}">'
+                f'Showing {info["shown_rows"]:,} of {info["total_rows"]:,} rows'
+                f' and {info["shown_cols"]:,} of {info["total_cols"]:,} columns'
+                f'</vds-table-more>'
+            )
+        return (
+            f"<vds-table{table_class_attr}{paging_attrs}>"
+            f"<vds-thead>{header_html}</vds-thead>"
+            f"<vds-tbody>{rows_html}</vds-tbody>"
+            f"</vds-table>{more_html}"
+        )
 
 
 # Create global renderer instance
 _html_renderer = HTMLRenderer()
 
 # Convenience functions using global renderer
-def render_html(content: str) -> HTML:
+def render_html(content: str) -> "HTML":
     """Render content as HTML using global renderer"""
     return _html_renderer.render(content)
 
-def render_vds_container(inner_content: str, title: str = "") -> HTML:
+def render_vds_container(inner_content: str, title: str = "") -> "HTML":
     """Render content wrapped in VDS container using global renderer"""
     wrapped_content = _html_renderer.wrap_vds_container(inner_content, title)
     return _html_renderer.render(wrapped_content)
 
-def render_vds_table(headers: list, rows: list, table_class: str = "") -> HTML:
+def render_vds_table(headers: list, rows: list, table_class: str = "") -> "HTML":
     """Render VDS table using global renderer"""
     table_html = _html_renderer.create_vds_table(headers, rows, table_class)
     return _html_renderer.render(table_html)
 
+def render_frame_table(data: pd.DataFrame, **kwargs) -> str:
+    """Render a DataFrame as a VDS table string using global renderer"""
+    return _html_renderer.render_frame_table(data, **kwargs)
+
+def render_info_table(items: Union[Dict[Any, Any], Iterable[Tuple[Any, Any]]], **kwargs) -> str:
+    """Render label/value pairs as a VDS table string using global renderer"""
+    return _html_renderer.render_info_table(items, **kwargs)
+
 
 # Quick display functions
 def quick_display_html(html_content: str) -> None:
@@ -233,7 +498,17 @@ def help_html_output():
     - render(content: str) -> HTML
     - display(content: str) -> None
     - wrap_vds_container(inner_content: str, title: str = "") -> str
-    - create_vds_table(headers: list, rows: list, table_class: str = "") -> str
+    - create_vds_table(headers: list, rows: list, table_class: str = "", max_rows=None) -> str
+    - render_frame_table(data: DataFrame, max_rows=50, max_cols=50, row_offset=0, ...) -> str
+      Columnar DataFrame renderer: formats and escapes once per column,
+      caps rows/columns and adds "show more" paging metadata
+      (data-total-rows, data-row-offset, ... and a <vds-table-more> footer);
+      row_classes highlights rows, show_header=False drops the header row
+    - render_info_table(items, table_class="vds-info-table", ...) -> str
+      Label/value panels (info, summary, error tables) on the same engine
+    
+    css_block(*names) -> str returns the cached <style> block ("table",
+    "paging", "rows") that reports include once at the top of their container.
     
     QUICK FUNCTIONS:
     ================
@@ -243,6 +518,8 @@ def help_html_output():
     - render_html(content: str) -> HTML
     - render_vds_container(inner_content: str, title: str = "") -> HTML
     - render_vds_table(headers: list, rows: list, table_class: str = "") -> HTML
+    - render_frame_table(data: DataFrame, **kwargs) -> str
+    - render_info_table(items, **kwargs) -> str
     
     USAGE EXAMPLES:
     ===============
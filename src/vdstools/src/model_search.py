@@ -0,0 +1,380 @@
+"""
+Successive-halving model search across candidate models and parameter grids.
+
+Every (model, params) configuration is first scored on a small subsample of
+each training fold; only the best ``1/eta`` of the configurations are promoted
+to the next rung, which uses ``eta`` times more training rows, until the
+survivors are scored on the full folds. ``strategy="hyperband"`` runs several
+such brackets with different starting budgets.
+
+Fold splits are computed once and shared by every rung, the standardized
+feature matrix of each fold is computed once and shared by every model that
+needs scaling, and each rung runs as one flat set of (config, fold) tasks on a
+process pool sized to the core budget.
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .model_store import ModelStore, data_fingerprint
+from .stability import _detect_problem_type, _fold_splits, _resolve_workers
+
+# Candidate: {"name": str, "estimator": sklearn estimator, "params": param grid, "scale": bool}
+Candidate = Dict[str, Any]
+
+
+def default_search_space(problem_type: str, random_state: int = 42) -> List[Candidate]:
+    """
+    Default candidate models and parameter grids for a problem type.
+
+    Args:
+        problem_type: 'classification' or 'regression'
+        random_state: Seed passed to stochastic estimators
+
+    Returns:
+        List of candidate dicts usable as ``search_models(candidates=...)``
+    """
+    from sklearn.ensemble import (
+        GradientBoostingClassifier, GradientBoostingRegressor,
+        RandomForestClassifier, RandomForestRegressor,
+    )
+    from sklearn.linear_model import Lasso, LinearRegression, LogisticRegression, Ridge
+
+    if problem_type == "classification":
+        return [
+            {"name": "Logistic Regression", "estimator": LogisticRegression(max_iter=1000),
+             "params": {"C": [0.01, 0.1, 1.0, 10.0]}, "scale": True},
+            {"name": "Random Forest", "estimator": RandomForestClassifier(random_state=random_state),
+             "params": {"n_estimators": [100, 300], "max_depth": [None, 10, 20]}, "scale": False},
+            {"name": "Gradient Boosting", "estimator": GradientBoostingClassifier(random_state=random_state),
+             "params": {"learning_rate": [0.05, 0.1], "max_depth": [2, 3, 5]}, "scale": False},
+        ]
+    return [
+        {"name": "Linear Regression", "estimator": LinearRegression(), "params": {}, "scale": True},
+        {"name": "Ridge Regression", "estimator": Ridge(),
+         "params": {"alpha": [0.1, 1.0, 10.0, 100.0]}, "scale": True},
+        {"name": "Lasso Regression", "estimator": Lasso(max_iter=5000),
+         "params": {"alpha": [0.01, 0.1, 1.0, 10.0]}, "scale": True},
+        {"name": "Random Forest", "estimator": RandomForestRegressor(random_state=random_state),
+         "params": {"n_estimators": [100, 300], "max_depth": [None, 10, 20]}, "scale": False},
+        {"name": "Gradient Boosting", "estimator": GradientBoostingRegressor(random_state=random_state),
+         "params": {"learning_rate": [0.05, 0.1], "max_depth": [2, 3, 5]}, "scale": False},
+    ]
+
+
+def _expand_candidates(candidates: Union[List[Candidate], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Expand candidate grids into a flat list of configurations."""
+    from sklearn.model_selection import ParameterGrid
+
+    if isinstance(candidates, dict):
+        candidates = [{"name": name, "estimator": est} for name, est in candidates.items()]
+    configs = []
+    for cand in candidates:
+        for params in ParameterGrid(cand.get("params") or {}):
+            configs.append({
+                "id": len(configs),
+                "name": cand["name"],
+                "estimator": cand["estimator"],
+                "params": params,
+                "scale": bool(cand.get("scale", False)),
+            })
+    return configs
+
+
+def _scaled_folds(X: np.ndarray, splits: List[Tuple[np.ndarray, np.ndarray]]) -> List[np.ndarray]:
+    """Standardize ``X`` once per fold with statistics of that fold's training rows."""
+    mean_std = []
+    for train_idx, _ in splits:
+        train = X[train_idx]
+        std = train.std(axis=0)
+        std[std == 0] = 1.0
+        mean_std.append((train.mean(axis=0), std))
+    return [np.ascontiguousarray((X - mean) / std) for mean, std in mean_std]
+
+
+def _fit_score(
+    task_id: Tuple[int, int],
+    estimator: Any,
+    params: Dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    scoring: str,
+    threads: int,
+) -> Dict[str, Any]:
+    """Fit one configuration on (a subsample of) one fold and score it. Runs inside a worker process."""
+    import warnings
+    from sklearn.base import clone
+    from sklearn.metrics import get_scorer
+
+    config_id, fold = task_id
+    try:
+        model = clone(estimator).set_params(**params)
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=threads)
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model.fit(X[train_idx], y[train_idx])
+            score = get_scorer(scoring)(model, X[test_idx], y[test_idx])
+        return {"config": config_id, "fold": fold, "score": float(score),
+                "fit_seconds": time.perf_counter() - start}
+    except Exception as e:
+        return {"config": config_id, "fold": fold, "error": str(e)}
+
+
+def _run_rung(
+    configs: List[Dict[str, Any]],
+    resource: int,
+    X: np.ndarray,
+    X_scaled: List[np.ndarray],
+    y: np.ndarray,
+    splits: List[Tuple[np.ndarray, np.ndarray]],
+    orders: List[np.ndarray],
+    scoring: str,
+    n_jobs: int,
+    on_result: Optional[Callable[[Dict[str, Any]], None]],
+) -> Dict[int, Dict[str, Any]]:
+    """Score every configuration on every fold using ``resource`` training rows per fold."""
+    from joblib import Parallel, delayed, parallel_config
+
+    n_tasks = len(configs) * len(splits)
+    workers, threads = _resolve_workers(n_jobs, max(n_tasks, 1))
+    tasks = []
+    for cfg in configs:
+        for fold, (_, test_idx) in enumerate(splits):
+            # nested subsamples: a rung's rows always contain the previous rung's rows
+            train_idx = orders[fold][:resource]
+            data = X_scaled[fold] if cfg["scale"] else X
+            tasks.append(delayed(_fit_score)(
+                (cfg["id"], fold), cfg["estimator"], cfg["params"], data, y, train_idx, test_idx, scoring, threads
+            ))
+
+    scores: Dict[int, Dict[str, Any]] = {cfg["id"]: {"scores": [], "error": None} for cfg in configs}
+    with parallel_config(backend="loky", inner_max_num_threads=threads):
+        stream = Parallel(n_jobs=workers, max_nbytes="1M", return_as="generator_unordered")(tasks)
+        for result in stream:
+            entry = scores[result["config"]]
+            if "error" in result:
+                entry["error"] = entry["error"] or result["error"]
+            else:
+                entry["scores"].append(result["score"])
+            if on_result is not None:
+                on_result(dict(result, resource=resource))
+    return scores
+
+
+def _successive_halving(
+    configs: List[Dict[str, Any]],
+    min_resource: int,
+    max_resource: int,
+    eta: int,
+    run_rung: Callable[[List[Dict[str, Any]], int], Dict[int, Dict[str, Any]]],
+    record: Callable[[int, int, int, Dict[int, Dict[str, Any]]], List[Tuple[int, float]]],
+    bracket: int,
+) -> None:
+    """Run one successive-halving bracket from ``min_resource`` up to ``max_resource`` rows."""
+    survivors = list(configs)
+    resource = min_resource
+    rung = 0
+    while survivors:
+        resource = min(resource, max_resource)
+        ranked = record(bracket, rung, resource, run_rung(survivors, resource))
+        if resource >= max_resource or len(ranked) <= 1:
+            break
+        keep = max(1, len(ranked) // eta)
+        by_id = {cfg["id"]: cfg for cfg in survivors}
+        survivors = [by_id[config_id] for config_id, _ in ranked[:keep]]
+        resource *= eta
+        rung += 1
+
+
+def search_models(
+    X: Union[pd.DataFrame, np.ndarray],
+    y: Union[pd.Series, np.ndarray],
+    candidates: Optional[Union[List[Candidate], Dict[str, Any]]] = None,
+    problem_type: Optional[str] = None,
+    scoring: Optional[str] = None,
+    cv_folds: int = 5,
+    strategy: str = "halving",
+    eta: int = 3,
+    min_resource: Optional[int] = None,
+    n_jobs: int = -1,
+    refit: Union[str, bool] = "best",
+    random_state: int = 42,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    verbose: bool = True,
+    model_store: Optional[ModelStore] = None,
+    pipeline_spec: Any = None,
+    source: Optional[str] = None,
+    store_tags: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Search candidate models and parameter grids with successive halving or Hyperband.
+
+    Args:
+        X: Numeric feature matrix
+        y: Target vector
+        candidates: List of ``{"name", "estimator", "params": grid, "scale": bool}`` dicts or a
+            ``{name: estimator}`` dict (defaults to ``default_search_space(problem_type)``)
+        problem_type: 'classification' | 'regression' (auto-detected if None)
+        scoring: sklearn scorer name, higher is better (default: accuracy / neg_root_mean_squared_error)
+        cv_folds: Cross-validation folds, shared by every rung
+        strategy: 'halving' (one bracket) or 'hyperband' (several brackets with different starting budgets)
+        eta: Promotion factor; each rung keeps ``1/eta`` of the configurations with ``eta`` times more rows
+        min_resource: Training rows per fold on the first rung (default: derived from the number of configs)
+        n_jobs: Total cores used per rung (-1 = all cores)
+        refit: 'best' refits the winner on all rows, 'all' refits the best configuration of every model,
+            False skips refitting
+        random_state: Seed for fold splits and subsampling
+        on_result: Optional callback invoked with each (config, fold) result as soon as it completes
+        verbose: Print the leaderboard after every rung
+        model_store: Optional ModelStore; refits are loaded from / saved to it so later stages reuse them
+        pipeline_spec: Description of the feature pipeline that produced X (part of the store key)
+        source: Optional source data file; stale store entries are dropped when it changes
+        store_tags: Tags stored with every refit (plus ``candidate``: the model name), so later stages can
+            load them with ``ModelStore.load(data_fingerprint(X, y), pipeline_spec, **store_tags)``
+
+    Returns:
+        Dict with ``best_name``, ``best_params``, ``best_score``, ``best_estimator``, ``leaderboard``
+        (DataFrame, best score per configuration at its highest rung), ``best_per_model``, ``history``,
+        ``classes`` (original class labels when string targets were encoded for the search, else None),
+        ``n_fits`` and ``seconds``. Refitted estimators are trained on the original labels.
+    """
+    from sklearn.base import clone
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+    if strategy not in ("halving", "hyperband"):
+        raise ValueError("strategy must be 'halving' or 'hyperband'")
+    if eta < 2:
+        raise ValueError("eta must be >= 2")
+
+    started = time.perf_counter()
+    # fingerprint of the data as passed in, so other stages can find these fits from the same X and y
+    fingerprint = data_fingerprint(X, y) if model_store is not None else None
+    feature_names = list(X.columns) if isinstance(X, pd.DataFrame) else None
+    X = np.ascontiguousarray(np.asarray(X, dtype=np.float64))
+    y_series = pd.Series(np.asarray(y))
+    ptype = problem_type or _detect_problem_type(y_series)
+    # the search scores on integer codes; refits use the original labels so they predict them
+    y_labels = y_series.to_numpy()
+    label_encoder = None
+    if ptype == "classification" and not pd.api.types.is_integer_dtype(y_series):
+        label_encoder = LabelEncoder()
+        y = label_encoder.fit_transform(y_series.astype(str))
+        y_labels = y_series.astype(str).to_numpy()
+    y = np.asarray(y)
+    scoring = scoring or ("accuracy" if ptype == "classification" else "neg_root_mean_squared_error")
+
+    configs = _expand_candidates(candidates if candidates is not None else default_search_space(ptype, random_state))
+    if not configs:
+        raise ValueError("No candidate configurations to search")
+
+    splits = _fold_splits(y, ptype, cv_folds, {})
+    X_scaled = _scaled_folds(X, splits) if any(cfg["scale"] for cfg in configs) else []
+    rng = np.random.RandomState(random_state)
+    orders = [rng.permutation(train_idx) for train_idx, _ in splits]
+    max_resource = min(len(train_idx) for train_idx, _ in splits)
+
+    history: List[Dict[str, Any]] = []
+    best_rung: Dict[int, Dict[str, Any]] = {}
+    n_fits = 0
+
+    def run_rung(rung_configs, resource):
+        nonlocal n_fits
+        n_fits += len(rung_configs) * len(splits)
+        return _run_rung(rung_configs, resource, X, X_scaled, y, splits, orders, scoring, n_jobs, on_result)
+
+    def record(bracket, rung, resource, rung_scores):
+        ranked = []
+        for config_id, entry in rung_scores.items():
+            cfg = configs[config_id]
+            row = {"bracket": bracket, "rung": rung, "resource": resource, "config": config_id,
+                   "model": cfg["name"], "params": cfg["params"]}
+            if entry["error"] or not entry["scores"]:
+                row.update({"score": np.nan, "std": np.nan, "error": entry["error"]})
+            else:
+                row.update({"score": float(np.mean(entry["scores"])), "std": float(np.std(entry["scores"])),
+                            "error": None})
+                ranked.append((config_id, row["score"]))
+                # leaderboard keeps each configuration's score at the largest budget it reached
+                previous = best_rung.get(config_id)
+                if previous is None or resource >= previous["resource"]:
+                    best_rung[config_id] = row
+            history.append(row)
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        if verbose:
+            board = ", ".join(f"{configs[c]['name']} {configs[c]['params'] or ''}: {s:.4f}" for c, s in ranked[:5])
+            print(f"[search] bracket {bracket} rung {rung}: {len(rung_scores)} configs x {resource} rows | {board}")
+        return ranked
+
+    if strategy == "halving":
+        n_rungs = math.ceil(math.log(len(configs), eta)) + 1 if len(configs) > 1 else 1
+        start_resource = min_resource or max(cv_folds * 2, int(max_resource / eta ** (n_rungs - 1)))
+        _successive_halving(configs, min(start_resource, max_resource), max_resource, eta, run_rung, record, 0)
+    else:
+        smallest = min_resource or max(cv_folds * 2, max_resource // eta ** 3)
+        s_max = max(0, int(math.floor(math.log(max_resource / smallest, eta))))
+        for bracket, s in enumerate(range(s_max, -1, -1)):
+            n = min(len(configs), int(math.ceil((s_max + 1) / (s + 1) * eta ** s)))
+            chosen = sorted(rng.choice(len(configs), size=n, replace=False))
+            _successive_halving([configs[i] for i in chosen], max(smallest, int(max_resource / eta ** s)),
+                                max_resource, eta, run_rung, record, bracket)
+
+    leaderboard = pd.DataFrame(
+        sorted(best_rung.values(), key=lambda row: (row["resource"], row["score"]), reverse=True),
+        columns=["model", "params", "score", "std", "resource", "rung", "bracket", "config"],
+    )
+    if leaderboard.empty:
+        return {"search_successful": False, "error": "All configurations failed",
+                "history": history, "n_fits": n_fits, "seconds": time.perf_counter() - started}
+
+    def build(config_id):
+        cfg = configs[config_id]
+        estimator = clone(cfg["estimator"]).set_params(**cfg["params"])
+        return make_pipeline(StandardScaler(), estimator) if cfg["scale"] else estimator
+
+    best_per_model: Dict[str, Dict[str, Any]] = {}
+    for _, row in leaderboard.iterrows():
+        if row["model"] not in best_per_model:
+            best_per_model[row["model"]] = {"params": row["params"], "score": float(row["score"]),
+                                            "resource": int(row["resource"]), "config": int(row["config"])}
+
+    best = leaderboard.iloc[0]
+    best_estimator = None
+    if refit:
+        for name, info in best_per_model.items():
+            if refit == "all" or info["config"] == best["config"]:
+                if model_store is not None:
+                    info["estimator"] = model_store.fit(build(info["config"]), X, y_labels, pipeline_spec=pipeline_spec,
+                                                        fingerprint=fingerprint, source=source,
+                                                        tags=dict(store_tags or {}, candidate=name))
+                else:
+                    info["estimator"] = build(info["config"]).fit(X, y_labels)
+                if info["config"] == best["config"]:
+                    best_estimator = info["estimator"]
+
+    return {
+        "search_successful": True,
+        "problem_type": ptype,
+        "scoring": scoring,
+        "strategy": strategy,
+        "best_name": best["model"],
+        "best_params": best["params"],
+        "best_score": float(best["score"]),
+        "best_estimator": best_estimator,
+        "best_per_model": best_per_model,
+        "classes": list(label_encoder.classes_) if label_encoder is not None else None,
+        "leaderboard": leaderboard.drop(columns=["config"]).reset_index(drop=True),
+        "history": history,
+        "feature_names": feature_names,
+        "n_configs": len(configs),
+        "n_fits": n_fits,
+        "seconds": time.perf_counter() - started,
+    }
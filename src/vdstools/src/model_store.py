@@ -0,0 +1,314 @@
+"""
+Content-addressed store for fitted models.
+
+A fitted estimator (or preprocessor) is saved with joblib under a key derived
+from everything that determines the fit:
+
+    sha1(dataset fingerprint, feature pipeline spec, model class, params, seed)
+
+so any later stage that asks for the same fit on the same data loads it
+instead of refitting, and a change in the data, pipeline or parameters simply
+produces a different key. Entries can be tagged with a ``source`` data file
+(e.g. the CSV path); once that file changes, storing a new fit for it drops
+the entries made from the previous version of the file. Entries can also carry
+tags (e.g. the stage and candidate name), so a later stage can load a specific
+earlier fit with ``find`` / ``load`` without knowing its parameters.
+
+The store lives under the notebook directory (``./.vds_models`` by default,
+or ``$VDS_MODEL_STORE``) and is bounded: once it holds more than ``max_entries``
+entries or ``max_bytes`` bytes, the least recently used entries are evicted.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..core.utils import dataset_fingerprint, file_fingerprint
+
+DEFAULT_STORE_DIR = ".vds_models"
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# parsed entry metadata per store directory, keyed by file name -> (mtime_ns, metadata);
+# shared by every ModelStore in the process so put() does not re-read every entry
+_metadata_cache: Dict[str, Dict[str, Tuple[int, Dict[str, Any]]]] = {}
+_metadata_lock = threading.Lock()
+
+
+def _array_fingerprint(values: Any) -> str:
+    if isinstance(values, pd.DataFrame):
+        return dataset_fingerprint(values)
+    if isinstance(values, pd.Series):
+        return dataset_fingerprint(values.to_frame())
+    array = np.ascontiguousarray(np.asarray(values))
+    if array.dtype == object:
+        return dataset_fingerprint(pd.DataFrame(array.reshape(len(array), -1)))
+    digest = hashlib.sha1(repr((array.shape, str(array.dtype))).encode())
+    digest.update(array.view(np.uint8))
+    return digest.hexdigest()
+
+
+def data_fingerprint(X: Any, y: Any = None) -> str:
+    """Fingerprint of a training set (features and optional target)."""
+    parts = [_array_fingerprint(X)]
+    if y is not None:
+        parts.append(_array_fingerprint(y))
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+# parameters that change how a fit runs but not the fitted result
+_EXECUTION_PARAMS = ("n_jobs", "verbose", "copy_X")
+
+
+def _model_spec(estimator: Any) -> Dict[str, Any]:
+    cls = type(estimator)
+    params = estimator.get_params(deep=False) if hasattr(estimator, "get_params") else {}
+    params = {k: v for k, v in params.items() if k not in _EXECUTION_PARAMS}
+    return {
+        "class": f"{cls.__module__}.{cls.__qualname__}",
+        "params": json.loads(json.dumps(params, sort_keys=True, default=repr)),
+    }
+
+
+class ModelStore:
+    """
+    Content-addressed joblib store for fitted estimators and preprocessors
+
+    Example:
+        store = ModelStore()
+        model = store.fit(RandomForestRegressor(random_state=42), X_train, y_train,
+                          pipeline_spec={"impute": "median", "encode": "onehot"})
+        # any later cell or chapter: same call loads the fitted model instead of refitting
+    """
+
+    def __init__(self, root: Optional[str] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize ModelStore
+
+        Args:
+            root: Store directory (default: $VDS_MODEL_STORE or ./.vds_models)
+            max_entries: Maximum number of stored entries (default: $VDS_MODEL_STORE_MAX_ENTRIES or 256)
+            max_bytes: Maximum total size of stored models (default: $VDS_MODEL_STORE_MAX_BYTES or 2 GiB)
+        """
+        self.root = root or os.environ.get("VDS_MODEL_STORE") or os.path.join(os.getcwd(), DEFAULT_STORE_DIR)
+        self.max_entries = max_entries or int(os.environ.get("VDS_MODEL_STORE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.max_bytes = max_bytes or int(os.environ.get("VDS_MODEL_STORE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Keys and raw access
+    # ------------------------------------------------------------------
+    def key(self, fingerprint: str, estimator: Any, pipeline_spec: Any = None,
+            seed: Optional[int] = None) -> str:
+        """Cache key for fitting ``estimator`` on the data identified by ``fingerprint``."""
+        spec = _model_spec(estimator)
+        if seed is None:
+            seed = spec["params"].get("random_state")
+        payload = {"data": fingerprint, "pipeline": pipeline_spec, "model": spec, "seed": seed}
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=repr).encode()).hexdigest()
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.root, f"{key}{ext}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Load a stored object, or None if the key is unknown or unreadable."""
+        import joblib
+
+        path = self._path(key, ".joblib")
+        if not os.path.exists(path):
+            return None
+        try:
+            obj = joblib.load(path)
+        except Exception:
+            return None
+        try:
+            # the model file's mtime is the entry's last use, for LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return obj
+
+    def put(self, key: str, obj: Any, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Store ``obj`` under ``key`` (atomic write) and return its path."""
+        import joblib
+
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(key, ".joblib")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(obj, tmp_path)
+        os.replace(tmp_path, path)
+        meta = dict(metadata or {}, key=key, created=time.time())
+        with open(self._path(key, ".json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, default=repr)
+
+        source = meta.get("source")
+        if source is not None:
+            # the source file changed: entries made from its previous versions are stale
+            for entry in self.entries():
+                if entry.get("source") == source and entry.get("source_version") != meta.get("source_version"):
+                    self.remove(entry["key"])
+        self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Remove least recently used entries until the store is within max_entries and max_bytes."""
+        usage = []
+        for entry in self.entries():
+            try:
+                stat = os.stat(self._path(entry["key"], ".joblib"))
+            except OSError:
+                continue
+            usage.append((stat.st_mtime, stat.st_size, entry["key"]))
+        count, total = len(usage), sum(size for _, size, _ in usage)
+        for _, size, key in sorted(usage):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.remove(key)
+            self.evictions += 1
+            count -= 1
+            total -= size
+
+    def remove(self, key: str) -> None:
+        """Delete one entry (a no-op for files another process already removed)."""
+        for ext in (".joblib", ".json"):
+            try:
+                os.remove(self._path(key, ext))
+            except FileNotFoundError:
+                pass
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Metadata of every stored entry (only new or changed metadata files are read)."""
+        if not os.path.isdir(self.root):
+            return []
+        with _metadata_lock:
+            cache = _metadata_cache.setdefault(os.path.abspath(self.root), {})
+            current = {}
+            for item in sorted(os.scandir(self.root), key=lambda item: item.name):
+                if not item.name.endswith(".json"):
+                    continue
+                try:
+                    mtime = item.stat().st_mtime_ns
+                except OSError:
+                    continue
+                cached = cache.get(item.name)
+                if cached is None or cached[0] != mtime:
+                    try:
+                        with open(item.path, "r", encoding="utf-8") as f:
+                            cached = (mtime, json.load(f))
+                    except (OSError, ValueError):
+                        continue
+                current[item.name] = cached
+            cache.clear()
+            cache.update(current)
+            return [meta for _, meta in current.values()]
+
+    def find(self, fingerprint: Optional[str] = None, pipeline_spec: Any = None,
+             **tags: Any) -> List[Dict[str, Any]]:
+        """
+        Metadata of the entries matching a data fingerprint, pipeline spec and tags, newest first
+
+        Args:
+            fingerprint: Data fingerprint (``data_fingerprint(X, y)``); None matches any data
+            pipeline_spec: Feature pipeline spec; None matches any pipeline
+            **tags: Tags given to ``fit`` (e.g. ``stage='model_training'``)
+        """
+        if pipeline_spec is not None:
+            pipeline_spec = json.loads(json.dumps(pipeline_spec, sort_keys=True, default=repr))
+        matches = [
+            entry for entry in self.entries()
+            if (fingerprint is None or entry.get("fingerprint") == fingerprint)
+            and (pipeline_spec is None or entry.get("pipeline") == pipeline_spec)
+            and all((entry.get("tags") or {}).get(name) == value for name, value in tags.items())
+        ]
+        return sorted(matches, key=lambda entry: entry.get("created", 0), reverse=True)
+
+    def load(self, fingerprint: Optional[str] = None, pipeline_spec: Any = None,
+             **tags: Any) -> Dict[str, Any]:
+        """
+        Load the newest fit per candidate tag (or per key when untagged) matching ``find``'s filters
+
+        Returns:
+            Dict mapping the ``candidate`` tag (or the entry key) to the fitted object
+        """
+        loaded: Dict[str, Any] = {}
+        for entry in self.find(fingerprint, pipeline_spec, **tags):
+            name = (entry.get("tags") or {}).get("candidate") or entry["key"]
+            if name in loaded:
+                continue
+            obj = self.get(entry["key"])
+            if obj is not None:
+                loaded[name] = obj
+                self.hits += 1
+        return loaded
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        for entry in self.entries():
+            self.remove(entry["key"])
+
+    # ------------------------------------------------------------------
+    # Fit-or-load
+    # ------------------------------------------------------------------
+    def fit(self, estimator: Any, X: Any, y: Any = None, pipeline_spec: Any = None,
+            seed: Optional[int] = None, fingerprint: Optional[str] = None,
+            source: Optional[str] = None, tags: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Return ``estimator`` fitted on (X, y), loading it from the store when this exact fit exists
+
+        Args:
+            estimator: Unfitted estimator or preprocessor (not modified; a clone is fitted)
+            X: Training features
+            y: Optional training target
+            pipeline_spec: JSON-serializable description of the feature pipeline that produced X
+            seed: Random seed of the fit (defaults to the estimator's random_state)
+            fingerprint: Precomputed data fingerprint (default: computed from X and y)
+            source: Optional path of the source data file; when it changes, older entries are dropped
+            tags: Optional labels (e.g. ``{"stage": "model_training", "candidate": "Random Forest"}``)
+                stored with the entry for ``find`` / ``load``; not part of the key
+
+        Returns:
+            Fitted estimator
+        """
+        from sklearn.base import clone
+
+        fingerprint = fingerprint or data_fingerprint(X, y)
+        key = self.key(fingerprint, estimator, pipeline_spec, seed)
+        fitted = self.get(key)
+        if fitted is not None:
+            self.hits += 1
+            return fitted
+
+        self.misses += 1
+        fitted = clone(estimator)
+        if y is None:
+            fitted.fit(X)
+        else:
+            fitted.fit(X, y)
+        spec = _model_spec(estimator)
+        self.put(key, fitted, {
+            "fingerprint": fingerprint,
+            "pipeline": pipeline_spec,
+            "model": spec["class"],
+            "params": spec["params"],
+            "seed": seed if seed is not None else spec["params"].get("random_state"),
+            "source": os.path.abspath(source) if source else None,
+            "source_version": file_fingerprint(source) if source and os.path.exists(source) else None,
+            "tags": tags or {},
+        })
+        return fitted
+
+    def stats(self) -> Dict[str, Union[int, str]]:
+        """Hit/miss counters of this store instance."""
+        return {"root": self.root, "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self.entries())}
@@ -0,0 +1,336 @@
+"""
+Dataset profiling kernel.
+
+Computes every per-column metric used by the quality, missing-value and audit
+reports in a few vectorized passes over the frame (one ``isna`` pass, one
+``nunique`` pass, one batched ``quantile`` over the numeric block, ...) instead
+of one pass per column per metric. Profiles are cached by dataset fingerprint
+(or file fingerprint for CSV paths), so repeated reports on the same data
+render from the cached profile without re-reading or re-scanning it.
+
+Datetime detection follows the same idea: a small sample per column is tested
+against candidate formats, the detected format (or the fact that none matched)
+is cached per (fingerprint, column), and the full column is parsed once with
+the explicit format.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..core.utils import dataset_fingerprint, file_fingerprint
+
+DatasetProfile = Dict[str, Any]
+
+PROFILE_QUANTILES = (0.25, 0.5, 0.75, 0.99)
+
+# profile cache: {fingerprint: profile}
+_PROFILE_CACHE: Dict[str, DatasetProfile] = {}
+_PROFILE_CACHE_SIZE = 32
+
+# numeric columns sorted together per pass (bounds the temporary copy)
+_NUMERIC_BLOCK = 64
+_NUMERIC_METRICS = ("unique_count", "zeros", "negatives", "infinites", "min", "max", "mean") + tuple(
+    f"q{int(q * 100)}" for q in PROFILE_QUANTILES
+)
+
+
+def _numeric_block_metrics(values: np.ndarray) -> np.ndarray:
+    """Per-column numeric metrics of a 2-D float block, in ``_NUMERIC_METRICS`` order."""
+    n_rows, n_cols = values.shape
+    result = np.full((n_cols, len(_NUMERIC_METRICS)), np.nan)
+    with np.errstate(invalid="ignore"):
+        result[:, 1] = (values == 0).sum(axis=0)
+        result[:, 2] = (values < 0).sum(axis=0)
+    result[:, 3] = np.isinf(values).sum(axis=0)
+    if n_rows == 0:
+        result[:, 0] = 0
+        return result
+
+    ordered = np.sort(values, axis=0)  # NaN sorts last
+    valid = (~np.isnan(ordered)).sum(axis=0)
+    has_values = valid > 0
+    last = np.maximum(valid - 1, 0)
+    cols = np.arange(n_cols)
+
+    changes = ordered[1:] != ordered[:-1]
+    changes &= np.arange(1, n_rows)[:, None] < valid[None, :]
+    result[:, 0] = np.where(has_values, changes.sum(axis=0) + 1, 0)
+    result[:, 4] = np.where(has_values, ordered[0], np.nan)
+    result[:, 5] = np.where(has_values, ordered[last, cols], np.nan)
+    with np.errstate(invalid="ignore"):
+        result[:, 6] = np.where(has_values, np.nansum(values, axis=0) / np.maximum(valid, 1), np.nan)
+
+    # linear interpolation between order statistics (same as pandas' default)
+    for j, q in enumerate(PROFILE_QUANTILES):
+        position = q * last
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, last)
+        fraction = position - lower
+        low_values = ordered[lower, cols]
+        high_values = ordered[upper, cols]
+        with np.errstate(invalid="ignore"):
+            interpolated = np.where(fraction > 0, low_values + (high_values - low_values) * fraction, low_values)
+        result[:, 7 + j] = np.where(has_values, interpolated, np.nan)
+    return result
+
+
+def compute_profile(data: pd.DataFrame) -> DatasetProfile:
+    """
+    Profile ``data`` without using the cache.
+
+    Returns:
+        Dict with dataset-level metrics (``n_rows``, ``n_columns``, ``total_cells``,
+        ``missing_cells``, ``duplicate_rows``, ``memory_bytes``) and ``columns``, a
+        DataFrame indexed by column name with dtype, null, uniqueness, numeric
+        (zeros, negatives, infinites, min, max, mean, quantiles) and text
+        (empty strings, whitespace-only) metrics
+    """
+    n_rows = len(data)
+    columns = pd.DataFrame(index=data.columns)
+    columns["dtype"] = data.dtypes.astype(str)
+
+    null_count = data.isna().sum()
+    columns["null_count"] = null_count
+    columns["non_null"] = n_rows - null_count
+    columns["null_pct"] = null_count / n_rows * 100 if n_rows else 0.0
+
+    numeric = data.select_dtypes(include=[np.number])
+    columns["is_numeric"] = columns.index.isin(numeric.columns)
+    columns["is_numeric"] |= columns.index.isin(data.select_dtypes(include=["bool"]).columns)
+
+    for name in ("unique_count", "zeros", "negatives", "infinites", "empty_strings", "whitespace_only"):
+        columns[name] = 0
+    for name in ["min", "max", "mean"] + [f"q{int(q * 100)}" for q in PROFILE_QUANTILES]:
+        columns[name] = np.nan
+
+    # numeric block: one sort per column block yields unique counts, extremes and quantiles
+    for start in range(0, numeric.shape[1], _NUMERIC_BLOCK):
+        block = numeric.iloc[:, start:start + _NUMERIC_BLOCK]
+        columns.loc[block.columns, list(_NUMERIC_METRICS)] = _numeric_block_metrics(
+            block.to_numpy(dtype=np.float64, na_value=np.nan)
+        )
+
+    other = data.columns[~columns.index.isin(numeric.columns)]
+    if len(other):
+        columns.loc[other, "unique_count"] = data[other].nunique()
+    columns["unique_pct"] = columns["unique_count"] / n_rows * 100 if n_rows else 0.0
+
+    bools = data.select_dtypes(include=["bool"])
+    if bools.shape[1]:
+        columns.loc[bools.columns, "zeros"] = (~bools).sum()
+
+    text = data.select_dtypes(include=["object", "string"])
+    if text.shape[1]:
+        columns.loc[text.columns, "empty_strings"] = text.eq("").sum()
+        for col in text.columns:
+            if _is_text(text[col]):
+                columns.loc[col, "whitespace_only"] = int(text[col].str.strip().eq("").sum())
+
+    return {
+        "n_rows": n_rows,
+        "n_columns": data.shape[1],
+        "total_cells": n_rows * data.shape[1],
+        "missing_cells": int(null_count.sum()),
+        "duplicate_rows": int(data.duplicated().sum()),
+        "memory_bytes": int(data.memory_usage(deep=True).sum()),
+        "columns": columns,
+    }
+
+
+def _is_text(series: pd.Series) -> bool:
+    """Whether an object column holds strings (``.str`` accessor is available)."""
+    try:
+        series.str
+        return True
+    except AttributeError:
+        return False
+
+
+def _remember(key: str, profile: DatasetProfile) -> DatasetProfile:
+    if key not in _PROFILE_CACHE and len(_PROFILE_CACHE) >= _PROFILE_CACHE_SIZE:
+        _PROFILE_CACHE.pop(next(iter(_PROFILE_CACHE)))
+    profile["fingerprint"] = key
+    _PROFILE_CACHE[key] = profile
+    return profile
+
+
+def profile_dataset(data: pd.DataFrame, use_cache: bool = True) -> DatasetProfile:
+    """
+    Return the (cached) profile of an in-memory DataFrame.
+
+    Args:
+        data: DataFrame to profile
+        use_cache: Reuse a profile computed earlier for identical content
+
+    Returns:
+        Dataset profile, see ``compute_profile``
+    """
+    if not use_cache:
+        return compute_profile(data)
+    key = "data:" + dataset_fingerprint(data)
+    if key in _PROFILE_CACHE:
+        return _PROFILE_CACHE[key]
+    return _remember(key, compute_profile(data))
+
+
+def profile_csv(csv_file_path: str, data: Optional[pd.DataFrame] = None,
+                use_cache: bool = True) -> DatasetProfile:
+    """
+    Return the (cached) profile of a CSV file.
+
+    The cache key is the file fingerprint (path, size, mtime), so a cache hit
+    skips reading the file entirely.
+
+    Args:
+        csv_file_path: Path to CSV file
+        data: Optional already loaded contents of the file
+        use_cache: Reuse a profile computed earlier for the unchanged file
+
+    Returns:
+        Dataset profile, see ``compute_profile``
+    """
+    key = "file:" + file_fingerprint(csv_file_path)
+    if use_cache and key in _PROFILE_CACHE:
+        return _PROFILE_CACHE[key]
+    if data is None:
+        data = pd.read_csv(csv_file_path)
+    return _remember(key, compute_profile(data))
+
+
+def clear_profile_cache() -> None:
+    """Drop all cached dataset profiles."""
+    _PROFILE_CACHE.clear()
+
+
+# ----------------------------------------------------------------------
+# Datetime format detection
+# ----------------------------------------------------------------------
+DATETIME_FORMATS: Tuple[str, ...] = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y/%m/%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%m/%d/%Y %H:%M",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%d-%m-%Y",
+    "%m-%d-%Y",
+    "%d.%m.%Y",
+    "%Y%m%d",
+    "%Y-%m",
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%d %b %Y",
+    "%d %B %Y",
+    "ISO8601",
+)
+
+# detected format per (fingerprint, column); None records a column that is not a date.
+# Fingerprints change whenever the data (or the file's size/mtime) changes, so stale
+# entries are never hit again; the LRU bound keeps them from piling up.
+_DATETIME_FORMAT_CACHE: "OrderedDict[Tuple[str, str], Optional[str]]" = OrderedDict()
+_DATETIME_FORMAT_CACHE_SIZE = 4096
+
+
+def infer_datetime_format(series: pd.Series, sample_size: int = 200, min_success: float = 0.9,
+                          formats: Sequence[str] = DATETIME_FORMATS) -> Optional[str]:
+    """
+    Detect the datetime format of a text column from a small sample.
+
+    Args:
+        series: Column to test
+        sample_size: Number of non-null values tested per candidate format
+        min_success: Minimum share of sample values a format must parse
+        formats: Candidate ``strftime`` formats, tried in order
+
+    Returns:
+        The format parsing the largest share of the sample (ties go to the
+        earlier candidate), or None when no format reaches ``min_success``
+    """
+    sample = series.dropna()
+    if sample.empty:
+        return None
+    if len(sample) > sample_size:
+        sample = sample.sample(sample_size, random_state=0)
+    sample = sample.astype(str).str.strip()
+
+    # dates contain digits; reject free text without trying any format
+    if sample.str.contains(r"\d", regex=True).mean() < min_success:
+        return None
+
+    best_format, best_rate = None, 0.0
+    for fmt in formats:
+        try:
+            rate = pd.to_datetime(sample, format=fmt, errors="coerce").notna().mean()
+        except (ValueError, TypeError):
+            continue
+        if rate > best_rate:
+            best_format, best_rate = fmt, rate
+            if rate == 1.0:
+                break
+    return best_format if best_rate >= min_success else None
+
+
+def detect_datetime_format(data: pd.DataFrame, column: str, fingerprint: Optional[str] = None,
+                           **kwargs) -> Optional[str]:
+    """
+    Cached ``infer_datetime_format`` for one column of a dataset.
+
+    Args:
+        data: DataFrame holding the column
+        column: Column name
+        fingerprint: Dataset fingerprint used as cache key (e.g. ``file_fingerprint``
+            of the source CSV); computed from ``data`` when omitted
+        **kwargs: Passed to ``infer_datetime_format``
+
+    Returns:
+        Detected format or None (cached either way, least recently used entries
+        are evicted beyond ``_DATETIME_FORMAT_CACHE_SIZE``)
+    """
+    key = (fingerprint or dataset_fingerprint(data), str(column))
+    if key in _DATETIME_FORMAT_CACHE:
+        _DATETIME_FORMAT_CACHE.move_to_end(key)
+        return _DATETIME_FORMAT_CACHE[key]
+    series = data[column]
+    if pd.api.types.is_datetime64_any_dtype(series):
+        fmt = "datetime64"
+    elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        fmt = infer_datetime_format(series, **kwargs)
+    else:
+        fmt = None
+    _DATETIME_FORMAT_CACHE[key] = fmt
+    if len(_DATETIME_FORMAT_CACHE) > _DATETIME_FORMAT_CACHE_SIZE:
+        _DATETIME_FORMAT_CACHE.popitem(last=False)
+    return fmt
+
+
+def parse_datetime_column(data: pd.DataFrame, column: str, fingerprint: Optional[str] = None,
+                          **kwargs) -> Optional[pd.Series]:
+    """
+    Parse a column with its detected format.
+
+    Returns:
+        Parsed datetime Series (unparseable values become NaT), or None when the
+        sample showed the column is not a date column
+    """
+    fmt = detect_datetime_format(data, column, fingerprint, **kwargs)
+    if fmt is None:
+        return None
+    if fmt == "datetime64":
+        return data[column]
+    return pd.to_datetime(data[column], format=fmt, errors="coerce")
+
+
+def clear_datetime_format_cache() -> None:
+    """Drop all cached datetime formats."""
+    _DATETIME_FORMAT_CACHE.clear()
@@ -1,155 +1,280 @@
 """
 Stability utilities for evaluating model performance across dataset variations.
 Designed for agent-friendly, structured outputs and stable execution.
+
+Evaluation is scheduled as a flat list of (variation, model, fold) tasks on a
+single process pool. Each task gets a fixed thread budget, the prepared arrays
+are shared with workers through joblib's memory mapping, and fold splits are
+computed once per distinct target vector and reused across variations.
 """
 
-from typing import List, Optional, Dict, Any
+import hashlib
+import os
+from typing import Callable, List, Optional, Dict, Any, Tuple
 import pandas as pd
 import numpy as np
 
-from sklearn.model_selection import cross_val_score, StratifiedKFold, KFold
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.linear_model import LogisticRegression, LinearRegression
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    mean_squared_error,
-    r2_score,
-    mean_absolute_error,
-)
+from .model_store import ModelStore
+from .variations import VARIATION_SUFFIX, load_dataset
+
+# sub-store of ``model_store`` holding per-fold fits
+FOLD_STORE_DIR = "folds"
 
 
 def _detect_problem_type(y: pd.Series) -> str:
-    if y.dtype == "object":
+    if not pd.api.types.is_numeric_dtype(y):
         return "classification"
     unique = y.nunique(dropna=True)
     # heuristic threshold for classification
     return "classification" if unique <= 20 else "regression"
 
 
+def _prepare_variation(
+    path: Any, target_column: Optional[str], base_cache: Optional[Dict[str, pd.DataFrame]] = None
+) -> Tuple[np.ndarray, pd.Series, str]:
+    """Load one variation (file or lazy spec) and return scaled feature matrix, target and target name."""
+    from sklearn.preprocessing import StandardScaler, LabelEncoder
+
+    df = load_dataset(path, base_cache=base_cache)
+    if df.shape[1] < 2:
+        raise ValueError("Variation must contain at least one feature and a target column")
+
+    tgt_col = target_column or df.columns[-1]
+    if tgt_col not in df.columns:
+        # fallback: last column
+        tgt_col = df.columns[-1]
+
+    X = df.drop(columns=[tgt_col])
+    y = df[tgt_col]
+
+    # basic preprocessing
+    # fill missing
+    if X.isnull().sum().sum() > 0:
+        num_cols = X.select_dtypes(include=[np.number]).columns
+        cat_cols = X.select_dtypes(include=["object", "category"]).columns
+        if len(num_cols) > 0:
+            X[num_cols] = X[num_cols].fillna(X[num_cols].median())
+        for c in cat_cols:
+            mode_vals = X[c].mode()
+            X[c] = X[c].fillna(mode_vals[0] if len(mode_vals) > 0 else "Unknown")
+
+    # encode
+    cat_cols = X.select_dtypes(include=["object", "category", "string"]).columns
+    for c in cat_cols:
+        X[c] = LabelEncoder().fit_transform(X[c].astype(str))
+
+    # scale
+    num_cols = X.select_dtypes(include=[np.number]).columns
+    if len(num_cols) > 0:
+        X[num_cols] = StandardScaler().fit_transform(X[num_cols])
+
+    return np.ascontiguousarray(X.to_numpy(dtype=np.float64)), y, tgt_col
+
+
+def _build_models(ptype: str, threads_per_task: int) -> Dict[str, Any]:
+    from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+    from sklearn.linear_model import LogisticRegression, LinearRegression
+
+    if ptype == "classification":
+        return {
+            "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=threads_per_task),
+            "Logistic Regression": LogisticRegression(max_iter=1000, random_state=42),
+        }
+    return {
+        "Random Forest": RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=threads_per_task),
+        "Linear Regression": LinearRegression(),
+    }
+
+
+def _fold_splits(
+    y: np.ndarray, ptype: str, cv_folds: int, cache: Dict[str, List[Tuple[np.ndarray, np.ndarray]]]
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Return CV splits for ``y``, reusing splits already computed for an identical target."""
+    from sklearn.model_selection import StratifiedKFold, KFold
+
+    digest = hashlib.sha1(np.ascontiguousarray(y).view(np.uint8)).hexdigest()
+    key = f"{ptype}:{cv_folds}:{y.shape[0]}:{y.dtype}:{digest}"
+    if key not in cache:
+        if ptype == "classification":
+            cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42)
+        else:
+            cv = KFold(n_splits=cv_folds, shuffle=True, random_state=42)
+        cache[key] = list(cv.split(np.zeros((y.shape[0], 1)), y))
+    return cache[key]
+
+
+def _run_fold(
+    task_id: Tuple[str, str, int],
+    model: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    metric: str,
+    model_store: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Fit and score one model on one fold. Runs inside a worker process."""
+    from sklearn.base import clone
+    from sklearn.metrics import get_scorer
+
+    variation_name, mname, fold = task_id
+    try:
+        if model_store:
+            # fold fits live in their own namespace with their own LRU bound, so they never evict
+            # the full-data fits other stages stored in ``model_store``
+            fold_store = ModelStore(os.path.join(model_store, FOLD_STORE_DIR))
+            estimator = fold_store.fit(model, X[train_idx], y[train_idx])
+        else:
+            estimator = clone(model).fit(X[train_idx], y[train_idx])
+        score = get_scorer(metric)(estimator, X[test_idx], y[test_idx])
+        return {"variation": variation_name, "model": mname, "fold": fold, "score": float(score)}
+    except Exception as e:
+        return {"variation": variation_name, "model": mname, "fold": fold, "error": str(e)}
+
+
+def _resolve_workers(n_jobs: int, n_tasks: int) -> Tuple[int, int]:
+    """Split the available cores into (worker processes, threads per task)."""
+    from joblib import cpu_count
+
+    total = cpu_count()
+    if n_jobs is None or n_jobs == 0:
+        n_jobs = 1
+    elif n_jobs < 0:
+        n_jobs = max(1, total + 1 + n_jobs)
+    workers = max(1, min(n_jobs, n_tasks, total))
+    threads_per_task = max(1, min(n_jobs, total) // workers)
+    return workers, threads_per_task
+
+
 def evaluate_variations(
-    variation_files: List[str],
+    variation_files: List[Any],
     target_column: Optional[str] = None,
     problem_type: Optional[str] = None,
     cv_folds: int = 5,
+    n_jobs: int = -1,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    model_store: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Evaluate model performance across dataset variations.
 
     Args:
-        variation_files: List of CSV file paths (each a dataset variation)
+        variation_files: List of dataset paths (CSV/Parquet) or ``*.variation.json`` specs;
+            specs sharing a base dataset parse it only once
         target_column: Optional target column name (defaults to last column)
         problem_type: Optional explicit type ('classification' | 'regression'). If None, auto-detect per file
         cv_folds: Cross-validation folds
+        n_jobs: Total cores to use across all (variation, model, fold) tasks (-1 = all cores)
+        on_result: Optional callback invoked with each fold result as soon as it completes
+        model_store: Optional ModelStore directory; fold models are loaded from its ``folds``
+            sub-store when the same fit exists (e.g. on re-runs) and saved there otherwise
 
     Returns:
         Structured dict with per-variation results, summary tables and stability score
     """
+    from joblib import Parallel, delayed, parallel_config
+    from sklearn.preprocessing import LabelEncoder
+
     results: List[Dict[str, Any]] = []
     per_variation: Dict[str, Any] = {}
+    prepared: Dict[str, Dict[str, Any]] = {}
+    split_cache: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = {}
+    base_cache: Dict[str, pd.DataFrame] = {}
 
     for path in variation_files:
         try:
-            df = pd.read_csv(path)
-            if df.shape[1] < 2:
-                continue
-
-            tgt_col = target_column or df.columns[-1]
-            if tgt_col not in df.columns:
-                # fallback: last column
-                tgt_col = df.columns[-1]
-
-            X = df.drop(columns=[tgt_col])
-            y = df[tgt_col]
-
-            # basic preprocessing
-            # fill missing
-            if X.isnull().sum().sum() > 0:
-                num_cols = X.select_dtypes(include=[np.number]).columns
-                cat_cols = X.select_dtypes(include=["object", "category"]).columns
-                if len(num_cols) > 0:
-                    X[num_cols] = X[num_cols].fillna(X[num_cols].median())
-                for c in cat_cols:
-                    mode_vals = X[c].mode()
-                    X[c] = X[c].fillna(mode_vals[0] if len(mode_vals) > 0 else "Unknown")
-
-            # encode
-            cat_cols = X.select_dtypes(include=["object", "category"]).columns
-            if len(cat_cols) > 0:
-                for c in cat_cols:
-                    le = LabelEncoder()
-                    X[c] = le.fit_transform(X[c].astype(str))
-
-            # scale
-            num_cols = X.select_dtypes(include=[np.number]).columns
-            if len(num_cols) > 0:
-                scaler = StandardScaler()
-                X[num_cols] = scaler.fit_transform(X[num_cols])
+            X, y, _ = _prepare_variation(path, target_column, base_cache)
 
             # determine problem type
             ptype = problem_type or _detect_problem_type(y)
-            if ptype == "classification" and y.dtype == "object":
-                y = LabelEncoder().fit_transform(y)
-
-            # models and CV
-            if ptype == "classification":
-                models = {
-                    "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1),
-                    "Logistic Regression": LogisticRegression(max_iter=1000, random_state=42),
-                }
-                primary_metric = "accuracy"
-                cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42)
-            else:
-                models = {
-                    "Random Forest": RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1),
-                    "Linear Regression": LinearRegression(),
-                }
-                primary_metric = "neg_mean_squared_error"
-                cv = KFold(n_splits=cv_folds, shuffle=True, random_state=42)
-
-            variation_name = path.split("/")[-1].replace(".csv", "")
-
-            var_results: List[Dict[str, Any]] = []
-            for mname, model in models.items():
-                try:
-                    scores = cross_val_score(model, X, y, cv=cv, scoring=primary_metric, n_jobs=-1)
-                    var_results.append(
-                        {
-                            "variation": variation_name,
-                            "path": path,
-                            "model": mname,
-                            "cv_mean": float(scores.mean()),
-                            "cv_std": float(scores.std()),
-                            "cv_scores": scores.tolist(),
-                            "samples": int(X.shape[0]),
-                            "features": int(X.shape[1]),
-                        }
-                    )
-                except Exception as e:
-                    var_results.append(
-                        {
-                            "variation": variation_name,
-                            "path": path,
-                            "model": mname,
-                            "error": str(e),
-                        }
-                    )
+            if ptype == "classification" and not pd.api.types.is_integer_dtype(y):
+                y = LabelEncoder().fit_transform(y.astype(str))
+            y = np.asarray(y)
 
-            # choose best model by cv_mean
-            best_cv = max((r for r in var_results if "cv_mean" in r), key=lambda r: r["cv_mean"], default=None)
-            per_variation[variation_name] = {
+            if isinstance(path, dict):
+                variation_name = path["name"]
+            else:
+                variation_name = os.path.splitext(os.path.basename(path).replace(VARIATION_SUFFIX, ""))[0]
+            prepared[variation_name] = {
                 "path": path,
-                "results": var_results,
-                "best_cv_mean": float(best_cv["cv_mean"]) if best_cv else None,
-                "best_model": best_cv["model"] if best_cv else None,
+                "X": X,
+                "y": y,
+                "ptype": ptype,
+                "metric": "accuracy" if ptype == "classification" else "neg_mean_squared_error",
+                "splits": _fold_splits(y, ptype, cv_folds, split_cache),
             }
-            results.extend(var_results)
-
         except Exception as e:
-            per_variation[path] = {"error": str(e)}
+            per_variation[path if isinstance(path, str) else str(path.get("name"))] = {"error": str(e)}
+
+    n_tasks = sum(2 * len(v["splits"]) for v in prepared.values())
+    workers, threads_per_task = _resolve_workers(n_jobs, max(n_tasks, 1))
+
+    tasks = []
+    model_names: Dict[str, List[str]] = {}
+    for variation_name, info in prepared.items():
+        models = _build_models(info["ptype"], threads_per_task)
+        model_names[variation_name] = list(models)
+        for mname, model in models.items():
+            for fold, (train_idx, test_idx) in enumerate(info["splits"]):
+                tasks.append(
+                    delayed(_run_fold)(
+                        (variation_name, mname, fold), model, info["X"], info["y"], train_idx, test_idx, info["metric"],
+                        model_store,
+                    )
+                )
+
+    fold_scores: Dict[Tuple[str, str], Dict[int, float]] = {}
+    fold_errors: Dict[Tuple[str, str], str] = {}
+    if tasks:
+        # one flat pool; large arrays are memory-mapped once and shared by every worker
+        with parallel_config(backend="loky", inner_max_num_threads=threads_per_task):
+            stream = Parallel(n_jobs=workers, max_nbytes="1M", return_as="generator_unordered")(tasks)
+            for fold_result in stream:
+                key = (fold_result["variation"], fold_result["model"])
+                if "error" in fold_result:
+                    fold_errors.setdefault(key, fold_result["error"])
+                else:
+                    fold_scores.setdefault(key, {})[fold_result["fold"]] = fold_result["score"]
+                if on_result is not None:
+                    on_result(fold_result)
+
+    for variation_name, info in prepared.items():
+        var_results: List[Dict[str, Any]] = []
+        for mname in model_names[variation_name]:
+            key = (variation_name, mname)
+            if key in fold_errors:
+                var_results.append(
+                    {
+                        "variation": variation_name,
+                        "path": info["path"],
+                        "model": mname,
+                        "error": fold_errors[key],
+                    }
+                )
+                continue
+            scores = np.array([fold_scores[key][f] for f in sorted(fold_scores[key])])
+            var_results.append(
+                {
+                    "variation": variation_name,
+                    "path": info["path"],
+                    "model": mname,
+                    "cv_mean": float(scores.mean()),
+                    "cv_std": float(scores.std()),
+                    "cv_scores": scores.tolist(),
+                    "samples": int(info["X"].shape[0]),
+                    "features": int(info["X"].shape[1]),
+                }
+            )
+
+        # choose best model by cv_mean
+        best_cv = max((r for r in var_results if "cv_mean" in r), key=lambda r: r["cv_mean"], default=None)
+        per_variation[variation_name] = {
+            "path": info["path"],
+            "results": var_results,
+            "best_cv_mean": float(best_cv["cv_mean"]) if best_cv else None,
+            "best_model": best_cv["model"] if best_cv else None,
+        }
+        results.extend(var_results)
 
     # summary
     summary_df = pd.DataFrame([r for r in results if "cv_mean" in r])
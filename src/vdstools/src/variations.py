@@ -0,0 +1,217 @@
+"""
+Lazy dataset variations for stability testing.
+
+A variation is stored as a small JSON spec instead of a full copy of the data:
+
+    {
+        "name": "StandardScaler_Variation",
+        "base": "/path/to/dataset.csv",
+        "transforms": [{"op": "standard_scale", "columns": null, "exclude": []}],
+        "shape": [1000, 12]
+    }
+
+Consumers (e.g. ``evaluate_variations``) load the base dataset once and apply the
+transforms in memory. ``materialize_variation`` writes a variation to a columnar
+file only when a physical copy is really needed.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+VARIATION_SUFFIX = ".variation.json"
+
+VariationSpec = Dict[str, Any]
+
+
+def _target_columns(df: pd.DataFrame, columns: Optional[List[str]], exclude: Optional[List[str]]) -> List[str]:
+    """Resolve the numeric columns a transform applies to."""
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    else:
+        columns = [c for c in columns if c in df.columns]
+    excluded = set(exclude or [])
+    return [c for c in columns if c not in excluded]
+
+
+def _scale(scaler_name: str) -> Callable[..., pd.DataFrame]:
+    def transform(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                  exclude: Optional[List[str]] = None) -> pd.DataFrame:
+        from sklearn import preprocessing
+
+        cols = _target_columns(df, columns, exclude)
+        if cols:
+            scaler = getattr(preprocessing, scaler_name)()
+            df[cols] = scaler.fit_transform(df[cols])
+        return df
+    return transform
+
+
+def _inject_missing(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                    exclude: Optional[List[str]] = None, fraction: float = 0.05,
+                    max_columns: Optional[int] = None, seed: int = 42) -> pd.DataFrame:
+    cols = _target_columns(df, columns, exclude)
+    if max_columns is not None:
+        cols = cols[:max_columns]
+    rng = np.random.RandomState(seed)
+    for col in cols:
+        mask = rng.random_sample(len(df)) < fraction
+        df.loc[mask, col] = np.nan
+    return df
+
+
+def _impute(df: pd.DataFrame, columns: Optional[List[str]] = None,
+            exclude: Optional[List[str]] = None, strategy: str = "mean") -> pd.DataFrame:
+    cols = _target_columns(df, columns, exclude)
+    if cols:
+        if strategy == "median":
+            fill_values = df[cols].median()
+        else:
+            fill_values = df[cols].mean()
+        df[cols] = df[cols].fillna(fill_values)
+    return df
+
+
+VARIATION_TRANSFORMS: Dict[str, Callable[..., pd.DataFrame]] = {
+    "standard_scale": _scale("StandardScaler"),
+    "minmax_scale": _scale("MinMaxScaler"),
+    "robust_scale": _scale("RobustScaler"),
+    "inject_missing": _inject_missing,
+    "impute": _impute,
+}
+
+
+def create_variation_spec(base: str, transforms: List[Dict[str, Any]], name: Optional[str] = None,
+                          shape: Optional[List[int]] = None) -> VariationSpec:
+    """
+    Build a variation spec referencing ``base`` with an ordered list of transforms.
+
+    Args:
+        base: Path of the base dataset (CSV, Parquet or pickle)
+        transforms: List of ``{"op": <name>, **params}`` entries from VARIATION_TRANSFORMS
+        name: Variation name (defaults to the base file name)
+        shape: Optional [rows, cols] of the resulting dataset
+
+    Returns:
+        Variation spec dict
+    """
+    for step in transforms:
+        if step.get("op") not in VARIATION_TRANSFORMS:
+            raise ValueError(f"Unknown variation transform: {step.get('op')}")
+    return {
+        "name": name or os.path.splitext(os.path.basename(base))[0],
+        "base": os.path.abspath(base),
+        "transforms": [dict(step) for step in transforms],
+        "shape": list(shape) if shape is not None else None,
+    }
+
+
+def save_variation_spec(spec: VariationSpec, output_dir: str) -> str:
+    """Write ``spec`` to ``<output_dir>/<name>.variation.json`` and return the path."""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{spec['name']}{VARIATION_SUFFIX}")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(spec, f, indent=2)
+    return path
+
+
+def is_variation_spec(source: Any) -> bool:
+    """Return True for spec dicts and paths to ``*.variation.json`` files."""
+    if isinstance(source, dict):
+        return "base" in source and "transforms" in source
+    return isinstance(source, str) and source.endswith(VARIATION_SUFFIX)
+
+
+def load_variation_spec(source: Union[str, VariationSpec]) -> VariationSpec:
+    """Return the spec dict for a spec path or an already loaded spec."""
+    if isinstance(source, dict):
+        return source
+    with open(source, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_dataset(path: str) -> pd.DataFrame:
+    """Read a dataset file, choosing the reader from its extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    if ext in (".pkl", ".pickle"):
+        return pd.read_pickle(path)
+    return pd.read_csv(path)
+
+
+def apply_variation(spec: Union[str, VariationSpec], base_df: Optional[pd.DataFrame] = None,
+                    base_cache: Optional[Dict[str, pd.DataFrame]] = None) -> pd.DataFrame:
+    """
+    Materialize a variation in memory.
+
+    Args:
+        spec: Spec dict or path to a ``*.variation.json`` file
+        base_df: Optional already loaded base dataset
+        base_cache: Optional dict shared across calls so each base file is parsed once
+
+    Returns:
+        Transformed DataFrame (the base data is never modified)
+    """
+    spec = load_variation_spec(spec)
+    if base_df is None:
+        base_path = spec["base"]
+        if base_cache is not None and base_path in base_cache:
+            base_df = base_cache[base_path]
+        else:
+            base_df = read_dataset(base_path)
+            if base_cache is not None:
+                base_cache[base_path] = base_df
+
+    df = base_df.copy()
+    for step in spec["transforms"]:
+        params = {k: v for k, v in step.items() if k != "op"}
+        df = VARIATION_TRANSFORMS[step["op"]](df, **params)
+    return df
+
+
+def load_dataset(source: Union[str, VariationSpec],
+                 base_cache: Optional[Dict[str, pd.DataFrame]] = None) -> pd.DataFrame:
+    """Load either a plain dataset file or a lazy variation spec."""
+    if is_variation_spec(source):
+        return apply_variation(source, base_cache=base_cache)
+    return read_dataset(source)
+
+
+def materialize_variation(spec: Union[str, VariationSpec], output_path: Optional[str] = None,
+                          base_cache: Optional[Dict[str, pd.DataFrame]] = None) -> str:
+    """
+    Write a variation to a columnar file once and return its path.
+
+    Parquet is used when a Parquet engine is installed, otherwise a pandas pickle.
+    An existing output file is reused as-is.
+
+    Args:
+        spec: Spec dict or path to a ``*.variation.json`` file
+        output_path: Target path without extension (defaults to next to the spec / base file)
+        base_cache: Optional shared base dataset cache
+
+    Returns:
+        Path of the materialized file
+    """
+    spec_path = spec if isinstance(spec, str) else None
+    spec = load_variation_spec(spec)
+    if output_path is None:
+        directory = os.path.dirname(spec_path) if spec_path else os.path.dirname(spec["base"])
+        output_path = os.path.join(directory, spec["name"])
+    output_path = os.path.splitext(output_path)[0]
+
+    for ext in (".parquet", ".pkl"):
+        if os.path.exists(output_path + ext):
+            return output_path + ext
+
+    df = apply_variation(spec, base_cache=base_cache)
+    try:
+        df.to_parquet(output_path + ".parquet", index=False)
+        return output_path + ".parquet"
+    except ImportError:
+        df.to_pickle(output_path + ".pkl")
+        return output_path + ".pkl"
@@ -1,5 +1,3 @@
-from IPython.display import HTML, display
-
 class Display:
     """
     Display raw HTML content directly in Jupyter notebook
@@ -19,4 +17,6 @@ class Display:
         pass
     
     def show(self, html_content: str) -> None:
+        from IPython.display import HTML, display
+
         display(HTML(html_content))
\ No newline at end of file